@@ -14,6 +14,9 @@ class FileHashesPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  # The report does not depend on the order of the events.
+  REQUIRES_SORTED_EVENTS = False
+
   def __init__(self):
     """Initializes the unique hashes plugin."""
     super(FileHashesPlugin, self).__init__()
@@ -52,6 +52,13 @@ class AnalysisPlugin(object):
   # should be able to run during the extraction phase.
   ENABLE_IN_EXTRACTION = False
 
+  # A flag indicating whether or not this plugin needs to examine the events
+  # in chronological order. Plugins that do not depend on the order of
+  # the events can be passed the events in the order they were stored,
+  # which avoids merging the event streams of the storage in chronological
+  # order.
+  REQUIRES_SORTED_EVENTS = True
+
   def __init__(self):
     """Initializes an analysis plugin."""
     super(AnalysisPlugin, self).__init__()
@@ -108,6 +115,21 @@ class AnalysisPlugin(object):
       event (EventObject): event.
     """
 
+  def ExamineEvents(self, mediator, events):
+    """Analyzes a batch of event objects.
+
+    Plugins that can share work between events, such as the evaluation of
+    rules, can override this method. By default every event is examined
+    separately.
+
+    Args:
+      mediator (AnalysisMediator): mediates interactions between
+          analysis plugins and other components, such as storage and dfvfs.
+      events (list[EventObject]): events.
+    """
+    for event in events:
+      self.ExamineEvent(mediator, event)
+
 
 class HashTaggingAnalysisPlugin(AnalysisPlugin):
   """An interface for plugins that tag events based on the source file hash.
@@ -36,12 +36,17 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
   _OBJECTFILTER_WORDS = re.compile(
       r'\s(is|isnot|equals|notequals|inset|notinset|contains|notcontains)\s')
 
+  # Names of the event attributes the rules are dispatched on.
+  _DISPATCH_ATTRIBUTE_NAMES = (u'data_type', u'parser')
+
   def __init__(self):
     """Initializes a tagging analysis plugin."""
     super(TaggingAnalysisPlugin, self).__init__()
     self._autodetect_tag_file_attempt = False
     self._number_of_event_tags = 0
+    self._tag_definitions = None
     self._tag_rules = None
+    self._tag_rules_per_dispatch_key = {}
     self._tagging_file_name = None
 
   def _AttemptAutoDetectTagFile(self, analysis_mediator):
@@ -67,6 +72,167 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
     self.SetAndLoadTagFile(tag_file_path)
     return True
 
+  def _CreateTagExpression(self, label_name, rules):
+    """Creates the efilter expression of a tag.
+
+    Args:
+      label_name (str): name of the label.
+      rules (list[efilter.ast.Expression]): efilter abstract syntax trees
+          (ASTs) of the rules of the label.
+
+    Returns:
+      efilter.ast.Expression: efilter abstract syntax tree (AST) that
+          evaluates to the name of the label if any of the rules match and
+          to None otherwise.
+    """
+    return efilter_ast.IfElse(
+        # Union will be true if any of the 'rules' match.
+        efilter_ast.Union(*rules),
+        # If so then evaluate to a string with the name of the tag.
+        efilter_ast.Literal(label_name),
+        # Otherwise don't return anything.
+        efilter_ast.Literal(None))
+
+  def _CreateTagRules(self, tag_definitions):
+    """Creates the efilter expression of all the tags.
+
+    Args:
+      tag_definitions (list[tuple[str, list[efilter.ast.Expression]]]): label
+          names and efilter abstract syntax trees (ASTs) of their rules.
+
+    Returns:
+      efilter.ast.Expression: efilter abstract syntax tree (AST), containing the
+          tagging rules.
+    """
+    tags = [
+        self._CreateTagExpression(label_name, rules)
+        for label_name, rules in tag_definitions]
+
+    # Generate a repeated value with all the tags (None will be skipped).
+    return efilter_ast.Repeat(*tags)
+
+  def _GetRuleConstraints(self, expression):
+    """Determines the dispatch attribute values a rule can match.
+
+    Only the equivalence of a dispatch attribute with a literal and the
+    conjunction and disjunction of such conditions are analyzed. Any other
+    expression is considered to match any value.
+
+    Args:
+      expression (efilter.ast.Expression): efilter abstract syntax tree (AST)
+          of the rule.
+
+    Returns:
+      dict[str, frozenset[object]]: values the rule can match per dispatch
+          attribute name, where a missing attribute name represents that
+          the rule can match any value.
+    """
+    expression_type = type(expression)
+
+    if expression_type is efilter_ast.Equivalence:
+      attribute_names = set()
+      values = set()
+      for child in expression.children:
+        if isinstance(child, efilter_ast.Var):
+          attribute_names.add(child.value)
+        elif isinstance(child, efilter_ast.Literal):
+          values.add(child.value)
+        else:
+          return {}
+
+      if len(attribute_names) != 1 or not values:
+        return {}
+
+      attribute_name = attribute_names.pop()
+      if attribute_name not in self._DISPATCH_ATTRIBUTE_NAMES:
+        return {}
+
+      # All the children must be equivalent, hence literals with different
+      # values cannot match.
+      if len(values) > 1:
+        return {attribute_name: frozenset()}
+
+      return {attribute_name: frozenset(values)}
+
+    if expression_type is efilter_ast.Intersection:
+      constraints = {}
+      for child in expression.children:
+        for attribute_name, values in iter(
+            self._GetRuleConstraints(child).items()):
+          if attribute_name in constraints:
+            values = constraints[attribute_name] & values
+          constraints[attribute_name] = values
+
+      return constraints
+
+    if expression_type is efilter_ast.Union:
+      constraints = None
+      for child in expression.children:
+        child_constraints = self._GetRuleConstraints(child)
+        if constraints is None:
+          constraints = child_constraints
+          continue
+
+        # An attribute only constrains the union if it constrains every
+        # alternative.
+        constraints = {
+            attribute_name: values | child_constraints[attribute_name]
+            for attribute_name, values in iter(constraints.items())
+            if attribute_name in child_constraints}
+
+      return constraints or {}
+
+    return {}
+
+  def _GetTagRules(self, event):
+    """Retrieves the tagging rules that can match an event.
+
+    The rules are compiled per combination of dispatch attribute values,
+    such as the data type and parser, and cached.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      efilter.ast.Expression: efilter abstract syntax tree (AST), containing
+          the tagging rules that can match the event or None if no rule can
+          match the event.
+    """
+    dispatch_key = tuple(
+        getattr(event, attribute_name, None)
+        for attribute_name in self._DISPATCH_ATTRIBUTE_NAMES)
+
+    try:
+      return self._tag_rules_per_dispatch_key[dispatch_key]
+    except KeyError:
+      pass
+    except TypeError:
+      # An unhashable attribute value cannot be cached, hence all the rules
+      # are evaluated.
+      return self._tag_rules
+
+    tags = []
+    for label_name, rules in self._tag_definitions:
+      matching_rules = []
+      for rule, constraints in rules:
+        for attribute_name, value in zip(
+            self._DISPATCH_ATTRIBUTE_NAMES, dispatch_key):
+          values = constraints.get(attribute_name, None)
+          if values is not None and value not in values:
+            break
+        else:
+          matching_rules.append(rule)
+
+      if matching_rules:
+        tags.append(self._CreateTagExpression(label_name, matching_rules))
+
+    tag_rules = None
+    if tags:
+      tag_rules = efilter_ast.Repeat(*tags)
+
+    self._tag_rules_per_dispatch_key[dispatch_key] = tag_rules
+    return tag_rules
+
   def _ParseDefinitions(self, tag_file_path):
     """Parses the tag file and yields tuples of label name, list of rule ASTs.
 
@@ -132,34 +298,39 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
           u'Unable to build query from rule: "{0:s}" with error: {1:s}'.format(
               stripped_rule, exception.message))
 
-  def _ParseTaggingFile(self, tag_file_path):
-    """Parses tag definitions from the source.
+  def _ParseTagDefinitions(self, tag_file_path):
+    """Parses the tag definitions with valid rules from the tag file.
 
     Args:
       tag_file_path (str): path to the tag file.
 
     Returns:
-      efilter.ast.Expression: efilter abstract syntax tree (AST), containing the
-          tagging rules.
+      list[tuple[str, list[efilter.ast.Expression]]]: label names and efilter
+          abstract syntax trees (ASTs) of their rules.
     """
-    tags = []
+    tag_definitions = []
     for label_name, rules in self._ParseDefinitions(tag_file_path):
       if not rules:
         logging.warning(u'All rules for label "{0:s}" are invalid.'.format(
             label_name))
         continue
 
-      tag = efilter_ast.IfElse(
-          # Union will be true if any of the 'rules' match.
-          efilter_ast.Union(*[rule.root for rule in rules]),
-          # If so then evaluate to a string with the name of the tag.
-          efilter_ast.Literal(label_name),
-          # Otherwise don't return anything.
-          efilter_ast.Literal(None))
-      tags.append(tag)
+      tag_definitions.append((label_name, [rule.root for rule in rules]))
 
-    # Generate a repeated value with all the tags (None will be skipped).
-    return efilter_ast.Repeat(*tags)
+    return tag_definitions
+
+  def _ParseTaggingFile(self, tag_file_path):
+    """Parses tag definitions from the source.
+
+    Args:
+      tag_file_path (str): path to the tag file.
+
+    Returns:
+      efilter.ast.Expression: efilter abstract syntax tree (AST), containing the
+          tagging rules.
+    """
+    tag_definitions = self._ParseTagDefinitions(tag_file_path)
+    return self._CreateTagRules(tag_definitions)
 
   def CompileReport(self, mediator):
     """Compiles an analysis report.
@@ -184,6 +355,19 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
           plugins and other components, such as storage and dfvfs.
       event (EventObject): event to examine.
     """
+    self.ExamineEvents(mediator, [event])
+
+  def ExamineEvents(self, mediator, events):
+    """Analyzes events and tags them according to rules in the tag file.
+
+    Only the rules that can match the data type and parser of an event
+    are evaluated.
+
+    Args:
+      mediator (AnalysisMediator): mediates interactions between analysis
+          plugins and other components, such as storage and dfvfs.
+      events (list[EventObject]): events to examine.
+    """
     if self._tag_rules is None:
       if self._autodetect_tag_file_attempt:
         # There's nothing to tag with, and we've already tried to find a good
@@ -196,21 +380,27 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
             u'no events will be tagged.')
         return
 
-    try:
-      matched_labels = efilter_api.apply(self._tag_rules, vars=event)
-    except efilter_errors.EfilterTypeError as exception:
-      logging.warning(u'Unable to apply efilter query with error: {0:s}'.format(
-          exception))
-      matched_labels = None
+    for event in events:
+      tag_rules = self._GetTagRules(event)
+      if tag_rules is None:
+        continue
+
+      try:
+        matched_labels = efilter_api.apply(tag_rules, vars=event)
+      except efilter_errors.EfilterTypeError as exception:
+        logging.warning(
+            u'Unable to apply efilter query with error: {0:s}'.format(
+                exception))
+        matched_labels = None
 
-    if not matched_labels:
-      return
+      if not matched_labels:
+        continue
 
-    labels = list(efilter_api.getvalues(matched_labels))
-    event_tag = self._CreateEventTag(event, self._EVENT_TAG_COMMENT, labels)
+      labels = list(efilter_api.getvalues(matched_labels))
+      event_tag = self._CreateEventTag(event, self._EVENT_TAG_COMMENT, labels)
 
-    mediator.ProduceEventTag(event_tag)
-    self._number_of_event_tags += 1
+      mediator.ProduceEventTag(event_tag)
+      self._number_of_event_tags += 1
 
   def SetAndLoadTagFile(self, tagging_file_path):
     """Sets the tag file to be used by the plugin.
@@ -218,8 +408,14 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
     Args:
       tagging_file_path (str): path of the tagging file.
     """
+    tag_definitions = self._ParseTagDefinitions(tagging_file_path)
+
+    self._tag_definitions = [
+        (label_name, [(rule, self._GetRuleConstraints(rule)) for rule in rules])
+        for label_name, rules in tag_definitions]
+    self._tag_rules = self._CreateTagRules(tag_definitions)
+    self._tag_rules_per_dispatch_key = {}
     self._tagging_file_name = tagging_file_path
-    self._tag_rules = self._ParseTaggingFile(self._tagging_file_name)
 
 
 manager.AnalysisPluginManager.RegisterPlugin(TaggingAnalysisPlugin)
@@ -26,6 +26,9 @@ class UniqueDomainsVisitedPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  # The report does not depend on the order of the events.
+  REQUIRES_SORTED_EVENTS = False
+
   _DATATYPES = frozenset([
       u'chrome:history:file_downloaded', u'chrome:history:page_visited',
       u'firefox:places:page_visited', u'firefox:downloads:download',
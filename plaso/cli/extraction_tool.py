@@ -320,6 +320,20 @@ class ExtractionTool(status_view_tool.StatusViewTool):
             u'The profiling type: "all", "memory", "parsers", "processing" '
             u'or "serializers".'))
 
+  def AddStorageOptions(self, argument_group):
+    """Adds the storage options to the argument group.
+
+    Args:
+      argument_group (argparse._ArgumentGroup): argparse argument group.
+    """
+    argument_group.add_argument(
+        u'--serializer_format', u'--serializer-format',
+        dest=u'serializer_format', action=u'store',
+        choices=sorted(definitions.SERIALIZER_FORMATS),
+        default=definitions.SERIALIZER_FORMAT_JSON, metavar=u'FORMAT', help=(
+            u'The storage serializer format: "binary" or "json" [defaults '
+            u'to "json"].'))
+
   def ParseOptions(self, options):
     """Parses tool specific options.
 
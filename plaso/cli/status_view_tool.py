@@ -133,6 +133,20 @@ class StatusViewTool(storage_media_tool.StorageMediaTool):
 
     self._PrintStatusHeader()
 
+    if processing_status.collection_status:
+      self._output_writer.Write(
+          u'Collection\t: {0:s} ({1:d} path specifications)\n\n'.format(
+              processing_status.collection_status,
+              processing_status.number_of_collected_path_specs))
+
+    if processing_status.merge_backlog is not None:
+      self._output_writer.Write((
+          u'Merge\t\t: {0:d} task storage files pending ({1:d} merged, '
+          u'{2:.1f} events/s)\n\n').format(
+              processing_status.merge_backlog,
+              processing_status.number_of_merged_tasks,
+              processing_status.merge_throughput))
+
     # TODO: for win32console get current color and set intensity,
     # write the header separately then reset intensity.
     status_header = (
@@ -5,6 +5,7 @@ from plaso.containers import artifacts
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import path_specs
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
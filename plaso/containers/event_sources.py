@@ -13,6 +13,8 @@ class EventSource(interface.AttributeContainer):
   or Application Compatibility cache.
 
   Attributes:
+    data_size (int): size of the data of the file entry, in bytes, or None
+        if not known.
     data_type (str): attribute container type indicator.
     file_entry_type (str): dfVFS file entry type.
     path_spec (dfvfs.PathSpec): path specification.
@@ -27,6 +29,7 @@ class EventSource(interface.AttributeContainer):
       path_spec (Optional[dfvfs.PathSpec]): path specification.
     """
     super(EventSource, self).__init__()
+    self.data_size = None
     self.data_type = self.DATA_TYPE
     self.file_entry_type = None
     self.path_spec = path_spec
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Path specification related attribute container object definitions."""
+
+from plaso.containers import interface
+from plaso.containers import manager
+
+
+class PathSpecContainer(interface.AttributeContainer):
+  """Class to represent a path specification attribute container.
+
+  The path specification attribute container is used by the storage to
+  store a distinct path specification once, so that events can refer to it
+  instead of each containing a copy of the path specification.
+
+  Attributes:
+    path_spec (dfvfs.PathSpec): path specification.
+  """
+  CONTAINER_TYPE = u'path_spec'
+
+  def __init__(self, path_spec=None):
+    """Initializes a path specification attribute container.
+
+    Args:
+      path_spec (Optional[dfvfs.PathSpec]): path specification.
+    """
+    super(PathSpecContainer, self).__init__()
+    self.path_spec = path_spec
+
+
+manager.AttributeContainersManager.RegisterAttributeContainer(
+    PathSpecContainer)
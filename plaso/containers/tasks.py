@@ -18,6 +18,8 @@ class Task(interface.AttributeContainer):
     aborted (bool): True if the session was aborted.
     completion_time (int): time that the task was completed. Contains the
         number of micro seconds since January 1, 1970, 00:00:00 UTC.
+    data_size (int): total data size of the files to process, in bytes,
+        or None if not known.
     file_entry_type (str): dfVFS type of the file entry the path specification
         is referencing.
     identifier (str): unique identifier of the task.
@@ -26,6 +28,8 @@ class Task(interface.AttributeContainer):
     merge_priority (int): priority used for the task storage file merge, where
         a lower value indicates a higher priority to merge.
     path_spec (dfvfs.PathSpec): path specification.
+    path_specs (list[dfvfs.PathSpec]): path specifications of a batched task,
+        where None indicates the task only consists of path_spec.
     session_identifier (str): the identifier of the session the task
         is part of.
     start_time (int): time that the task was started. Contains the number
@@ -44,11 +48,13 @@ class Task(interface.AttributeContainer):
     super(Task, self).__init__()
     self.aborted = False
     self.completion_time = None
+    self.data_size = None
     self.file_entry_type = None
     self.identifier = u'{0:s}'.format(uuid.uuid4().get_hex())
     self.last_processing_time = None
     self.merge_priority = None
     self.path_spec = None
+    self.path_specs = None
     self.session_identifier = session_identifier
     self.start_time = int(time.time() * 1000000)
     self.storage_file_size = None
@@ -80,6 +86,20 @@ class Task(interface.AttributeContainer):
     task_start.timestamp = self.start_time
     return task_start
 
+  def GetPathSpecs(self):
+    """Retrieves the path specifications to process.
+
+    Returns:
+      list[dfvfs.PathSpec]: path specifications.
+    """
+    if self.path_specs:
+      return self.path_specs
+
+    if self.path_spec:
+      return [self.path_spec]
+
+    return []
+
   def UpdateProcessingTime(self):
     """Updates the processing time to now."""
     self.last_processing_time = int(time.time() * 1000000)
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""The cached data stream file-like object.
+
+The cached data stream is a bounded read-through block cache of a data
+stream, that allows the analyzers, the archive and compressed stream type
+detection, the signature scan and the parsers to share the data read from
+the underlying storage.
+"""
+
+import collections
+import os
+
+from dfvfs.file_io import file_io
+
+
+class CachedDataStream(object):
+  """Class that implements a read-through block cache of a data stream.
+
+  Blocks that contain the header or the footer of the data stream are used
+  by type detection and signature scanning and are therefore kept for the
+  lifetime of the cache. Other blocks are kept up to the maximum cached data
+  size and evicted in least-recently-used order.
+
+  Attributes:
+    number_of_bytes_read (int): number of bytes read from the underlying
+        file-like object.
+    number_of_bytes_requested (int): number of bytes requested from the cached
+        data stream.
+  """
+
+  _BLOCK_SIZE = 32 * 1024
+
+  # Size of the header and footer data that is kept for the lifetime of
+  # the cache.
+  _HEADER_DATA_SIZE = 64 * 1024
+  _FOOTER_DATA_SIZE = 64 * 1024
+
+  _MAXIMUM_CACHED_DATA_SIZE = 16 * 1024 * 1024
+
+  def __init__(self, file_object, maximum_cached_data_size=None):
+    """Initializes a cached data stream.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object of the data stream.
+      maximum_cached_data_size (Optional[int]): maximum size of the cached
+          data, excluding the header and footer data, where None represents
+          the default.
+    """
+    if maximum_cached_data_size is None:
+      maximum_cached_data_size = self._MAXIMUM_CACHED_DATA_SIZE
+
+    super(CachedDataStream, self).__init__()
+    self._blocks = collections.OrderedDict()
+    self._current_offset = 0
+    self._file_object = file_object
+    self._last_block_data = None
+    self._last_block_index = None
+    self._maximum_number_of_blocks = max(
+        1, maximum_cached_data_size // self._BLOCK_SIZE)
+    self._pinned_blocks = {}
+    self._size = file_object.get_size()
+
+    self._last_header_block_index = (
+        (self._HEADER_DATA_SIZE - 1) // self._BLOCK_SIZE)
+    self._first_footer_block_index = (
+        max(0, self._size - self._FOOTER_DATA_SIZE) // self._BLOCK_SIZE)
+
+    self.number_of_bytes_read = 0
+    self.number_of_bytes_requested = 0
+
+  def _CacheBlock(self, block_index, block_data):
+    """Caches a block.
+
+    Args:
+      block_index (int): index of the block.
+      block_data (bytes): data of the block.
+    """
+    if (block_index <= self._last_header_block_index or
+        block_index >= self._first_footer_block_index):
+      self._pinned_blocks[block_index] = block_data
+      return
+
+    self._blocks[block_index] = block_data
+    if len(self._blocks) > self._maximum_number_of_blocks:
+      self._blocks.popitem(last=False)
+
+  def _GetCachedBlock(self, block_index):
+    """Retrieves a cached block.
+
+    Args:
+      block_index (int): index of the block.
+
+    Returns:
+      bytes: data of the block or None if the block is not cached.
+    """
+    block_data = self._pinned_blocks.get(block_index, None)
+    if block_data is None:
+      block_data = self._blocks.pop(block_index, None)
+      if block_data is not None:
+        # Move the block to the end to mark it as most recently used.
+        self._blocks[block_index] = block_data
+
+    return block_data
+
+  def _ReadBlocks(self, first_block_index, last_block_index):
+    """Reads blocks, using the cached blocks where available.
+
+    Consecutive blocks that are not cached are read from the underlying
+    file-like object with a single read.
+
+    Args:
+      first_block_index (int): index of the first block.
+      last_block_index (int): index of the last block.
+
+    Returns:
+      list[bytes]: data of the blocks.
+    """
+    blocks_data = []
+    uncached_block_index = None
+
+    for block_index in range(first_block_index, last_block_index + 1):
+      block_data = self._GetCachedBlock(block_index)
+      if block_data is None:
+        if uncached_block_index is None:
+          uncached_block_index = block_index
+        continue
+
+      if uncached_block_index is not None:
+        blocks_data.extend(self._ReadUncachedBlocks(
+            uncached_block_index, block_index - 1))
+        uncached_block_index = None
+
+      blocks_data.append(block_data)
+
+    if uncached_block_index is not None:
+      blocks_data.extend(self._ReadUncachedBlocks(
+          uncached_block_index, last_block_index))
+
+    return blocks_data
+
+  def _ReadUncachedBlocks(self, first_block_index, last_block_index):
+    """Reads blocks from the underlying file-like object.
+
+    Args:
+      first_block_index (int): index of the first block.
+      last_block_index (int): index of the last block.
+
+    Returns:
+      list[bytes]: data of the blocks.
+
+    Raises:
+      IOError: if the blocks cannot be read.
+    """
+    offset = first_block_index * self._BLOCK_SIZE
+    read_size = min(
+        (last_block_index + 1) * self._BLOCK_SIZE, self._size) - offset
+
+    self._file_object.seek(offset, os.SEEK_SET)
+    data = self._file_object.read(read_size)
+    if len(data) != read_size:
+      raise IOError(
+          u'Unable to read: {0:d} bytes at offset: 0x{1:08x}.'.format(
+              read_size, offset))
+
+    self.number_of_bytes_read += read_size
+
+    blocks_data = []
+    for block_index in range(first_block_index, last_block_index + 1):
+      block_offset = (block_index - first_block_index) * self._BLOCK_SIZE
+      block_data = data[block_offset:block_offset + self._BLOCK_SIZE]
+      self._CacheBlock(block_index, block_data)
+      blocks_data.append(block_data)
+
+    return blocks_data
+
+  # Note: that the following functions do not follow the style guide
+  # because they are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the cached data stream and the underlying file-like object."""
+    if not self._file_object:
+      raise IOError(u'Not opened.')
+
+    self._file_object.close()
+    self._file_object = None
+
+    self._blocks = collections.OrderedDict()
+    self._last_block_data = None
+    self._last_block_index = None
+    self._pinned_blocks = {}
+
+  def get_offset(self):
+    """Retrieves the current offset into the data stream.
+
+    Returns:
+      int: current offset into the data stream.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the data stream.
+
+    Returns:
+      int: size of the data stream.
+    """
+    return self._size
+
+  def read(self, size=None):
+    """Reads a byte string from the data stream at the current offset.
+
+    The function will read a byte string of the specified size or
+    all of the remaining data if no size was specified.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None is all
+          remaining data.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the read failed.
+    """
+    if not self._file_object:
+      raise IOError(u'Not opened.')
+
+    if self._current_offset < 0:
+      raise IOError(u'Invalid current offset value less than zero.')
+
+    if self._current_offset >= self._size or size == 0:
+      return b''
+
+    if size is None or self._current_offset + size > self._size:
+      size = self._size - self._current_offset
+
+    first_block_index, block_offset = divmod(
+        self._current_offset, self._BLOCK_SIZE)
+    last_block_index = (self._current_offset + size - 1) // self._BLOCK_SIZE
+
+    if (first_block_index == last_block_index and
+        first_block_index == self._last_block_index):
+      # Fast path for consecutive small reads within the same block.
+      data = self._last_block_data[block_offset:block_offset + size]
+
+    else:
+      blocks_data = self._ReadBlocks(first_block_index, last_block_index)
+
+      self._last_block_data = blocks_data[-1]
+      self._last_block_index = last_block_index
+
+      if len(blocks_data) == 1:
+        data = blocks_data[0][block_offset:block_offset + size]
+      else:
+        data = b''.join(blocks_data)[block_offset:block_offset + size]
+
+    self._current_offset += size
+    self.number_of_bytes_requested += size
+
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks to an offset within the data stream.
+
+    Args:
+      offset (int): offset to seek to.
+      whence (Optional(int)): value that indicates whether offset is an
+          absolute or relative position within the data stream.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if not self._file_object:
+      raise IOError(u'Not opened.')
+
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def tell(self):
+    """Retrieves the current offset into the data stream.
+
+    Returns:
+      int: current offset into the data stream.
+    """
+    return self._current_offset
+
+
+class CachedDataStreamFileIO(file_io.FileIO):
+  """Class that implements a dfVFS file-like object of a cached data stream.
+
+  The file-like object allows dfVFS functions that open a data stream by its
+  path specification, such as the type indicator detection of the dfVFS
+  analyzer, to read the cached data stream instead of the underlying storage.
+  It is cached in the resolver context under the path specification of
+  the data stream, so that the dfVFS resolver returns it instead of opening
+  the data stream again.
+
+  The cached data stream is owned by the caller and is not closed when
+  the file-like object is closed.
+  """
+
+  def __init__(self, resolver_context, data_stream):
+    """Initializes a file-like object.
+
+    Args:
+      resolver_context (dfvfs.Context): resolver context.
+      data_stream (CachedDataStream): cached data stream.
+    """
+    super(CachedDataStreamFileIO, self).__init__(resolver_context)
+    self._current_offset = 0
+    self._data_stream = data_stream
+
+  def _Close(self):
+    """Closes the file-like object."""
+    return
+
+  def _Open(self, path_spec=None, mode='rb'):
+    """Opens the file-like object.
+
+    Args:
+      path_spec (Optional[dfvfs.PathSpec]): path specification.
+      mode (Optional[str]): file access mode.
+    """
+    self._current_offset = 0
+
+  # Note: that the following functions do not follow the style guide
+  # because they are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def get_offset(self):
+    """Retrieves the current offset into the data stream.
+
+    Returns:
+      int: current offset into the data stream.
+
+    Raises:
+      IOError: if the file-like object has not been opened.
+    """
+    if not self._is_open:
+      raise IOError(u'Not opened.')
+
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the data stream.
+
+    Returns:
+      int: size of the data stream.
+
+    Raises:
+      IOError: if the file-like object has not been opened.
+    """
+    if not self._is_open:
+      raise IOError(u'Not opened.')
+
+    return self._data_stream.get_size()
+
+  def read(self, size=None):
+    """Reads a byte string from the data stream at the current offset.
+
+    The function will read a byte string of the specified size or
+    all of the remaining data if no size was specified.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None is all
+          remaining data.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the file-like object has not been opened or the read
+          failed.
+    """
+    if not self._is_open:
+      raise IOError(u'Not opened.')
+
+    # The cached data stream can be shared with other readers, therefore
+    # the current offset is maintained independently.
+    self._data_stream.seek(self._current_offset, os.SEEK_SET)
+    data = self._data_stream.read(size)
+    self._current_offset += len(data)
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks to an offset within the data stream.
+
+    Args:
+      offset (int): offset to seek to.
+      whence (Optional(int)): value that indicates whether offset is an
+          absolute or relative position within the data stream.
+
+    Raises:
+      IOError: if the file-like object has not been opened or the seek
+          failed.
+    """
+    if not self._is_open:
+      raise IOError(u'Not opened.')
+
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._data_stream.get_size()
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value less than zero.')
+
+    self._current_offset = offset
@@ -54,6 +54,10 @@ class ExtractionConfiguration(interface.AttributeContainer):
   These settings are primarily used by the extraction worker.
 
   Attributes:
+    event_cache_maximum_size (int): maximum total size of the events stored
+        in the event cache in bytes, where None represents the default.
+    event_cache_path (str): path of the event cache file, where None
+        represents that the event cache is disabled.
     hasher_names_string (str): comma separated string of names
         of hashers to use during processing.
     process_archives (bool): True if archive files should be
@@ -67,6 +71,8 @@ class ExtractionConfiguration(interface.AttributeContainer):
   def __init__(self):
     """Initializes an extraction configuration object."""
     super(ExtractionConfiguration, self).__init__()
+    self.event_cache_maximum_size = None
+    self.event_cache_path = None
     self.hasher_names_string = None
     self.process_archives = False
     self.process_compressed_streams = True
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""The persistent cache of events extracted from file content.
+
+The event cache allows successive extractions of the same or similar sources,
+such as acquisitions of systems installed from the same image, to reuse the
+events that the parsers produced for data streams with identical content
+instead of parsing these data streams again.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import zlib
+
+# pylint: disable=wrong-import-order
+try:
+  from pysqlite2 import dbapi2 as sqlite3
+except ImportError:
+  import sqlite3
+
+import plaso
+
+
+class EventCache(object):
+  """Class that implements a persistent cache of extracted events.
+
+  The events are stored in a SQLite database file, which can be shared by
+  multiple worker processes. The events are stored per key, which is derived
+  from the content of the data stream and the context of the extraction,
+  such as the enabled parsers and the plaso version. When the total size of
+  the stored events exceeds the maximum size the least recently used events
+  are evicted.
+
+  The last used times of the entries that are read are updated in batches,
+  since every write needs a lock on the database file that is shared by
+  the worker processes.
+
+  Attributes:
+    number_of_hits (int): number of keys for which events were found.
+    number_of_misses (int): number of keys for which no events were found.
+  """
+
+  # The default maximum total size of the stored events.
+  _DEFAULT_MAXIMUM_SIZE = 1024 * 1024 * 1024
+
+  # Number of stored entries between checks of the total size.
+  _EVICTION_CHECK_INTERVAL = 64
+
+  # The total size is reduced to this fraction of the maximum size
+  # on eviction, to prevent evicting on every subsequent check.
+  _EVICTION_TARGET_FRACTION = 0.9
+
+  # Number of seconds to wait for a lock held by another process.
+  _LOCK_TIMEOUT = 30.0
+
+  # Number of read entries of which the last used time is updated at once.
+  _LAST_USED_UPDATE_INTERVAL = 256
+
+  _CREATE_TABLE_QUERY = (
+      u'CREATE TABLE IF NOT EXISTS events ('
+      u'key TEXT PRIMARY KEY, data BLOB, data_size INTEGER, '
+      u'last_used INTEGER)')
+
+  _CREATE_INDEX_QUERY = (
+      u'CREATE INDEX IF NOT EXISTS events_last_used ON events (last_used)')
+
+  def __init__(self, path, maximum_size=None):
+    """Initializes an event cache.
+
+    Args:
+      path (str): path of the SQLite database file of the cache.
+      maximum_size (Optional[int]): maximum total size of the stored events
+          in bytes, where None represents the default.
+    """
+    super(EventCache, self).__init__()
+    self._connection = None
+    self._last_used_keys = set()
+    self._maximum_size = maximum_size or self._DEFAULT_MAXIMUM_SIZE
+    self._number_of_stored_entries = 0
+    self._path = path
+
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+
+  def _DeleteEntry(self, key):
+    """Deletes the entry of a key.
+
+    Args:
+      key (str): key of the events.
+    """
+    try:
+      cursor = self._connection.cursor()
+      cursor.execute(u'DELETE FROM events WHERE key = ?', (key, ))
+      self._connection.commit()
+
+    except sqlite3.Error as exception:
+      logging.warning(
+          u'Unable to delete from event cache with error: {0!s}'.format(
+              exception))
+
+  def _EvictEntries(self):
+    """Evicts the least recently used entries if the cache is too large."""
+    self._UpdateLastUsed()
+
+    cursor = self._connection.cursor()
+    cursor.execute(u'SELECT SUM(data_size) FROM events')
+    total_size = cursor.fetchone()[0] or 0
+    if total_size <= self._maximum_size:
+      return
+
+    target_size = int(self._maximum_size * self._EVICTION_TARGET_FRACTION)
+
+    evicted_keys = []
+    cursor.execute(
+        u'SELECT key, data_size FROM events ORDER BY last_used ASC')
+    for key, data_size in cursor.fetchall():
+      if total_size <= target_size:
+        break
+
+      evicted_keys.append((key, ))
+      total_size -= data_size
+
+    cursor.executemany(u'DELETE FROM events WHERE key = ?', evicted_keys)
+    self._connection.commit()
+
+    logging.debug(u'Evicted {0:d} entries from event cache: {1:s}'.format(
+        len(evicted_keys), self._path))
+
+  def _UpdateLastUsed(self):
+    """Updates the last used time of the entries that were read."""
+    if not self._last_used_keys:
+      return
+
+    last_used = int(time.time())
+    parameters = [(last_used, key) for key in self._last_used_keys]
+    self._last_used_keys = set()
+
+    try:
+      cursor = self._connection.cursor()
+      cursor.executemany(
+          u'UPDATE events SET last_used = ? WHERE key = ?', parameters)
+      self._connection.commit()
+
+    except sqlite3.Error as exception:
+      logging.warning((
+          u'Unable to update last used time of {0:d} entries in event cache '
+          u'with error: {1!s}').format(len(parameters), exception))
+
+  def Close(self):
+    """Closes the cache.
+
+    Raises:
+      IOError: if the cache is not opened.
+    """
+    if not self._connection:
+      raise IOError(u'Cache not opened.')
+
+    self._UpdateLastUsed()
+
+    self._connection.close()
+    self._connection = None
+
+    logging.debug((
+        u'Closed event cache: {0:s} with {1:d} hits and {2:d} '
+        u'misses.').format(
+            self._path, self.number_of_hits, self.number_of_misses))
+
+  def GetEvents(self, key):
+    """Retrieves the events stored for a key.
+
+    Args:
+      key (str): key of the events.
+
+    Returns:
+      list[tuple[str, str, str]]: parser chain, query and JSON serialized
+          event of the recorded events or None if no events are stored
+          for the key or the stored events are corrupt.
+
+    Raises:
+      IOError: if the cache is not opened.
+    """
+    if not self._connection:
+      raise IOError(u'Cache not opened.')
+
+    try:
+      cursor = self._connection.cursor()
+      cursor.execute(u'SELECT data FROM events WHERE key = ?', (key, ))
+      row = cursor.fetchone()
+
+    except sqlite3.Error as exception:
+      logging.warning(
+          u'Unable to read from event cache with error: {0!s}'.format(
+              exception))
+      row = None
+
+    if not row:
+      self.number_of_misses += 1
+      return
+
+    try:
+      data = zlib.decompress(bytes(row[0]))
+      recorded_events = [tuple(values) for values in json.loads(data)]
+
+      for values in recorded_events:
+        if len(values) != 3:
+          raise ValueError(u'Unsupported number of recorded event values.')
+
+    except (TypeError, ValueError, zlib.error) as exception:
+      logging.warning((
+          u'Unable to read corrupt entry from event cache with error: '
+          u'{0!s}').format(exception))
+
+      # The corrupt entry is deleted so that the events are stored again.
+      self._DeleteEntry(key)
+
+      self.number_of_misses += 1
+      return
+
+    self._last_used_keys.add(key)
+    if len(self._last_used_keys) >= self._LAST_USED_UPDATE_INTERVAL:
+      self._UpdateLastUsed()
+
+    self.number_of_hits += 1
+    return recorded_events
+
+  def GetKey(
+      self, content_digest, data_stream_name, parser_filter_expression,
+      parsing_context):
+    """Retrieves the key of the events of a data stream.
+
+    Args:
+      content_digest (str): SHA-256 digest of the content of the data stream.
+      data_stream_name (str): name of the file entry and data stream, which
+          determines the parsers that are applied.
+      parser_filter_expression (str): parser filter expression.
+      parsing_context (tuple[object]): values, other than the content,
+          that the parsers depend on.
+
+    Returns:
+      str: key of the events.
+    """
+    key_values = [
+        plaso.GetVersion(), content_digest, data_stream_name,
+        parser_filter_expression or u'']
+    key_values.extend(parsing_context)
+
+    key_string = u'\x00'.join([
+        u'{0!s}'.format(value) for value in key_values])
+    return hashlib.sha256(key_string.encode(u'utf-8')).hexdigest()
+
+  def Open(self):
+    """Opens the cache and creates the SQLite database file if needed.
+
+    Raises:
+      IOError: if the cache is already opened or cannot be opened.
+    """
+    if self._connection:
+      raise IOError(u'Cache already opened.')
+
+    try:
+      self._connection = sqlite3.connect(
+          self._path, timeout=self._LOCK_TIMEOUT)
+
+      cursor = self._connection.cursor()
+      cursor.execute(self._CREATE_TABLE_QUERY)
+      cursor.execute(self._CREATE_INDEX_QUERY)
+      self._connection.commit()
+
+    except sqlite3.Error as exception:
+      self._connection = None
+      raise IOError(
+          u'Unable to open event cache: {0:s} with error: {1!s}'.format(
+              self._path, exception))
+
+  def SetEvents(self, key, recorded_events):
+    """Stores the events for a key.
+
+    Args:
+      key (str): key of the events.
+      recorded_events (list[tuple[str, str, str]]): parser chain, query and
+          JSON serialized event of the recorded events.
+
+    Raises:
+      IOError: if the cache is not opened.
+    """
+    if not self._connection:
+      raise IOError(u'Cache not opened.')
+
+    data = zlib.compress(json.dumps(recorded_events))
+    data_size = len(data)
+
+    # Events that would fill most of the cache are not worth storing.
+    if data_size > self._maximum_size // 4:
+      return
+
+    try:
+      cursor = self._connection.cursor()
+      cursor.execute(
+          u'INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)',
+          (key, sqlite3.Binary(data), data_size, int(time.time())))
+      self._connection.commit()
+
+      self._number_of_stored_entries += 1
+      if not self._number_of_stored_entries % self._EVICTION_CHECK_INTERVAL:
+        self._EvictEntries()
+
+    except sqlite3.Error as exception:
+      logging.warning(
+          u'Unable to write to event cache with error: {0!s}'.format(
+              exception))
@@ -7,6 +7,8 @@ An extractor is a class used to extract information from "raw" data.
 import copy
 import hashlib
 import logging
+import os
+import re
 
 import pysigscan
 
@@ -26,6 +28,12 @@ class EventExtractor(object):
   An event extractor extracts events from event sources.
   """
 
+  # The number of bytes at the start of a data stream that are read to match
+  # the first line hints of the parsers.
+  _FIRST_LINE_HINTS_DATA_SIZE = 4096
+
+  _BYTE_ORDER_MARK = u'\ufeff'
+
   def __init__(self, parser_filter_expression=None):
     """Initializes an event extractor object.
 
@@ -45,6 +53,8 @@ class EventExtractor(object):
     super(EventExtractor, self).__init__()
     self._file_scanner = None
     self._filestat_parser = None
+    self._first_line_hint_group_names = None
+    self._first_line_hints_regex = None
     self._mft_parser = None
     self._non_sigscan_parser_names = None
     self._parsers = None
@@ -71,6 +81,71 @@ class EventExtractor(object):
 
     return False
 
+  def _CompileFirstLineHints(self):
+    """Compiles the first line hints of the parsers without a signature.
+
+    The hints are combined into a single regular expression, in which every
+    hint is an optional look-ahead with a named group, so that a single match
+    determines all the hints that match.
+    """
+    self._first_line_hint_group_names = {}
+    self._first_line_hints_regex = None
+
+    expressions = []
+    for parser_name in self._non_sigscan_parser_names:
+      parser = self._parsers.get(parser_name, None)
+      first_line_hint = getattr(parser, u'FIRST_LINE_HINT', None)
+      if not first_line_hint:
+        continue
+
+      group_name = u'hint{0:d}'.format(len(expressions))
+      expressions.append(u'(?:(?=(?P<{0:s}>{1:s}))|)'.format(
+          group_name, first_line_hint))
+      self._first_line_hint_group_names[parser_name] = group_name
+
+    if expressions:
+      self._first_line_hints_regex = re.compile(u''.join(expressions))
+
+  def _GetFirstLineHintMatchParserNames(self, file_object):
+    """Determines the parsers without a signature to apply to a file.
+
+    Args:
+      file_object (file): file-like object whose contents will be checked
+          against the first line hints.
+
+    Returns:
+      list[str]: names of the parsers without a signature, that either have
+          no first line hint or whose hint matches the contents of
+          the file-like object.
+    """
+    if not self._first_line_hints_regex:
+      return self._non_sigscan_parser_names
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(self._FIRST_LINE_HINTS_DATA_SIZE)
+
+    # Undecodable bytes are replaced instead of rejecting the data, since
+    # the text parsers can skip lines that cannot be decoded.
+    text = data.decode(u'utf-8', u'replace')
+    text = text.lstrip(self._BYTE_ORDER_MARK).lstrip()
+    match = self._first_line_hints_regex.match(text)
+
+    parser_names = []
+    for parser_name in self._non_sigscan_parser_names:
+      group_name = self._first_line_hint_group_names.get(parser_name, None)
+      if not group_name:
+        parser_names.append(parser_name)
+        continue
+
+      matched = match.group(group_name) is not None
+      if self._parsers_profiler:
+        self._parsers_profiler.SampleFirstLineHint(parser_name, matched)
+
+      if matched:
+        parser_names.append(parser_name)
+
+    return parser_names
+
   def _GetSignatureMatchParserNames(self, file_object):
     """Determines if a file-like object matches one of the known signatures.
 
@@ -138,6 +213,8 @@ class EventExtractor(object):
     if u'usnjrnl' in self._parsers:
       del self._parsers[u'usnjrnl']
 
+    self._CompileFirstLineHints()
+
   def _ParseDataStreamWithParser(
       self, parser_mediator, parser, file_entry, data_stream_name):
     """Parses a data stream of a file entry with a specific parser.
@@ -265,24 +342,33 @@ class EventExtractor(object):
           u'[ParseDataStream] parsing file: {0:s} with parser: '
           u'{1:s}').format(display_name, parser_name))
 
-      self._ParseFileEntryWithParser(
+      result = self._ParseFileEntryWithParser(
           parser_mediator, parser, file_entry, file_object=file_object)
 
-  def ParseDataStream(self, parser_mediator, file_entry, data_stream_name):
+      if self._parsers_profiler:
+        self._parsers_profiler.SampleParseResult(parser_name, result)
+
+  def ParseDataStream(
+      self, parser_mediator, file_entry, data_stream_name, file_object=None):
     """Parses a data stream of a file entry with the enabled parsers.
 
     Args:
       parser_mediator (ParserMediator): parser mediator.
       file_entry (dfvfs.FileEntry): file entry.
       data_stream_name (str): data stream name.
+      file_object (Optional[file]): file-like object of the data stream,
+          which is not closed after parsing. If not set the data stream is
+          opened and closed by the event extractor.
 
     Raises:
       RuntimeError: if the file-like object or the parser object is missing.
     """
-    file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
-    if not file_object:
-      raise RuntimeError(
-          u'Unable to retrieve file-like object from file entry.')
+    close_file_object = file_object is None
+    if close_file_object:
+      file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
+      if not file_object:
+        raise RuntimeError(
+            u'Unable to retrieve file-like object from file entry.')
 
     try:
       parser_names = self._GetSignatureMatchParserNames(file_object)
@@ -293,12 +379,13 @@ class EventExtractor(object):
             parser_mediator, parser_names, file_entry, file_object=file_object)
 
       if not result:
+        parser_names = self._GetFirstLineHintMatchParserNames(file_object)
         self._ParserFileEntryWithParsers(
-            parser_mediator, self._non_sigscan_parser_names, file_entry,
-            file_object=file_object)
+            parser_mediator, parser_names, file_entry, file_object=file_object)
 
     finally:
-      file_object.close()
+      if close_file_object:
+        file_object.close()
 
   def ParseFileEntryMetadata(self, parser_mediator, file_entry):
     """Parses the file entry metadata e.g. file system data.
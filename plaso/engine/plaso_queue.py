@@ -11,11 +11,46 @@ scalability.
 
 import abc
 
+try:
+  import cPickle as pickle
+except ImportError:
+  import pickle  # pylint: disable=wrong-import-order
+
 
 class QueueAbort(object):
   """Class that implements a queue abort."""
 
 
+class QueueEventBatch(object):
+  """Class that implements a batch of events on a queue.
+
+  The events are serialized when the batch is created, hence the same batch
+  can be pushed onto multiple queues without serializing the events again
+  for every queue.
+
+  Attributes:
+    number_of_events (int): number of events in the batch.
+  """
+
+  def __init__(self, events):
+    """Initializes a batch of events.
+
+    Args:
+      events (list[EventObject]): events.
+    """
+    super(QueueEventBatch, self).__init__()
+    self._serialized_events = pickle.dumps(events, pickle.HIGHEST_PROTOCOL)
+    self.number_of_events = len(events)
+
+  def GetEvents(self):
+    """Retrieves the events.
+
+    Returns:
+      list[EventObject]: events.
+    """
+    return pickle.loads(self._serialized_events)
+
+
 class Queue(object):
   """Class that implements the queue interface."""
 
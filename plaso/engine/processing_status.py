@@ -309,9 +309,21 @@ class ProcessingStatus(object):
 
   Attributes:
     aborted (bool): True if processing was aborted.
+    collection_status (str): human readable status of the collection of
+        path specifications from the sources e.g. 'collecting' or None if
+        not available.
     error_path_specs (list[str]): path specification strings that caused
         critical errors during processing.
     foreman_status (ProcessingStatus): foreman processing status.
+    merge_backlog (int): number of task storage files that are waiting to be
+        merged or are being merged with the session storage or None if not
+        available.
+    merge_throughput (float): number of events merged with the session
+        storage per second or None if not available.
+    number_of_collected_path_specs (int): number of path specifications
+        collected from the sources.
+    number_of_merged_tasks (int): number of task storage files merged with
+        the session storage.
   """
 
   def __init__(self):
@@ -320,8 +332,13 @@ class ProcessingStatus(object):
     self._workers_status = {}
 
     self.aborted = False
+    self.collection_status = None
     self.error_path_specs = []
     self.foreman_status = None
+    self.merge_backlog = None
+    self.merge_throughput = None
+    self.number_of_collected_path_specs = 0
+    self.number_of_merged_tasks = 0
 
   @property
   def workers_status(self):
@@ -392,6 +409,18 @@ class ProcessingStatus(object):
         new_reports):
       process_status.last_running_time = time.time()
 
+  def UpdateCollectionStatus(self, status, number_of_collected_path_specs):
+    """Updates the status of the collection of path specifications.
+
+    Args:
+      status (str): human readable status of the collection e.g.
+          'collecting'.
+      number_of_collected_path_specs (int): total number of path
+          specifications collected from the sources.
+    """
+    self.collection_status = status
+    self.number_of_collected_path_specs = number_of_collected_path_specs
+
   def UpdateForemanStatus(
       self, identifier, status, pid, used_memory, display_name,
       number_of_consumed_sources, number_of_produced_sources,
@@ -440,6 +469,22 @@ class ProcessingStatus(object):
         number_of_consumed_errors, number_of_produced_errors,
         number_of_consumed_reports, number_of_produced_reports)
 
+  def UpdateMergeStatus(
+      self, merge_backlog, number_of_merged_tasks, merge_throughput):
+    """Updates the status of the merge of task storage files.
+
+    Args:
+      merge_backlog (int): number of task storage files that are waiting to
+          be merged or are being merged with the session storage.
+      number_of_merged_tasks (int): total number of task storage files merged
+          with the session storage.
+      merge_throughput (float): number of events merged with the session
+          storage per second.
+    """
+    self.merge_backlog = merge_backlog
+    self.merge_throughput = merge_throughput
+    self.number_of_merged_tasks = number_of_merged_tasks
+
   def UpdateWorkerStatus(
       self, identifier, status, pid, used_memory, display_name,
       number_of_consumed_sources, number_of_produced_sources,
@@ -47,6 +47,28 @@ class CPUTimeMeasurements(object):
     self._system_time = None
 
 
+class ParserAttemptMeasurements(object):
+  """The parser attempt measurements.
+
+  Attributes:
+    number_of_attempts (int): number of files the parser was applied to.
+    number_of_failed_attempts (int): number of files the parser was applied
+        to but was unable to parse.
+    number_of_hint_hits (int): number of files the first line hint of
+        the parser matched.
+    number_of_hint_misses (int): number of files the first line hint of
+        the parser did not match.
+  """
+
+  def __init__(self):
+    """Initializes the parser attempt measurements object."""
+    super(ParserAttemptMeasurements, self).__init__()
+    self.number_of_attempts = 0
+    self.number_of_failed_attempts = 0
+    self.number_of_hint_hits = 0
+    self.number_of_hint_misses = 0
+
+
 class CPUTimeProfiler(object):
   """The CPU time profiler."""
 
@@ -218,18 +240,305 @@ class GuppyMemoryProfiler(BaseMemoryProfiler):
 
 
 class ParsersProfiler(CPUTimeProfiler):
-  """The parsers profiler."""
+  """The parsers profiler.
+
+  Besides the CPU time the parsers profiler records per parser the number of
+  files its first line hint did and did not match, and the number of files it
+  was applied to and could not parse, which are wasted attempts.
+  """
 
   _FILENAME_PREFIX = u'parsers'
 
+  _HINTS_FILENAME_PREFIX = u'hints'
+
+  def __init__(self, identifier, path=None):
+    """Initializes the parsers profiler object.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      path (Optional[str]): path to write the sample file.
+    """
+    super(ParsersProfiler, self).__init__(identifier, path=path)
+    self._hints_sample_file = u'{0:s}-{1!s}.csv'.format(
+        self._HINTS_FILENAME_PREFIX, identifier)
+    self._parser_measurements = {}
+
+    if path:
+      self._hints_sample_file = os.path.join(path, self._hints_sample_file)
+
+  def _GetParserMeasurements(self, parser_name):
+    """Retrieves the attempt measurements of a parser.
+
+    Args:
+      parser_name (str): name of the parser.
+
+    Returns:
+      ParserAttemptMeasurements: attempt measurements of the parser.
+    """
+    measurements = self._parser_measurements.get(parser_name, None)
+    if measurements is None:
+      measurements = ParserAttemptMeasurements()
+      self._parser_measurements[parser_name] = measurements
+
+    return measurements
+
+  def SampleFirstLineHint(self, parser_name, matched):
+    """Takes a sample of matching the first line hint of a parser.
+
+    Args:
+      parser_name (str): name of the parser.
+      matched (bool): True if the hint matched the file and the parser
+          is applied.
+    """
+    measurements = self._GetParserMeasurements(parser_name)
+    if matched:
+      measurements.number_of_hint_hits += 1
+    else:
+      measurements.number_of_hint_misses += 1
+
+  def SampleParseResult(self, parser_name, result):
+    """Takes a sample of applying a parser to a file.
+
+    Args:
+      parser_name (str): name of the parser.
+      result (bool): False if the parser was unable to parse the file.
+    """
+    measurements = self._GetParserMeasurements(parser_name)
+    measurements.number_of_attempts += 1
+    if not result:
+      measurements.number_of_failed_attempts += 1
+
+  def Write(self):
+    """Writes the CPU time and attempt measurements to sample files."""
+    super(ParsersProfiler, self).Write()
+
+    with open(self._hints_sample_file, 'wb') as file_object:
+      line = (
+          u'parser name\thint hits\thint misses\thint miss rate\t'
+          u'attempts\tfailed attempts\tfailed attempt rate\n')
+      file_object.write(line.encode(u'utf-8'))
+
+      for parser_name, measurements in sorted(
+          self._parser_measurements.items()):
+        number_of_hints = (
+            measurements.number_of_hint_hits +
+            measurements.number_of_hint_misses)
+
+        hint_miss_rate = 0.0
+        if number_of_hints:
+          hint_miss_rate = (
+              float(measurements.number_of_hint_misses) / number_of_hints)
+
+        failed_attempt_rate = 0.0
+        if measurements.number_of_attempts:
+          failed_attempt_rate = (
+              float(measurements.number_of_failed_attempts) /
+              measurements.number_of_attempts)
+
+        line = (
+            u'{0:s}\t{1:d}\t{2:d}\t{3:.2f}\t{4:d}\t{5:d}\t{6:.2f}\n').format(
+                parser_name, measurements.number_of_hint_hits,
+                measurements.number_of_hint_misses, hint_miss_rate,
+                measurements.number_of_attempts,
+                measurements.number_of_failed_attempts, failed_attempt_rate)
+        file_object.write(line.encode(u'utf-8'))
+
 
 class ProcessingProfiler(CPUTimeProfiler):
-  """The processing profiler."""
+  """The processing profiler.
+
+  Besides the CPU time the processing profiler records the number of bytes
+  read from the data streams, which can be used to determine the read
+  amplification factor, that is the number of bytes read relative to the
+  size of the data streams, and the number of hits and misses of the event
+  cache.
+  """
+
+  _EVENT_CACHE_FILENAME_PREFIX = u'event_cache'
 
   _FILENAME_PREFIX = u'processing'
 
+  _READS_FILENAME_PREFIX = u'reads'
+
+  def __init__(self, identifier, path=None):
+    """Initializes the processing profiler object.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      path (Optional[str]): path to write the sample file.
+    """
+    super(ProcessingProfiler, self).__init__(identifier, path=path)
+    self._event_cache_sample_file = u'{0:s}-{1!s}.csv'.format(
+        self._EVENT_CACHE_FILENAME_PREFIX, identifier)
+    self._number_of_data_streams = 0
+    self._number_of_event_cache_hits = 0
+    self._number_of_event_cache_misses = 0
+    self._reads_sample_file = u'{0:s}-{1!s}.csv'.format(
+        self._READS_FILENAME_PREFIX, identifier)
+    self._total_data_size = 0
+    self._total_number_of_bytes_read = 0
+    self._total_number_of_bytes_requested = 0
+
+    if path:
+      self._event_cache_sample_file = os.path.join(
+          path, self._event_cache_sample_file)
+      self._reads_sample_file = os.path.join(path, self._reads_sample_file)
+
+  def _WriteEventCacheSamples(self):
+    """Writes the event cache measurements to a sample file."""
+    number_of_lookups = (
+        self._number_of_event_cache_hits + self._number_of_event_cache_misses)
+
+    hit_ratio = 0.0
+    if number_of_lookups:
+      hit_ratio = float(self._number_of_event_cache_hits) / number_of_lookups
+
+    with open(self._event_cache_sample_file, 'wb') as file_object:
+      line = (
+          u'number of lookups\tnumber of hits\tnumber of misses\t'
+          u'hit ratio\n')
+      file_object.write(line.encode(u'utf-8'))
+
+      line = u'{0:d}\t{1:d}\t{2:d}\t{3:.2f}\n'.format(
+          number_of_lookups, self._number_of_event_cache_hits,
+          self._number_of_event_cache_misses, hit_ratio)
+      file_object.write(line.encode(u'utf-8'))
+
+  def SampleDataStreamReads(
+      self, data_size, number_of_bytes_requested, number_of_bytes_read):
+    """Takes a sample of the reads of a data stream.
+
+    Args:
+      data_size (int): size of the data stream.
+      number_of_bytes_requested (int): number of bytes requested from the data
+          stream by the analyzers, type detection and parsers.
+      number_of_bytes_read (int): number of bytes read from the underlying
+          storage.
+    """
+    self._number_of_data_streams += 1
+    self._total_data_size += data_size
+    self._total_number_of_bytes_read += number_of_bytes_read
+    self._total_number_of_bytes_requested += number_of_bytes_requested
+
+  def SampleEventCacheLookup(self, hit):
+    """Takes a sample of a lookup of the events of a data stream.
+
+    Args:
+      hit (bool): True if the events were found in the event cache.
+    """
+    if hit:
+      self._number_of_event_cache_hits += 1
+    else:
+      self._number_of_event_cache_misses += 1
+
+  def Write(self):
+    """Writes the CPU time, read and event cache measurements to sample files.
+
+    The event cache measurements are only written if the event cache was
+    used.
+    """
+    super(ProcessingProfiler, self).Write()
+
+    if self._number_of_event_cache_hits or self._number_of_event_cache_misses:
+      self._WriteEventCacheSamples()
+
+    requested_amplification_factor = 0.0
+    read_amplification_factor = 0.0
+    if self._total_data_size:
+      requested_amplification_factor = (
+          float(self._total_number_of_bytes_requested) /
+          self._total_data_size)
+      read_amplification_factor = (
+          float(self._total_number_of_bytes_read) / self._total_data_size)
+
+    with open(self._reads_sample_file, 'wb') as file_object:
+      line = (
+          u'number of data streams\ttotal data size\t'
+          u'total bytes requested\ttotal bytes read\t'
+          u'requested amplification factor\tread amplification factor\n')
+      file_object.write(line.encode(u'utf-8'))
+
+      line = u'{0:d}\t{1:d}\t{2:d}\t{3:d}\t{4:.2f}\t{5:.2f}\n'.format(
+          self._number_of_data_streams, self._total_data_size,
+          self._total_number_of_bytes_requested,
+          self._total_number_of_bytes_read, requested_amplification_factor,
+          read_amplification_factor)
+      file_object.write(line.encode(u'utf-8'))
+
 
 class SerializersProfiler(CPUTimeProfiler):
   """The serializers profiler."""
 
   _FILENAME_PREFIX = u'serializers'
+
+
+class TasksProfiler(object):
+  """The tasks profiler.
+
+  The tasks profiler records the data size and processing time per task,
+  which can be used to simulate task scheduling strategies.
+  """
+
+  _FILENAME_PREFIX = u'tasks'
+
+  # Maximum number of samples that are kept in memory before they are
+  # written to the sample file.
+  _MAXIMUM_NUMBER_OF_SAMPLES = 1000
+
+  def __init__(self, identifier, path=None):
+    """Initializes the tasks profiler object.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      path (Optional[str]): path to write the sample file.
+    """
+    super(TasksProfiler, self).__init__()
+    self._identifier = identifier
+    self._samples = []
+    self._sample_file = u'{0:s}-{1!s}.csv'.format(
+        self._FILENAME_PREFIX, identifier)
+
+    if path:
+      self._sample_file = os.path.join(path, self._sample_file)
+
+    self._WriteHeader()
+
+  def _WriteHeader(self):
+    """Writes the header of the sample file."""
+    with open(self._sample_file, 'wb') as file_object:
+      line = u'task identifier\tnumber of files\tdata size\tprocessing time\n'
+      file_object.write(line.encode(u'utf-8'))
+
+  def _WriteSamples(self):
+    """Writes the samples to the sample file."""
+    with open(self._sample_file, 'ab') as file_object:
+      for task_identifier, number_of_files, data_size, processing_time in (
+          self._samples):
+        line = u'{0:s}\t{1:d}\t{2!s}\t{3!s}\n'.format(
+            task_identifier, number_of_files, data_size, processing_time)
+        file_object.write(line.encode(u'utf-8'))
+
+    self._samples = []
+
+  def Sample(self, task, processing_time):
+    """Takes a sample of a processed task.
+
+    Args:
+      task (Task): task.
+      processing_time (float): time it took to process the task in seconds.
+    """
+    sample = (
+        task.identifier, len(task.GetPathSpecs()), task.data_size,
+        processing_time)
+    self._samples.append(sample)
+
+    if len(self._samples) >= self._MAXIMUM_NUMBER_OF_SAMPLES:
+      self._WriteSamples()
+
+  def Write(self):
+    """Writes the remaining samples to the sample file."""
+    if self._samples:
+      self._WriteSamples()
@@ -338,6 +338,8 @@ class SingleProcessEngine(engine.BaseEngine):
       if self._serializers_profiler:
         storage_writer.SetSerializersProfiler(None)
 
+      extraction_worker.CloseEventCache()
+
       self._StopProfiling(extraction_worker)
 
     if self._abort:
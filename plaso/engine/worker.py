@@ -11,10 +11,14 @@ from dfvfs.analyzer import analyzer
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
 from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import context
 from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.analyzers import manager as analyzers_manager
+from plaso.analyzers.hashers import manager as hashers_manager
 from plaso.containers import event_sources
+from plaso.engine import cached_data_stream
+from plaso.engine import event_cache
 from plaso.engine import extractors
 from plaso.lib import definitions
 from plaso.lib import errors
@@ -75,6 +79,10 @@ class EventExtractionWorker(object):
   _TYPES_WITH_ROOT_METADATA = frozenset([
       dfvfs_definitions.TYPE_INDICATOR_GZIP])
 
+  # Size of the reads to calculate the digest of a data stream for
+  # the event cache, when not calculated by the hashing analyzer.
+  _HASH_READ_SIZE = 4 * 1024 * 1024
+
   def __init__(self, parser_filter_expression=None):
     """Initializes the event extraction worker object.
 
@@ -94,9 +102,11 @@ class EventExtractionWorker(object):
     super(EventExtractionWorker, self).__init__()
     self._abort = False
     self._analyzers = []
+    self._event_cache = None
     self._event_extractor = extractors.EventExtractor(
         parser_filter_expression=parser_filter_expression)
     self._hasher_names = None
+    self._parser_filter_expression = parser_filter_expression
     self._path_spec_extractor = extractors.PathSpecExtractor()
     self._process_archives = None
     self._process_compressed_streams = None
@@ -105,7 +115,7 @@ class EventExtractionWorker(object):
     self.last_activity_timestamp = 0.0
     self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
-  def _AnalyzeDataStream(self, mediator, file_entry, data_stream_name):
+  def _AnalyzeDataStream(self, mediator, file_object):
     """Analyzes the contents of a specific data stream of a file entry.
 
     The results of the analyzers are set in the parser mediator as attributes
@@ -115,13 +125,8 @@ class EventExtractionWorker(object):
     Args:
       mediator (ParserMediator): mediates the interactions between
           parsers and other components, such as storage and abort signals.
-      file_entry (dfvfs.FileEntry): file entry whose data stream is to be
-          analyzed.
-      data_stream_name (str): name of the data stream.
-
-    Raises:
-      RuntimeError: if the file-like object cannot be retrieved from
-          the file entry.
+      file_object (CachedDataStream): file-like object of the data stream
+          to analyze.
     """
     if not self._analyzers:
       return
@@ -134,16 +139,7 @@ class EventExtractionWorker(object):
       self._processing_profiler.StartTiming(u'analyzing')
 
     try:
-      file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
-      if not file_object:
-        raise RuntimeError((
-            u'Unable to retrieve file-like object for file entry: '
-            u'{0:s}.').format(display_name))
-
-      try:
-        self._AnalyzeFileObject(mediator, file_object)
-      finally:
-        file_object.close()
+      self._AnalyzeFileObject(mediator, file_object)
 
     finally:
       if self._processing_profiler:
@@ -285,7 +281,7 @@ class EventExtractionWorker(object):
     return False
 
   def _ExtractContentFromDataStream(
-      self, mediator, file_entry, data_stream_name):
+      self, mediator, file_entry, data_stream_name, file_object):
     """Extracts content from a data stream.
 
     Args:
@@ -294,14 +290,44 @@ class EventExtractionWorker(object):
       file_entry (dfvfs.FileEntry): file entry to extract its content.
       data_stream_name (str): name of the data stream whose content is to be
           extracted.
+      file_object (CachedDataStream): file-like object of the data stream.
     """
     self.processing_status = definitions.PROCESSING_STATUS_EXTRACTING
 
     if self._processing_profiler:
       self._processing_profiler.StartTiming(u'extracting')
 
-    self._event_extractor.ParseDataStream(
-        mediator, file_entry, data_stream_name)
+    event_cache_key = None
+    if self._event_cache:
+      event_cache_key = self._GetEventCacheKey(
+          mediator, file_entry, data_stream_name, file_object)
+
+    recorded_events = None
+    if event_cache_key:
+      recorded_events = self._event_cache.GetEvents(event_cache_key)
+
+      if self._processing_profiler:
+        self._processing_profiler.SampleEventCacheLookup(
+            recorded_events is not None)
+
+    if recorded_events is not None:
+      mediator.ProduceRecordedEvents(recorded_events)
+
+    elif not event_cache_key:
+      self._event_extractor.ParseDataStream(
+          mediator, file_entry, data_stream_name, file_object=file_object)
+
+    else:
+      mediator.StartEventRecording()
+      try:
+        self._event_extractor.ParseDataStream(
+            mediator, file_entry, data_stream_name, file_object=file_object)
+
+      finally:
+        recorded_events = mediator.StopEventRecording()
+
+      if recorded_events is not None and not self._abort:
+        self._event_cache.SetEvents(event_cache_key, recorded_events)
 
     if self._processing_profiler:
       self._processing_profiler.StopTiming(u'extracting')
@@ -330,20 +356,21 @@ class EventExtractionWorker(object):
 
     self.processing_status = definitions.PROCESSING_STATUS_RUNNING
 
-  def _GetArchiveTypes(self, mediator, path_spec):
+  def _GetArchiveTypes(self, mediator, path_spec, file_object):
     """Determines if a data stream contains an archive such as: TAR or ZIP.
 
     Args:
       mediator (ParserMediator): mediates the interactions between
           parsers and other components, such as storage and abort signals.
       path_spec (dfvfs.PathSpec): path specification of the data stream.
+      file_object (CachedDataStream): file-like object of the data stream.
 
     Returns:
       list[str]: dfVFS archive type indicators found in the data stream.
     """
     try:
-      type_indicators = analyzer.Analyzer.GetArchiveTypeIndicators(
-          path_spec, resolver_context=mediator.resolver_context)
+      type_indicators = self._GetTypeIndicators(
+          dfvfs_definitions.FORMAT_CATEGORY_ARCHIVE, path_spec, file_object)
     except IOError as exception:
       type_indicators = []
 
@@ -354,21 +381,23 @@ class EventExtractionWorker(object):
 
     return type_indicators
 
-  def _GetCompressedStreamTypes(self, mediator, path_spec):
+  def _GetCompressedStreamTypes(self, mediator, path_spec, file_object):
     """Determines if a data stream contains a compressed stream such as: gzip.
 
     Args:
       mediator (ParserMediator): mediates the interactions between
           parsers and other components, such as storage and abort signals.
       path_spec (dfvfs.PathSpec): path specification of the data stream.
+      file_object (CachedDataStream): file-like object of the data stream.
 
     Returns:
       list[str]: dfVFS compressed stream type indicators found in
           the data stream.
     """
     try:
-      type_indicators = analyzer.Analyzer.GetCompressedStreamTypeIndicators(
-          path_spec, resolver_context=mediator.resolver_context)
+      type_indicators = self._GetTypeIndicators(
+          dfvfs_definitions.FORMAT_CATEGORY_COMPRESSED_STREAM, path_spec,
+          file_object)
     except IOError as exception:
       type_indicators = []
 
@@ -379,6 +408,96 @@ class EventExtractionWorker(object):
 
     return type_indicators
 
+  def _GetDataStreamDigest(self, mediator, file_object):
+    """Retrieves the SHA-256 digest of the content of a data stream.
+
+    The digest calculated by the hashing analyzer is used when available.
+
+    Args:
+      mediator (ParserMediator): mediates the interactions between
+          parsers and other components, such as storage and abort signals.
+      file_object (CachedDataStream): file-like object of the data stream.
+
+    Returns:
+      str: hexadecimal SHA-256 digest of the content of the data stream.
+    """
+    digest = mediator.GetEventAttribute(u'sha256_hash')
+    if digest:
+      return digest
+
+    hasher = hashers_manager.HashersManager.GetHasher(u'sha256')
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(self._HASH_READ_SIZE)
+    while data:
+      hasher.Update(data)
+      data = file_object.read(self._HASH_READ_SIZE)
+
+    return hasher.GetStringDigest()
+
+  def _GetEventCacheKey(
+      self, mediator, file_entry, data_stream_name, file_object):
+    """Retrieves the event cache key of a data stream.
+
+    Args:
+      mediator (ParserMediator): mediates the interactions between
+          parsers and other components, such as storage and abort signals.
+      file_entry (dfvfs.FileEntry): file entry containing the data stream.
+      data_stream_name (str): name of the data stream.
+      file_object (CachedDataStream): file-like object of the data stream.
+
+    Returns:
+      str: event cache key.
+    """
+    digest = self._GetDataStreamDigest(mediator, file_object)
+
+    # The parsers that are applied depend on the name of the file entry.
+    name = file_entry.name
+    if data_stream_name:
+      name = u'{0:s}:{1:s}'.format(name, data_stream_name)
+
+    return self._event_cache.GetKey(
+        digest, name, self._parser_filter_expression,
+        mediator.GetParsingContext())
+
+  def _GetTypeIndicators(self, format_category, path_spec, file_object):
+    """Determines the dfVFS type indicators of a data stream.
+
+    The type indicators are determined by the dfVFS analyzer, which reads
+    the cached data stream instead of opening the data stream again by its
+    path specification.
+
+    Args:
+      format_category (str): dfVFS format category, such as archive or
+          compressed stream.
+      path_spec (dfvfs.PathSpec): path specification of the data stream.
+      file_object (CachedDataStream): file-like object of the data stream.
+
+    Returns:
+      list[str]: dfVFS type indicators found in the data stream.
+    """
+    # A separate resolver context is used so that the dfVFS resolver opens
+    # the cached data stream for the path specification of the data stream.
+    resolver_context = context.Context()
+
+    data_stream_file_object = cached_data_stream.CachedDataStreamFileIO(
+        resolver_context, file_object)
+    data_stream_file_object.open(path_spec=path_spec)
+
+    try:
+      if format_category == dfvfs_definitions.FORMAT_CATEGORY_ARCHIVE:
+        type_indicators = analyzer.Analyzer.GetArchiveTypeIndicators(
+            path_spec, resolver_context=resolver_context)
+      else:
+        type_indicators = (
+            analyzer.Analyzer.GetCompressedStreamTypeIndicators(
+                path_spec, resolver_context=resolver_context))
+
+    finally:
+      data_stream_file_object.close()
+
+    return type_indicators
+
   def _IsMetadataFile(self, file_entry):
     """Determines if the file entry is a metadata file.
 
@@ -552,6 +671,7 @@ class EventExtractionWorker(object):
       # TODO: move this into a dfVFS file entry property.
       stat_object = sub_file_entry.GetStat()
       if stat_object:
+        event_source.data_size = getattr(stat_object, u'size', None)
         event_source.file_entry_type = stat_object.type
 
       mediator.ProduceEventSource(event_source)
@@ -629,22 +749,59 @@ class EventExtractionWorker(object):
     if not data_stream_name and not file_entry.IsFile():
       has_data_stream = False
 
-    if has_data_stream:
+    if not has_data_stream:
+      self._ProcessFileEntryMetadata(mediator, file_entry, data_stream_name)
+      return
+
+    error_message = u'unable to retrieve file-like object of data stream'
+    try:
+      file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
+    except (IOError, dfvfs_errors.BackEndError) as exception:
+      file_object = None
+      error_message = u'{0:s} with error: {1!s}'.format(
+          error_message, exception)
+
+    if not file_object:
+      mediator.ProduceExtractionError(error_message)
+
+      # The metadata of the file entry is extracted even if its data stream
+      # cannot be read.
+      self._ProcessFileEntryMetadata(mediator, file_entry, data_stream_name)
+      return
+
+    # The analyzers, the type detection and the parsers share the data read
+    # from the data stream by means of the cached data stream.
+    file_object = cached_data_stream.CachedDataStream(file_object)
+
+    try:
       # Since AnalyzeDataStream generates event attributes it needs to be
       # called before producing events.
-      self._AnalyzeDataStream(mediator, file_entry, data_stream_name)
+      self._AnalyzeDataStream(mediator, file_object)
 
-    # We always want to extract the file entry metadata but we only want
-    # to parse it once per file entry, so we only use it if we are
-    # processing the default (nameless) data stream.
-    if (not data_stream_name and (
-        not file_entry.IsRoot() or
-        file_entry.type_indicator in self._TYPES_WITH_ROOT_METADATA)):
-      self._ExtractMetadataFromFileEntry(mediator, file_entry)
+      self._ProcessFileEntryMetadata(mediator, file_entry, data_stream_name)
 
-    if not has_data_stream:
-      return
+      self._ProcessFileEntryDataStreamContent(
+          mediator, file_entry, data_stream_name, file_object)
+
+    finally:
+      if self._processing_profiler:
+        self._processing_profiler.SampleDataStreamReads(
+            file_object.get_size(), file_object.number_of_bytes_requested,
+            file_object.number_of_bytes_read)
 
+      file_object.close()
+
+  def _ProcessFileEntryDataStreamContent(
+      self, mediator, file_entry, data_stream_name, file_object):
+    """Processes the content of a specific data stream of a file entry.
+
+    Args:
+      mediator (ParserMediator): mediates the interactions between
+          parsers and other components, such as storage and abort signals.
+      file_entry (dfvfs.FileEntry): file entry containing the data stream.
+      data_stream_name (str): name of the data stream.
+      file_object (CachedDataStream): file-like object of the data stream.
+    """
     # Determine if the content of the file entry should not be extracted.
     skip_content_extraction = self._CanSkipContentExtraction(file_entry)
     if skip_content_extraction:
@@ -663,10 +820,10 @@ class EventExtractionWorker(object):
 
     if self._process_compressed_streams:
       compressed_stream_types = self._GetCompressedStreamTypes(
-          mediator, path_spec)
+          mediator, path_spec, file_object)
 
     if not compressed_stream_types:
-      archive_types = self._GetArchiveTypes(mediator, path_spec)
+      archive_types = self._GetArchiveTypes(mediator, path_spec, file_object)
 
     if archive_types:
       if self._process_archives:
@@ -675,7 +832,7 @@ class EventExtractionWorker(object):
       if dfvfs_definitions.TYPE_INDICATOR_ZIP in archive_types:
         # ZIP files are the base of certain file formats like docx.
         self._ExtractContentFromDataStream(
-            mediator, file_entry, data_stream_name)
+            mediator, file_entry, data_stream_name, file_object)
 
     elif compressed_stream_types:
       self._ProcessCompressedStreamTypes(
@@ -683,7 +840,24 @@ class EventExtractionWorker(object):
 
     else:
       self._ExtractContentFromDataStream(
-          mediator, file_entry, data_stream_name)
+          mediator, file_entry, data_stream_name, file_object)
+
+  def _ProcessFileEntryMetadata(self, mediator, file_entry, data_stream_name):
+    """Processes the metadata of a file entry.
+
+    Args:
+      mediator (ParserMediator): mediates the interactions between
+          parsers and other components, such as storage and abort signals.
+      file_entry (dfvfs.FileEntry): file entry.
+      data_stream_name (str): name of the data stream.
+    """
+    # We always want to extract the file entry metadata but we only want
+    # to parse it once per file entry, so we only use it if we are
+    # processing the default (nameless) data stream.
+    if (not data_stream_name and (
+        not file_entry.IsRoot() or
+        file_entry.type_indicator in self._TYPES_WITH_ROOT_METADATA)):
+      self._ExtractMetadataFromFileEntry(mediator, file_entry)
 
   def _ProcessMetadataFile(self, mediator, file_entry):
     """Processes a metadata file.
@@ -700,6 +874,28 @@ class EventExtractionWorker(object):
 
     self.last_activity_timestamp = time.time()
 
+  def _SetEventCache(self, path, maximum_size=None):
+    """Sets the event cache.
+
+    Args:
+      path (str): path of the event cache file, where None disables
+          the event cache.
+      maximum_size (Optional[int]): maximum total size of the events stored
+          in the event cache in bytes, where None represents the default.
+    """
+    if not path:
+      return
+
+    cache = event_cache.EventCache(path, maximum_size=maximum_size)
+
+    try:
+      cache.Open()
+    except IOError as exception:
+      logging.warning(u'Event cache disabled: {0!s}'.format(exception))
+      return
+
+    self._event_cache = cache
+
   def _SetHashers(self, hasher_names_string):
     """Sets the hasher names.
 
@@ -729,6 +925,14 @@ class EventExtractionWorker(object):
     analyzer_object.SetRules(yara_rules_string)
     self._analyzers.append(analyzer_object)
 
+  def CloseEventCache(self):
+    """Closes the event cache, if set."""
+    if not self._event_cache:
+      return
+
+    self._event_cache.Close()
+    self._event_cache = None
+
   def GetAnalyzerNames(self):
     """Gets the names of the active analyzers.
 
@@ -779,6 +983,9 @@ class EventExtractionWorker(object):
     Args:
       configuration (ExtractionConfiguration): extraction configuration.
     """
+    self._SetEventCache(
+        configuration.event_cache_path,
+        maximum_size=configuration.event_cache_maximum_size)
     self._SetHashers(configuration.hasher_names_string)
     self._process_archives = configuration.process_archives
     self._process_compressed_streams = configuration.process_compressed_streams
@@ -9,6 +9,8 @@ import yaml
 from plaso.filters import interface
 from plaso.filters import manager
 from plaso.lib import errors
+from plaso.lib import objectfilter
+from plaso.lib import pfilter
 
 
 class ObjectFilterList(interface.FilterObject):
@@ -114,7 +116,42 @@ class ObjectFilterList(interface.FilterObject):
       raise errors.WrongPlugin(
           u'Wrong format of YAML file, entry not a dict ({0:s})'.format(
               results_type))
+
+    # The filters are combined into a single compiled filter so that
+    # the values of attributes referenced by multiple filters, such as
+    # the message, are only expanded once per event.
+    filters = objectfilter.OrFilter(
+        arguments=[matcher.filter for _, matcher, _ in self.filters])
+    filter_compiler = pfilter.PlasoFilterCompiler()
+
     self._filter_expression = filter_expression
+    self._matcher = filter_compiler.Compile(filters)
+
+  def GetEventConstraints(self):
+    """Retrieves the constraints that events matching the filter meet.
+
+    Returns:
+      EventConstraints: constraints that events matching the filter meet or
+          None if any event can match the filter.
+    """
+    if not self.filters:
+      return
+
+    constraints = None
+    for _, matcher, _ in self.filters:
+      matcher_constraints = self._GetMatcherConstraints(matcher)
+      if not matcher_constraints:
+        return
+
+      if not constraints:
+        constraints = matcher_constraints
+      else:
+        constraints = constraints.Union(matcher_constraints)
+
+    if not constraints.HasConstraints():
+      return
+
+    return constraints
 
   def Match(self, event_object):
     """Determines if an event object matches the filter.
@@ -128,11 +165,7 @@ class ObjectFilterList(interface.FilterObject):
     if not self.filters:
       return True
 
-    for _, matcher, _ in self.filters:
-      if matcher.Matches(event_object):
-        return True
-
-    return False
+    return self._matcher.Matches(event_object)
 
 
 manager.FiltersManager.RegisterFilter(ObjectFilterList)
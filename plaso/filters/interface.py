@@ -4,12 +4,27 @@
 import abc
 
 from plaso.lib import errors
+from plaso.lib import objectfilter
 from plaso.lib import pfilter
+from plaso.lib import py2to3
+from plaso.storage import event_constraints as storage_event_constraints
+from plaso.storage import time_range as storage_time_range
 
 
 class FilterObject(object):
   """The filter interface class."""
 
+  # The smallest and largest timestamp that can be stored.
+  _MINIMUM_TIMESTAMP = -(2 ** 63)
+  _MAXIMUM_TIMESTAMP = (2 ** 63) - 1
+
+  # Characters that have a special meaning in a regular expression.
+  _REGEXP_SPECIAL_CHARACTERS = frozenset(u'.^$*+?{}[]\\|()')
+
+  # Characters that make the preceding character in a regular expression
+  # optional.
+  _REGEXP_OPTIONAL_QUANTIFIERS = frozenset(u'*?{')
+
   def __init__(self):
     """Initializes a filter object."""
     super(FilterObject, self).__init__()
@@ -42,21 +57,169 @@ class FilterObject(object):
     """The output field separator value."""
     return u','
 
+  def _GetFilenamePrefixFromRegexp(self, regexp):
+    """Retrieves the literal filename prefix of a regular expression.
+
+    Args:
+      regexp (str): regular expression.
+
+    Returns:
+      str: literal prefix that every matching filename starts with or None
+          if the regular expression does not define such a prefix.
+    """
+    # Only a regular expression that is anchored at the start and does not
+    # contain alternatives defines a prefix, since the regular expression
+    # is searched for.
+    if not regexp.startswith(u'^') or u'|' in regexp:
+      return
+
+    prefix_length = 1
+    while (prefix_length < len(regexp) and
+           regexp[prefix_length] not in self._REGEXP_SPECIAL_CHARACTERS):
+      prefix_length += 1
+
+    if (prefix_length < len(regexp) and
+        regexp[prefix_length] in self._REGEXP_OPTIONAL_QUANTIFIERS):
+      prefix_length -= 1
+
+    return regexp[1:prefix_length] or None
+
+  def _GetMatcherConstraints(self, matcher):
+    """Retrieves the event constraints defined by a matcher.
+
+    The constraints are a superset of the events that match, which means
+    parts of the matcher that cannot be expressed as constraints are treated
+    as matching any event.
+
+    Args:
+      matcher (objectfilter.Filter): matcher.
+
+    Returns:
+      EventConstraints: constraints that matching events meet or None if
+          any event can match.
+    """
+    if isinstance(matcher, objectfilter.CompiledFilter):
+      matcher = matcher.filter
+
+    if isinstance(matcher, objectfilter.AndFilter):
+      constraints = None
+      for argument in matcher.args:
+        argument_constraints = self._GetMatcherConstraints(argument)
+        if not argument_constraints:
+          continue
+
+        if not constraints:
+          constraints = argument_constraints
+        else:
+          constraints = constraints.Intersect(argument_constraints)
+
+      return constraints
+
+    if isinstance(matcher, objectfilter.OrFilter):
+      constraints = None
+      for argument in matcher.args:
+        argument_constraints = self._GetMatcherConstraints(argument)
+        if not argument_constraints:
+          return
+
+        if not constraints:
+          constraints = argument_constraints
+        else:
+          constraints = constraints.Union(argument_constraints)
+
+      return constraints
+
+    # A negated operator matches events that do not meet the constraints.
+    if (not isinstance(matcher, objectfilter.GenericBinaryOperator) or
+        not matcher.bool_value):
+      return
+
+    attribute_name = matcher.left_operand
+    if not isinstance(attribute_name, py2to3.STRING_TYPES):
+      return
+
+    attribute_name = attribute_name.lower()
+    value = matcher.right_operand
+
+    if attribute_name == u'timestamp':
+      if not isinstance(value, pfilter.DateCompareObject):
+        return
+
+      start_timestamp = self._MINIMUM_TIMESTAMP
+      end_timestamp = self._MAXIMUM_TIMESTAMP
+
+      matcher_type = type(matcher)
+      if matcher_type is objectfilter.Greater:
+        start_timestamp = value.data + 1
+      elif matcher_type is objectfilter.GreaterEqual:
+        start_timestamp = value.data
+      elif matcher_type is objectfilter.Less:
+        end_timestamp = value.data - 1
+      elif matcher_type is objectfilter.LessEqual:
+        end_timestamp = value.data
+      elif matcher_type is objectfilter.Equals:
+        start_timestamp = value.data
+        end_timestamp = value.data
+      else:
+        return
+
+      if start_timestamp > end_timestamp:
+        return
+
+      return storage_event_constraints.EventConstraints(
+          time_range=storage_time_range.TimeRange(
+              start_timestamp, end_timestamp))
+
+    if isinstance(matcher, pfilter.ParserList):
+      if attribute_name != u'parser':
+        return
+
+      return storage_event_constraints.EventConstraints(
+          parsers=matcher.compiled_list)
+
+    if not isinstance(value, py2to3.STRING_TYPES):
+      return
+
+    if type(matcher) is objectfilter.Equals:
+      if attribute_name == u'data_type':
+        return storage_event_constraints.EventConstraints(
+            data_types=[value])
+
+      if attribute_name == u'parser':
+        return storage_event_constraints.EventConstraints(parsers=[value])
+
+      if attribute_name == u'filename':
+        return storage_event_constraints.EventConstraints(
+            filename_prefix=value)
+
+    elif (type(matcher) is objectfilter.Regexp and
+          attribute_name == u'filename'):
+      filename_prefix = self._GetFilenamePrefixFromRegexp(value)
+      if filename_prefix:
+        return storage_event_constraints.EventConstraints(
+            filename_prefix=filename_prefix)
+
   def _GetMatcher(self, filter_expression):
     """Retrieves a filter object for a specific filter expression.
 
     Args:
       filter_expression: string that contains the filter expression.
 
+    The filter expression is compiled into a single closure, which matches
+    the same events as the interpreted filter but is faster.
+
     Returns:
-      A filter object (instance of objectfilter.TODO) or None.
+      A filter object (instance of objectfilter.CompiledFilter) or None.
     """
     try:
       parser = pfilter.BaseParser(filter_expression).Parse()
-      return parser.Compile(pfilter.PlasoAttributeFilterImplementation)
+      matcher = parser.Compile(pfilter.PlasoAttributeFilterImplementation)
 
     except errors.ParseError:
-      pass
+      return
+
+    filter_compiler = pfilter.PlasoFilterCompiler()
+    return filter_compiler.Compile(matcher)
 
   @abc.abstractmethod
   def CompileFilter(self, filter_expression):
@@ -69,6 +232,25 @@ class FilterObject(object):
       WrongPlugin: if the filter could not be compiled.
     """
 
+  def GetEventConstraints(self):
+    """Retrieves the constraints that events matching the filter meet.
+
+    The constraints allow a storage reader to skip events that cannot
+    match the filter before they are deserialized.
+
+    Returns:
+      EventConstraints: constraints that events matching the filter meet or
+          None if any event can match the filter.
+    """
+    if not self._matcher:
+      return
+
+    constraints = self._GetMatcherConstraints(self._matcher)
+    if not constraints or not constraints.HasConstraints():
+      return
+
+    return constraints
+
   def Match(self, unused_event_object):
     """Determines if an event object matches the filter.
 
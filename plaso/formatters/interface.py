@@ -13,6 +13,7 @@ to the description_long and description_short field.
 
 import logging
 import re
+import string
 
 from plaso.lib import errors
 from plaso.lib import py2to3
@@ -46,10 +47,21 @@ class EventFormatter(object):
   _FORMAT_STRING_ATTRIBUTE_NAME_RE = re.compile(
       u'{([a-z][a-zA-Z0-9_]*)[!]?[^:}]*[:]?[^}]*}')
 
+  # The name of a replacement field is the part before an attribute
+  # or index lookup, e.g. "name" in {name.attribute} or {name[index]}.
+  _REPLACEMENT_FIELD_NAME_RE = re.compile(u'[^.[]*')
+
+  # Attributes that are used to describe the event when the message strings
+  # cannot be formatted.
+  _ERROR_ATTRIBUTE_NAMES = frozenset([
+      u'data_type', u'display_name', u'parser', u'uuid'])
+
   def __init__(self):
     """Initializes an event formatter object."""
     super(EventFormatter, self).__init__()
+    self._compiled_attribute_names = None
     self._format_string_attribute_names = None
+    self._format_string_replacement_field_names = None
 
   def _FormatMessage(self, format_string, event_values):
     """Determines the formatted message string.
@@ -140,6 +152,97 @@ class EventFormatter(object):
 
     return message_string, short_message_string
 
+  def _GetCompiledAttributeNames(self, replacement_field_names):
+    """Retrieves the names of the event attributes to read for formatting.
+
+    Args:
+      replacement_field_names (set[str]): replacement field names.
+
+    Returns:
+      tuple[str]: event attribute names.
+    """
+    attribute_names = set(self._ERROR_ATTRIBUTE_NAMES)
+    for field_name in replacement_field_names:
+      # Attributes with a leading underscore are not copied by CopyToDict().
+      if field_name and not field_name.startswith(u'_'):
+        attribute_names.add(field_name)
+
+    return tuple(sorted(attribute_names))
+
+  def _GetCompiledEventValues(self, event):
+    """Retrieves the values of the event attributes used by the format strings.
+
+    The event values only contain the attributes referenced by the compiled
+    format strings, which avoids copying all the attributes of the event.
+    Like with CopyToDict() attributes that are set to None are ignored.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      dict[str, object]: event values.
+    """
+    if self._compiled_attribute_names is None:
+      self.CompileFormatStrings()
+
+    event_attributes = event.__dict__
+
+    event_values = {}
+    for attribute_name in self._compiled_attribute_names:
+      attribute_value = event_attributes.get(attribute_name, None)
+      if attribute_value is not None:
+        event_values[attribute_name] = attribute_value
+
+    return event_values
+
+  def _GetReplacementFieldNames(self, format_string):
+    """Retrieves the names of the replacement fields in a format string.
+
+    These are the keywords that format() looks up, including the replacement
+    fields that are nested in a format specification.
+
+    Args:
+      format_string (str): format string.
+
+    Returns:
+      set(str): replacement field names.
+    """
+    replacement_field_names = set()
+
+    format_strings = [format_string]
+    while format_strings:
+      format_string = format_strings.pop()
+      try:
+        parsed_format_string = list(string.Formatter().parse(format_string))
+      except ValueError:
+        # An invalid format string is reported when the message is formatted.
+        continue
+
+      for _, field_name, format_specification, _ in parsed_format_string:
+        if field_name is not None:
+          replacement_field_names.add(
+              self._REPLACEMENT_FIELD_NAME_RE.match(field_name).group(0))
+        if format_specification:
+          format_strings.append(format_specification)
+
+    return replacement_field_names
+
+  def CompileFormatStrings(self):
+    """Compiles the format strings.
+
+    Determines which event attributes are referenced by the format strings,
+    so that the message strings can be formatted from the values of these
+    attributes only.
+    """
+    self._format_string_replacement_field_names = (
+        self._GetReplacementFieldNames(self.FORMAT_STRING))
+    if self.FORMAT_STRING_SHORT:
+      self._format_string_replacement_field_names.update(
+          self._GetReplacementFieldNames(self.FORMAT_STRING_SHORT))
+
+    self._compiled_attribute_names = self._GetCompiledAttributeNames(
+        self._format_string_replacement_field_names)
+
   def GetFormatStringAttributeNames(self):
     """Retrieves the attribute names in the format string.
 
@@ -172,7 +275,11 @@ class EventFormatter(object):
       raise errors.WrongFormatter(u'Unsupported data type: {0:s}.'.format(
           event.data_type))
 
-    event_values = event.CopyToDict()
+    event_values = self._GetCompiledEventValues(event)
+    if not self._format_string_replacement_field_names.issubset(event_values):
+      # Use all the event values to report the missing attributes.
+      event_values = event.CopyToDict()
+
     return self._FormatMessages(
         self.FORMAT_STRING, self.FORMAT_STRING_SHORT, event_values)
 
@@ -266,18 +373,44 @@ class ConditionalEventFormatter(EventFormatter):
             u'Invalid short format string piece: [{0:s}] contains more '
             u'than 1 attribute name.').format(format_string_piece))
 
+    self._conditional_format_strings = {}
+    self._format_string_pieces_field_names = None
+    self._format_string_short_pieces_field_names = None
+
   def _ConditionalFormatMessages(self, event_values):
     """Determines the conditional formatted message strings.
 
     Args:
-      event_values: a dictionary object containing the event (object) values.
+      event_values (dict[str, object]): event values.
 
     Returns:
       tuple(str, str): formatted message string and short message string.
     """
+    format_string, short_format_string, _ = self._GetConditionalFormatStrings(
+        event_values)
+
+    return self._FormatMessages(
+        format_string, short_format_string, event_values)
+
+  def _GetConditionalFormatStrings(self, event_values):
+    """Determines the conditional format strings.
+
+    The format strings are joined once per combination of format string
+    pieces and reused for other events with the same combination.
+
+    Args:
+      event_values (dict[str, object]): event values.
+
+    Returns:
+      tuple(str, str, set[str]): format string, short format string and
+          the names of their replacement fields.
+    """
+    if self._compiled_attribute_names is None:
+      self.CompileFormatStrings()
+
     # Using getattr here to make sure the attribute is not set to None.
     # if A.b = None, hasattr(A, b) is True but getattr(A, b, None) is False.
-    string_pieces = []
+    piece_indexes = []
     for map_index, attribute_name in enumerate(self._format_string_pieces_map):
       if not attribute_name or attribute_name in event_values:
         if attribute_name:
@@ -288,18 +421,64 @@ class ConditionalEventFormatter(EventFormatter):
           # pylint: disable=unidiomatic-typecheck
           if type(attribute) not in (bool, int, long, float) and not attribute:
             continue
-        string_pieces.append(self.FORMAT_STRING_PIECES[map_index])
-    format_string = self.FORMAT_STRING_SEPARATOR.join(string_pieces)
+        piece_indexes.append(map_index)
 
-    string_pieces = []
+    short_piece_indexes = []
     for map_index, attribute_name in enumerate(
         self._format_string_short_pieces_map):
       if not attribute_name or event_values.get(attribute_name, None):
-        string_pieces.append(self.FORMAT_STRING_SHORT_PIECES[map_index])
-    short_format_string = self.FORMAT_STRING_SEPARATOR.join(string_pieces)
-
-    return self._FormatMessages(
-        format_string, short_format_string, event_values)
+        short_piece_indexes.append(map_index)
+
+    lookup_key = (tuple(piece_indexes), tuple(short_piece_indexes))
+    format_strings = self._conditional_format_strings.get(lookup_key, None)
+    if not format_strings:
+      format_string = self.FORMAT_STRING_SEPARATOR.join([
+          self.FORMAT_STRING_PIECES[map_index] for map_index in piece_indexes])
+      short_format_string = self.FORMAT_STRING_SEPARATOR.join([
+          self.FORMAT_STRING_SHORT_PIECES[map_index]
+          for map_index in short_piece_indexes])
+
+      replacement_field_names = set()
+      for map_index in piece_indexes:
+        replacement_field_names.update(
+            self._format_string_pieces_field_names[map_index])
+      for map_index in short_piece_indexes:
+        replacement_field_names.update(
+            self._format_string_short_pieces_field_names[map_index])
+
+      format_strings = (
+          format_string, short_format_string, replacement_field_names)
+      self._conditional_format_strings[lookup_key] = format_strings
+
+    return format_strings
+
+  def CompileFormatStrings(self):
+    """Compiles the format strings.
+
+    Determines which event attributes are referenced by the format string
+    pieces, so that the message strings can be formatted from the values
+    of these attributes only.
+    """
+    self._format_string_pieces_field_names = [
+        self._GetReplacementFieldNames(format_string_piece)
+        for format_string_piece in self.FORMAT_STRING_PIECES]
+    self._format_string_short_pieces_field_names = [
+        self._GetReplacementFieldNames(format_string_piece)
+        for format_string_piece in self.FORMAT_STRING_SHORT_PIECES]
+
+    replacement_field_names = set()
+    for field_names in self._format_string_pieces_field_names:
+      replacement_field_names.update(field_names)
+    for field_names in self._format_string_short_pieces_field_names:
+      replacement_field_names.update(field_names)
+
+    # The attributes that determine which pieces are used are needed as well.
+    replacement_field_names.update(self._format_string_pieces_map)
+    replacement_field_names.update(self._format_string_short_pieces_map)
+
+    self._conditional_format_strings = {}
+    self._compiled_attribute_names = self._GetCompiledAttributeNames(
+        replacement_field_names)
 
   def GetFormatStringAttributeNames(self):
     """Retrieves the attribute names in the format string.
@@ -337,5 +516,13 @@ class ConditionalEventFormatter(EventFormatter):
       raise errors.WrongFormatter(u'Unsupported data type: {0:s}.'.format(
           event.data_type))
 
-    event_values = event.CopyToDict()
-    return self._ConditionalFormatMessages(event_values)
+    event_values = self._GetCompiledEventValues(event)
+    format_string, short_format_string, replacement_field_names = (
+        self._GetConditionalFormatStrings(event_values))
+
+    if not replacement_field_names.issubset(event_values):
+      # Use all the event values to report the missing attributes.
+      return self._ConditionalFormatMessages(event.CopyToDict())
+
+    return self._FormatMessages(
+        format_string, short_format_string, event_values)
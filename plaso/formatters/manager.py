@@ -58,6 +58,7 @@ class FormattersManager(object):
             u'Using default formatter for data type: {0:s}'.format(data_type))
         formatter_object = default.DefaultFormatter()
 
+      formatter_object.CompileFormatStrings()
       cls._formatter_objects[data_type] = formatter_object
 
     return cls._formatter_objects[data_type]
@@ -203,19 +203,24 @@ class ExtractionFrontend(frontend.Frontend):
 
     return session
 
-  def CreateStorageWriter(self, session, storage_file_path):
+  def CreateStorageWriter(
+      self, session, storage_file_path,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
     """Creates a storage writer.
 
     Args:
       session (Session): session the storage changes are part of.
       storage_file_path (str): path of the storage file.
+      serialization_format (Optional[str]): serialization format of
+          the storage file.
 
     Returns:
       StorageWriter: storage writer.
     """
     self._CheckStorageFile(storage_file_path)
 
-    return storage_zip_file.ZIPStorageFileWriter(session, storage_file_path)
+    return storage_zip_file.ZIPStorageFileWriter(
+        session, storage_file_path, serialization_format=serialization_format)
 
   def DisableProfiling(self):
     """Disabled profiling."""
@@ -285,9 +290,10 @@ class ExtractionFrontend(frontend.Frontend):
   def ProcessSources(
       self, session, storage_writer, source_path_specs, source_type,
       processing_configuration, enable_sigsegv_handler=False,
-      force_preprocessing=False, number_of_extraction_workers=0,
+      force_preprocessing=False, group_tasks_by_parent=False,
+      number_of_extraction_workers=0, number_of_merge_workers=0,
       single_process_mode=False, status_update_callback=None,
-      worker_memory_limit=None):
+      task_batch_size=1, worker_memory_limit=None):
     """Processes the sources.
 
     Args:
@@ -302,12 +308,21 @@ class ExtractionFrontend(frontend.Frontend):
           should be enabled.
       force_preprocessing (Optional[bool]): True if preprocessing should be
           forced.
+      group_tasks_by_parent (Optional[bool]): True if the tasks of files that
+          are stored on the same parent, such as a volume shadow snapshot or
+          partition, should be scheduled consecutively.
       number_of_extraction_workers (Optional[int]): number of extraction
           workers to run. If 0, the number will be selected automatically.
+      number_of_merge_workers (Optional[int]): number of workers that
+          pre-merge the results of the extraction workers. If 0, the results
+          are only merged by the main process.
       single_process_mode (Optional[bool]): True if the front-end should
           run in single process mode.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      task_batch_size (Optional[int]): maximum number of small files that
+          are processed as part of a single task. If 1, the files are not
+          batched.
       worker_memory_limit (Optional[int]): maximum amount of memory a worker is
           allowed to consume, where None represents 2 GiB.
 
@@ -386,8 +401,11 @@ class ExtractionFrontend(frontend.Frontend):
           processing_configuration,
           enable_sigsegv_handler=enable_sigsegv_handler,
           filter_find_specs=filter_find_specs,
+          group_tasks_by_parent=group_tasks_by_parent,
+          number_of_merge_processes=number_of_merge_workers,
           number_of_worker_processes=number_of_extraction_workers,
           status_update_callback=status_update_callback,
+          task_batch_size=task_batch_size,
           worker_memory_limit=worker_memory_limit)
 
     return processing_status
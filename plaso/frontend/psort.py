@@ -29,11 +29,14 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     super(PsortFrontend, self).__init__()
     self._abort = False
     self._debug_mode = False
+    self._direct_storage_access = False
     self._enable_profiling = False
     # Instance of EventObjectFilter.
+    self._event_batch_size = None
     self._event_filter = None
     self._event_filter_expression = None
     self._knowledge_base = knowledge_base.KnowledgeBase()
+    self._number_of_merge_workers = 1
     self._preferred_language = u'en-US'
     self._profiling_directory = None
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
@@ -76,7 +79,7 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
 
   def AnalyzeEvents(
       self, storage_writer, analysis_plugins, processing_configuration,
-      status_update_callback=None):
+      status_update_callback=None, storage_file_path=None):
     """Analyzes events in a plaso storage.
 
     Args:
@@ -87,6 +90,9 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
           configuration.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      storage_file_path (Optional[str]): path of the storage file, which
+          the analysis processes read the events from when direct storage
+          access is enabled.
 
     Raises:
       RuntimeError: if a non-recoverable situation is encountered.
@@ -97,11 +103,16 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     # TODO: pass configuration object.
     _ = processing_configuration
 
+    if not self._direct_storage_access:
+      storage_file_path = None
+
     engine.AnalyzeEvents(
         self._knowledge_base, storage_writer, self._data_location,
-        analysis_plugins, event_filter=self._event_filter,
+        analysis_plugins, event_batch_size=self._event_batch_size,
+        event_filter=self._event_filter,
         event_filter_expression=self._event_filter_expression,
-        status_update_callback=status_update_callback)
+        status_update_callback=status_update_callback,
+        storage_file_path=storage_file_path)
 
   def CreateOutputModule(
       self, output_format, preferred_encoding=u'utf-8', timezone=u'UTC'):
@@ -173,7 +184,9 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     Returns:
       StorageReader: storage reader.
     """
-    return storage_zip_file.ZIPStorageFileReader(storage_file_path)
+    return storage_zip_file.ZIPStorageFileReader(
+        storage_file_path,
+        number_of_merge_workers=self._number_of_merge_workers)
 
   def CreateStorageWriter(self, session, storage_file_path):
     """Creates a storage writer.
@@ -289,6 +302,16 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     """
     return output_manager.OutputManager.HasOutputClass(name)
 
+  def SetDirectStorageAccess(self, direct_storage_access):
+    """Sets whether the analysis processes read the storage file directly.
+
+    Args:
+      direct_storage_access (bool): True if the analysis processes should read
+          the events from the storage file themselves instead of the events
+          being passed to them.
+    """
+    self._direct_storage_access = direct_storage_access
+
   def SetEventFilter(self, event_filter, event_filter_expression):
     """Sets the event filter information.
 
@@ -299,6 +322,27 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     self._event_filter = event_filter
     self._event_filter_expression = event_filter_expression
 
+  def SetEventBatchSize(self, event_batch_size):
+    """Sets the number of events that are passed to analysis as a batch.
+
+    Args:
+      event_batch_size (int): maximum number of events that are pushed onto
+          the queues of the analysis processes as a single batch, where None
+          represents the default batch size.
+    """
+    self._event_batch_size = event_batch_size
+
+  def SetNumberOfMergeWorkers(self, number_of_merge_workers):
+    """Sets the number of worker processes used to merge the events.
+
+    Args:
+      number_of_merge_workers (int): number of worker processes used to
+          deserialize events while retrieving the events in chronological
+          order, where 0 represents the number of available system CPUs
+          minus one and 1 represents that no worker processes should be used.
+    """
+    self._number_of_merge_workers = number_of_merge_workers
+
   def SetPreferredLanguageIdentifier(self, language_identifier):
     """Sets the preferred language identifier.
 
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Buffered reader of file-like objects for parsers of binary formats.
+
+Parsers of binary formats tend to read a file-like object in many small reads,
+such as one per record or even one per field of a record. Every read of a dfVFS
+file-like object passes through all the layers of its path specification, such
+as a storage media image, a volume system and a file system. The buffered
+reader reads the file-like object in large reads, aligned to the buffer size,
+and serves the small reads from its buffer.
+"""
+
+import os
+import struct
+
+
+class BufferedReader(object):
+  """Class that implements a buffered reader of a file-like object.
+
+  The buffered reader provides the read, seek, get_offset, tell and get_size
+  methods of a dfVFS file-like object, so that it can be passed to functions
+  that expect a file-like object, such as construct parse_stream(). The
+  position of the buffered reader is independent of the position of the
+  file-like object it reads from.
+  """
+
+  _DEFAULT_BUFFER_SIZE = 64 * 1024
+
+  def __init__(self, file_object, buffer_size=None):
+    """Initializes a buffered reader.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object to read from.
+      buffer_size (Optional[int]): size of the reads of the file-like object,
+          where None represents the default size.
+    """
+    super(BufferedReader, self).__init__()
+    self._buffer = b''
+    self._buffer_offset = 0
+    self._buffer_size = buffer_size or self._DEFAULT_BUFFER_SIZE
+    self._current_offset = file_object.get_offset()
+    self._file_object = file_object
+    self._file_size = None
+
+  def _GetBufferedData(self, size):
+    """Retrieves the buffer offset of the data at the current offset.
+
+    Args:
+      size (int): size of the data.
+
+    Returns:
+      tuple: contains:
+
+        int: offset of the data relative to the start of the buffer.
+        int: size of the data in the buffer, which is smaller than the size
+            if the data extends beyond the end of the file.
+    """
+    buffer_end_offset = self._buffer_offset + len(self._buffer)
+    if (self._current_offset < self._buffer_offset or
+        self._current_offset + size > buffer_end_offset):
+      self._ReadBuffer(size)
+
+    relative_offset = self._current_offset - self._buffer_offset
+    available_size = max(0, len(self._buffer) - relative_offset)
+    return relative_offset, min(size, available_size)
+
+  def _ReadBuffer(self, size):
+    """Reads the buffer so that it contains the data at the current offset.
+
+    The part of the buffer that overlaps with the data at the current offset
+    is retained, so that sequential reads never read data twice.
+
+    Args:
+      size (int): size of the data at the current offset that the buffer
+          should contain, if available.
+    """
+    buffer_end_offset = self._buffer_offset + len(self._buffer)
+    end_offset = self._current_offset + size
+
+    if self._buffer_offset <= self._current_offset < buffer_end_offset:
+      retained_data = self._buffer[
+          self._current_offset - self._buffer_offset:]
+      buffer_offset = self._current_offset
+      read_offset = buffer_end_offset
+    else:
+      retained_data = b''
+      read_offset = self._current_offset - (
+          self._current_offset % self._buffer_size)
+      buffer_offset = read_offset
+
+    read_size = end_offset - read_offset
+    remainder = read_size % self._buffer_size
+    if remainder:
+      read_size += self._buffer_size - remainder
+
+    self._file_object.seek(read_offset, os.SEEK_SET)
+    data = self._file_object.read(read_size)
+
+    self._buffer = b''.join([retained_data, data])
+    self._buffer_offset = buffer_offset
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset into the file-like object.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size of the file-like object data.
+    """
+    if self._file_size is None:
+      self._file_size = self._file_object.get_size()
+    return self._file_size
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None or a negative
+          value represents all remaining bytes.
+
+    Returns:
+      bytes: data read, which is shorter than the size if the end of
+          the file-like object was reached.
+    """
+    if size is None or size < 0:
+      size = max(0, self.get_size() - self._current_offset)
+
+    if not size:
+      return b''
+
+    relative_offset, size = self._GetBufferedData(size)
+    data = self._buffer[relative_offset:relative_offset + size]
+    self._current_offset += size
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks to an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek to.
+      whence (Optional(int)): value that indicates whether offset is an
+          absolute or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self.get_size()
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset into the file-like object.
+    """
+    return self._current_offset
+
+  def ReadArray(self, element_format, number_of_elements):
+    """Reads an array of fixed-size elements at the current offset.
+
+    The elements are decoded in bulk from the buffer, without copying their
+    data.
+
+    Args:
+      element_format (str): struct format of an element, which consists of
+          a byte order character followed by a single format character,
+          for example '<I' for a little-endian 32-bit unsigned integer.
+      number_of_elements (int): number of elements to read.
+
+    Returns:
+      tuple[object]: values of the elements, which contains fewer values than
+          the number of elements if the end of the file-like object was
+          reached.
+    """
+    if number_of_elements <= 0:
+      return ()
+
+    element_size = struct.calcsize(element_format)
+
+    relative_offset, size = self._GetBufferedData(
+        element_size * number_of_elements)
+    number_of_elements = size // element_size
+
+    array_format = u'{0:s}{1:d}{2:s}'.format(
+        element_format[0], number_of_elements, element_format[1:])
+    values = struct.unpack_from(
+        array_format.encode(u'ascii'), self._buffer, relative_offset)
+
+    self._current_offset += number_of_elements * element_size
+    return values
+
+  def ReadRecords(self, record_size, maximum_number_of_records=None):
+    """Reads consecutive fixed-size records at the current offset.
+
+    The records are read from the buffer, without a read of the file-like
+    object per record. Reading stops at the end of the file-like object or
+    at the first record that is incomplete, without consuming that record.
+
+    Args:
+      record_size (int): size of a record.
+      maximum_number_of_records (Optional[int]): maximum number of records to
+          read, where None represents all remaining records.
+
+    Yields:
+      tuple[int, bytes]: offset and data of the record.
+    """
+    number_of_records = 0
+    while (maximum_number_of_records is None or
+           number_of_records < maximum_number_of_records):
+      relative_offset, size = self._GetBufferedData(record_size)
+      if size < record_size:
+        break
+
+      record_offset = self._current_offset
+      self._current_offset += record_size
+      number_of_records += 1
+
+      yield record_offset, self._buffer[
+          relative_offset:relative_offset + record_size]
@@ -59,9 +59,12 @@ RESERVED_VARIABLE_NAMES = frozenset([
     u'timezone',
     u'username'])
 
+SERIALIZER_FORMAT_BINARY = u'binary'
 SERIALIZER_FORMAT_JSON = u'json'
 
-SERIALIZER_FORMATS = frozenset([SERIALIZER_FORMAT_JSON])
+SERIALIZER_FORMATS = frozenset([
+    SERIALIZER_FORMAT_BINARY,
+    SERIALIZER_FORMAT_JSON])
 
 # The session storage contains the results of one or more sessions.
 # A typical session is e.g. a single run of a tool (log2timeline.py).
@@ -98,6 +98,7 @@ filter is easy. Three basic filter implementations are given:
 import abc
 import binascii
 import logging
+import operator
 import re
 
 from plaso.lib import errors
@@ -567,6 +568,305 @@ class DictValueExpander(ValueExpander):
     return obj.get(attr_name, None)
 
 
+class CompiledFilter(Filter):
+  """Filter that matches objects using a filter compiled into a closure.
+
+  Attributes:
+    filter: the filter that was compiled, which is kept for inspection of
+        the filter and for evaluation of operators that cannot be compiled.
+  """
+
+  def __init__(self, filter_object, matches_function):
+    """Constructor.
+
+    Args:
+      filter_object: the filter that was compiled (instance of Filter).
+      matches_function: function that takes an object and a dictionary to
+          cache expanded values and returns a boolean that indicates if
+          the object matches the filter.
+    """
+    super(CompiledFilter, self).__init__(arguments=[filter_object])
+    self._matches_function = matches_function
+    self.filter = filter_object
+
+  def Matches(self, obj):
+    """Whether object obj matches this filter."""
+    return self._matches_function(obj, {})
+
+  def __str__(self):
+    return 'CompiledFilter({0!s})'.format(self.filter)
+
+
+class FilterCompiler(object):
+  """Compiles a filter into a single closure.
+
+  The interpreted filter expands the values of an attribute for every
+  operator that references it and determines the operator to apply for
+  every value. The compiled filter determines the function that expands
+  the values and the operation to apply once, expands the values of
+  attributes that are referenced by multiple operators only once per object,
+  compares against precomputed right operands and short-circuits AND and OR
+  filters. Filters that cannot be compiled, such as Context, are evaluated
+  by the interpreter.
+
+  The compiled filter matches exactly the same objects as the interpreted
+  filter.
+  """
+
+  # Operators that compare the expanded value with the right operand.
+  _COMPARISON_OPERATORS = {
+      Equals: operator.eq,
+      NotEquals: operator.eq,
+      Less: operator.lt,
+      LessEqual: operator.le,
+      Greater: operator.gt,
+      GreaterEqual: operator.ge}
+
+  def __init__(self):
+    """Initializes a filter compiler."""
+    super(FilterCompiler, self).__init__()
+    self._number_of_references_per_path = {}
+
+  def _CompileAndFilter(self, filter_object):
+    """Compiles an AND filter.
+
+    Args:
+      filter_object: the filter (instance of AndFilter).
+
+    Returns:
+      A function that takes an object and a values cache and returns a boolean.
+    """
+    functions = [
+        self._CompileFilter(argument) for argument in filter_object.args]
+    if not functions:
+      return lambda unused_obj, unused_values_cache: True
+
+    if len(functions) == 1:
+      return functions[0]
+
+    def MatchesAll(obj, values_cache):
+      for function in functions:
+        if not function(obj, values_cache):
+          return False
+      return True
+
+    return MatchesAll
+
+  def _CompileBinaryOperator(self, filter_object):
+    """Compiles a generic binary operator.
+
+    Args:
+      filter_object: the operator (instance of GenericBinaryOperator).
+
+    Returns:
+      A function that takes an object and a values cache and returns a boolean
+      or None if the operator cannot be compiled.
+    """
+    operation = self._CompileOperation(filter_object)
+    if not operation:
+      return
+
+    get_values = self._CompileValuesFunction(filter_object)
+    if not get_values:
+      return
+
+    bool_value = filter_object.bool_value
+
+    def MatchesOperator(obj, values_cache):
+      for value in get_values(obj, values_cache):
+        try:
+          if operation(value):
+            return bool_value
+        except (ValueError, TypeError):
+          continue
+      return not bool_value
+
+    return MatchesOperator
+
+  def _CompileFilter(self, filter_object):
+    """Compiles a filter.
+
+    Args:
+      filter_object: the filter (instance of Filter).
+
+    Returns:
+      A function that takes an object and a values cache and returns a boolean.
+    """
+    function = None
+    filter_type = type(filter_object)
+    if filter_type is AndFilter:
+      function = self._CompileAndFilter(filter_object)
+
+    elif filter_type is OrFilter:
+      function = self._CompileOrFilter(filter_object)
+
+    elif filter_type is IdentityFilter:
+      function = lambda unused_obj, unused_values_cache: True
+
+    elif (isinstance(filter_object, GenericBinaryOperator) and
+          filter_type.Matches == GenericBinaryOperator.Matches and
+          filter_type.Operate == GenericBinaryOperator.Operate):
+      function = self._CompileBinaryOperator(filter_object)
+
+    if not function:
+      # Fall back to the interpreter.
+      matches = filter_object.Matches
+      function = lambda obj, unused_values_cache: matches(obj)
+
+    return function
+
+  def _CompileOperation(self, filter_object):
+    """Compiles the operation of a generic binary operator.
+
+    Args:
+      filter_object: the operator (instance of GenericBinaryOperator).
+
+    Returns:
+      A function that takes an expanded value and returns a boolean.
+    """
+    filter_type = type(filter_object)
+    right_operand = filter_object.right_operand
+
+    comparison_operator = self._COMPARISON_OPERATORS.get(filter_type, None)
+    if comparison_operator:
+      return lambda value: comparison_operator(value, right_operand)
+
+    if (filter_type is Contains and
+        isinstance(right_operand, py2to3.STRING_TYPES)):
+      lower_case_right_operand = right_operand.lower()
+
+      def ContainsValue(value):
+        if isinstance(value, py2to3.STRING_TYPES):
+          return lower_case_right_operand in value.lower()
+        return right_operand in value
+
+      return ContainsValue
+
+    if filter_type in (Regexp, RegexpInsensitive):
+      search = filter_object.compiled_re.search
+
+      def SearchValue(value):
+        if not isinstance(value, py2to3.UNICODE_TYPE):
+          value = GetUnicodeString(value)
+        return search(value) is not None
+
+      return SearchValue
+
+    operation = filter_object.Operation
+    return lambda value: operation(value, right_operand)
+
+  def _CompileOrFilter(self, filter_object):
+    """Compiles an OR filter.
+
+    Args:
+      filter_object: the filter (instance of OrFilter).
+
+    Returns:
+      A function that takes an object and a values cache and returns a boolean.
+    """
+    functions = [
+        self._CompileFilter(argument) for argument in filter_object.args]
+    if not functions:
+      return lambda unused_obj, unused_values_cache: True
+
+    if len(functions) == 1:
+      return functions[0]
+
+    def MatchesAny(obj, values_cache):
+      for function in functions:
+        if function(obj, values_cache):
+          return True
+      return False
+
+    return MatchesAny
+
+  def _CompileValuesFunction(self, filter_object):
+    """Compiles the expansion of the values of the left operand.
+
+    Args:
+      filter_object: the operator (instance of BinaryOperator).
+
+    Returns:
+      A function that takes an object and a values cache and returns
+      a sequence of the expanded values or None if the left operand cannot
+      be compiled.
+    """
+    value_expander = filter_object.value_expander
+    path = filter_object.left_operand
+    if not value_expander or not isinstance(path, py2to3.STRING_TYPES):
+      return
+
+    expander_type = type(value_expander)
+
+    # pylint: disable=protected-access
+    if (value_expander.FIELD_SEPARATOR not in path and
+        expander_type._AtLeaf == ValueExpander._AtLeaf):
+      # An attribute without sub attributes expands into its value, if any.
+      attribute_name = value_expander._GetAttributeName([path])
+      get_value = value_expander._GetValue
+
+      def GetValues(obj):
+        value = get_value(obj, attribute_name)
+        if value is None:
+          return ()
+        return (value, )
+
+    else:
+      expand = value_expander.Expand
+
+      def GetValues(obj):
+        return list(expand(obj, path))
+
+    lookup_key = (expander_type, path)
+    if self._number_of_references_per_path.get(lookup_key, 0) <= 1:
+      return lambda obj, unused_values_cache: GetValues(obj)
+
+    def GetCachedValues(obj, values_cache):
+      values = values_cache.get(lookup_key, None)
+      if values is None:
+        values = GetValues(obj)
+        values_cache[lookup_key] = values
+      return values
+
+    return GetCachedValues
+
+  def _CountPathReferences(self, filter_object):
+    """Counts the number of operators that reference each path.
+
+    Args:
+      filter_object: the filter (instance of Filter).
+    """
+    if isinstance(filter_object, (AndFilter, OrFilter)):
+      for argument in filter_object.args:
+        self._CountPathReferences(argument)
+
+    elif (isinstance(filter_object, BinaryOperator) and
+          filter_object.value_expander and
+          isinstance(filter_object.left_operand, py2to3.STRING_TYPES)):
+      lookup_key = (type(filter_object.value_expander),
+                    filter_object.left_operand)
+      self._number_of_references_per_path.setdefault(lookup_key, 0)
+      self._number_of_references_per_path[lookup_key] += 1
+
+  def Compile(self, filter_object):
+    """Compiles a filter.
+
+    Args:
+      filter_object: the filter (instance of Filter).
+
+    Returns:
+      The compiled filter (instance of CompiledFilter).
+    """
+    if isinstance(filter_object, CompiledFilter):
+      return filter_object
+
+    self._number_of_references_per_path = {}
+    self._CountPathReferences(filter_object)
+
+    matches_function = self._CompileFilter(filter_object)
+    return CompiledFilter(filter_object, matches_function)
+
+
 class BasicExpression(lexer.Expression):
   """Basic Expression."""
 
@@ -76,6 +76,7 @@ class PlasoValueExpander(objectfilter.AttributeValueExpander):
   def __init__(self):
     """Initialize an attribute value expander."""
     super(PlasoValueExpander, self).__init__()
+    self._formatter_mediator = None
 
   def _GetMessage(self, event_object):
     """Returns a properly formatted message string.
@@ -86,13 +87,13 @@ class PlasoValueExpander(objectfilter.AttributeValueExpander):
     Returns:
       A formatted message string.
     """
-    # TODO: move this somewhere where the mediator can be instantiated once.
-    formatter_mediator = formatters_mediator.FormatterMediator()
+    if not self._formatter_mediator:
+      self._formatter_mediator = formatters_mediator.FormatterMediator()
 
     result = u''
     try:
       result, _ = formatters_manager.FormattersManager.GetMessageStrings(
-          formatter_mediator, event_object)
+          self._formatter_mediator, event_object)
     except KeyError as exception:
       logging.warning(u'Unable to correctly assemble event: {0:s}'.format(
           exception))
@@ -238,6 +239,49 @@ class PlasoAttributeFilterImplementation(objectfilter.BaseFilterImplementation):
   OPS.update({'inlist': ParserList,})
 
 
+class PlasoFilterCompiler(objectfilter.FilterCompiler):
+  """Compiles a Plaso filter into a single closure.
+
+  In addition to the generic operators, timestamps are compared directly
+  against the timestamp of the date compare object and parser lists are
+  looked up in a set.
+  """
+
+  def _CompileOperation(self, filter_object):
+    """Compiles the operation of a generic binary operator.
+
+    Args:
+      filter_object: the operator (instance of GenericBinaryOperator).
+
+    Returns:
+      A function that takes an expanded value and returns a boolean.
+    """
+    operation = super(PlasoFilterCompiler, self)._CompileOperation(
+        filter_object)
+
+    filter_type = type(filter_object)
+    right_operand = filter_object.right_operand
+
+    if filter_type is ParserList and filter_object.left_operand == 'parser':
+      parsers = frozenset(filter_object.compiled_list)
+      return lambda value: value in parsers
+
+    comparison_operator = self._COMPARISON_OPERATORS.get(filter_type, None)
+    if comparison_operator and isinstance(right_operand, DateCompareObject):
+      timestamp = right_operand.data
+
+      def CompareTimestamp(value):
+        # Comparing an integer with a date compare object is equivalent
+        # to comparing it with its timestamp.
+        if isinstance(value, py2to3.INTEGER_TYPES):
+          return comparison_operator(value, timestamp)
+        return operation(value)
+
+      return CompareTimestamp
+
+    return operation
+
+
 class DateCompareObject(object):
   """A specific class created for date comparison.
 
@@ -9,6 +9,7 @@ It also contains various functions to represent timestamps in a more
 human readable form.
 """
 
+import bisect
 import calendar
 import datetime
 import logging
@@ -44,6 +45,17 @@ class Timestamp(object):
 
     The timestamp is not necessarily in UTC.
   """
+  # The naive datetime object of January 1, 1970, 00:00:00 UTC.
+  _EPOCH = datetime.datetime(1970, 1, 1)
+
+  # The range of timestamps that can be represented by a datetime object,
+  # which is January 1, 0001 00:00:00 to December 31, 9999 23:59:59.999999.
+  _DATETIME_MIN_TIMESTAMP = -62135596800000000
+  _DATETIME_MAX_TIMESTAMP = 253402300799999999
+
+  # The UTC offset tables per timezone.
+  _utc_offset_tables = {}
+
   # The minimum timestamp in seconds
   TIMESTAMP_MIN_SECONDS = -(((1 << 63) - 1) / 1000000)
 
@@ -70,6 +82,64 @@ class Timestamp(object):
   # The multiplication factor to change milliseconds to micro seconds.
   MILLI_SECONDS_TO_MICRO_SECONDS = 1000
 
+  @classmethod
+  def _GetUTCOffsetTable(cls, timezone):
+    """Retrieves the UTC offset table of a timezone.
+
+    The UTC offset table is derived from the UTC transition times of a pytz
+    timezone and contains the UTC offset and the corresponding tzinfo per
+    range of timestamps, the same values pytz uses to convert a UTC date and
+    time into the timezone.
+
+    Args:
+      timezone (datetime.tzinfo): timezone.
+
+    Returns:
+      tuple[list[int], list[tuple[int, datetime.tzinfo]]]: timestamps of the
+          start of each range of timestamps and the UTC offset in micro seconds
+          and tzinfo per range, or None if the timezone is not supported.
+    """
+    utc_offset_table = cls._utc_offset_tables.get(timezone, None)
+    if utc_offset_table:
+      return utc_offset_table
+
+    if timezone is pytz.UTC or isinstance(timezone, pytz.tzinfo.StaticTzInfo):
+      utc_offset = timezone.utcoffset(None)
+      utc_offset_table = ([], [(cls._GetMicroseconds(utc_offset), timezone)])
+
+    elif isinstance(timezone, pytz.tzinfo.DstTzInfo):
+      # pylint: disable=protected-access
+      transition_timestamps = [
+          cls._GetMicroseconds(transition_time - cls._EPOCH)
+          for transition_time in timezone._utc_transition_times]
+
+      utc_offsets = [
+          (cls._GetMicroseconds(transition_info[0]),
+           timezone._tzinfos[transition_info])
+          for transition_info in timezone._transition_info]
+
+      utc_offset_table = (transition_timestamps, utc_offsets)
+
+    else:
+      return
+
+    cls._utc_offset_tables[timezone] = utc_offset_table
+    return utc_offset_table
+
+  @classmethod
+  def _GetMicroseconds(cls, timedelta_object):
+    """Retrieves the number of micro seconds of a time delta.
+
+    Args:
+      timedelta_object (datetime.timedelta): time delta.
+
+    Returns:
+      int: number of micro seconds.
+    """
+    return (
+        (timedelta_object.days * 86400 + timedelta_object.seconds) * 1000000 +
+        timedelta_object.microseconds)
+
   @classmethod
   def CopyFromString(cls, time_string):
     """Copies a timestamp from a string containing a date and time value.
@@ -254,6 +324,89 @@ class Timestamp(object):
 
     return datetime_object
 
+  @classmethod
+  def CopyToDatetimes(cls, timestamps, timezone):
+    """Copies a block of timestamps to datetime objects.
+
+    The UTC offsets of the timezone are looked up in a transition table
+    that is determined once per timezone. Consecutive equal timestamps,
+    which are common in a sorted timeline, share the same datetime object.
+    The datetime objects are equal to those returned by CopyToDatetime().
+
+    Args:
+      timestamps (list[int]): timestamps that contain the number of micro
+          seconds since January 1, 1970, 00:00:00 UTC.
+      timezone (datetime.tzinfo): timezone.
+
+    Returns:
+      list[datetime.datetime]: datetime objects, where None represents
+          a timestamp that could not be copied, such as a timestamp that is
+          out of bounds.
+    """
+    utc_offset_table = cls._GetUTCOffsetTable(timezone)
+    if not utc_offset_table:
+      datetime_objects = []
+      for timestamp in timestamps:
+        try:
+          datetime_object = cls.CopyToDatetime(
+              timestamp, timezone, raise_error=True)
+        except (OverflowError, TypeError):
+          datetime_object = None
+
+        datetime_objects.append(datetime_object)
+
+      return datetime_objects
+
+    transition_timestamps, utc_offsets = utc_offset_table
+
+    datetime_objects = []
+    datetime_object = None
+    last_timestamp = None
+    range_end_timestamp = None
+    range_start_timestamp = None
+    utc_offset = None
+    tzinfo = None
+
+    for timestamp in timestamps:
+      if timestamp == last_timestamp and datetime_object:
+        datetime_objects.append(datetime_object)
+        continue
+
+      last_timestamp = timestamp
+      datetime_object = None
+
+      if (isinstance(timestamp, py2to3.INTEGER_TYPES) and
+          cls._DATETIME_MIN_TIMESTAMP <= timestamp <=
+          cls._DATETIME_MAX_TIMESTAMP):
+
+        if (range_start_timestamp is None or
+            not range_start_timestamp <= timestamp < range_end_timestamp):
+          range_index = max(
+              0, bisect.bisect_right(transition_timestamps, timestamp) - 1)
+
+          if transition_timestamps:
+            range_start_timestamp = transition_timestamps[range_index]
+          else:
+            range_start_timestamp = cls._DATETIME_MIN_TIMESTAMP
+
+          if range_index + 1 < len(transition_timestamps):
+            range_end_timestamp = transition_timestamps[range_index + 1]
+          else:
+            range_end_timestamp = cls._DATETIME_MAX_TIMESTAMP + 1
+
+          utc_offset, tzinfo = utc_offsets[range_index]
+
+        try:
+          datetime_object = cls._EPOCH + datetime.timedelta(
+              microseconds=timestamp + utc_offset)
+          datetime_object = datetime_object.replace(tzinfo=tzinfo)
+        except OverflowError:
+          datetime_object = None
+
+      datetime_objects.append(datetime_object)
+
+    return datetime_objects
+
   @classmethod
   def CopyToIsoFormat(cls, timestamp, timezone=pytz.UTC, raise_error=False):
     """Copies the timestamp to an ISO 8601 formatted string.
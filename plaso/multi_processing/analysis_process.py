@@ -4,12 +4,17 @@
 import logging
 import threading
 
+# The following import makes sure the filters are registered.
+from plaso import filters  # pylint: disable=unused-import
+
 from plaso.analysis import mediator as analysis_mediator
 from plaso.containers import tasks
 from plaso.engine import plaso_queue
+from plaso.filters import manager as filters_manager
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.multi_processing import base_process
+from plaso.storage import zip_file as storage_zip_file
 
 
 class AnalysisProcess(base_process.MultiProcessBaseProcess):
@@ -19,16 +24,26 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
   # by the foreman process.
   _FOREMAN_STATUS_WAIT = 5 * 60
 
+  # Maximum number of events read from the storage file that are examined
+  # by the analysis plugin as a single batch.
+  _EVENT_BATCH_SIZE = 256
+
+  # Number of events read from the storage file between samples of
+  # the memory profiler.
+  _MEMORY_PROFILER_SAMPLE_RATE = 1000
+
   def __init__(
       self, event_queue, storage_writer, knowledge_base, analysis_plugin,
-      data_location=None, event_filter_expression=None, **kwargs):
+      data_location=None, event_filter_expression=None,
+      storage_file_path=None, **kwargs):
     """Initializes an analysis process.
 
     Non-specified keyword arguments (kwargs) are directly passed to
     multiprocessing.Process.
 
     Args:
-      event_queue (plaso_queue.Queue): event queue.
+      event_queue (plaso_queue.Queue): event queue, which is not used when
+          the events are read from the storage file.
       storage_writer (StorageWriter): storage writer for a session storage.
       knowledge_base (KnowledgeBase): contains information from the source
           data needed for analysis.
@@ -36,6 +51,9 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
       data_location (Optional[str]): path to the location that data files
           should be loaded from.
       event_filter_expression (Optional[str]): event filter expression.
+      storage_file_path (Optional[str]): path of the storage file to read
+          the events from directly, where None represents that the events
+          are read from the event queue.
     """
     super(AnalysisProcess, self).__init__(**kwargs)
     self._abort = False
@@ -51,6 +69,7 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
     self._number_of_consumed_events = 0
     self._serializers_profiler = None
     self._status = definitions.PROCESSING_STATUS_INITIALIZED
+    self._storage_file_path = storage_file_path
     self._storage_writer = storage_writer
     self._task = None
 
@@ -123,33 +142,10 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
     storage_writer.WriteTaskStart()
 
     try:
-      logging.debug(
-          u'{0!s} (PID: {1:d}) started monitoring event queue.'.format(
-              self._name, self._pid))
-
-      while not self._abort:
-        try:
-          event = self._event_queue.PopItem()
-
-        except (errors.QueueClose, errors.QueueEmpty) as exception:
-          logging.debug(u'ConsumeItems exiting with exception {0:s}.'.format(
-              type(exception)))
-          break
-
-        if isinstance(event, plaso_queue.QueueAbort):
-          logging.debug(u'ConsumeItems exiting, dequeued QueueAbort object.')
-          break
-
-        self._ProcessEvent(self._analysis_mediator, event)
-
-        self._number_of_consumed_events += 1
-
-        if self._memory_profiler:
-          self._memory_profiler.Sample()
-
-      logging.debug(
-          u'{0!s} (PID: {1:d}) stopped monitoring event queue.'.format(
-              self._name, self._pid))
+      if self._storage_file_path:
+        self._ProcessStorageFile()
+      else:
+        self._ProcessEventQueue()
 
       if not self._abort:
         self._status = definitions.PROCESSING_STATUS_REPORTING
@@ -191,10 +187,11 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
     self._storage_writer = None
     self._task = None
 
-    try:
-      self._event_queue.Close(abort=self._abort)
-    except errors.QueueAlreadyClosed:
-      logging.error(u'Queue for {0:s} was already closed.'.format(self.name))
+    if self._event_queue:
+      try:
+        self._event_queue.Close(abort=self._abort)
+      except errors.QueueAlreadyClosed:
+        logging.error(u'Queue for {0:s} was already closed.'.format(self.name))
 
   def _ProcessEvent(self, mediator, event):
     """Processes an event.
@@ -216,6 +213,129 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
         logging.warning(u'Unhandled exception while processing event object.')
         logging.exception(exception)
 
+  def _ProcessEvents(self, mediator, events):
+    """Processes a batch of events.
+
+    Args:
+      mediator (AnalysisMediator): mediates interactions between
+          analysis plugins and other components, such as storage and dfvfs.
+      events (list[EventObject]): events.
+    """
+    try:
+      self._analysis_plugin.ExamineEvents(mediator, events)
+
+    except Exception as exception:  # pylint: disable=broad-except
+      self.SignalAbort()
+
+      # TODO: write analysis error.
+
+      if self._debug_output:
+        logging.warning(u'Unhandled exception while processing event objects.')
+        logging.exception(exception)
+
+  def _ProcessEventQueue(self):
+    """Processes the events pushed onto the event queue by the foreman."""
+    logging.debug(
+        u'{0!s} (PID: {1:d}) started monitoring event queue.'.format(
+            self._name, self._pid))
+
+    while not self._abort:
+      try:
+        queued_object = self._event_queue.PopItem()
+
+      except (errors.QueueClose, errors.QueueEmpty) as exception:
+        logging.debug(u'ConsumeItems exiting with exception {0:s}.'.format(
+            type(exception)))
+        break
+
+      if isinstance(queued_object, plaso_queue.QueueAbort):
+        logging.debug(u'ConsumeItems exiting, dequeued QueueAbort object.')
+        break
+
+      if isinstance(queued_object, plaso_queue.QueueEventBatch):
+        events = queued_object.GetEvents()
+        self._ProcessEvents(self._analysis_mediator, events)
+        self._number_of_consumed_events += len(events)
+
+      else:
+        self._ProcessEvent(self._analysis_mediator, queued_object)
+        self._number_of_consumed_events += 1
+
+      if self._memory_profiler:
+        self._memory_profiler.Sample()
+
+    logging.debug(
+        u'{0!s} (PID: {1:d}) stopped monitoring event queue.'.format(
+            self._name, self._pid))
+
+  def _ProcessStorageFile(self):
+    """Processes the events read directly from the storage file.
+
+    The events are read in chronological order, unless the analysis plugin
+    does not require sorted events, in which case they are read in the order
+    they were stored.
+
+    Raises:
+      RuntimeError: if the event filter cannot be created.
+    """
+    event_filter = None
+    if self._event_filter_expression:
+      event_filter = filters_manager.FiltersManager.GetFilterObject(
+          self._event_filter_expression)
+      if not event_filter:
+        raise RuntimeError(u'Unable to create event filter: {0:s}.'.format(
+            self._event_filter_expression))
+
+    event_constraints = None
+    if event_filter:
+      event_constraints = event_filter.GetEventConstraints()
+
+    filter_limit = getattr(event_filter, u'limit', None)
+
+    logging.debug(
+        u'{0!s} (PID: {1:d}) started reading storage file: {2:s}.'.format(
+            self._name, self._pid, self._storage_file_path))
+
+    with storage_zip_file.ZIPStorageFileReader(
+        self._storage_file_path) as storage_reader:
+      if self._analysis_plugin.REQUIRES_SORTED_EVENTS:
+        events = storage_reader.GetEvents(event_constraints=event_constraints)
+      else:
+        events = storage_reader.GetUnsortedEvents()
+
+      event_batch = []
+      number_of_read_events = 0
+      for event in events:
+        if self._abort:
+          break
+
+        # pylint: disable=singleton-comparison
+        if event_filter and event_filter.Match(event) == False:
+          continue
+
+        event_batch.append(event)
+        number_of_read_events += 1
+
+        if filter_limit and filter_limit == number_of_read_events:
+          break
+
+        if len(event_batch) >= self._EVENT_BATCH_SIZE:
+          self._ProcessEvents(self._analysis_mediator, event_batch)
+          self._number_of_consumed_events += len(event_batch)
+          event_batch = []
+
+        if (self._memory_profiler and not number_of_read_events %
+            self._MEMORY_PROFILER_SAMPLE_RATE):
+          self._memory_profiler.Sample()
+
+      if event_batch and not self._abort:
+        self._ProcessEvents(self._analysis_mediator, event_batch)
+        self._number_of_consumed_events += len(event_batch)
+
+    logging.debug(
+        u'{0!s} (PID: {1:d}) stopped reading storage file.'.format(
+            self._name, self._pid))
+
   def SignalAbort(self):
     """Signals the process to abort."""
     self._abort = True
@@ -23,6 +23,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
   _DEFAULT_WORKER_MEMORY_LIMIT = 2048 * 1024 * 1024
 
+  # The default maximum number of events that are pushed onto the queues
+  # of the analysis processes as a single batch.
+  _DEFAULT_EVENT_BATCH_SIZE = 256
+
   _PROCESS_JOIN_TIMEOUT = 5.0
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
@@ -37,6 +41,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     """
     super(PsortMultiProcessEngine, self).__init__()
     self._completed_analysis_processes = set()
+    self._event_batch_size = self._DEFAULT_EVENT_BATCH_SIZE
     self._event_queues = {}
     self._merge_task = None
     self._number_of_consumed_errors = 0
@@ -51,10 +56,13 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._number_of_produced_sources = 0
     self._status = definitions.PROCESSING_STATUS_IDLE
     self._status_update_callback = None
+    self._storage_file_path = None
     self._use_zeromq = use_zeromq
     self._worker_memory_limit = self._DEFAULT_WORKER_MEMORY_LIMIT
 
-  def _AnalyzeEvents(self, storage_writer, analysis_plugins, event_filter=None):
+  def _AnalyzeEvents(
+      self, storage_writer, analysis_plugins, event_filter=None,
+      push_events=True):
     """Analyzes events in a plaso storage.
 
     Args:
@@ -62,13 +70,15 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       analysis_plugins (list[AnalysisPlugin]): analysis plugins that should
           be run.
       event_filter (Optional[FilterObject]): event filter.
+      push_events (Optional[bool]): True if the events should be pushed onto
+          the queues of the analysis processes, False if the analysis
+          processes read the events from the storage file themselves.
 
     Raises:
       RuntimeError: if a non-recoverable situation is encountered.
     """
     self._status = definitions.PROCESSING_STATUS_RUNNING
     self._number_of_consumed_errors = 0
-    self._number_of_consumed_events = 0
     self._number_of_consumed_reports = 0
     self._number_of_consumed_sources = 0
     self._number_of_produced_errors = 0
@@ -76,13 +86,24 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
 
+    # When the analysis processes read the events from the storage file
+    # the number of consumed events is tracked by _UpdateProcessingStatus.
+    if push_events:
+      self._number_of_consumed_events = 0
+
     number_of_filtered_events = 0
 
     logging.debug(u'Processing events.')
 
     filter_limit = getattr(event_filter, u'limit', None)
 
-    for event in storage_writer.GetEvents():
+    if push_events:
+      event_generator = storage_writer.GetEvents()
+    else:
+      event_generator = []
+
+    events = []
+    for event in event_generator:
       if event_filter:
         filter_match = event_filter.Match(event)
       else:
@@ -93,9 +114,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         number_of_filtered_events += 1
         continue
 
-      for event_queue in self._event_queues.values():
-        # TODO: Check for premature exit of analysis plugins.
-        event_queue.PushItem(event)
+      events.append(event)
+      if len(events) >= self._event_batch_size:
+        self._PushEventBatch(events)
+        events = []
 
       self._number_of_consumed_events += 1
 
@@ -103,6 +125,9 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           filter_limit == self._number_of_consumed_events):
         break
 
+    if events:
+      self._PushEventBatch(events)
+
     logging.debug(u'Finished pushing events to analysis plugins.')
     # Signal that we have finished adding events.
     for event_queue in self._event_queues.values():
@@ -125,10 +150,9 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         if merge_ready:
           self._status = definitions.PROCESSING_STATUS_MERGING
 
-          event_queue = self._event_queues[plugin_name]
-          del self._event_queues[plugin_name]
-
-          event_queue.Close()
+          event_queue = self._event_queues.pop(plugin_name, None)
+          if event_queue:
+            event_queue.Close()
 
           storage_merge_reader = storage_writer.StartMergeTaskStorage(task)
 
@@ -237,6 +261,40 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
       self._TerminateProcess(pid)
 
+  def _CreateEventQueues(self, analysis_plugin):
+    """Creates the event queues of an analysis process.
+
+    Args:
+      analysis_plugin (AnalysisPlugin): analysis plugin.
+
+    Returns:
+      plaso_queue.Queue: queue from which the analysis process pops events.
+    """
+    if self._use_zeromq:
+      queue_name = u'{0:s} output event queue'.format(analysis_plugin.NAME)
+      output_event_queue = zeromq_queue.ZeroMQPushBindQueue(
+          name=queue_name, timeout_seconds=self._QUEUE_TIMEOUT)
+      # Open the queue so it can bind to a random port, and we can get the
+      # port number to use in the input queue.
+      output_event_queue.Open()
+
+    else:
+      output_event_queue = multi_process_queue.MultiProcessingQueue(
+          timeout=self._QUEUE_TIMEOUT)
+
+    self._event_queues[analysis_plugin.NAME] = output_event_queue
+
+    if self._use_zeromq:
+      queue_name = u'{0:s} input event queue'.format(analysis_plugin.NAME)
+      input_event_queue = zeromq_queue.ZeroMQPullConnectQueue(
+          name=queue_name, delay_open=True, port=output_event_queue.port,
+          timeout_seconds=self._QUEUE_TIMEOUT)
+
+    else:
+      input_event_queue = output_event_queue
+
+    return input_event_queue
+
   def _ExportEvents(
       self, storage_reader, event_buffer, event_filter=None, time_slice=None,
       use_time_slicer=False):
@@ -267,13 +325,20 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       if use_time_slicer:
         time_slice_buffer = bufferlib.CircularBuffer(time_slice.duration)
 
+    # Events that cannot match the filter are skipped by the storage reader
+    # unless the time slicer needs them to provide context.
+    event_constraints = None
+    if event_filter and not time_slice_buffer:
+      event_constraints = event_filter.GetEventConstraints()
+
     filter_limit = getattr(event_filter, u'limit', None)
     forward_entries = 0
 
     number_of_filtered_events = 0
     number_of_events_from_time_slice = 0
 
-    for event in storage_reader.GetEvents(time_range=time_slice):
+    for event in storage_reader.GetEvents(
+        time_range=time_slice, event_constraints=event_constraints):
       if event_filter:
         filter_match = event_filter.Match(event)
       else:
@@ -334,9 +399,22 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     return events_counter
 
+  def _PushEventBatch(self, events):
+    """Pushes a batch of events onto the queues of the analysis processes.
+
+    The events are serialized once for all the analysis processes.
+
+    Args:
+      events (list[EventObject]): events.
+    """
+    event_batch = plaso_queue.QueueEventBatch(events)
+    for event_queue in self._event_queues.values():
+      # TODO: Check for premature exit of analysis plugins.
+      event_queue.PushItem(event_batch)
+
   def _StartAnalysisProcesses(
       self, knowledge_base_object, storage_writer, analysis_plugins,
-      data_location, event_filter_expression=None):
+      data_location, event_filter_expression=None, storage_file_path=None):
     """Starts the analysis processes.
 
     Args:
@@ -348,37 +426,25 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       data_location (str): path to the location that data files should
           be loaded from.
       event_filter_expression (Optional[str]): event filter expression.
+      storage_file_path (Optional[str]): path of the storage file the analysis
+          processes read the events from directly, where None represents
+          that the events are pushed onto the queues of the analysis
+          processes.
     """
     logging.info(u'Starting analysis plugins.')
 
     for analysis_plugin in analysis_plugins:
-      if self._use_zeromq:
-        queue_name = u'{0:s} output event queue'.format(analysis_plugin.NAME)
-        output_event_queue = zeromq_queue.ZeroMQPushBindQueue(
-            name=queue_name, timeout_seconds=self._QUEUE_TIMEOUT)
-        # Open the queue so it can bind to a random port, and we can get the
-        # port number to use in the input queue.
-        output_event_queue.Open()
+      if storage_file_path:
+        input_event_queue = None
 
       else:
-        output_event_queue = multi_process_queue.MultiProcessingQueue(
-            timeout=self._QUEUE_TIMEOUT)
-
-      self._event_queues[analysis_plugin.NAME] = output_event_queue
-
-      if self._use_zeromq:
-        queue_name = u'{0:s} input event queue'.format(analysis_plugin.NAME)
-        input_event_queue = zeromq_queue.ZeroMQPullConnectQueue(
-            name=queue_name, delay_open=True, port=output_event_queue.port,
-            timeout_seconds=self._QUEUE_TIMEOUT)
-
-      else:
-        input_event_queue = output_event_queue
+        input_event_queue = self._CreateEventQueues(analysis_plugin)
 
       process = analysis_process.AnalysisProcess(
           input_event_queue, storage_writer, knowledge_base_object,
           analysis_plugin, data_location=data_location,
           event_filter_expression=event_filter_expression,
+          storage_file_path=storage_file_path,
           name=analysis_plugin.plugin_name)
 
       process.start()
@@ -499,6 +565,13 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     number_of_produced_events = process_status.get(
         u'number_of_produced_events', None)
 
+    # The analysis processes read the events from the storage file
+    # themselves, hence the foreman reports the number of events consumed
+    # by the analysis process that has read the most events.
+    if self._storage_file_path and number_of_consumed_events:
+      self._number_of_consumed_events = max(
+          self._number_of_consumed_events, number_of_consumed_events)
+
     number_of_consumed_reports = process_status.get(
         u'number_of_consumed_reports', None)
     number_of_produced_reports = process_status.get(
@@ -544,10 +617,66 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     # TODO: implement.
     return
 
+  def _WaitForAnalysisTasks(self, storage_writer, analysis_plugins):
+    """Waits for the tasks of the analysis processes to be ready for merge.
+
+    Analysis plugins of which the analysis process is no longer alive before
+    its task is ready for merge are skipped.
+
+    Args:
+      storage_writer (StorageWriter): storage writer.
+      analysis_plugins (list[AnalysisPlugin]): analysis plugins that are run.
+
+    Returns:
+      list[AnalysisPlugin]: analysis plugins of which the task is ready for
+          merge.
+    """
+    processes_per_name = {
+        process.name: process for process in self._processes_per_pid.values()}
+
+    ready_analysis_plugins = []
+    pending_analysis_plugins = list(analysis_plugins)
+    try:
+      while pending_analysis_plugins and not self._abort:
+        for analysis_plugin in list(pending_analysis_plugins):
+          process = processes_per_name.get(analysis_plugin.plugin_name, None)
+
+          # Determine if the process is alive before checking the task
+          # otherwise a process that exits right after its task became
+          # ready for merge could be considered dead.
+          process_is_alive = process is not None and process.is_alive()
+
+          # TODO: temporary solution.
+          task = tasks.Task()
+          task.identifier = analysis_plugin.plugin_name
+
+          if storage_writer.CheckTaskReadyForMerge(task):
+            ready_analysis_plugins.append(analysis_plugin)
+            pending_analysis_plugins.remove(analysis_plugin)
+
+          elif not process_is_alive:
+            logging.error((
+                u'Analysis process: {0:s} is no longer alive, skipping '
+                u'analysis plugin.').format(analysis_plugin.plugin_name))
+            pending_analysis_plugins.remove(analysis_plugin)
+
+        if pending_analysis_plugins:
+          time.sleep(self._STATUS_UPDATE_INTERVAL)
+
+    except KeyboardInterrupt:
+      self._abort = True
+
+      self._processing_status.aborted = True
+      if self._status_update_callback:
+        self._status_update_callback(self._processing_status)
+
+    return ready_analysis_plugins
+
   def AnalyzeEvents(
       self, knowledge_base_object, storage_writer, data_location,
-      analysis_plugins, event_filter=None, event_filter_expression=None,
-      status_update_callback=None, worker_memory_limit=None):
+      analysis_plugins, event_batch_size=None, event_filter=None,
+      event_filter_expression=None, status_update_callback=None,
+      storage_file_path=None, worker_memory_limit=None):
     """Analyzes events in a plaso storage.
 
     Args:
@@ -558,17 +687,27 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           be loaded from.
       analysis_plugins (list[AnalysisPlugin]): analysis plugins that should
           be run.
+      event_batch_size (Optional[int]): maximum number of events that are
+          pushed onto the queues of the analysis processes as a single batch,
+          where None represents the default batch size.
       event_filter (Optional[FilterObject]): event filter.
       event_filter_expression (Optional[str]): event filter expression.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      storage_file_path (Optional[str]): path of the storage file, that
+          the analysis processes read the events from directly instead of
+          the events being pushed onto their queues, where None represents
+          that the events are pushed.
       worker_memory_limit (Optional[int]): maximum amount of memory a worker is
           allowed to consume, where None represents the default memory limit.
     """
     if not analysis_plugins:
       return
 
+    self._event_batch_size = event_batch_size or self._DEFAULT_EVENT_BATCH_SIZE
+    self._number_of_consumed_events = 0
     self._status_update_callback = status_update_callback
+    self._storage_file_path = storage_file_path
     self._worker_memory_limit = (
         worker_memory_limit or self._DEFAULT_WORKER_MEMORY_LIMIT)
 
@@ -577,13 +716,21 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     self._StartAnalysisProcesses(
         knowledge_base_object, storage_writer, analysis_plugins,
-        data_location, event_filter_expression=event_filter_expression)
+        data_location, event_filter_expression=event_filter_expression,
+        storage_file_path=storage_file_path)
 
     # Start the status update thread after open of the storage writer
     # so we don't have to clean up the thread if the open fails.
     self._StartStatusUpdateThread()
 
     try:
+      if storage_file_path:
+        # Opening the storage file for writing moves it to a temporary
+        # location, hence wait until the analysis processes, which read
+        # the events from the storage file, are done.
+        analysis_plugins = self._WaitForAnalysisTasks(
+            storage_writer, analysis_plugins)
+
       # Open the storage file after creating the worker processes otherwise
       # the ZIP storage file will remain locked as long as the worker processes
       # are alive.
@@ -593,7 +740,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
       try:
         self._AnalyzeEvents(
-            storage_writer, analysis_plugins, event_filter=event_filter)
+            storage_writer, analysis_plugins, event_filter=event_filter,
+            push_events=not storage_file_path)
 
         self._status = definitions.PROCESSING_STATUS_FINALIZING
 
@@ -625,7 +773,9 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       self._KillProcess(os.getpid())
 
     # Reset values.
+    self._event_batch_size = self._DEFAULT_EVENT_BATCH_SIZE
     self._status_update_callback = None
+    self._storage_file_path = None
     self._worker_memory_limit = self._DEFAULT_WORKER_MEMORY_LIMIT
 
   def ExportEvents(
@@ -5,8 +5,14 @@ import heapq
 import logging
 import multiprocessing
 import os
+import threading
 import time
 
+try:
+  import Queue
+except ImportError:
+  import queue as Queue  # pylint: disable=import-error
+
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.resolver import context
 
@@ -24,18 +30,88 @@ from plaso.multi_processing import worker_process
 
 
 class _EventSourceHeap(object):
-  """Class that defines an event source heap."""
+  """Class that defines an event source heap.
+
+  Directories are popped first, so that the worker processes keep producing
+  event sources, followed by files in order of decreasing weight. The weight
+  of a file is based on its data size and if the file is known to be
+  expensive to process. Starting the largest files early prevents them from
+  becoming the long tail of the processing.
+  """
 
-  def __init__(self, maximum_number_of_items=50000):
+  # Weight factors of files that are known to be expensive to process,
+  # per lower case file name.
+  _EXPENSIVE_FILE_NAMES = {
+      u'$logfile': 2,
+      u'$mft': 4,
+      u'$usnjrnl': 4}
+
+  # Weight factors of files that are known to be expensive to process,
+  # per lower case file name extension.
+  _EXPENSIVE_FILE_NAME_EXTENSIONS = {
+      u'.db': 2,
+      u'.edb': 4,
+      u'.evtx': 2,
+      u'.sqlite': 2}
+
+  def __init__(self, group_by_parent=False, maximum_number_of_items=50000):
     """Initializes an event source heap.
 
     Args:
+      group_by_parent (Optional[bool]): True if files of similar weight should
+          be grouped by the parent of their path specification, such as
+          a volume shadow snapshot or partition.
       maximum_number_of_items (Optional[int]): maximum number of items
           in the heap.
     """
     super(_EventSourceHeap, self).__init__()
+    self._group_by_parent = group_by_parent
     self._heap = []
     self._maximum_number_of_items = maximum_number_of_items
+    self._number_of_pushed_items = 0
+
+  def GetParentKey(self, event_source):
+    """Retrieves the key of the parent of an event source.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      str: comparable of the parent path specification or an empty string
+          if not available.
+    """
+    parent_path_spec = getattr(event_source.path_spec, u'parent', None)
+    if not parent_path_spec:
+      return u''
+
+    return parent_path_spec.comparable
+
+  def GetWeight(self, event_source):
+    """Determines the weight of an event source.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      int: weight of the event source, where a larger value represents
+          a higher priority.
+    """
+    weight = getattr(event_source, u'data_size', None) or 0
+
+    location = getattr(event_source.path_spec, u'location', None)
+    if weight and location:
+      _, _, file_name = location.rpartition(u'/')
+      file_name = file_name.lower()
+
+      weight_factor = self._EXPENSIVE_FILE_NAMES.get(file_name, None)
+      if not weight_factor:
+        _, _, file_name_extension = file_name.rpartition(u'.')
+        weight_factor = self._EXPENSIVE_FILE_NAME_EXTENSIONS.get(
+            u'.{0:s}'.format(file_name_extension), 1)
+
+      weight *= weight_factor
+
+    return weight
 
   def PopEventSource(self):
     """Pops an event source from the heap.
@@ -44,12 +120,12 @@ class _EventSourceHeap(object):
       EventSource: event source.
     """
     try:
-      _, event_source = heapq.heappop(self._heap)
+      heap_values = heapq.heappop(self._heap)
 
     except IndexError:
       return
 
-    return event_source
+    return heap_values[-1]
 
   def PushEventSource(self, event_source):
     """Pushes an event source onto the heap.
@@ -63,11 +139,26 @@ class _EventSourceHeap(object):
     """
     if event_source.file_entry_type == (
         dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY):
-      weight = 1
+      heap_values = (0, 0, u'', 0, self._number_of_pushed_items, event_source)
+
     else:
-      weight = 100
+      weight = self.GetWeight(event_source)
+
+      # Files are grouped by parent within a weight class, which is based
+      # on the number of bits of the weight, to keep the largest files first.
+      weight_class = weight.bit_length()
+
+      if self._group_by_parent:
+        parent_key = self.GetParentKey(event_source)
+      else:
+        parent_key = u''
+
+      # Note that the heap values are negated since heapq is a min-heap.
+      heap_values = (
+          1, -weight_class, parent_key, -weight, self._number_of_pushed_items,
+          event_source)
 
-    heap_values = (weight, event_source)
+    self._number_of_pushed_items += 1
     heapq.heappush(self._heap, heap_values)
 
     if len(self._heap) >= self._maximum_number_of_items:
@@ -85,9 +176,31 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
   # Maximum number of attribute containers to merge per loop.
   _MAXIMUM_NUMBER_OF_CONTAINERS = 50
 
+  # Maximum number of task storage files per merge process that are
+  # handed to the merge processes at the same time.
+  _MAXIMUM_NUMBER_OF_PRE_MERGES_PER_PROCESS = 4
+
+  # Total size of the task storage files that are collected before they are
+  # pre-merged together, which corresponds with the maximum size of the task
+  # storage files that the storage writer pre-merges together (8 MiB).
+  _PRE_MERGE_TASK_STORAGE_SIZE = 8 * 1024 * 1024
+
+  # Maximum number of collected path specifications that are queued before
+  # the collector thread waits for the task scheduler to catch up.
+  _MAXIMUM_NUMBER_OF_COLLECTED_PATH_SPECS = 10000
+
+  # Maximum number of collected path specifications to add as event source
+  # per loop.
+  _MAXIMUM_NUMBER_OF_EVENT_SOURCES = 1000
+
+  _COLLECTOR_QUEUE_TIMEOUT_SECONDS = 0.5
+
   # Maximum number of concurrent tasks.
   _MAXIMUM_NUMBER_OF_TASKS = 10000
 
+  # Maximum total data size of the files in a batched task.
+  _MAXIMUM_TASK_BATCH_DATA_SIZE = 4 * 1024 * 1024
+
   _PROCESS_JOIN_TIMEOUT = 5.0
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
@@ -109,8 +222,15 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           instead of Python's multiprocessing queue.
     """
     super(TaskMultiProcessEngine, self).__init__()
+    self._collection_status = None
+    self._collector_active = False
+    self._collector_queue = None
+    self._collector_thread = None
     self._enable_sigsegv_handler = False
     self._filter_find_specs = None
+    self._group_tasks_by_parent = False
+    self._last_merge_status_time = None
+    self._last_number_of_merged_events = 0
     self._last_worker_number = 0
     self._maximum_number_of_tasks = maximum_number_of_tasks
     self._memory_profiler = None
@@ -126,6 +246,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_produced_events = 0
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
+    self._number_of_collected_path_specs = 0
+    self._number_of_merge_processes = 0
+    self._number_of_merged_tasks = 0
     self._number_of_worker_processes = 0
     self._path_spec_extractor = extractors.PathSpecExtractor()
     self._processing_configuration = None
@@ -136,17 +259,112 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._status = definitions.PROCESSING_STATUS_IDLE
     self._storage_merge_reader = None
     self._storage_merge_reader_on_hold = None
+    self._storage_merge_readers = []
+    self._task_batch_data_size = self._MAXIMUM_TASK_BATCH_DATA_SIZE
+    self._task_batch_size = 1
     self._task_queue = None
     self._task_queue_port = None
     self._task_manager = task_manager.TaskManager()
+    self._tasks_pending_pre_merge = []
+    self._tasks_pending_pre_merge_size = 0
     self._use_zeromq = use_zeromq
 
-  def _MergeTaskStorage(self, storage_writer):
-    """Merges a task storage with the session storage.
+  def _AddCollectedEventSources(self, storage_writer, block=False):
+    """Adds the collected path specifications as event sources.
 
-    This function checks all task storages that are ready to merge and updates
-    the scheduled tasks. Note that to prevent this function holding up
-    the task scheduling loop only the first available task storage is merged.
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage.
+      block (Optional[bool]): True if the function should wait for a path
+          specification to be collected if none is available.
+    """
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming(u'add_event_sources')
+
+    for _ in range(self._MAXIMUM_NUMBER_OF_EVENT_SOURCES):
+      try:
+        path_spec = self._collector_queue.get(
+            block=block, timeout=self._COLLECTOR_QUEUE_TIMEOUT_SECONDS)
+      except Queue.Empty:
+        break
+
+      block = False
+
+      # TODO: determine if event sources should be DataStream or FileEntry
+      # or both.
+      event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+      storage_writer.AddEventSource(event_source)
+
+    self._number_of_produced_sources = storage_writer.number_of_event_sources
+
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming(u'add_event_sources')
+
+  def _CollectorThreadMain(self, source_path_specs, filter_find_specs=None):
+    """Main function of the path specification collector thread.
+
+    The collector thread extracts the path specifications from the sources
+    while the task scheduler adds them as event sources and schedules tasks,
+    so that the worker processes do not have to wait for the collection to
+    complete.
+
+    Args:
+      source_path_specs (list[dfvfs.PathSpec]): path specifications of
+          the sources to process.
+      filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
+          used in path specification extraction.
+    """
+    logging.debug(u'Collector started')
+
+    collection_status = definitions.PROCESSING_STATUS_COMPLETED
+
+    try:
+      path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
+          source_path_specs, find_specs=filter_find_specs,
+          recurse_file_system=False, resolver_context=self._resolver_context)
+
+      for path_spec in path_spec_generator:
+        while self._collector_active and not self._abort:
+          try:
+            self._collector_queue.put(
+                path_spec, timeout=self._COLLECTOR_QUEUE_TIMEOUT_SECONDS)
+            break
+          except Queue.Full:
+            pass
+
+        if not self._collector_active or self._abort:
+          collection_status = definitions.PROCESSING_STATUS_ABORTED
+          break
+
+        self._number_of_collected_path_specs += 1
+
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.error(
+          u'Unable to collect path specifications with error: {0!s}'.format(
+              exception))
+      collection_status = definitions.PROCESSING_STATUS_ERROR
+
+    # Note that the collection status is set after the last path
+    # specification was queued.
+    self._collection_status = collection_status
+
+    logging.debug(u'Collector stopped')
+
+  def _IsCollecting(self):
+    """Determines if path specifications are still being collected.
+
+    Returns:
+      bool: True if the collector thread is collecting path specifications
+          or collected path specifications are queued.
+    """
+    return bool(
+        self._collection_status == definitions.PROCESSING_STATUS_COLLECTING or
+        not self._collector_queue.empty())
+
+  def _CheckTasksReadyForMerge(self, storage_writer):
+    """Checks all task storages that are ready to merge.
+
+    Tasks of which the task storage is ready to merge are updated as pending
+    merge.
 
     Args:
       storage_writer (StorageWriter): storage writer for a session storage used
@@ -166,6 +384,162 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._processing_profiler:
       self._processing_profiler.StopTiming(u'merge_check')
 
+  def _CreateTask(self, event_source, event_source_heap):
+    """Creates a task for an event source.
+
+    When task batching is enabled, event sources of files that are smaller
+    than the batch data size are grouped into a single task, which saves
+    the per task overhead of scheduling, task storage and merging.
+
+    Args:
+      event_source (EventSource): event source.
+      event_source_heap (_EventSourceHeap): event source heap.
+
+    Returns:
+      tuple: contains:
+
+        Task: task.
+        EventSource: event source that was popped from the heap but is not
+            part of the task or None.
+    """
+    task = self._task_manager.CreateTask(self._session_identifier)
+    task.data_size = event_source.data_size
+    task.file_entry_type = event_source.file_entry_type
+    task.path_spec = event_source.path_spec
+
+    self._number_of_consumed_sources += 1
+
+    if not self._IsBatchableEventSource(event_source):
+      return task, None
+
+    parent_key = None
+    if self._group_tasks_by_parent:
+      parent_key = event_source_heap.GetParentKey(event_source)
+
+    path_specs = [event_source.path_spec]
+    task_data_size = event_source.data_size
+
+    next_event_source = None
+    while len(path_specs) < self._task_batch_size:
+      next_event_source = event_source_heap.PopEventSource()
+      if not next_event_source:
+        break
+
+      if not self._IsBatchableEventSource(next_event_source):
+        break
+
+      next_task_data_size = task_data_size + next_event_source.data_size
+      if next_task_data_size > self._task_batch_data_size:
+        break
+
+      if (self._group_tasks_by_parent and
+          event_source_heap.GetParentKey(next_event_source) != parent_key):
+        break
+
+      path_specs.append(next_event_source.path_spec)
+      task_data_size = next_task_data_size
+      next_event_source = None
+
+      self._number_of_consumed_sources += 1
+
+    if len(path_specs) > 1:
+      task.data_size = task_data_size
+      task.path_specs = path_specs
+
+    return task, next_event_source
+
+  def _GetMergeBacklog(self):
+    """Retrieves the number of task storages waiting for or being merged.
+
+    Returns:
+      int: number of task storages that are waiting to be merged or are being
+          merged with the session storage.
+    """
+    merge_backlog = self._task_manager.GetNumberOfTasksPendingMerge()
+    merge_backlog += len(self._tasks_pending_pre_merge)
+
+    for tasks, _ in self._storage_merge_readers:
+      merge_backlog += len(tasks)
+
+    if self._storage_merge_reader:
+      merge_backlog += 1
+    if self._storage_merge_reader_on_hold:
+      merge_backlog += 1
+
+    return merge_backlog
+
+  def _GetTasksToPreMerge(self):
+    """Retrieves the tasks of which the task storages are pre-merged together.
+
+    Tasks pending merge are collected until the total size of their task
+    storage files reaches the pre-merge task storage size, or until no more
+    tasks are being processed, so that small task storages are not pre-merged
+    into separate event streams.
+
+    Returns:
+      list[Task]: tasks to pre-merge together or None if no tasks are ready
+          to be pre-merged.
+    """
+    while (self._tasks_pending_pre_merge_size <
+           self._PRE_MERGE_TASK_STORAGE_SIZE):
+      task = self._task_manager.GetTaskPendingMerge(None)
+      if not task:
+        break
+
+      self._tasks_pending_pre_merge.append(task)
+      self._tasks_pending_pre_merge_size += task.storage_file_size or 0
+
+    if not self._tasks_pending_pre_merge:
+      return
+
+    if (self._tasks_pending_pre_merge_size <
+        self._PRE_MERGE_TASK_STORAGE_SIZE and
+        self._task_manager.GetProcessingTasks()):
+      return
+
+    tasks = self._tasks_pending_pre_merge
+
+    self._tasks_pending_pre_merge = []
+    self._tasks_pending_pre_merge_size = 0
+
+    return tasks
+
+  def _IsBatchableEventSource(self, event_source):
+    """Determines if an event source can be part of a batched task.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      bool: True if the event source is a file that is smaller than the batch
+          data size.
+    """
+    if self._task_batch_size <= 1:
+      return False
+
+    if event_source.file_entry_type != dfvfs_definitions.FILE_ENTRY_TYPE_FILE:
+      return False
+
+    data_size = getattr(event_source, u'data_size', None)
+    return data_size is not None and data_size < self._task_batch_data_size
+
+  def _MergeTaskStorage(self, storage_writer):
+    """Merges a task storage with the session storage.
+
+    This function checks all task storages that are ready to merge and updates
+    the scheduled tasks. Note that to prevent this function holding up
+    the task scheduling loop only the first available task storage is merged.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage used
+          to merge task storage.
+    """
+    if self._number_of_merge_processes:
+      self._MergeTaskStorageInParallel(storage_writer)
+      return
+
+    self._CheckTasksReadyForMerge(storage_writer)
+
     task = None
     if not self._storage_merge_reader_on_hold:
       task = self._task_manager.GetTaskPendingMerge(self._merge_task)
@@ -208,6 +582,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
       if fully_merged:
         self._task_manager.CompleteTask(self._merge_task)
+        self._number_of_merged_tasks += 1
 
         if self._storage_merge_reader_on_hold:
           self._merge_task = self._merge_task_on_hold
@@ -224,6 +599,92 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self._number_of_produced_events = storage_writer.number_of_events
       self._number_of_produced_sources = storage_writer.number_of_event_sources
 
+  def _MergeTaskStorageInParallel(self, storage_writer):
+    """Merges task storages pre-merged by the merge processes.
+
+    The task storages that are ready to merge are handed to the merge
+    processes, which pre-sort and pre-serialize the events into event streams.
+    Small task storages are handed to the merge processes together, so that
+    their events are pre-merged into a single event stream. The finished event
+    streams are added to the session storage in the order in which the task
+    storages were handed to the merge processes. Note that
+    to prevent this function holding up the task scheduling loop the number
+    of other attribute containers merged per task storage is limited.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage used
+          to merge task storage.
+    """
+    self._CheckTasksReadyForMerge(storage_writer)
+
+    maximum_number_of_pre_merges = (
+        self._number_of_merge_processes *
+        self._MAXIMUM_NUMBER_OF_PRE_MERGES_PER_PROCESS)
+
+    while len(self._storage_merge_readers) < maximum_number_of_pre_merges:
+      if self._abort:
+        break
+
+      tasks = self._GetTasksToPreMerge()
+      if not tasks:
+        break
+
+      try:
+        storage_merge_readers = storage_writer.StartMergeTaskStorages(tasks)
+      except IOError:
+        # The task storages are merged individually instead, so that only
+        # the results of the tasks that cannot be merged are lost.
+        storage_merge_readers = []
+        for task in tasks:
+          try:
+            storage_merge_reader = storage_writer.StartMergeTaskStorage(task)
+          except IOError as exception:
+            logging.error(
+                (u'Unable to merge results of task: {0:s} '
+                 u'with error: {1:s}').format(
+                     task.identifier, exception))
+            # TODO: Do something more sensible when this happens, perhaps
+            # retrying the task once that is implemented. For now, we mark
+            # the task as fully merged because we can't continue with it.
+            self._task_manager.CompleteTask(task)
+            continue
+
+          storage_merge_readers.append(([task], storage_merge_reader))
+
+      self._storage_merge_readers.extend(storage_merge_readers)
+
+    if not self._storage_merge_readers:
+      return
+
+    self._status = definitions.PROCESSING_STATUS_MERGING
+
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming(u'merge')
+
+    storage_merge_readers = []
+    for tasks, storage_merge_reader in self._storage_merge_readers:
+      fully_merged = False
+      if not self._abort:
+        fully_merged = storage_merge_reader.MergeAttributeContainers(
+            maximum_number_of_containers=self._MAXIMUM_NUMBER_OF_CONTAINERS)
+
+      if fully_merged:
+        for task in tasks:
+          self._task_manager.CompleteTask(task)
+        self._number_of_merged_tasks += len(tasks)
+      else:
+        storage_merge_readers.append((tasks, storage_merge_reader))
+
+    self._storage_merge_readers = storage_merge_readers
+
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming(u'merge')
+
+    self._status = definitions.PROCESSING_STATUS_RUNNING
+    self._number_of_produced_errors = storage_writer.number_of_errors
+    self._number_of_produced_events = storage_writer.number_of_events
+    self._number_of_produced_sources = storage_writer.number_of_event_sources
+
   def _ProcessSources(
       self, source_path_specs, storage_writer, filter_find_specs=None):
     """Processes the sources.
@@ -239,7 +700,6 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._processing_profiler:
       self._processing_profiler.StartTiming(u'process_sources')
 
-    self._status = definitions.PROCESSING_STATUS_COLLECTING
     self._number_of_consumed_errors = 0
     self._number_of_consumed_event_tags = 0
     self._number_of_consumed_events = 0
@@ -251,22 +711,19 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
 
-    path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
-        source_path_specs, find_specs=filter_find_specs,
-        recurse_file_system=False, resolver_context=self._resolver_context)
+    self._number_of_merged_tasks = 0
+    self._storage_merge_readers = []
+    self._tasks_pending_pre_merge = []
+    self._tasks_pending_pre_merge_size = 0
 
-    for path_spec in path_spec_generator:
-      if self._abort:
-        break
+    self._StartCollectorThread(
+        source_path_specs, filter_find_specs=filter_find_specs)
 
-      # TODO: determine if event sources should be DataStream or FileEntry
-      # or both.
-      event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
-      storage_writer.AddEventSource(event_source)
-
-      self._number_of_produced_sources = storage_writer.number_of_event_sources
+    try:
+      self._ScheduleTasks(storage_writer)
 
-    self._ScheduleTasks(storage_writer)
+    finally:
+      self._StopCollectorThread()
 
     if self._abort:
       self._status = definitions.PROCESSING_STATUS_ABORTED
@@ -368,28 +825,33 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     task = None
 
-    event_source_heap = _EventSourceHeap()
+    event_source_heap = _EventSourceHeap(
+        group_by_parent=self._group_tasks_by_parent)
+
+    self._AddCollectedEventSources(storage_writer, block=True)
 
     self._FillEventSourceHeap(
         storage_writer, event_source_heap, start_with_first=True)
 
     event_source = event_source_heap.PopEventSource()
 
-    while event_source or self._task_manager.HasActiveTasks():
+    while (event_source or self._task_manager.HasActiveTasks() or
+           self._IsCollecting()):
       if self._abort:
         break
 
       try:
         if event_source and not task:
-          task = self._task_manager.CreateTask(self._session_identifier)
-          task.file_entry_type = event_source.file_entry_type
-          task.path_spec = event_source.path_spec
-          logging.debug(
-              u'Scheduled task {0:s} for path specification {1:s}'.format(
-                  task.identifier, task.path_spec.comparable))
-          event_source = None
-
-          self._number_of_consumed_sources += 1
+          task, event_source = self._CreateTask(
+              event_source, event_source_heap)
+          if task.path_specs:
+            logging.debug(
+                u'Scheduled task {0:s} for {1:d} path specifications'.format(
+                    task.identifier, len(task.path_specs)))
+          else:
+            logging.debug(
+                u'Scheduled task {0:s} for path specification {1:s}'.format(
+                    task.identifier, task.path_spec.comparable))
 
           if self._memory_profiler:
             self._memory_profiler.Sample()
@@ -400,6 +862,14 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
         self._MergeTaskStorage(storage_writer)
 
+        # Only wait for newly collected path specifications when there is
+        # nothing else to do.
+        wait_for_collection = bool(
+            not event_source and not task and
+            not self._task_manager.HasActiveTasks())
+        self._AddCollectedEventSources(
+            storage_writer, block=wait_for_collection)
+
         self._FillEventSourceHeap(storage_writer, event_source_heap)
 
         if not event_source and not task:
@@ -413,7 +883,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           self._status_update_callback(self._processing_status)
 
     for task in self._task_manager.GetAbandonedTasks():
-      self._processing_status.error_path_specs.append(task.path_spec)
+      self._processing_status.error_path_specs.extend(task.GetPathSpecs())
 
     self._status = definitions.PROCESSING_STATUS_IDLE
 
@@ -455,6 +925,30 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     return process
 
+  def _StartCollectorThread(self, source_path_specs, filter_find_specs=None):
+    """Starts the path specification collector thread.
+
+    Args:
+      source_path_specs (list[dfvfs.PathSpec]): path specifications of
+          the sources to process.
+      filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
+          used in path specification extraction.
+    """
+    self._collection_status = definitions.PROCESSING_STATUS_COLLECTING
+    self._collector_active = True
+    self._collector_queue = Queue.Queue(
+        maxsize=self._MAXIMUM_NUMBER_OF_COLLECTED_PATH_SPECS)
+    self._number_of_collected_path_specs = 0
+
+    self._collector_thread = threading.Thread(
+        name=u'Collector', target=self._CollectorThreadMain,
+        args=(source_path_specs, ),
+        kwargs={u'filter_find_specs': filter_find_specs})
+    # The collector thread should not prevent the process from exiting
+    # on abort, since it can be blocked reading the source.
+    self._collector_thread.daemon = True
+    self._collector_thread.start()
+
   def _StartProfiling(self):
     """Starts profiling."""
     if not self._processing_configuration:
@@ -499,11 +993,32 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           self._number_of_consumed_errors, self._number_of_produced_errors,
           self._number_of_consumed_reports, self._number_of_produced_reports)
 
+      if self._collection_status:
+        self._processing_status.UpdateCollectionStatus(
+            self._collection_status, self._number_of_collected_path_specs)
+
+      self._UpdateMergeStatus()
+
       if self._status_update_callback:
         self._status_update_callback(self._processing_status)
 
       time.sleep(self._STATUS_UPDATE_INTERVAL)
 
+  def _StopCollectorThread(self):
+    """Stops the path specification collector thread."""
+    self._collector_active = False
+    if self._collector_thread.isAlive():
+      self._collector_thread.join(timeout=self._PROCESS_JOIN_TIMEOUT)
+    self._collector_thread = None
+
+    # Update the collection status in case the collector thread did not
+    # stop in time.
+    if self._collection_status == definitions.PROCESSING_STATUS_COLLECTING:
+      self._collection_status = definitions.PROCESSING_STATUS_ABORTED
+
+    self._processing_status.UpdateCollectionStatus(
+        self._collection_status, self._number_of_collected_path_specs)
+
   def _StopExtractionProcesses(self, abort=False):
     """Stops the extraction processes.
 
@@ -560,6 +1075,30 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self._serializers_profiler.Write()
       self._serializers_profiler = None
 
+  def _UpdateMergeStatus(self):
+    """Updates the merge status.
+
+    The merge throughput is determined over the interval since the previous
+    merge status update.
+    """
+    current_time = time.time()
+    number_of_merged_events = self._number_of_produced_events
+
+    merge_throughput = 0.0
+    if self._last_merge_status_time:
+      elapsed_time = current_time - self._last_merge_status_time
+      if elapsed_time > 0.0:
+        merge_throughput = float(
+            number_of_merged_events - self._last_number_of_merged_events)
+        merge_throughput /= elapsed_time
+
+    self._last_merge_status_time = current_time
+    self._last_number_of_merged_events = number_of_merged_events
+
+    self._processing_status.UpdateMergeStatus(
+        self._GetMergeBacklog(), self._number_of_merged_tasks,
+        merge_throughput)
+
   def _UpdateProcessingStatus(self, pid, process_status, used_memory):
     """Updates the processing status.
 
@@ -657,8 +1196,10 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
   def ProcessSources(
       self, session_identifier, source_path_specs, storage_writer,
       processing_configuration, enable_sigsegv_handler=False,
-      filter_find_specs=None, number_of_worker_processes=0,
-      status_update_callback=None, worker_memory_limit=None):
+      filter_find_specs=None, group_tasks_by_parent=False,
+      number_of_merge_processes=0, number_of_worker_processes=0,
+      status_update_callback=None, task_batch_data_size=None,
+      task_batch_size=1, worker_memory_limit=None):
     """Processes the sources and extract event objects.
 
     Args:
@@ -672,9 +1213,20 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           should be enabled.
       filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
           used in path specification extraction.
+      group_tasks_by_parent (Optional[bool]): True if tasks of files that are
+          stored on the same parent, such as a volume shadow snapshot or
+          partition, should be scheduled consecutively.
+      number_of_merge_processes (Optional[int]): number of processes that
+          pre-merge task storage files, where 0 represents that the task
+          storage files are only merged by the main process.
       number_of_worker_processes (Optional[int]): number of worker processes.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      task_batch_data_size (Optional[int]): maximum total data size of
+          the files in a batched task, where None represents the default
+          batch data size.
+      task_batch_size (Optional[int]): maximum number of files in a batched
+          task, where 1 represents that files are not batched.
       worker_memory_limit (Optional[int]): maximum amount of memory a worker is
           allowed to consume, where None represents the default memory limit.
 
@@ -707,7 +1259,12 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       number_of_worker_processes = cpu_count
 
     self._enable_sigsegv_handler = enable_sigsegv_handler
+    self._group_tasks_by_parent = group_tasks_by_parent
+    self._number_of_merge_processes = number_of_merge_processes
     self._number_of_worker_processes = number_of_worker_processes
+    self._task_batch_data_size = (
+        task_batch_data_size or self._MAXIMUM_TASK_BATCH_DATA_SIZE)
+    self._task_batch_size = task_batch_size
     self._worker_memory_limit = (
         worker_memory_limit or self._DEFAULT_WORKER_MEMORY_LIMIT)
 
@@ -742,8 +1299,10 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._serializers_profiler:
       storage_writer.SetSerializersProfiler(self._serializers_profiler)
 
-    # Set up the storage writer before the worker processes.
-    storage_writer.StartTaskStorage()
+    # Set up the storage writer before the worker processes. Note that this
+    # also starts the merge processes, if any.
+    storage_writer.StartTaskStorage(
+        number_of_merge_processes=number_of_merge_processes)
 
     for _ in range(number_of_worker_processes):
       extraction_process = self._StartWorkerProcess(storage_writer)
@@ -814,7 +1373,12 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     # Reset values.
     self._enable_sigsegv_handler = None
+    self._group_tasks_by_parent = False
+    self._last_merge_status_time = None
+    self._number_of_merge_processes = 0
     self._number_of_worker_processes = None
+    self._task_batch_data_size = self._MAXIMUM_TASK_BATCH_DATA_SIZE
+    self._task_batch_size = 1
     self._worker_memory_limit = self._DEFAULT_WORKER_MEMORY_LIMIT
 
     self._processing_configuration = None
@@ -20,6 +20,11 @@ class _PendingMergeTaskHeap(object):
     super(_PendingMergeTaskHeap, self).__init__()
     self._heap = []
 
+  @property
+  def number_of_tasks(self):
+    """int: number of tasks on the heap."""
+    return len(self._heap)
+
   def PeekTask(self):
     """Retrieves the first task from the heap without removing it.
 
@@ -189,6 +194,15 @@ class TaskManager(object):
       processing_tasks = list(self._tasks_processing.values())
     return processing_tasks
 
+  def GetNumberOfTasksPendingMerge(self):
+    """Retrieves the number of tasks that are pending merge.
+
+    Returns:
+      int: number of tasks that are pending merge.
+    """
+    with self._lock:
+      return self._tasks_pending_merge.number_of_tasks
+
   def GetTaskPendingMerge(self, current_task):
     """Retrieves the first task that is pending merge or has a higher priority.
 
@@ -2,6 +2,7 @@
 """The multi-process worker process."""
 
 import logging
+import time
 
 from dfvfs.lib import errors as dfvfs_errors
 from dfvfs.resolver import context
@@ -55,6 +56,7 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     self._status = definitions.PROCESSING_STATUS_INITIALIZED
     self._storage_writer = storage_writer
     self._task = None
+    self._tasks_profiler = None
     self._task_queue = task_queue
 
   def _GetStatus(self):
@@ -175,6 +177,8 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
 
       self._abort = True
 
+    self._extraction_worker.CloseEventCache()
+
     self._StopProfiling()
     self._extraction_worker = None
     self._parser_mediator = None
@@ -244,14 +248,23 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
 
     storage_writer.WriteTaskStart()
 
+    start_time = time.time()
+
     try:
       # TODO: add support for more task types.
-      self._ProcessPathSpec(
-          self._extraction_worker, self._parser_mediator, task.path_spec)
-      self._number_of_consumed_sources += 1
+      # Note that a batched task contains multiple path specifications that
+      # are processed in order. Extraction errors are attributed to the path
+      # specification being processed.
+      for path_spec in task.GetPathSpecs():
+        if self._abort:
+          break
+
+        self._ProcessPathSpec(
+            self._extraction_worker, self._parser_mediator, path_spec)
+        self._number_of_consumed_sources += 1
 
-      if self._memory_profiler:
-        self._memory_profiler.Sample()
+        if self._memory_profiler:
+          self._memory_profiler.Sample()
 
     finally:
       storage_writer.WriteTaskCompletion(aborted=self._abort)
@@ -260,6 +273,9 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
 
       storage_writer.Close()
 
+    if self._tasks_profiler:
+      self._tasks_profiler.Sample(task, time.time() - start_time)
+
     try:
       self._storage_writer.PrepareMergeTaskStorage(task)
     except IOError:
@@ -292,6 +308,10 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
           identifier, path=self._processing_configuration.profiling.directory)
       self._extraction_worker.SetProcessingProfiler(self._processing_profiler)
 
+      identifier = u'{0:s}-tasks'.format(self._name)
+      self._tasks_profiler = profiler.TasksProfiler(
+          identifier, path=self._processing_configuration.profiling.directory)
+
     if self._processing_configuration.profiling.HaveProfileSerializers():
       identifier = u'{0:s}-serializers'.format(self._name)
       self._serializers_profiler = profiler.SerializersProfiler(
@@ -317,6 +337,10 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
       self._serializers_profiler.Write()
       self._serializers_profiler = None
 
+    if self._tasks_profiler:
+      self._tasks_profiler.Write()
+      self._tasks_profiler = None
+
   def SignalAbort(self):
     """Signals the process to abort."""
     self._abort = True
@@ -5,7 +5,6 @@ import logging
 
 from plaso.lib import errors
 from plaso.lib import py2to3
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -56,10 +55,9 @@ class DynamicFieldsHelper(object):
     Returns:
       str: date field.
     """
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event.timestamp, self._output_mediator.timezone,
-          raise_error=True)
+      date_use = formatted_event.GetDateTime(raise_error=True)
     except OverflowError as exception:
       self._ReportEventError(event, (
           u'unable to copy timestamp: {0:d} to a human readable date '
@@ -80,11 +78,9 @@ class DynamicFieldsHelper(object):
     Returns:
       str: date and time field.
     """
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
     try:
-      return timelib.Timestamp.CopyToIsoFormat(
-          event.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
-
+      date_use = formatted_event.GetDateTime(raise_error=True)
     except OverflowError as exception:
       self._ReportEventError(event, (
           u'unable to copy timestamp: {0:d} to a human readable date and time '
@@ -93,6 +89,8 @@ class DynamicFieldsHelper(object):
 
       return u'0000-00-00T00:00:00'
 
+    return date_use.isoformat()
+
   def _FormatHostname(self, event):
     """Formats the hostname.
 
@@ -132,7 +130,8 @@ class DynamicFieldsHelper(object):
     Returns:
       str: MACB field.
     """
-    return self._output_mediator.GetMACBRepresentation(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+    return formatted_event.GetMACBRepresentation()
 
   def _FormatMessage(self, event):
     """Formats the message.
@@ -147,7 +146,8 @@ class DynamicFieldsHelper(object):
       NoFormatterFound: If no event formatter can be found to match the data
                         type in the event.
     """
-    message, _ = self._output_mediator.GetFormattedMessages(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+    message, _ = formatted_event.GetMessages()
     if message is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
@@ -168,7 +168,8 @@ class DynamicFieldsHelper(object):
       NoFormatterFound: If no event formatter can be found to match the data
                         type in the event.
     """
-    _, message_short = self._output_mediator.GetFormattedMessages(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+    _, message_short = formatted_event.GetMessages()
     if message_short is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
@@ -189,7 +190,8 @@ class DynamicFieldsHelper(object):
       NoFormatterFound: If no event formatter can be found to match the data
                         type in the event.
     """
-    _, source = self._output_mediator.GetFormattedSources(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+    _, source = formatted_event.GetSources()
     if source is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
@@ -210,7 +212,8 @@ class DynamicFieldsHelper(object):
       NoFormatterFound: If no event formatter can be found to match the data
                         type in the event.
     """
-    source_short, _ = self._output_mediator.GetFormattedSources(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+    source_short, _ = formatted_event.GetSources()
     if source_short is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
@@ -243,10 +246,9 @@ class DynamicFieldsHelper(object):
     Returns:
       str: time field.
     """
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event.timestamp, self._output_mediator.timezone,
-          raise_error=True)
+      date_use = formatted_event.GetDateTime(raise_error=True)
     except OverflowError as exception:
       self._ReportEventError(event, (
           u'unable to copy timestamp: {0:d} to a human readable time '
@@ -129,7 +129,9 @@ class ElasticSearchHelper(object):
         attribute_value, timezone=self._output_mediator.timezone)
     event_values[u'datetime'] = attribute_value
 
-    message, _ = self._output_mediator.GetFormattedMessages(event_object)
+    formatted_event = self._output_mediator.GetFormattedEvent(event_object)
+
+    message, _ = formatted_event.GetMessages()
     if message is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
@@ -143,8 +145,7 @@ class ElasticSearchHelper(object):
       labels = []
     event_values[u'tag'] = labels
 
-    source_short, source = self._output_mediator.GetFormattedSources(
-        event_object)
+    source_short, source = formatted_event.GetSources()
     if source is None or source_short is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
@@ -71,6 +71,9 @@ class EventBuffer(object):
 
   _JOIN_ATTRIBUTES = frozenset([u'display_name', u'filename', u'inode'])
 
+  # The maximum number of events that are written as a block.
+  _MAXIMUM_NUMBER_OF_BLOCK_EVENTS = 1024
+
   # Attributes that should not be used in calculating the event key.
   # TODO: remove uuid when test files have been updated.
   _EXCLUDED_ATTRIBUTES = frozenset([
@@ -95,6 +98,7 @@ class EventBuffer(object):
       check_dedups (Optional[bool]): True if the event buffer should check and
           merge duplicate events.
     """
+    self._block_events = []
     self._current_timestamp = 0
     self._events_per_key = {}
     self._output_module = output_module
@@ -112,6 +116,26 @@ class EventBuffer(object):
     """Make usable with "with" statement."""
     self.End()
 
+  def _AppendBlockEvents(self):
+    """Appends the buffered events to the block of events to write.
+
+    The events are sorted and the block is written when it is full.
+    """
+    if self._events_per_key:
+      # The heap is used to make sure the events are sorted in
+      # a deterministic way.
+      events_heap = _EventsHeap()
+      events_heap.PushEvents(self._events_per_key.values())
+      self._events_per_key = {}
+
+      event = events_heap.PopEvent()
+      while event:
+        self._block_events.append(event)
+        event = events_heap.PopEvent()
+
+    if len(self._block_events) >= self._MAXIMUM_NUMBER_OF_BLOCK_EVENTS:
+      self._WriteBlockEvents()
+
   def _GetEventIdentifier(self, event):
     """Determines an unique identifier of an event from its attributes.
 
@@ -152,6 +176,24 @@ class EventBuffer(object):
         event.timestamp, event.data_type, event_identifier_string)
     return event_identifier_string
 
+  def _WriteBlockEvents(self):
+    """Writes the block of events using the output module."""
+    if not self._block_events:
+      return
+
+    block_events = self._block_events
+    self._block_events = []
+
+    self._output_module.PrepareEvents(block_events)
+
+    for event in block_events:
+      try:
+        self._output_module.WriteEvent(event)
+      except errors.WrongFormatter as exception:
+        # TODO: store errors and report them at the end of psort.
+        logging.error(
+            u'Unable to write event with error: {0:s}'.format(exception))
+
   def Append(self, event):
     """Appends an event.
 
@@ -159,12 +201,14 @@ class EventBuffer(object):
       event (EventObject): event.
     """
     if not self.check_dedups:
-      self._output_module.WriteEvent(event)
+      self._block_events.append(event)
+      if len(self._block_events) >= self._MAXIMUM_NUMBER_OF_BLOCK_EVENTS:
+        self._WriteBlockEvents()
       return
 
     if event.timestamp != self._current_timestamp:
       self._current_timestamp = event.timestamp
-      self.Flush()
+      self._AppendBlockEvents()
 
     lookup_key = self._GetEventIdentifier(event)
     if lookup_key in self._events_per_key:
@@ -190,25 +234,8 @@ class EventBuffer(object):
 
     Buffered events are written using the output module.
     """
-    if not self._events_per_key:
-      return
-
-    # The heap is used to make sure the events are sorted in
-    # a deterministic way.
-    events_heap = _EventsHeap()
-    events_heap.PushEvents(self._events_per_key.values())
-    self._events_per_key = {}
-
-    event = events_heap.PopEvent()
-    while event:
-      try:
-        self._output_module.WriteEvent(event)
-      except errors.WrongFormatter as exception:
-        # TODO: store errors and report them at the end of psort.
-        logging.error(
-            u'Unable to write event with error: {0:s}'.format(exception))
-
-      event = events_heap.PopEvent()
+    self._AppendBlockEvents()
+    self._WriteBlockEvents()
 
   def JoinEvents(self, first_event, second_event):
     """Joins the attributes of two events.
@@ -59,6 +59,17 @@ class OutputModule(object):
     """Opens the output."""
     pass
 
+  def PrepareEvents(self, events):
+    """Prepares a block of events to be written.
+
+    Preparing a block of events allows values, such as the date and time,
+    to be determined for all events in the block at once.
+
+    Args:
+      events (list[EventObject]): events.
+    """
+    self._output_mediator.PrepareFormattedEvents(events)
+
   def WriteEvent(self, event):
     """Writes the event object to the output.
 
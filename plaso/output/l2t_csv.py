@@ -8,7 +8,6 @@ http://forensicswiki.org/wiki/L2T_CSV
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.lib import py2to3
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -74,20 +73,21 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
     if not hasattr(event, u'timestamp'):
       return
 
-    message, message_short = self._output_mediator.GetFormattedMessages(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+
+    message, message_short = formatted_event.GetMessages()
     if message is None or message_short is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
               getattr(event, u'data_type', u'UNKNOWN')))
 
-    source_short, source = self._output_mediator.GetFormattedSources(event)
+    source_short, source = formatted_event.GetSources()
     if source is None or source_short is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(
               getattr(event, u'data_type', u'UNKNOWN')))
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event.timestamp, self._output_mediator.timezone)
+    date_use = formatted_event.GetDateTime()
 
     format_variables = self._output_mediator.GetFormatStringAttributeNames(
         event)
@@ -143,7 +143,7 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
         date_string,
         time_string,
         u'{0!s}'.format(self._output_mediator.timezone),
-        self._output_mediator.GetMACBRepresentation(event),
+        formatted_event.GetMACBRepresentation(),
         source_short,
         source,
         getattr(event, u'timestamp_desc', u'-'),
@@ -3,10 +3,111 @@
 
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import eventdata
+from plaso.lib import timelib
 
 import pytz  # pylint: disable=wrong-import-order
 
 
+class FormattedEvent(object):
+  """Class that implements a formatted view of an event.
+
+  The formatted values of the event, such as the messages, the sources and
+  the date and time, are determined on first use and shared by the fields
+  of an output module that are derived from them.
+
+  Attributes:
+    event (EventObject): event.
+  """
+
+  def __init__(self, output_mediator, event, date_time=None):
+    """Initializes a formatted view of an event.
+
+    Args:
+      output_mediator (OutputMediator): output mediator.
+      event (EventObject): event.
+      date_time (Optional[datetime.datetime]): date and time of the event in
+          the output time zone, where None represents the date and time
+          should be determined on first use.
+    """
+    super(FormattedEvent, self).__init__()
+    self._date_time = date_time
+    self._date_time_error = None
+    self._macb_representation = None
+    self._messages = None
+    self._output_mediator = output_mediator
+    self._sources = None
+
+    self.event = event
+
+  def GetDateTime(self, raise_error=False):
+    """Retrieves the date and time of the event in the output time zone.
+
+    Args:
+      raise_error (Optional[bool]): True if an OverflowError should be raised
+          if the timestamp is out of bounds.
+
+    Returns:
+      datetime.datetime: date and time of the event. January 1, 1970 00:00:00
+          UTC is returned if the timestamp is out of bounds and raise_error
+          is not set.
+
+    Raises:
+      OverflowError: if raise_error is set and the timestamp is out of bounds.
+    """
+    if self._date_time is None and self._date_time_error is None:
+      try:
+        self._date_time = timelib.Timestamp.CopyToDatetime(
+            self.event.timestamp, self._output_mediator.timezone,
+            raise_error=True)
+      except OverflowError as exception:
+        self._date_time_error = exception
+
+    if self._date_time_error:
+      if raise_error:
+        raise self._date_time_error
+
+      return timelib.Timestamp.CopyToDatetime(
+          self.event.timestamp, self._output_mediator.timezone)
+
+    return self._date_time
+
+  def GetMACBRepresentation(self):
+    """Retrieves the MACB representation.
+
+    Returns:
+      str: MACB representation.
+    """
+    if self._macb_representation is None:
+      self._macb_representation = (
+          self._output_mediator.GetMACBRepresentation(self.event))
+
+    return self._macb_representation
+
+  def GetMessages(self):
+    """Retrieves the formatted messages.
+
+    Returns:
+      tuple(str, str): formatted message string and short message string,
+          or None, None if no event formatter to match the event can be found.
+    """
+    if self._messages is None:
+      self._messages = self._output_mediator.GetFormattedMessages(self.event)
+
+    return self._messages
+
+  def GetSources(self):
+    """Retrieves the formatted sources.
+
+    Returns:
+      tuple(str, str): short and long source string, or None, None if no
+          event formatter to match the event can be found.
+    """
+    if self._sources is None:
+      self._sources = self._output_mediator.GetFormattedSources(self.event)
+
+    return self._sources
+
+
 class OutputMediator(object):
   """Class that implements the output mediator.
 
@@ -28,6 +129,8 @@ class OutputMediator(object):
       preferred_encoding (Optional[str]): preferred encoding to output.
     """
     super(OutputMediator, self).__init__()
+    self._formatted_event = None
+    self._formatted_events = {}
     self._formatter_mediator = formatter_mediator
     self._knowledge_base = knowledge_base
     self._preferred_encoding = preferred_encoding
@@ -69,6 +172,27 @@ class OutputMediator(object):
     return formatters_manager.FormattersManager.GetFormatterObject(
         event.data_type)
 
+  def GetFormattedEvent(self, event):
+    """Retrieves the formatted view of an event.
+
+    The formatted view of the most recently retrieved event is reused, hence
+    an event should not be changed once it is being output.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      FormattedEvent: formatted view of the event.
+    """
+    if not self._formatted_event or self._formatted_event.event is not event:
+      formatted_event = self._formatted_events.pop(id(event), None)
+      if not formatted_event or formatted_event.event is not event:
+        formatted_event = FormattedEvent(self, event)
+
+      self._formatted_event = formatted_event
+
+    return self._formatted_event
+
   def GetFormattedMessages(self, event):
     """Retrieves the formatted messages related to the event.
 
@@ -242,6 +366,25 @@ class OutputMediator(object):
         user_sid, session_identifier=session_identifier)
     return username or default_username
 
+  def PrepareFormattedEvents(self, events):
+    """Prepares the formatted views of a block of events.
+
+    The timestamps of the events are converted to date and time values in
+    the output time zone in a single batch. The formatted views are used by
+    GetFormattedEvent until the next block of events is prepared.
+
+    Args:
+      events (list[EventObject]): events.
+    """
+    date_times = timelib.Timestamp.CopyToDatetimes(
+        [getattr(event, u'timestamp', None) for event in events],
+        self._timezone)
+
+    self._formatted_events = {}
+    for event, date_time in zip(events, date_times):
+      self._formatted_events[id(event)] = FormattedEvent(
+          self, event, date_time=date_time)
+
   def SetTimezone(self, timezone):
     """Sets the timezone.
 
@@ -258,3 +401,7 @@ class OutputMediator(object):
       self._timezone = pytz.timezone(timezone)
     except pytz.UnknownTimeZoneError:
       raise ValueError(u'Unsupported timezone: {0:s}'.format(timezone))
+
+    # The date and time of the formatted events depend on the timezone.
+    self._formatted_event = None
+    self._formatted_events = {}
@@ -3,7 +3,6 @@
 
 from plaso.lib import definitions
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import interface
 
 
@@ -53,20 +52,21 @@ class Shared4n6TimeOutputModule(interface.OutputModule):
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(data_type))
 
-    message, _ = self._output_mediator.GetFormattedMessages(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+
+    message, _ = formatted_event.GetMessages()
     if message is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(data_type))
 
-    source_short, source = self._output_mediator.GetFormattedSources(event)
+    source_short, source = formatted_event.GetSources()
     if source is None or source_short is None:
       raise errors.NoFormatterFound(
           u'Unable to find event formatter for: {0:s}.'.format(data_type))
 
     datetime_object = None
     if event.timestamp is not None:
-      datetime_object = timelib.Timestamp.CopyToDatetime(
-          event.timestamp, self._output_mediator.timezone)
+      datetime_object = formatted_event.GetDateTime()
       if not datetime_object:
         self._ReportEventError(event, (
             u'unable to copy timestamp: {0:d} to datetime object.'))
@@ -116,7 +116,7 @@ class Shared4n6TimeOutputModule(interface.OutputModule):
 
     row = {
         u'timezone': u'{0!s}'.format(self._output_mediator.timezone),
-        u'MACB': self._output_mediator.GetMACBRepresentation(event),
+        u'MACB': formatted_event.GetMACBRepresentation(),
         u'source': source_short,
         u'sourcetype': source,
         u'type': getattr(event, u'timestamp_desc', u'-'),
@@ -30,11 +30,12 @@ class TLNBaseOutputModule(interface.LinearOutputModule):
     Returns:
       str: formatted description field.
     """
-    date_time_string = timelib.Timestamp.CopyToIsoFormat(
-        event.timestamp, timezone=self._output_mediator.timezone)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+
+    date_time_string = formatted_event.GetDateTime().isoformat()
     timestamp_description = getattr(event, u'timestamp_desc', u'UNKNOWN')
 
-    message, _ = self._output_mediator.GetFormattedMessages(event)
+    message, _ = formatted_event.GetMessages()
     if message is None:
       data_type = getattr(event, u'data_type', u'UNKNOWN')
       raise errors.NoFormatterFound(
@@ -66,7 +67,8 @@ class TLNBaseOutputModule(interface.LinearOutputModule):
      Returns:
        str: formatted source field.
     """
-    source_short, _ = self._output_mediator.GetFormattedSources(event)
+    formatted_event = self._output_mediator.GetFormattedEvent(event)
+    source_short, _ = formatted_event.GetSources()
     if source_short is None:
       data_type = getattr(event, u'data_type', u'UNKNOWN')
       raise errors.NoFormatterFound(
@@ -12,6 +12,7 @@ from dfdatetime import posix_time as dfdatetime_posix_time
 
 from plaso.containers import events
 from plaso.containers import time_events
+from plaso.lib import buffered_reader
 from plaso.lib import errors
 from plaso.lib import eventdata
 from plaso.lib import timelib
@@ -822,8 +823,12 @@ class BSMParser(interface.FileObjectParser):
     Raises:
       UnableToParseFile: when the file cannot be parsed.
     """
+    # Construct reads the tokens field by field, which the buffered reader
+    # serves from its buffer.
+    reader = buffered_reader.BufferedReader(file_object)
+
     try:
-      is_bsm = self.VerifyFile(parser_mediator, file_object)
+      is_bsm = self.VerifyFile(parser_mediator, reader)
     except (IOError, construct.FieldError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse BSM file with error: {0:s}'.format(exception))
@@ -831,9 +836,9 @@ class BSMParser(interface.FileObjectParser):
     if not is_bsm:
       raise errors.UnableToParseFile(u'Not a BSM File, unable to parse.')
 
-    file_object.seek(0, os.SEEK_SET)
+    reader.seek(0, os.SEEK_SET)
 
-    while self._ParseBSMEvent(parser_mediator, file_object):
+    while self._ParseBSMEvent(parser_mediator, reader):
       pass
 
   def VerifyFile(self, parser_mediator, file_object):
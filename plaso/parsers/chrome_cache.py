@@ -11,6 +11,7 @@ from dfvfs.path import factory as path_spec_factory
 
 from plaso.containers import events
 from plaso.containers import time_events
+from plaso.lib import buffered_reader
 from plaso.lib import errors
 from plaso.lib import eventdata
 from plaso.parsers import interface
@@ -123,6 +124,7 @@ class IndexFile(object):
     """Initializes an index file."""
     super(IndexFile, self).__init__()
     self._file_object = None
+    self._reader = None
     self.creation_time = None
     self.version = None
     self.index_table = []
@@ -133,10 +135,10 @@ class IndexFile(object):
     Raises:
       IOError: if the file header cannot be read.
     """
-    self._file_object.seek(0, os.SEEK_SET)
+    self._reader.seek(0, os.SEEK_SET)
 
     try:
-      file_header = self._FILE_HEADER.parse_stream(self._file_object)
+      file_header = self._FILE_HEADER.parse_stream(self._reader)
     except construct.FieldError as exception:
       raise IOError(u'Unable to parse file header with error: {0:s}'.format(
           exception))
@@ -158,22 +160,21 @@ class IndexFile(object):
 
   def _ReadIndexTable(self):
     """Reads the index table."""
-    cache_address_data = self._file_object.read(4)
-
-    while len(cache_address_data) == 4:
-      value = construct.ULInt32(u'cache_address').parse(cache_address_data)
+    # The file can be truncated before the end of the LRU data.
+    number_of_cache_addresses = max(
+        0, (self._reader.get_size() - self._reader.tell()) // 4)
 
+    for value in self._reader.ReadArray(b'<I', number_of_cache_addresses):
       if value:
         cache_address = CacheAddress(value)
         self.index_table.append(cache_address)
 
-      cache_address_data = self._file_object.read(4)
-
   def Close(self):
     """Closes the index file."""
     if self._file_object:
       self._file_object.close()
       self._file_object = None
+      self._reader = None
 
   def Open(self, file_object):
     """Opens the index file.
@@ -182,9 +183,10 @@ class IndexFile(object):
       file_object (file): file-like object.
     """
     self._file_object = file_object
+    self._reader = buffered_reader.BufferedReader(file_object)
     self._ReadFileHeader()
     # Skip over the LRU data, which is 112 bytes in size.
-    self._file_object.seek(112, os.SEEK_CUR)
+    self._reader.seek(112, os.SEEK_CUR)
     self._ReadIndexTable()
 
 
@@ -230,6 +232,7 @@ class DataBlockFile(object):
     """Initializes a data block file."""
     super(DataBlockFile, self).__init__()
     self._file_object = None
+    self._reader = None
     self.creation_time = None
     self.block_size = None
     self.number_of_entries = None
@@ -241,10 +244,10 @@ class DataBlockFile(object):
     Raises:
       IOError: if the file header cannot be read.
     """
-    self._file_object.seek(0, os.SEEK_SET)
+    self._reader.seek(0, os.SEEK_SET)
 
     try:
-      file_header = self._FILE_HEADER.parse_stream(self._file_object)
+      file_header = self._FILE_HEADER.parse_stream(self._reader)
     except construct.FieldError as exception:
       raise IOError(u'Unable to parse file header with error: {0:s}'.format(
           exception))
@@ -274,10 +277,10 @@ class DataBlockFile(object):
     Returns:
       CacheEntry: cache entry.
     """
-    self._file_object.seek(block_offset, os.SEEK_SET)
+    self._reader.seek(block_offset, os.SEEK_SET)
 
     try:
-      cache_entry_struct = self._CACHE_ENTRY.parse_stream(self._file_object)
+      cache_entry_struct = self._CACHE_ENTRY.parse_stream(self._reader)
     except construct.FieldError as exception:
       raise IOError(u'Unable to parse cache entry with error: {0:s}'.format(
           exception))
@@ -303,6 +306,7 @@ class DataBlockFile(object):
     if self._file_object:
       self._file_object.close()
       self._file_object = None
+      self._reader = None
 
   def Open(self, file_object):
     """Opens the data block file.
@@ -311,6 +315,7 @@ class DataBlockFile(object):
       file_object (file): file-like object.
     """
     self._file_object = file_object
+    self._reader = buffered_reader.BufferedReader(file_object)
     self._ReadFileHeader()
 
 
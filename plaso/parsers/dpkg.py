@@ -59,6 +59,8 @@ class DpkgParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'dpkg'
   DESCRIPTION = u'Parser for Debian dpkg.log files.'
 
+  FIRST_LINE_HINT = r'\d{4}\s*-\s*\d{2}\s*-\s*\d{2}'
+
   _DPKG_STARTUP = u'startup'
   _DPKG_STATUS = u'status'
   _DPKG_CONFFILE = u'conffile'
@@ -124,14 +126,46 @@ class DpkgParser(text_parser.PyparsingSingleLineTextParser):
 
   LINE_STRUCTURES = [(u'line', _DPKG_LOG_LINE)]
 
+  # Regular expression that matches the same log lines as the pyparsing
+  # structure, used as a fast path. Printable characters are matched by
+  # [!-~], which corresponds with pyparsing.printables.
+  _DPKG_LOG_LINE_EXPRESSION = (
+      r'(?P<_year>[0-9]{{4}})-(?P<_month>[0-9]{{2}})-'
+      r'(?P<_day_of_month>[0-9]{{2}})[ \t]+(?P<_hours>[0-9]{{2}}):'
+      r'(?P<_minutes>[0-9]{{2}}):(?P<_seconds>[0-9]{{2}})[ \t]+(?P<body>'
+      r'{0:s}[ \t]+(?:{1:s})[ \t]+(?:{2:s})|'
+      r'{3:s}(?:[ \t]+[!-~]+){{3}}|'
+      r'(?:{4:s})(?:[ \t]+[!-~]+){{3}}|'
+      r'{5:s}[ \t]+[!-~]+[ \t]+(?:{6:s}))').format(
+          _DPKG_STARTUP, u'|'.join(_DPKG_STARTUP_TYPES),
+          u'|'.join(_DPKG_STARTUP_COMMANDS), _DPKG_STATUS,
+          u'|'.join(_DPKG_ACTIONS), _DPKG_CONFFILE,
+          u'|'.join(_DPKG_CONFFILE_DECISIONS))
+
+  REGULAR_EXPRESSION_LINE_STRUCTURES = [
+      (u'line', text_parser.RegularExpressionLineStructure(
+          _DPKG_LOG_LINE_EXPRESSION,
+          conversions={
+              u'_day_of_month': int,
+              u'_hours': int,
+              u'_minutes': int,
+              u'_month': int,
+              u'_seconds': int,
+              u'_year': int,
+              u'body': lambda body: u' '.join(body.split())},
+          lists={
+              u'date_time': (
+                  u'_year', u'_month', u'_day_of_month', u'_hours',
+                  u'_minutes', u'_seconds')}))]
+
   def ParseRecord(self, parser_mediator, key, structure):
     """Parses a structure of tokens derived from a line of a text file.
 
     Args:
       parser_mediator (ParserMediator): parser mediator.
       key (str): identifier of the structure of tokens.
-      structure (pyparsing.ParseResults): structure of tokens derived from
-          a line of a text file.
+      structure (pyparsing.ParseResults|RegularExpressionParseResults):
+          structure of tokens derived from a line of a text file.
 
     Raises:
       ParseError: when the structure type is unknown.
@@ -6,6 +6,8 @@ http://www.microsoft.com/technet/prodtechnol/WindowsServer2003/Library/
 IIS/676400bc-8969-4aa7-851a-9319490a9bbb.mspx?mfr=true
 """
 
+import re
+
 import pyparsing
 
 from dfdatetime import time_elements as dfdatetime_time_elements
@@ -34,12 +36,53 @@ class IISEventData(events.EventData):
     super(IISEventData, self).__init__(data_type=self.DATA_TYPE)
 
 
+def _ConvertInteger(string):
+  """Converts an integer value of a regular expression line structure.
+
+  Args:
+    string (str): integer value or "-" if blank.
+
+  Returns:
+    int|str: integer value or "-" if blank.
+  """
+  if string == u'-':
+    return string
+
+  return int(string, 10)
+
+
+def _ConvertIPAddress(string):
+  """Converts an IP address value of a regular expression line structure.
+
+  Args:
+    string (str): IP address value or "-" if blank.
+
+  Returns:
+    str: IP address value or "-" if blank, where the octets of an IPv4
+        address are normalized like pyparsing IPV4_ADDRESS does.
+
+  Raises:
+    ValueError: if an octet of an IPv4 address is out of bounds.
+  """
+  if u'.' not in string:
+    return string
+
+  octets = [int(octet, 10) for octet in string.split(u'.')]
+  if max(octets) > 255:
+    raise ValueError(u'IPv4 address octet value out of bounds.')
+
+  return u'.'.join([u'{0:d}'.format(octet) for octet in octets])
+
+
 class WinIISParser(text_parser.PyparsingSingleLineTextParser):
   """Parses a Microsoft IIS log file."""
 
   NAME = u'winiis'
   DESCRIPTION = u'Parser for Microsoft IIS log files.'
 
+  FIRST_LINE_HINT = (
+      r'[^\n]*#Software: Microsoft Internet Information Services')
+
   # Common Fields (6.0: date time s-sitename s-ip cs-method cs-uri-stem
   # cs-uri-query s-port cs-username c-ip cs(User-Agent) sc-status
   # sc-substatus sc-win32-status.
@@ -135,6 +178,123 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
       (u'comment', COMMENT),
       (u'logline', LOG_LINE_6_0)]
 
+  # Regular expressions that match the same values as the pyparsing
+  # structures, used as a fast path for the log lines. The blank value "-"
+  # is matched by the URI and word expressions since they contain "-".
+  _URI_EXPRESSION = r'[0-9A-Za-z/.?&+;_=()\-:,%]+'
+  _WORD_EXPRESSION = r'[0-9A-Za-z\-]+'
+  _INTEGER_EXPRESSION = r'[0-9]+|-'
+  _PORT_EXPRESSION = r'[0-9]{1,6}(?![0-9])|-'
+  _IP_ADDRESS_EXPRESSION = (
+      r'[0-9]{1,3}(?![0-9])(?:\.[0-9]{1,3}(?![0-9])){3}|[0-9A-Fa-f:]+|-')
+
+  _DATE_TIME_EXPRESSION = (
+      r'(?P<year>[0-9]{4})-(?P<month>[0-9]{2})-(?P<day_of_month>[0-9]{2})'
+      r'[ \t]+(?P<hours>[0-9]{2}):(?P<minutes>[0-9]{2}):'
+      r'(?P<seconds>[0-9]{2})(?![0-9])')
+
+  _LOG_LINE_EXPRESSIONS = {}
+
+  _LOG_LINE_EXPRESSIONS[u'date'] = (
+      r'(?P<_date_year>[0-9]{4})-(?P<_date_month>[0-9]{2})-'
+      r'(?P<_date_day_of_month>[0-9]{2})(?![0-9])')
+  _LOG_LINE_EXPRESSIONS[u'time'] = (
+      r'(?P<_time_hours>[0-9]{2}):(?P<_time_minutes>[0-9]{2}):'
+      r'(?P<_time_seconds>[0-9]{2})(?![0-9])')
+  _LOG_LINE_EXPRESSIONS[u's-sitename'] = (
+      r'(?P<s_sitename>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u's-ip'] = (
+      r'(?P<dest_ip>{0:s})'.format(_IP_ADDRESS_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-method'] = (
+      r'(?P<http_method>{0:s})'.format(_WORD_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-uri-stem'] = (
+      r'(?P<requested_uri_stem>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-uri-query'] = (
+      r'(?P<cs_uri_query>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u's-port'] = (
+      r'(?P<dest_port>{0:s})'.format(_PORT_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-username'] = (
+      r'(?P<cs_username>{0:s})'.format(_WORD_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'c-ip'] = (
+      r'(?P<source_ip>{0:s})'.format(_IP_ADDRESS_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs(User-Agent)'] = (
+      r'(?P<user_agent>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'sc-status'] = (
+      r'(?P<http_status>{0:s})'.format(_INTEGER_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'sc-substatus'] = (
+      r'(?P<sc_substatus>{0:s})'.format(_INTEGER_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'sc-win32-status'] = (
+      r'(?P<sc_win32_status>{0:s})'.format(_INTEGER_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u's-computername'] = (
+      r'(?P<s_computername>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'sc-bytes'] = (
+      r'(?P<sent_bytes>{0:s})'.format(_INTEGER_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-bytes'] = (
+      r'(?P<received_bytes>{0:s})'.format(_INTEGER_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'time-taken'] = (
+      r'(?P<time_taken>{0:s})'.format(_INTEGER_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-version'] = (
+      r'(?P<protocol_version>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs-host'] = (
+      r'(?P<cs_host>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs(Cookie)'] = (
+      r'(?P<cs_cookie>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs(Referrer)'] = (
+      r'(?P<cs_referrer>{0:s})'.format(_URI_EXPRESSION))
+  _LOG_LINE_EXPRESSIONS[u'cs(Referer)'] = (
+      r'(?P<cs_referrer>{0:s})'.format(_URI_EXPRESSION))
+
+  _LOG_LINE_CONVERSIONS = {
+      u'_date_day_of_month': int,
+      u'_date_month': int,
+      u'_date_year': int,
+      u'_time_hours': int,
+      u'_time_minutes': int,
+      u'_time_seconds': int,
+      u'day_of_month': int,
+      u'dest_ip': _ConvertIPAddress,
+      u'dest_port': _ConvertInteger,
+      u'hours': int,
+      u'http_status': _ConvertInteger,
+      u'minutes': int,
+      u'month': int,
+      u'received_bytes': _ConvertInteger,
+      u'sc_status': _ConvertInteger,
+      u'sc_substatus': _ConvertInteger,
+      u'sc_win32_status': _ConvertInteger,
+      u'seconds': int,
+      u'sent_bytes': _ConvertInteger,
+      u'source_ip': _ConvertIPAddress,
+      u'time_taken': _ConvertInteger,
+      u'year': int}
+
+  _LOG_LINE_LISTS = {
+      u'date': (u'_date_year', u'_date_month', u'_date_day_of_month'),
+      u'date_time': (
+          u'year', u'month', u'day_of_month', u'hours', u'minutes',
+          u'seconds'),
+      u'time': (u'_time_hours', u'_time_minutes', u'_time_seconds')}
+
+  _LOG_LINE_6_0_EXPRESSION = r'[ \t]+'.join([
+      _DATE_TIME_EXPRESSION,
+      _LOG_LINE_EXPRESSIONS[u's-sitename'],
+      _LOG_LINE_EXPRESSIONS[u's-ip'],
+      _LOG_LINE_EXPRESSIONS[u'cs-method'],
+      r'(?P<cs_uri_stem>{0:s})'.format(_URI_EXPRESSION),
+      _LOG_LINE_EXPRESSIONS[u'cs-uri-query'],
+      _LOG_LINE_EXPRESSIONS[u's-port'],
+      _LOG_LINE_EXPRESSIONS[u'cs-username'],
+      _LOG_LINE_EXPRESSIONS[u'c-ip'],
+      _LOG_LINE_EXPRESSIONS[u'cs(User-Agent)'],
+      r'(?P<sc_status>{0:s})'.format(_INTEGER_EXPRESSION),
+      _LOG_LINE_EXPRESSIONS[u'sc-substatus'],
+      _LOG_LINE_EXPRESSIONS[u'sc-win32-status']])
+
+  REGULAR_EXPRESSION_LINE_STRUCTURES = [
+      (u'logline', text_parser.RegularExpressionLineStructure(
+          _LOG_LINE_6_0_EXPRESSION, conversions=_LOG_LINE_CONVERSIONS,
+          lists=_LOG_LINE_LISTS))]
+
   # Define a signature value for the log file.
   _SIGNATURE = b'#Software: Microsoft Internet Information Services'
 
@@ -145,6 +305,35 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
     self._month = None
     self._year = None
 
+  def _CreateRegularExpressionLineStructure(self, fields):
+    """Creates a regular expression line structure for log lines.
+
+    Args:
+      fields (list[str]): names of the fields of the log lines.
+
+    Returns:
+      RegularExpressionLineStructure: line structure or None if the fields
+          cannot be represented by a regular expression, for example when
+          multiple fields map to the same value.
+    """
+    expressions = []
+    if fields[:2] == [u'date', u'time']:
+      expressions.append(self._DATE_TIME_EXPRESSION)
+      fields = fields[2:]
+
+    for member in fields:
+      expression = self._LOG_LINE_EXPRESSIONS.get(
+          member, r'(?:{0:s})'.format(self._URI_EXPRESSION))
+      expressions.append(expression)
+
+    try:
+      return text_parser.RegularExpressionLineStructure(
+          r'[ \t]+'.join(expressions), conversions=self._LOG_LINE_CONVERSIONS,
+          lists=self._LOG_LINE_LISTS)
+
+    except re.error:
+      return
+
   def _ParseComment(self, structure):
     """Parses a comment.
 
@@ -164,6 +353,9 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
     """
     fields = structure.fields.split(u' ')
 
+    regular_expression_line_structure = (
+        self._CreateRegularExpressionLineStructure(fields))
+
     log_line_structure = pyparsing.Empty()
     if fields[0] == u'date' and fields[1] == u'time':
       log_line_structure += self.DATE_TIME.setResultsName(u'date_time')
@@ -176,13 +368,19 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
     # a structural fix.
     self._line_structures[1] = (u'logline', log_line_structure)
 
+    self._regular_expression_line_structures = []
+    if regular_expression_line_structure:
+      self._regular_expression_line_structures.append(
+          (u'logline', regular_expression_line_structure))
+
   def _ParseLogLine(self, parser_mediator, structure):
     """Parse a single log line and produce an event object.
 
     Args:
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfvfs.
-      structure (pyparsing.ParseResults): structure parsed from the log file.
+      structure (pyparsing.ParseResults|RegularExpressionParseResults):
+          structure parsed from the log file.
     """
     if structure.date_time:
       time_elements_tuple = structure.date_time
@@ -212,12 +410,15 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
     event_data = IISEventData()
 
     for key, value in iter(structure.items()):
-      if key in (u'date', u'date_time', u'time') or value == u'-':
+      if key in (u'date', u'date_time', u'time'):
         continue
 
       if isinstance(value, pyparsing.ParseResults):
         value = u''.join(value)
 
+      if value == u'-':
+        continue
+
       setattr(event_data, key, value)
 
     event = time_events.DateTimeValuesEvent(
@@ -231,7 +432,8 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfvfs.
       key (str): name of the parsed structure.
-      structure (pyparsing.ParseResults): structure parsed from the log file.
+      structure (pyparsing.ParseResults|RegularExpressionParseResults):
+          structure parsed from the log file.
 
     Raises:
       ParseError: when the structure type is unknown.
@@ -259,6 +461,8 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
     # TODO: self._line_structures is a work-around and this needs
     # a structural fix.
     self._line_structures = self.LINE_STRUCTURES
+    self._regular_expression_line_structures = (
+        self.REGULAR_EXPRESSION_LINE_STRUCTURES)
 
     self._day_of_month = None
     self._month = None
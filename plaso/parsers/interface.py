@@ -59,6 +59,13 @@ class BaseParser(object):
   # List of filters that should match for the parser to be applied.
   FILTERS = frozenset()
 
+  # Regular expression that the start of the text of a file, without leading
+  # white space and byte order mark, must match for the parser to be applied,
+  # where None represents the parser has no such hint. The hint is only used
+  # for parsers without a format specification and should match every file
+  # the parser can parse.
+  FIRST_LINE_HINT = None
+
   # Every derived parser class that implements plugins should define
   # its own _plugin_classes dict:
   # _plugin_classes = {}
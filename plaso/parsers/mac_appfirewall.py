@@ -48,6 +48,8 @@ class MacAppFirewallParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'mac_appfirewall_log'
   DESCRIPTION = u'Parser for appfirewall.log files.'
 
+  FIRST_LINE_HINT = r'[A-Za-z]{3}\s*\d{1,2}\s*\d{2}\s*:'
+
   ENCODING = u'utf-8'
 
   # Define how a log line should look like.
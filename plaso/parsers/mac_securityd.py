@@ -56,6 +56,8 @@ class MacSecuritydLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'mac_securityd'
   DESCRIPTION = u'Parser for Mac OS X securityd log files.'
 
+  FIRST_LINE_HINT = r'[A-Za-z]{3}\s*\d{1,2}\s*\d{2}\s*:'
+
   _ENCODING = u'utf-8'
   _DEFAULT_YEAR = 2012
 
@@ -49,6 +49,9 @@ class MacWifiLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'macwifi'
   DESCRIPTION = u'Parser for Mac OS X wifi.log files.'
 
+  FIRST_LINE_HINT = (
+      r'[A-Za-z]{3}\s*(?:[A-Za-z]{3}\s*)?\d{1,2}\s*\d{2}\s*:')
+
   _ENCODING = u'utf-8'
 
   THREE_DIGITS = text_parser.PyparsingConstants.THREE_DIGITS
@@ -8,6 +8,7 @@ from plaso.containers import errors
 from plaso.engine import path_helper
 from plaso.lib import py2to3
 from plaso.lib import timelib
+from plaso.serializer import json_serializer
 
 
 class ParserMediator(object):
@@ -39,6 +40,8 @@ class ParserMediator(object):
     self._number_of_events = 0
     self._parser_chain_components = []
     self._preferred_year = preferred_year
+    self._recorded_events = None
+    self._recorded_events_reusable = False
     self._resolver_context = resolver_context
     self._storage_writer = storage_writer
     self._temporary_directory = temporary_directory
@@ -242,6 +245,8 @@ class ParserMediator(object):
       ValueError: if the file entry is missing.
     """
     if file_entry is None:
+      # The display name of the active file entry depends on its location.
+      self._recorded_events_reusable = False
       file_entry = self._file_entry
 
     if file_entry is None:
@@ -302,6 +307,9 @@ class ParserMediator(object):
     Returns:
       dfvfs.FileEntry: file entry.
     """
+    # Events produced with information from the file entry, other than
+    # the content of the data stream, cannot be reused for other file entries.
+    self._recorded_events_reusable = False
     return self._file_entry
 
   def GetFilename(self):
@@ -310,6 +318,7 @@ class ParserMediator(object):
     Returns:
       str: name of the active file entry or None.
     """
+    self._recorded_events_reusable = False
     if not self._file_entry:
       return
 
@@ -319,6 +328,17 @@ class ParserMediator(object):
 
     return self._file_entry.name
 
+  def GetEventAttribute(self, attribute_name):
+    """Retrieves an attribute that will be set on all events produced.
+
+    Args:
+      attribute_name (str): name of the attribute.
+
+    Returns:
+      object: value of the attribute or None if not set.
+    """
+    return self._extra_event_attributes.get(attribute_name, None)
+
   def GetLatestYear(self):
     """Retrieves the latest (newest) year for an event from a file.
 
@@ -335,6 +355,16 @@ class ParserMediator(object):
 
     return year
 
+  def GetParsingContext(self):
+    """Retrieves the values, other than the data, that parsers depend on.
+
+    Returns:
+      tuple[object]: codepage, platform, time zone, preferred year and year.
+    """
+    return (
+        self.codepage, self.platform, u'{0!s}'.format(self.timezone),
+        self._preferred_year, self.year)
+
   def GetParserChain(self):
     """Retrieves the current parser chain.
 
@@ -433,9 +463,25 @@ class ParserMediator(object):
     if not self._storage_writer:
       raise RuntimeError(u'Storage writer not set.')
 
+    parser_chain = self.GetParserChain()
+
+    if self._recorded_events_reusable:
+      # The event is recorded before the file entry specific attributes
+      # are set, so that the attributes can be set when it is reused.
+      try:
+        serialized_event = (
+            json_serializer.JSONAttributeContainerSerializer.WriteSerialized(
+                event))
+        self._recorded_events.append((parser_chain, query, serialized_event))
+
+      except (TypeError, ValueError):
+        # Events with attribute values that cannot be serialized are not
+        # reused.
+        self._recorded_events_reusable = False
+
     self.ProcessEvent(
-        event, parser_chain=self.GetParserChain(),
-        file_entry=self._file_entry, query=query)
+        event, parser_chain=parser_chain, file_entry=self._file_entry,
+        query=query)
 
     if self.MatchesFilter(event):
       return
@@ -465,6 +511,7 @@ class ParserMediator(object):
     if not self._storage_writer:
       raise RuntimeError(u'Storage writer not set.')
 
+    self._recorded_events_reusable = False
     self._storage_writer.AddEventSource(event_source)
     self._number_of_event_sources += 1
 
@@ -481,6 +528,36 @@ class ParserMediator(object):
 
     self.ProduceEvent(event)
 
+  def ProduceRecordedEvents(self, recorded_events):
+    """Produces events recorded while parsing identical data.
+
+    The file entry specific attributes of the events are set as if
+    the events were produced by parsing the active file entry.
+
+    Args:
+      recorded_events (list[tuple[str, str, str]]): parser chain, query and
+          JSON serialized event of the recorded events.
+
+    Raises:
+      RuntimeError: when storage writer is not set.
+    """
+    if not self._storage_writer:
+      raise RuntimeError(u'Storage writer not set.')
+
+    for parser_chain, query, serialized_event in recorded_events:
+      event = json_serializer.JSONAttributeContainerSerializer.ReadSerialized(
+          serialized_event)
+
+      self.ProcessEvent(
+          event, parser_chain=parser_chain, file_entry=self._file_entry,
+          query=query)
+
+      if self.MatchesFilter(event):
+        continue
+
+      self._storage_writer.AddEvent(event)
+      self._number_of_events += 1
+
   def ProduceExtractionError(self, message, path_spec=None):
     """Produces an extraction error.
 
@@ -496,6 +573,8 @@ class ParserMediator(object):
     if not self._storage_writer:
       raise RuntimeError(u'Storage writer not set.')
 
+    self._recorded_events_reusable = False
+
     if not path_spec and self._file_entry:
       path_spec = self._file_entry.path_spec
 
@@ -553,3 +632,29 @@ class ParserMediator(object):
   def SignalAbort(self):
     """Signals the parsers to abort."""
     self._abort = True
+
+  def StartEventRecording(self):
+    """Starts recording the produced events.
+
+    The recorded events can be reused for data streams with identical content
+    as long as the parsers did not use information from the file entry, or
+    produce event sources or extraction errors.
+    """
+    self._recorded_events = []
+    self._recorded_events_reusable = True
+
+  def StopEventRecording(self):
+    """Stops recording the produced events.
+
+    Returns:
+      list[tuple[str, str, str]]: parser chain, query and JSON serialized
+          event of the recorded events or None if the recorded events
+          cannot be reused.
+    """
+    recorded_events = self._recorded_events
+    if not self._recorded_events_reusable:
+      recorded_events = None
+
+    self._recorded_events = None
+    self._recorded_events_reusable = False
+    return recorded_events
@@ -2,8 +2,10 @@
 """Parser for PCAP files."""
 
 import binascii
+import collections
 import operator
 import socket
+import struct
 
 import dpkt
 
@@ -285,14 +287,17 @@ class Stream(object):
     super(Stream, self).__init__()
     self.all_data = [prot_data]
     self.dest_ip = dest_ip
-    self.packet_id = [packet[1]]
+    self.first_packet_id = packet[1]
+    self.last_packet_id = packet[1]
+    self.maximum_timestamp = packet[0]
+    self.minimum_timestamp = packet[0]
+    self.packet_count = 1
     self.protocol = prot
     self.protocol_data = u''
     self.size = packet[3]
     self.source_ip = source_ip
     self.start_time = packet[0]
     self.stream_data = b''
-    self.timestamps = [packet[0]]
 
     if prot in (u'TCP', u'UDP'):
       self.dest_port = prot_data.dport
@@ -301,17 +306,26 @@ class Stream(object):
       self.dest_port = u''
       self.source_port = u''
 
-  def AddPacket(self, packet, prot_data):
+  def AddPacket(self, packet, prot_data, maximum_data_size=None):
     """Add another packet to an existing stream.
 
     Args:
       packet: Packet data.
       prot_data: Protocol level data for ARP, UDP, RCP, ICMP.
           other types of ether packets, this is just the ether.data
+      maximum_data_size (Optional[int]): size of the stream up to which
+          the protocol level data of the packets is retained, where None
+          represents all data is retained.
     """
-    self.packet_id.append(packet[1])
-    self.timestamps.append(packet[0])
-    self.all_data.append(prot_data)
+    self.first_packet_id = min(self.first_packet_id, packet[1])
+    self.last_packet_id = max(self.last_packet_id, packet[1])
+    self.maximum_timestamp = max(self.maximum_timestamp, packet[0])
+    self.minimum_timestamp = min(self.minimum_timestamp, packet[0])
+    self.packet_count += 1
+
+    if maximum_data_size is None or self.size < maximum_data_size:
+      self.all_data.append(prot_data)
+
     self.size += packet[3]
 
   def SpecialTypes(self):
@@ -444,6 +458,158 @@ class Stream(object):
       self.stream_data = b''.join(clean_data)
 
 
+class StreamTable(object):
+  """Table of the network streams in a PCAP file.
+
+  By default streams are kept in the table until the end of the file. When
+  timeouts are set, streams that have been idle for the idle timeout and TCP
+  streams for which the close timeout passed since a FIN or RST packet are
+  closed, so that their events can be produced before the end of the file.
+  When the maximum number of streams is reached, the least recently active
+  stream is closed to make room for a new stream.
+  """
+
+  def __init__(
+      self, close_timeout=None, idle_timeout=None,
+      maximum_number_of_streams=None, maximum_stream_data_size=None):
+    """Initializes a stream table.
+
+    Args:
+      close_timeout (Optional[int]): number of microseconds after a FIN or
+          RST packet that a TCP stream is closed, where None represents
+          the stream is not closed.
+      idle_timeout (Optional[int]): number of microseconds after the last
+          packet that a stream is closed, where None represents the stream
+          is not closed.
+      maximum_number_of_streams (Optional[int]): maximum number of streams
+          in the table, where None represents no maximum.
+      maximum_stream_data_size (Optional[int]): size of a stream up to which
+          the protocol level data of the packets is retained, where None
+          represents all data is retained.
+    """
+    super(StreamTable, self).__init__()
+    self._close_timeout = close_timeout
+    self._closed_streams = []
+    # The streams for which a FIN or RST packet was seen, in the order of
+    # the packet, as tuples of the timestamp of the packet and the stream.
+    self._closing_streams = collections.OrderedDict()
+    self._idle_timeout = idle_timeout
+    self._maximum_number_of_streams = maximum_number_of_streams
+    self._maximum_stream_data_size = maximum_stream_data_size
+    # The other streams, in the order of their last packet if an idle
+    # timeout is set.
+    self._open_streams = collections.OrderedDict()
+
+  @property
+  def number_of_streams(self):
+    """int: number of streams in the table."""
+    return len(self._open_streams) + len(self._closing_streams)
+
+  def _CloseLeastRecentlyActiveStream(self):
+    """Closes the least recently active stream."""
+    if self._closing_streams:
+      stream_key = next(iter(self._closing_streams))
+      _, stream_object = self._closing_streams.pop(stream_key)
+    else:
+      stream_key = next(iter(self._open_streams))
+      stream_object = self._open_streams.pop(stream_key)
+
+    self._closed_streams.append(stream_object)
+
+  def AddPacket(
+      self, stream_key, packet, prot_data, source_ip, dest_ip, prot,
+      close=False):
+    """Adds a packet to its stream.
+
+    Args:
+      stream_key (str): key that identifies the stream.
+      packet: Packet data.
+      prot_data: Protocol level data for ARP, UDP, RCP, ICMP.
+      source_ip: Source IP.
+      dest_ip: Dest IP.
+      prot: Protocol (TCP, UDP, ICMP).
+      close (Optional[bool]): True if the packet closes the stream, such as
+          a TCP FIN or RST packet.
+    """
+    closing_stream = self._closing_streams.get(stream_key, None)
+    if closing_stream:
+      closing_stream[1].AddPacket(
+          packet, prot_data,
+          maximum_data_size=self._maximum_stream_data_size)
+      return
+
+    stream_object = self._open_streams.get(stream_key, None)
+    if stream_object:
+      stream_object.AddPacket(
+          packet, prot_data,
+          maximum_data_size=self._maximum_stream_data_size)
+
+      if close or self._idle_timeout is not None:
+        del self._open_streams[stream_key]
+
+    else:
+      if (self._maximum_number_of_streams is not None and
+          self.number_of_streams >= self._maximum_number_of_streams):
+        self._CloseLeastRecentlyActiveStream()
+
+      stream_object = Stream(packet, prot_data, source_ip, dest_ip, prot)
+
+    if close and self._close_timeout is not None:
+      self._closing_streams[stream_key] = (packet[0], stream_object)
+    elif stream_key not in self._open_streams:
+      self._open_streams[stream_key] = stream_object
+
+  def GetClosedStreams(self, timestamp):
+    """Retrieves the streams that were closed.
+
+    Args:
+      timestamp (int): timestamp of the last packet, which determines
+          the streams that timed out.
+
+    Returns:
+      list[Stream]: streams that were closed since the previous call.
+    """
+    if self._close_timeout is not None:
+      while self._closing_streams:
+        stream_key = next(iter(self._closing_streams))
+        close_timestamp, stream_object = self._closing_streams[stream_key]
+        if timestamp - close_timestamp < self._close_timeout:
+          break
+
+        del self._closing_streams[stream_key]
+        self._closed_streams.append(stream_object)
+
+    if self._idle_timeout is not None:
+      while self._open_streams:
+        stream_key = next(iter(self._open_streams))
+        stream_object = self._open_streams[stream_key]
+        if timestamp - stream_object.maximum_timestamp < self._idle_timeout:
+          break
+
+        del self._open_streams[stream_key]
+        self._closed_streams.append(stream_object)
+
+    closed_streams = self._closed_streams
+    self._closed_streams = []
+    return closed_streams
+
+  def GetStreams(self):
+    """Retrieves and removes all the streams in the table.
+
+    Returns:
+      list[Stream]: streams.
+    """
+    streams = self._closed_streams
+    streams.extend(self._open_streams.values())
+    streams.extend(
+        stream_object for _, stream_object in self._closing_streams.values())
+
+    self._closed_streams = []
+    self._closing_streams = collections.OrderedDict()
+    self._open_streams = collections.OrderedDict()
+    return streams
+
+
 class PcapEventData(events.EventData):
   """PCAP event data.
 
@@ -488,13 +654,36 @@ class PcapParser(interface.FileObjectParser):
   NAME = u'pcap'
   DESCRIPTION = u'Parser for PCAP files.'
 
+  # PCAP files of at least this size are parsed in streaming mode, where
+  # the events of a stream are produced when the stream is closed instead
+  # of at the end of the file, to bound the memory used by the parser.
+  STREAMING_MINIMUM_FILE_SIZE = 64 * 1024 * 1024
+
+  # The maximum number of streams that are tracked in streaming mode.
+  MAXIMUM_NUMBER_OF_STREAMS = 65536
+
+  # The size of a stream up to which the protocol level data of its packets
+  # is retained in streaming mode.
+  MAXIMUM_STREAM_DATA_SIZE = 64 * 1024
+
+  # The number of microseconds after a TCP FIN or RST packet that a stream
+  # is closed in streaming mode.
+  STREAM_CLOSE_TIMEOUT = 5 * 1000000
+
+  # The number of microseconds after its last packet that a stream is closed
+  # in streaming mode.
+  STREAM_IDLE_TIMEOUT = 60 * 1000000
+
+  _READ_BUFFER_SIZE = 1024 * 1024
+
   def _ParseIPPacket(
-      self, connections, trunc_list, packet_number, timestamp,
+      self, stream_table, trunc_list, packet_number, timestamp,
       packet_data_size, ip_packet):
     """Parses an IP packet.
 
     Args:
-      connections: A dictionary object to track the IP connections.
+      stream_table: A stream table object (instance of StreamTable) to track
+                    the IP connections.
       trunc_list: A list of packets that truncated strangely and could
                   not be turned into a stream.
       packet_number: The PCAP packet number, where 1 is the first packet.
@@ -522,12 +711,10 @@ class PcapParser(interface.FileObjectParser):
       stream_key = u'tcp: {0:s}:{1:d} > {2:s}:{3:d}'.format(
           source_ip_address, tcp.sport, destination_ip_address, tcp.dport)
 
-      if stream_key in connections:
-        connections[stream_key].AddPacket(packet_values, tcp)
-      else:
-        connections[stream_key] = Stream(
-            packet_values, tcp, source_ip_address, destination_ip_address,
-            u'TCP')
+      close = bool(tcp.flags & (dpkt.tcp.TH_FIN | dpkt.tcp.TH_RST))
+      stream_table.AddPacket(
+          stream_key, packet_values, tcp, source_ip_address,
+          destination_ip_address, u'TCP', close=close)
 
     elif ip_packet.p == dpkt.ip.IP_PROTO_UDP:
       # Later versions of dpkt seem to return a string instead of an UDP object.
@@ -544,12 +731,9 @@ class PcapParser(interface.FileObjectParser):
       stream_key = u'udp: {0:s}:{1:d} > {2:s}:{3:d}'.format(
           source_ip_address, udp.sport, destination_ip_address, udp.dport)
 
-      if stream_key in connections:
-        connections[stream_key].AddPacket(packet_values, udp)
-      else:
-        connections[stream_key] = Stream(
-            packet_values, udp, source_ip_address, destination_ip_address,
-            u'UDP')
+      stream_table.AddPacket(
+          stream_key, packet_values, udp, source_ip_address,
+          destination_ip_address, u'UDP')
 
     elif ip_packet.p == dpkt.ip.IP_PROTO_ICMP:
       # Later versions of dpkt seem to return a string instead of
@@ -562,12 +746,9 @@ class PcapParser(interface.FileObjectParser):
       stream_key = u'icmp: {0:d} {1:s} > {2:s}'.format(
           timestamp, source_ip_address, destination_ip_address)
 
-      if stream_key in connections:
-        connections[stream_key].AddPacket(packet_values, icmp)
-      else:
-        connections[stream_key] = Stream(
-            packet_values, icmp, source_ip_address, destination_ip_address,
-            u'ICMP')
+      stream_table.AddPacket(
+          stream_key, packet_values, icmp, source_ip_address,
+          destination_ip_address, u'ICMP')
 
   def _ParseOtherPacket(self, packet_values):
     """Parses a non-IP packet.
@@ -722,6 +903,107 @@ class PcapParser(interface.FileObjectParser):
 
     return other_streams
 
+  def _ProduceConnectionEvents(self, parser_mediator, stream_object):
+    """Produces the events of an IP connection stream.
+
+    Args:
+      parser_mediator: A parser mediator object (instance of ParserMediator).
+      stream_object: A stream object (instance of Stream).
+    """
+    if not stream_object.protocol == u'ICMP':
+      stream_object.Clean()
+
+    self._ProduceStreamEvents(parser_mediator, stream_object)
+
+  def _ProduceStreamEvents(self, parser_mediator, stream_object):
+    """Produces the events of a stream.
+
+    Args:
+      parser_mediator: A parser mediator object (instance of ParserMediator).
+      stream_object: A stream object (instance of Stream).
+    """
+    event_data = PcapEventData()
+    event_data.dest_ip = stream_object.dest_ip
+    event_data.dest_port = stream_object.dest_port
+    event_data.first_packet_id = stream_object.first_packet_id
+    event_data.last_packet_id = stream_object.last_packet_id
+    event_data.packet_count = stream_object.packet_count
+    event_data.protocol = stream_object.protocol
+    event_data.size = stream_object.size
+    event_data.source_ip = stream_object.source_ip
+    event_data.source_port = stream_object.source_port
+    event_data.stream_data = repr(stream_object.stream_data[:50])
+    event_data.stream_type, event_data.protocol_data = (
+        stream_object.SpecialTypes())
+
+    date_time = dfdatetime_posix_time.PosixTime(
+        timestamp=stream_object.minimum_timestamp)
+    event = time_events.DateTimeValuesEvent(
+        date_time, eventdata.EventTimestamp.START_TIME)
+    parser_mediator.ProduceEventWithEventData(event, event_data)
+
+    date_time = dfdatetime_posix_time.PosixTime(
+        timestamp=stream_object.maximum_timestamp)
+    event = time_events.DateTimeValuesEvent(
+        date_time, eventdata.EventTimestamp.END_TIME)
+    parser_mediator.ProduceEventWithEventData(event, event_data)
+
+  def _ReadPacketRecords(self, parser_mediator, file_object, byte_order):
+    """Reads the packet records.
+
+    The packet records are read in blocks of _READ_BUFFER_SIZE bytes instead
+    of with separate reads of every packet header and packet data.
+
+    Args:
+      parser_mediator: A parser mediator object (instance of ParserMediator).
+      file_object: A file-like object, positioned after the file header.
+      byte_order (str): struct byte order of the packet headers.
+
+    Yields:
+      tuple[int, bytes]: packet timestamp, which contains the number of
+          microseconds since January 1, 1970 00:00:00 UTC, and packet data.
+    """
+    # The packet header contains: tv_sec, tv_usec, caplen and len.
+    packet_header_struct = struct.Struct(byte_order + 'IIII')
+    packet_header_size = packet_header_struct.size
+
+    buffer_data = b''
+    buffer_offset = 0
+    end_of_file = False
+
+    while True:
+      buffer_size = len(buffer_data)
+      header_end_offset = buffer_offset + packet_header_size
+      read_size = self._READ_BUFFER_SIZE
+
+      if header_end_offset <= buffer_size:
+        seconds, microseconds, captured_size, _ = (
+            packet_header_struct.unpack_from(buffer_data, buffer_offset))
+        data_end_offset = header_end_offset + captured_size
+
+        # Data of the last packet that is truncated is returned as-is.
+        if data_end_offset <= buffer_size or end_of_file:
+          timestamp = (seconds * 1000000) + microseconds
+          yield timestamp, buffer_data[header_end_offset:data_end_offset]
+
+          buffer_offset = data_end_offset
+          continue
+
+        read_size = max(read_size, data_end_offset - buffer_size)
+
+      elif end_of_file:
+        if buffer_offset < buffer_size:
+          parser_mediator.ProduceExtractionError(
+              u'truncated packet header at end of file')
+        break
+
+      data = file_object.read(read_size)
+      if not data:
+        end_of_file = True
+
+      buffer_data = b''.join([buffer_data[buffer_offset:], data])
+      buffer_offset = 0
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a PCAP file-like object.
 
@@ -736,7 +1018,7 @@ class PcapParser(interface.FileObjectParser):
 
     try:
       file_header = dpkt.pcap.FileHdr(data)
-      packet_header_class = dpkt.pcap.PktHdr
+      byte_order = b'>'
 
     except (dpkt.NeedData, dpkt.UnpackError) as exception:
       raise errors.UnableToParseFile(
@@ -746,7 +1028,7 @@ class PcapParser(interface.FileObjectParser):
     if file_header.magic == dpkt.pcap.PMUDPCT_MAGIC:
       try:
         file_header = dpkt.pcap.LEFileHdr(data)
-        packet_header_class = dpkt.pcap.LEPktHdr
+        byte_order = b'<'
 
       except (dpkt.NeedData, dpkt.UnpackError) as exception:
         raise errors.UnableToParseFile(
@@ -756,22 +1038,31 @@ class PcapParser(interface.FileObjectParser):
     elif file_header.magic != dpkt.pcap.TCPDUMP_MAGIC:
       raise errors.UnableToParseFile(u'Unsupported file signature')
 
+    streaming_mode = (
+        file_object.get_size() >= self.STREAMING_MINIMUM_FILE_SIZE)
+    if streaming_mode:
+      stream_table = StreamTable(
+          close_timeout=self.STREAM_CLOSE_TIMEOUT,
+          idle_timeout=self.STREAM_IDLE_TIMEOUT,
+          maximum_number_of_streams=self.MAXIMUM_NUMBER_OF_STREAMS,
+          maximum_stream_data_size=self.MAXIMUM_STREAM_DATA_SIZE)
+    else:
+      stream_table = StreamTable()
+
     packet_number = 1
-    connections = {}
     other_list = []
     trunc_list = []
 
-    data = file_object.read(dpkt.pcap.PktHdr.__hdr_len__)
-    while data:
-      packet_header = packet_header_class(data)
-      timestamp = (packet_header.tv_sec * 1000000) + packet_header.tv_usec
-      packet_data = file_object.read(packet_header.caplen)
+    for timestamp, packet_data in self._ReadPacketRecords(
+        parser_mediator, file_object, byte_order):
+      if parser_mediator.abort:
+        break
 
       ethernet_frame = dpkt.ethernet.Ethernet(packet_data)
 
       if ethernet_frame.type == dpkt.ethernet.ETH_TYPE_IP:
         self._ParseIPPacket(
-            connections, trunc_list, packet_number, timestamp,
+            stream_table, trunc_list, packet_number, timestamp,
             len(ethernet_frame), ethernet_frame.data)
 
       else:
@@ -779,69 +1070,26 @@ class PcapParser(interface.FileObjectParser):
             timestamp, packet_number, ethernet_frame, len(ethernet_frame)]
         other_list.append(packet_values)
 
+      if streaming_mode:
+        for stream_object in self._ParseOtherStreams(other_list, trunc_list):
+          self._ProduceStreamEvents(parser_mediator, stream_object)
+
+        other_list = []
+        trunc_list = []
+
+        for stream_object in stream_table.GetClosedStreams(timestamp):
+          self._ProduceConnectionEvents(parser_mediator, stream_object)
+
       packet_number += 1
-      data = file_object.read(dpkt.pcap.PktHdr.__hdr_len__)
 
     other_streams = self._ParseOtherStreams(other_list, trunc_list)
 
     for stream_object in sorted(
-        connections.values(), key=operator.attrgetter(u'start_time')):
-
-      if not stream_object.protocol == u'ICMP':
-        stream_object.Clean()
-
-      event_data = PcapEventData()
-      event_data.dest_ip = stream_object.dest_ip
-      event_data.dest_port = stream_object.dest_port
-      event_data.first_packet_id = min(stream_object.packet_id)
-      event_data.last_packet_id = max(stream_object.packet_id)
-      event_data.packet_count = len(stream_object.packet_id)
-      event_data.protocol = stream_object.protocol
-      event_data.size = stream_object.size
-      event_data.source_ip = stream_object.source_ip
-      event_data.source_port = stream_object.source_port
-      event_data.stream_data = repr(stream_object.stream_data[:50])
-      event_data.stream_type, event_data.protocol_data = (
-          stream_object.SpecialTypes())
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=min(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, eventdata.EventTimestamp.START_TIME)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=max(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, eventdata.EventTimestamp.END_TIME)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
+        stream_table.GetStreams(), key=operator.attrgetter(u'start_time')):
+      self._ProduceConnectionEvents(parser_mediator, stream_object)
 
     for stream_object in other_streams:
-      event_data = PcapEventData()
-      event_data.dest_ip = stream_object.dest_ip
-      event_data.dest_port = stream_object.dest_port
-      event_data.first_packet_id = min(stream_object.packet_id)
-      event_data.last_packet_id = max(stream_object.packet_id)
-      event_data.packet_count = len(stream_object.packet_id)
-      event_data.protocol = stream_object.protocol
-      event_data.size = stream_object.size
-      event_data.source_ip = stream_object.source_ip
-      event_data.source_port = stream_object.source_port
-      event_data.stream_data = repr(stream_object.stream_data[:50])
-      event_data.stream_type, event_data.protocol_data = (
-          stream_object.SpecialTypes())
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=min(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, eventdata.EventTimestamp.START_TIME)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=max(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, eventdata.EventTimestamp.END_TIME)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
+      self._ProduceStreamEvents(parser_mediator, stream_object)
 
 
 manager.ParsersManager.RegisterParser(PcapParser)
@@ -145,6 +145,8 @@ class PopularityContestParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'popularity_contest'
   DESCRIPTION = u'Parser for popularity contest log files.'
 
+  FIRST_LINE_HINT = r'POPULARITY-CONTEST-'
+
   _ASCII_PRINTABLES = pyparsing.printables
   if sys.version_info[0] < 3:
     _UNICODE_PRINTABLES = u''.join(
@@ -63,6 +63,8 @@ class SELinuxParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'selinux'
   DESCRIPTION = u'Parser for SELinux audit.log files.'
 
+  FIRST_LINE_HINT = r'type\s*='
+
   _SELINUX_KEY_VALUE_GROUP = pyparsing.Group(
       pyparsing.Word(pyparsing.alphanums).setResultsName(u'key') +
       pyparsing.Suppress(u'=') + (
@@ -66,6 +66,8 @@ class SkyDriveLogParser(text_parser.PyparsingMultiLineTextParser):
   NAME = u'skydrive_log'
   DESCRIPTION = u'Parser for OneDrive (or SkyDrive) log files.'
 
+  FIRST_LINE_HINT = r'######\s*Logging started\.'
+
   _ENCODING = u'utf-8'
 
   # Common SDF (SkyDrive Format) structures.
@@ -260,6 +262,8 @@ class SkyDriveOldLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'skydrive_log_old'
   DESCRIPTION = u'Parser for OneDrive (or SkyDrive) old log files.'
 
+  FIRST_LINE_HINT = r'\d{2}\s*-\s*\d{2}\s*-\s*\d{4}'
+
   _ENCODING = u'UTF-8-SIG'
 
   _FOUR_DIGITS = text_parser.PyparsingConstants.FOUR_DIGITS
@@ -1,16 +1,26 @@
 # -*- coding: utf-8 -*-
 """This file contains a SQLite parser."""
 
+import collections
+import hashlib
 import logging
 import os
 import tempfile
 
+from multiprocessing import util as multiprocessing_util
+
 # pylint: disable=wrong-import-order
 try:
   from pysqlite2 import dbapi2 as sqlite3
 except ImportError:
   import sqlite3
 
+try:
+  from urllib.request import pathname2url
+except ImportError:
+  from urllib import pathname2url  # pylint: disable=no-name-in-module
+
+from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as dfvfs_factory
 
 from plaso.lib import specification
@@ -81,10 +91,298 @@ class SQLiteCache(plugins.BasePluginCache):
       row = sql_results.fetchone()
 
 
+class SQLiteTemporaryCopy(object):
+  """Class that contains a temporary copy of a SQLite database file.
+
+  Attributes:
+    data_size (int): size of the database and WAL file data.
+    path (str): path of the temporary copy of the database file.
+    reference_count (int): number of databases that use the temporary copy.
+    wal_path (str): path of the temporary copy of the WAL file or None.
+  """
+
+  def __init__(self, path, data_size, wal_path=None):
+    """Initializes a temporary copy.
+
+    Args:
+      path (str): path of the temporary copy of the database file.
+      data_size (int): size of the database and WAL file data.
+      wal_path (Optional[str]): path of the temporary copy of the WAL file.
+    """
+    super(SQLiteTemporaryCopy, self).__init__()
+    self.data_size = data_size
+    self.path = path
+    self.reference_count = 0
+    self.wal_path = wal_path
+
+
+class SQLiteTemporaryCopyCache(object):
+  """Cache of temporary copies of SQLite database files.
+
+  Since pysqlite cannot read directly from a file-like object, databases
+  are copied to a temporary file. The cache keeps the temporary copies of
+  recently used databases, addressed by the SHA-256 of their content, so
+  that databases with the same content, such as a database stored in
+  multiple volume shadow snapshots, are only copied once per process.
+
+  The temporary copies are removed when the process exits.
+  """
+
+  # Maximum total data size of the temporary copies that are kept after
+  # they are no longer used.
+  _MAXIMUM_CACHED_DATA_SIZE = 256 * 1024 * 1024
+
+  _READ_BUFFER_SIZE = 65536
+
+  def __init__(self):
+    """Initializes a temporary copy cache."""
+    super(SQLiteTemporaryCopyCache, self).__init__()
+    self._cached_data_size = 0
+    self._finalizer = None
+    self._process_identifier = None
+    self._temporary_copies = collections.OrderedDict()
+    self._temporary_copies_per_path = {}
+
+  def _CalculateDigest(self, file_object):
+    """Calculates the SHA-256 digest of the contents of a file-like object.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+
+    Returns:
+      tuple: contains:
+
+        str: hexadecimal representation of the digest.
+        int: size of the data.
+    """
+    hash_context = hashlib.sha256()
+    data_size = 0
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(self._READ_BUFFER_SIZE)
+    while data:
+      hash_context.update(data)
+      data_size += len(data)
+      data = file_object.read(self._READ_BUFFER_SIZE)
+
+    return hash_context.hexdigest(), data_size
+
+  def _CopyFileObjectToTemporaryFile(self, file_object, temporary_file):
+    """Copies the contents of the file-like object to a temporary file.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      temporary_file (file): temporary file.
+    """
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(self._READ_BUFFER_SIZE)
+    while data:
+      temporary_file.write(data)
+      data = file_object.read(self._READ_BUFFER_SIZE)
+
+  def _CreateTemporaryCopy(
+      self, file_object, data_size, wal_file_object=None,
+      temporary_directory=None):
+    """Creates a temporary copy of a database.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object of the database.
+      data_size (int): size of the database and WAL file data.
+      wal_file_object (Optional[dfvfs.FileIO]): file-like object of
+          the Write-Ahead Log (WAL) file.
+      temporary_directory (Optional[str]): path of the directory for
+          temporary files.
+
+    Returns:
+      SQLiteTemporaryCopy: temporary copy.
+
+    Raises:
+      IOError: if the file-like object cannot be read.
+    """
+    temporary_file = tempfile.NamedTemporaryFile(
+        delete=False, dir=temporary_directory)
+
+    try:
+      self._CopyFileObjectToTemporaryFile(file_object, temporary_file)
+
+    except IOError:
+      temporary_file.close()
+      os.remove(temporary_file.name)
+      raise
+
+    finally:
+      temporary_file.close()
+
+    temporary_copy = SQLiteTemporaryCopy(temporary_file.name, data_size)
+
+    if wal_file_object:
+      # Create WAL file using same filename so it is available for
+      # sqlite3.connect()
+      temporary_filename = u'{0:s}-wal'.format(temporary_copy.path)
+      temporary_file = open(temporary_filename, 'wb')
+      try:
+        self._CopyFileObjectToTemporaryFile(wal_file_object, temporary_file)
+        temporary_copy.wal_path = temporary_filename
+
+      except IOError:
+        temporary_file.close()
+        self._RemoveTemporaryCopy(temporary_copy)
+        raise
+
+      finally:
+        temporary_file.close()
+
+    return temporary_copy
+
+  def _RemoveTemporaryCopy(self, temporary_copy):
+    """Removes the files of a temporary copy.
+
+    Args:
+      temporary_copy (SQLiteTemporaryCopy): temporary copy.
+    """
+    # Note that SQLite can create the WAL and shared-memory files, even if
+    # the database was not copied with a WAL file.
+    paths = [temporary_copy.path]
+    for suffix in (u'-journal', u'-shm', u'-wal'):
+      paths.append(u'{0:s}{1:s}'.format(temporary_copy.path, suffix))
+
+    for path in paths:
+      if not os.path.exists(path):
+        continue
+
+      try:
+        os.remove(path)
+      except (OSError, IOError) as exception:
+        logging.warning(
+            u'Unable to remove temporary copy: {0:s} with error: {1!s}'.format(
+                path, exception))
+
+  def _RemoveUnusedTemporaryCopies(self):
+    """Removes the least recently used temporary copies that are not used.
+
+    Temporary copies are removed until the total data size of the cached
+    temporary copies is within the maximum.
+    """
+    for key, temporary_copy in list(self._temporary_copies.items()):
+      if self._cached_data_size <= self._MAXIMUM_CACHED_DATA_SIZE:
+        break
+
+      if temporary_copy.reference_count > 0:
+        continue
+
+      del self._temporary_copies[key]
+      del self._temporary_copies_per_path[temporary_copy.path]
+      self._cached_data_size -= temporary_copy.data_size
+
+      self._RemoveTemporaryCopy(temporary_copy)
+
+  def _ResetForProcess(self):
+    """Resets the cache if it is used by a different process.
+
+    A child process can inherit the cache of its parent process, in which
+    case the temporary copies are owned by the parent process.
+    """
+    process_identifier = os.getpid()
+    if self._process_identifier == process_identifier:
+      return
+
+    self._cached_data_size = 0
+    self._process_identifier = process_identifier
+    self._temporary_copies = collections.OrderedDict()
+    self._temporary_copies_per_path = {}
+
+    # Note that multiprocessing runs the finalizers when a process exits,
+    # which includes worker processes that do not run atexit handlers.
+    self._finalizer = multiprocessing_util.Finalize(
+        self, self.Clear, exitpriority=10)
+
+  def Clear(self):
+    """Removes all temporary copies."""
+    if self._process_identifier != os.getpid():
+      return
+
+    for temporary_copy in self._temporary_copies.values():
+      self._RemoveTemporaryCopy(temporary_copy)
+
+    self._cached_data_size = 0
+    self._temporary_copies = collections.OrderedDict()
+    self._temporary_copies_per_path = {}
+
+  def GetTemporaryCopy(
+      self, file_object, wal_file_object=None, temporary_directory=None):
+    """Retrieves a temporary copy of a database.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object of the database.
+      wal_file_object (Optional[dfvfs.FileIO]): file-like object of
+          the Write-Ahead Log (WAL) file.
+      temporary_directory (Optional[str]): path of the directory for
+          temporary files.
+
+    Returns:
+      str: path of the temporary copy of the database file.
+
+    Raises:
+      IOError: if the file-like object cannot be read.
+    """
+    self._ResetForProcess()
+
+    key, data_size = self._CalculateDigest(file_object)
+    if wal_file_object:
+      wal_digest, wal_data_size = self._CalculateDigest(wal_file_object)
+      key = u'{0:s}:{1:s}'.format(key, wal_digest)
+      data_size += wal_data_size
+
+    temporary_copy = self._temporary_copies.pop(key, None)
+    if not temporary_copy:
+      temporary_copy = self._CreateTemporaryCopy(
+          file_object, data_size, wal_file_object=wal_file_object,
+          temporary_directory=temporary_directory)
+
+      self._cached_data_size += data_size
+      self._temporary_copies_per_path[temporary_copy.path] = key
+
+    # Mark the temporary copy as most recently used.
+    self._temporary_copies[key] = temporary_copy
+
+    temporary_copy.reference_count += 1
+    return temporary_copy.path
+
+  def ReleaseTemporaryCopy(self, path):
+    """Releases a temporary copy of a database.
+
+    Args:
+      path (str): path of the temporary copy of the database file.
+    """
+    key = self._temporary_copies_per_path.get(path, None)
+    if not key:
+      return
+
+    temporary_copy = self._temporary_copies[key]
+    temporary_copy.reference_count -= 1
+
+    if (temporary_copy.reference_count <= 0 and
+        temporary_copy.data_size > self._MAXIMUM_CACHED_DATA_SIZE):
+      del self._temporary_copies[key]
+      del self._temporary_copies_per_path[path]
+      self._cached_data_size -= temporary_copy.data_size
+
+      self._RemoveTemporaryCopy(temporary_copy)
+
+    self._RemoveUnusedTemporaryCopies()
+
+
 class SQLiteDatabase(object):
   """A simple wrapper for opening up a SQLite database."""
 
-  _READ_BUFFER_SIZE = 65536
+  _FILE_HEADER_SIZE = 100
+
+  # The file format write and read versions of a database that uses
+  # a rollback journal instead of Write-Ahead Logging (WAL).
+  _LEGACY_FILE_FORMAT_VERSIONS = b'\x01\x01'
+
+  # The temporary copies are shared by all databases opened by the process.
+  _temporary_copy_cache = SQLiteTemporaryCopyCache()
 
   def __init__(self, filename, temporary_directory=None):
     """Initializes the database object.
@@ -100,63 +398,66 @@ class SQLiteDatabase(object):
     self._table_names = []
     self._temp_db_file_path = u''
     self._temporary_directory = temporary_directory
-    self._temp_wal_file_path = u''
 
   @property
   def tables(self):
     """list[str]: names of all the tables."""
     return self._table_names
 
-  def _CopyFileObjectToTemporaryFile(self, file_object, temporary_file):
-    """Copies the contents of the file-like object to a temporary file.
+  def _ConnectReadOnly(self, file_object, path):
+    """Connects to a database file on the operating system in read-only mode.
+
+    The database file is only opened directly if it does not use Write-Ahead
+    Logging (WAL) and has no rollback journal file, since SQLite creates or
+    changes these files even when the database is opened in read-only mode.
 
     Args:
-      file_object (dfvfs.FileIO): file-like object.
-      temporary_file (file): temporary file.
+      file_object (dfvfs.FileIO): file-like object of the database.
+      path (str): path of the database file.
+
+    Returns:
+      sqlite3.Connection: database connection or None if the database file
+          cannot be opened directly.
     """
     file_object.seek(0, os.SEEK_SET)
-    data = file_object.read(self._READ_BUFFER_SIZE)
-    while data:
-      temporary_file.write(data)
-      data = file_object.read(self._READ_BUFFER_SIZE)
+    file_header = file_object.read(self._FILE_HEADER_SIZE)
+    if file_header[18:20] != self._LEGACY_FILE_FORMAT_VERSIONS:
+      return
+
+    for suffix in (u'-journal', u'-shm', u'-wal'):
+      if os.path.exists(u'{0:s}{1:s}'.format(path, suffix)):
+        return
+
+    uri = u'file:{0:s}?immutable=1&mode=ro'.format(pathname2url(path))
+
+    try:
+      # Note that URI filenames are not supported by Python 2.
+      return sqlite3.connect(uri, uri=True)
+
+    except (TypeError, sqlite3.Error):
+      return
 
   def Close(self):
-    """Closes the database connection and clean up the temporary file."""
+    """Closes the database connection and releases the temporary copy."""
     self._table_names = []
 
     if self._is_open:
       self._database.close()
     self._database = None
 
-    if os.path.exists(self._temp_db_file_path):
-      try:
-        os.remove(self._temp_db_file_path)
-      except (OSError, IOError) as exception:
-        logging.warning((
-            u'Unable to remove temporary copy: {0:s} of SQLite database: '
-            u'{1:s} with error: {2:s}').format(
-                self._temp_db_file_path, self._filename, exception))
+    if self._temp_db_file_path:
+      self._temporary_copy_cache.ReleaseTemporaryCopy(self._temp_db_file_path)
 
     self._temp_db_file_path = u''
 
-    if os.path.exists(self._temp_wal_file_path):
-      try:
-        os.remove(self._temp_wal_file_path)
-      except (OSError, IOError) as exception:
-        logging.warning((
-            u'Unable to remove temporary copy: {0:s} of SQLite database: '
-            u'{1:s} with error: {2:s}').format(
-                self._temp_wal_file_path, self._filename, exception))
-
-    self._temp_wal_file_path = u''
-
     self._is_open = False
 
-  def Open(self, file_object, wal_file_object=None):
+  def Open(self, file_object, wal_file_object=None, os_path=None):
     """Opens a SQLite database file.
 
     Since pysqlite cannot read directly from a file-like object a temporary
-    copy of the file is made. After creating a copy the database file this
+    copy of the file is made. The temporary copies are shared by databases
+    with the same content. After creating a copy the database file this
     function sets up a connection with the database and determines the names
     of the tables.
 
@@ -164,6 +465,9 @@ class SQLiteDatabase(object):
       file_object (dfvfs.FileIO): file-like object.
       wal_file_object (Optional[dfvfs.FileIO]): file-like object for the
           Write-Ahead Log (WAL) file.
+      os_path (Optional[str]): path of the database file on the operating
+          system, which is opened directly in read-only mode, instead of
+          being copied, if supported.
 
     Raises:
       IOError: if the file-like object cannot be read.
@@ -173,50 +477,23 @@ class SQLiteDatabase(object):
     if not file_object:
       raise ValueError(u'Missing file object.')
 
-    # TODO: Current design copies the entire file into a buffer
-    # that is parsed by each SQLite parser. This is not very efficient,
-    # especially when many SQLite parsers are ran against a relatively
-    # large SQLite database. This temporary file that is created should
-    # be usable by all SQLite parsers so the file should only be read
-    # once in memory and then deleted when all SQLite parsers have completed.
-
     # TODO: Change this into a proper implementation using APSW
     # and virtual filesystems when that will be available.
     # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
     # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
-    # Until then, just copy the file into a tempfile and parse it.
+    # Until then, copy the file into a tempfile and parse it.
 
-    temporary_file = tempfile.NamedTemporaryFile(
-        delete=False, dir=self._temporary_directory)
+    if os_path and not wal_file_object:
+      self._database = self._ConnectReadOnly(file_object, os_path)
 
-    try:
-      self._CopyFileObjectToTemporaryFile(file_object, temporary_file)
-      self._temp_db_file_path = temporary_file.name
-
-    except IOError:
-      os.remove(temporary_file.name)
-      raise
-
-    finally:
-      temporary_file.close()
-
-    if wal_file_object:
-      # Create WAL file using same filename so it is available for
-      # sqlite3.connect()
-      temporary_filename = u'{0:s}-wal'.format(self._temp_db_file_path)
-      temporary_file = open(temporary_filename, 'wb')
-      try:
-        self._CopyFileObjectToTemporaryFile(wal_file_object, temporary_file)
-        self._temp_wal_file_path = temporary_filename
+    if not self._database:
+      self._temp_db_file_path = (
+          self._temporary_copy_cache.GetTemporaryCopy(
+              file_object, wal_file_object=wal_file_object,
+              temporary_directory=self._temporary_directory))
 
-      except IOError:
-        os.remove(temporary_filename)
-        raise
+      self._database = sqlite3.connect(self._temp_db_file_path)
 
-      finally:
-        temporary_file.close()
-
-    self._database = sqlite3.connect(self._temp_db_file_path)
     try:
       self._database.row_factory = sqlite3.Row
       cursor = self._database.cursor()
@@ -230,11 +507,10 @@ class SQLiteDatabase(object):
       self._database.close()
       self._database = None
 
-      os.remove(self._temp_db_file_path)
-      self._temp_db_file_path = u''
-      if self._temp_wal_file_path:
-        os.remove(self._temp_wal_file_path)
-        self._temp_wal_file_path = u''
+      if self._temp_db_file_path:
+        self._temporary_copy_cache.ReleaseTemporaryCopy(
+            self._temp_db_file_path)
+        self._temp_db_file_path = u''
 
       logging.debug(
           u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
@@ -340,9 +616,15 @@ class SQLiteParser(interface.FileEntryParser):
     database = SQLiteDatabase(
         filename, temporary_directory=parser_mediator.temporary_directory)
 
+    # A database that is stored directly on the operating system does not
+    # need to be copied.
+    os_path = None
+    if file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_OS:
+      os_path = getattr(file_entry.path_spec, u'location', None)
+
     file_object = file_entry.GetFileObject()
     try:
-      database.Open(file_object)
+      database.Open(file_object, os_path=os_path)
 
     except (IOError, ValueError, sqlite3.DatabaseError) as exception:
       parser_mediator.ProduceExtractionError(
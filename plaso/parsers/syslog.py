@@ -61,6 +61,10 @@ class SyslogParser(text_parser.PyparsingMultiLineTextParser):
 
   DESCRIPTION = u'Syslog Parser'
 
+  FIRST_LINE_HINT = (
+      r'(?:\w{3}\s+\d{1,2}\s\d{2}:\d{2}:\d{2}\s|'
+      r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.)')
+
   _ENCODING = u'utf-8'
 
   _plugin_classes = {}
@@ -7,8 +7,10 @@ parser.
 """
 
 import abc
+import bisect
 import csv
 import logging
+import re
 
 import pyparsing
 
@@ -369,6 +371,109 @@ class PyparsingConstants(object):
       pyparsing.nums, min=1, max=5).setParseAction(PyParseIntCast)
 
 
+class RegularExpressionParseResults(dict):
+  """Values of a line parsed with a regular expression line structure.
+
+  The values can be accessed as attributes, like the values of
+  pyparsing.ParseResults, where a missing value is represented by an empty
+  string.
+  """
+
+  def __getattr__(self, name):
+    """Retrieves a value.
+
+    Args:
+      name (str): name of the value.
+
+    Returns:
+      object: value or an empty string if not available.
+
+    Raises:
+      AttributeError: if the name refers to a special attribute.
+    """
+    if name.startswith(u'__'):
+      raise AttributeError(name)
+
+    return self.get(name, u'')
+
+
+class RegularExpressionLineStructure(object):
+  """Line structure defined by a regular expression.
+
+  A regular expression line structure is a faster alternative for
+  a pyparsing line structure. The values of the named groups of the regular
+  expression are provided as RegularExpressionParseResults, which can be
+  handled by ParseRecord as if it were pyparsing.ParseResults. Named groups
+  of which the name starts with an underscore are only used as part of
+  a list value.
+  """
+
+  def __init__(self, expression, conversions=None, lists=None):
+    """Initializes a regular expression line structure.
+
+    Args:
+      expression (str): regular expression, which is matched at the start
+          of the line.
+      conversions (Optional[dict[str, function]]): functions that convert
+          the string values of named groups, per name of the group. A
+          conversion function can raise ValueError to indicate the line
+          should be parsed by the pyparsing line structures instead.
+      lists (Optional[dict[str, tuple[str]]]): names of the named groups
+          that make up list values, per name of the list value. A list value
+          corresponds with a pyparsing structure of multiple tokens and is
+          only provided if all of its named groups matched.
+    """
+    super(RegularExpressionLineStructure, self).__init__()
+    self._regular_expression = re.compile(expression)
+
+    conversions = conversions or {}
+    self._conversions = [
+        (name, conversions.get(name, None))
+        for name in self._regular_expression.groupindex.keys()]
+    self._hidden_names = [
+        name for name in self._regular_expression.groupindex.keys()
+        if name.startswith(u'_')]
+    self._lists = sorted((lists or {}).items())
+
+  def Match(self, line):
+    """Matches a line.
+
+    Args:
+      line (str): line.
+
+    Returns:
+      RegularExpressionParseResults: values of the named groups or None if
+          the line does not match or a value could not be converted.
+    """
+    match = self._regular_expression.match(line)
+    if not match:
+      return
+
+    structure = RegularExpressionParseResults()
+    for name, conversion in self._conversions:
+      value = match.group(name)
+      if value is None:
+        continue
+
+      if conversion:
+        try:
+          value = conversion(value)
+        except ValueError:
+          return
+
+      structure[name] = value
+
+    for name, group_names in self._lists:
+      values = [structure.get(group_name, None) for group_name in group_names]
+      if None not in values:
+        structure[name] = values
+
+    for name in self._hidden_names:
+      structure.pop(name, None)
+
+    return structure
+
+
 class PyparsingSingleLineTextParser(interface.FileObjectParser):
   """Single line text parser based on the pyparsing library."""
 
@@ -384,6 +489,15 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
   # The value is the actual pyparsing structure.
   LINE_STRUCTURES = []
 
+  # Optional regular expression line structures, which are tried before the
+  # pyparsing line structures. This is defined as a list of tuples of a key
+  # and a RegularExpressionLineStructure. A line that matches a regular
+  # expression line structure is not parsed with pyparsing, hence it should
+  # only match lines that the pyparsing line structure with the same key
+  # parses into the same values. Lines that match none of the regular
+  # expression line structures are parsed with the pyparsing line structures.
+  REGULAR_EXPRESSION_LINE_STRUCTURES = []
+
   # In order for the tool to not read too much data into a buffer to evaluate
   # whether or not the parser is the right one for this file or not we
   # specifically define a maximum amount of bytes a single line can occupy. This
@@ -409,8 +523,39 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
     # TODO: self._line_structures is a work-around and this needs
     # a structural fix.
     self._line_structures = self.LINE_STRUCTURES
+    self._regular_expression_line_structures = (
+        self.REGULAR_EXPRESSION_LINE_STRUCTURES)
     self.encoding = self._ENCODING
 
+  def _ParseLine(self, line):
+    """Parses a line with the line structures.
+
+    Args:
+      line (str): line.
+
+    Returns:
+      tuple: contains:
+
+        str: key of the line structure that matched the line or None.
+        pyparsing.ParseResults|RegularExpressionParseResults: structure of
+            tokens derived from the line or None.
+    """
+    for key, structure in self._regular_expression_line_structures:
+      parsed_structure = structure.Match(line)
+      if parsed_structure is not None:
+        return key, parsed_structure
+
+    for key, structure in self.LINE_STRUCTURES:
+      try:
+        parsed_structure = structure.parseString(line)
+      except pyparsing.ParseException:
+        parsed_structure = None
+
+      if parsed_structure:
+        return key, parsed_structure
+
+    return None, None
+
   def _ReadLine(
       self, parser_mediator, text_file_object, max_len=0, quiet=False, depth=0):
     """Reads a line from a text file.
@@ -502,18 +647,9 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
     while line:
       if parser_mediator.abort:
         break
-      parsed_structure = None
-      use_key = None
-      # Try to parse the line using all the line structures.
-      for key, structure in self.LINE_STRUCTURES:
-        try:
-          parsed_structure = structure.parseString(line)
-        except pyparsing.ParseException:
-          pass
-        if parsed_structure:
-          use_key = key
-          break
 
+      # Try to parse the line using all the line structures.
+      use_key, parsed_structure = self._ParseLine(line)
       if parsed_structure:
         parsed_event = self.ParseRecord(
             parser_mediator, use_key, parsed_structure)
@@ -541,7 +677,8 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfvfs.
       key (str): name of the parsed structure.
-      structure (pyparsing.ParseResults): tokens from a parsed log line.
+      structure (pyparsing.ParseResults|RegularExpressionParseResults): tokens
+          from a parsed log line.
 
     Returns:
       EventObject: event or None.
@@ -565,7 +702,19 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
 
 
 class EncodedTextReader(object):
-  """Class to read simple encoded text."""
+  """Class to read simple encoded text.
+
+  The text is read and decoded in blocks of at least the buffer size that end
+  at a line boundary. The decoded text is kept in a buffer together with the
+  current position, hence consuming text does not copy the buffer. The buffer
+  is only compacted and filled when the remaining text becomes smaller than
+  the buffer size. The byte offset of the current position in the file-like
+  object is derived from the decoded blocks and lines.
+  """
+
+  # The maximum number of characters the buffer is extended to in order to
+  # match a structure.
+  _MAXIMUM_MATCH_SIZE = 1024 * 1024
 
   def __init__(self, buffer_size=2048, encoding=None):
     """Initializes the encoded test reader object.
@@ -577,61 +726,324 @@ class EncodedTextReader(object):
     super(EncodedTextReader, self).__init__()
     self._buffer = b''
     self._buffer_size = buffer_size
-    self._current_offset = 0
-    self._encoding = encoding
-
-    if self._encoding:
-      self._new_line = u'\n'.encode(self._encoding)
-      self._carriage_return = u'\r'.encode(self._encoding)
-    else:
-      self._new_line = b'\n'
-      self._carriage_return = b'\r'
+    self._decoded_offset = 0
+    self._encoding = encoding or u'ascii'
+    self._end_of_file = False
+    self._position = 0
+    self._segment_positions = []
+    self._segments = []
+    self._text = u''
+
+    # Encodings such as UTF-8-SIG prefix encoded text with a byte order mark.
+    self._byte_order_mark = u''.encode(self._encoding)
+    byte_order_mark_length = len(self._byte_order_mark)
+
+    self._new_line = u'\n'.encode(self._encoding)[byte_order_mark_length:]
+    self._carriage_return = u'\r'.encode(self._encoding)[
+        byte_order_mark_length:]
 
     self._new_line_length = len(self._new_line)
     self._carriage_return_length = len(self._carriage_return)
 
-    self.lines = u''
+  @property
+  def lines(self):
+    """str: remaining text in the buffer."""
+    return self._text[self._position:]
 
-  def _ReadLine(self, file_object):
-    """Reads a line from the file object.
+  def _AppendSegments(self, lines):
+    """Appends decoded lines to the buffer.
 
     Args:
-      file_object (dfvfs.FileIO): file-like object.
+      lines (list[tuple[str, int, int]]): decoded text, byte offset of the
+          text in the file-like object and size of the encoded text without
+          a carriage return and new line at the end, per line or block of
+          lines.
+    """
+    position = len(self._text)
+    for text, offset, size in lines:
+      end_position = position + len(text)
+      if text.endswith(u'\n'):
+        end_position -= 1
 
-    Returns:
-      str: line read from the file-like object.
+      # The byte offset in text with single byte characters can be derived
+      # from the position, for other text the size of the encoded text after
+      # the position is determined when needed.
+      if end_position - position == size:
+        size = None
+
+      self._segment_positions.append(position)
+      self._segments.append((position, offset, end_position, size))
+      position += len(text)
+
+    self._text = u''.join([self._text] + [text for text, _, _ in lines])
+
+  def _DecodeLines(self, data, lines_size):
+    """Decodes lines and appends them to the buffer.
+
+    Carriage returns before the new lines are stripped from the text. Data
+    with single byte characters is decoded at once, otherwise the lines are
+    decoded one by one until the buffer contains the minimum number of
+    characters and the remaining lines are kept undecoded.
+
+    Args:
+      data (bytes): encoded lines, where only the last line can be without
+          a new line at the end of the file.
+      lines_size (int): minimum number of characters in the buffer.
+
+    Raises:
+      UnicodeDecodeError: if a line cannot be decoded. The lines before it
+          are appended to the buffer and the line is skipped.
     """
-    if len(self._buffer) < self._buffer_size:
-      self._buffer = b''.join([
-          self._buffer, file_object.read(self._buffer_size)])
+    if self._carriage_return not in data:
+      try:
+        text = data.decode(self._encoding)
+      except UnicodeDecodeError:
+        text = None
 
-    line, new_line, self._buffer = self._buffer.partition(self._new_line)
-    if not line and not new_line:
-      line = self._buffer
-      self._buffer = b''
+      if text is not None and len(text) == len(data):
+        size = len(data)
+        if text.endswith(u'\n'):
+          size -= self._new_line_length
 
-    self._current_offset += len(line)
+        self._AppendSegments([(text, self._decoded_offset, size)])
+        self._decoded_offset += len(data)
+        return
 
-    # Strip carriage returns from the text.
-    if line.endswith(self._carriage_return):
-      line = line[:-self._carriage_return_length]
+    # The last line is without a new line, and empty if the data ends with
+    # a new line.
+    lines = data.split(self._new_line)
+    number_of_new_lines = len(lines) - 1
+    if not lines[-1]:
+      lines.pop()
+
+    decoded_lines = []
+    offset = self._decoded_offset
+    text_size = len(self._text)
+    for line_index, line in enumerate(lines):
+      if text_size >= lines_size:
+        remaining_data = data[offset - self._decoded_offset:]
+        self._buffer = b''.join([remaining_data, self._buffer])
+        break
+
+      has_new_line = line_index < number_of_new_lines
 
-    if new_line:
-      line = b''.join([line, self._new_line])
-      self._current_offset += self._new_line_length
+      size = len(line)
+      if line.endswith(self._carriage_return):
+        size -= self._carriage_return_length
+
+      line_size = len(line)
+      if has_new_line:
+        line_size += self._new_line_length
 
-    # If a parser specifically indicates specific encoding we need
-    # to handle the buffer as it is an encoded string.
-    # If it fails we fail back to the original raw string.
-    if self._encoding:
       try:
-        line = line.decode(self._encoding)
+        text = line[:size].decode(self._encoding)
       except UnicodeDecodeError:
-        # TODO: it might be better to raise here.
-        pass
+        self._AppendSegments(decoded_lines)
+        remaining_data = data[offset + line_size - self._decoded_offset:]
+        self._buffer = b''.join([remaining_data, self._buffer])
+        self._decoded_offset = offset + line_size
+        raise
+
+      if has_new_line:
+        text = u''.join([text, u'\n'])
 
+      decoded_lines.append((text, offset, size))
+      offset += line_size
+      text_size += len(text)
+
+    self._AppendSegments(decoded_lines)
+    self._decoded_offset = offset
+
+  def _MatchStructure(self, structure):
+    """Matches a pyparsing structure at the current position of the buffer.
+
+    Args:
+      structure (pyparsing.ParserElement): structure.
+
+    Returns:
+      tuple: contains:
+
+        pyparsing.ParseResults: tokens of the structure or None if the
+            structure does not match at the current position.
+        int: number of characters matched.
+    """
+    try:
+      if structure.preParse(self._text, self._position) != self._position:
+        return None, 0
+
+      # pylint: disable=protected-access
+      end_position, tokens = structure._parse(
+          self._text, self._position, callPreParse=False)
+    except pyparsing.ParseException:
+      return None, 0
+
+    if end_position <= self._position:
+      return None, 0
+
+    return tokens, end_position - self._position
+
+  def _ReadLineFromBuffer(self):
+    """Reads a line from the buffer.
+
+    Returns:
+      str: line, without the new line, read from the buffer.
+    """
+    end_position = self._text.find(u'\n', self._position)
+    if end_position == -1:
+      end_position = len(self._text)
+
+    line = self._text[self._position:end_position]
+    self._position = min(end_position + 1, len(self._text))
     return line
 
+  def _ReadLines(self, file_object, lines_size):
+    """Reads lines into the buffer.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      lines_size (int): minimum number of characters of the remaining text
+          in the buffer.
+
+    Raises:
+      UnicodeDecodeError: if a line cannot be decoded.
+    """
+    if len(self._text) - self._position >= lines_size:
+      return
+
+    if self._position:
+      if self._position >= len(self._text):
+        segments = []
+      else:
+        segment_index = bisect.bisect_right(
+            self._segment_positions, self._position) - 1
+        segments = self._segments[segment_index:]
+
+      self._segments = []
+      for position, offset, end_position, size in segments:
+        # The position of a partially consumed segment is moved to the start
+        # of the buffer if the offset can be derived from it, otherwise it
+        # is kept before the start of the buffer.
+        if position < self._position and size is None:
+          offset += self._position - position
+          position = self._position
+
+        self._segments.append((
+            position - self._position, offset,
+            end_position - self._position, size))
+
+      self._segment_positions = [segment[0] for segment in self._segments]
+      self._text = self._text[self._position:]
+      self._position = 0
+
+    while len(self._text) < lines_size:
+      data_size = self._buffer.rfind(self._new_line)
+      if data_size != -1:
+        data_size += self._new_line_length
+
+      elif self._end_of_file or len(self._buffer) >= self._buffer_size:
+        # A line that does not fit in the buffer is decoded in parts, where
+        # a character that is split by the end of a part is kept undecoded.
+        data_size = len(self._buffer)
+        if not data_size:
+          break
+
+        if not self._end_of_file:
+          try:
+            self._buffer.decode(self._encoding)
+          except UnicodeDecodeError as exception:
+            # The positions in the exception are relative to the data after
+            # a byte order mark.
+            object_size = len(exception.object)
+            if exception.start > 0 and exception.end == object_size:
+              data_size -= object_size - exception.start
+
+      else:
+        read_size = max(lines_size - len(self._text), self._buffer_size)
+        data = file_object.read(read_size)
+        if not data:
+          self._end_of_file = True
+        else:
+          self._buffer = b''.join([self._buffer, data])
+        continue
+
+      data = self._buffer[:data_size]
+      self._buffer = self._buffer[data_size:]
+      self._DecodeLines(data, lines_size)
+
+  def GetOffset(self):
+    """Retrieves the byte offset of the current position.
+
+    Returns:
+      int: byte offset of the current position in the file-like object.
+    """
+    if self._position >= len(self._text):
+      return self._decoded_offset
+
+    segment_index = bisect.bisect_right(
+        self._segment_positions, self._position) - 1
+    position, offset, end_position, size = self._segments[segment_index]
+
+    if self._position == position:
+      return offset
+
+    if size is None:
+      return offset + self._position - position
+
+    if self._position >= end_position:
+      return offset + size
+
+    encoded_text = self._text[self._position:end_position].encode(
+        self._encoding)
+    return offset + size - len(encoded_text) + len(self._byte_order_mark)
+
+  def HasLines(self):
+    """Determines if there is remaining text in the buffer.
+
+    Returns:
+      bool: True if there is remaining text in the buffer.
+    """
+    return self._position < len(self._text)
+
+  def MatchStructure(self, file_object, structure):
+    """Matches a pyparsing structure at the current position.
+
+    The structure only matches if it does not need to skip leading white
+    space, which is equivalent to scanning the remaining text and only
+    accepting a match at the start. A match that extends to the end of the
+    buffer could have been truncated, hence the buffer is extended and the
+    structure matched again, until the match ends before the end of the
+    buffer, the end of the file is reached or the remaining text exceeds
+    the maximum match size.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      structure (pyparsing.ParserElement): structure, which should keep tabs
+          and be streamlined.
+
+    Returns:
+      tuple: contains:
+
+        pyparsing.ParseResults: tokens of the structure or None if the
+            structure does not match at the current position.
+        int: number of characters matched.
+
+    Raises:
+      UnicodeDecodeError: if a line cannot be decoded.
+    """
+    tokens, number_of_characters = self._MatchStructure(structure)
+
+    lines_size = len(self._text) - self._position
+    while (tokens is not None and number_of_characters >= lines_size and
+           lines_size < self._MAXIMUM_MATCH_SIZE):
+      self._ReadLines(file_object, lines_size * 2)
+      if len(self._text) - self._position == lines_size:
+        break
+
+      tokens, number_of_characters = self._MatchStructure(structure)
+      lines_size = len(self._text) - self._position
+
+    return tokens, number_of_characters
+
   def ReadLine(self, file_object):
     """Reads a line.
 
@@ -641,36 +1053,38 @@ class EncodedTextReader(object):
     Returns:
       str: line read from the lines buffer.
     """
-    line, _, self.lines = self.lines.partition(u'\n')
+    line = self._ReadLineFromBuffer()
     if not line:
       self.ReadLines(file_object)
-      line, _, self.lines = self.lines.partition(u'\n')
+      line = self._ReadLineFromBuffer()
 
     return line
 
   def ReadLines(self, file_object):
     """Reads lines into the lines buffer.
 
+    Lines are only read when the remaining text is smaller than the buffer
+    size, in which case at least the buffer size of text is added.
+
     Args:
       file_object (dfvfs.FileIO): file-like object.
+
+    Raises:
+      UnicodeDecodeError: if a line cannot be decoded.
     """
-    lines_size = len(self.lines)
+    lines_size = len(self._text) - self._position
     if lines_size < self._buffer_size:
-      lines_size = self._buffer_size - lines_size
-      while lines_size > 0:
-        line = self._ReadLine(file_object)
-        if not line:
-          break
-
-        self.lines = u''.join([self.lines, line])
-        lines_size -= len(line)
+      self._ReadLines(file_object, lines_size + self._buffer_size)
 
   def Reset(self):
     """Resets the encoded text reader."""
     self._buffer = b''
-    self._current_offset = 0
-
-    self.lines = u''
+    self._decoded_offset = 0
+    self._end_of_file = False
+    self._position = 0
+    self._segment_positions = []
+    self._segments = []
+    self._text = u''
 
   def SkipAhead(self, file_object, number_of_characters):
     """Skips ahead a number of characters.
@@ -679,17 +1093,17 @@ class EncodedTextReader(object):
       file_object (dfvfs.FileIO): file-like object.
       number_of_characters (int): number of characters.
     """
-    lines_size = len(self.lines)
+    lines_size = len(self._text) - self._position
     while number_of_characters >= lines_size:
       number_of_characters -= lines_size
 
-      self.lines = u''
+      self._position = len(self._text)
       self.ReadLines(file_object)
-      lines_size = len(self.lines)
+      lines_size = len(self._text) - self._position
       if lines_size == 0:
         return
 
-    self.lines = self.lines[number_of_characters:]
+    self._position += number_of_characters
 
 
 class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
@@ -734,41 +1148,40 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
 
     # Using parseWithTabs() overrides Pyparsing's default replacement of tabs
     # with spaces to SkipAhead() the correct number of bytes after a match.
-    for key, structure in self.LINE_STRUCTURES:
+    # The structures are streamlined once since they are matched directly
+    # at the current position instead of using scanString().
+    for _, structure in self.LINE_STRUCTURES:
       structure.parseWithTabs()
+      structure.streamline()
 
     # Read every line in the text file.
-    while self._text_reader.lines:
+    while self._text_reader.HasLines():
       if parser_mediator.abort:
         break
 
-      # Initialize pyparsing objects.
+      self._current_offset = self._text_reader.GetOffset()
+
       tokens = None
-      start = 0
-      end = 0
+      number_of_characters = 0
 
       key = None
 
       # Try to parse the line using all the line structures.
-      for key, structure in self.LINE_STRUCTURES:
-        try:
-          structure_generator = structure.scanString(
-              self._text_reader.lines, maxMatches=1)
-          parsed_structure = next(structure_generator, None)
-        except pyparsing.ParseException:
-          parsed_structure = None
-
-        if not parsed_structure:
-          continue
-
-        tokens, start, end = parsed_structure
+      try:
+        for key, structure in self.LINE_STRUCTURES:
+          tokens, number_of_characters = self._text_reader.MatchStructure(
+              file_object, structure)
+          if tokens is not None:
+            break
 
-        # Only want to parse the structure if it starts
-        # at the beginning of the buffer.
-        if start == 0:
-          break
+      except UnicodeDecodeError as exception:
+        # The line that cannot be decoded is skipped, hence the line
+        # structures are matched again.
+        parser_mediator.ProduceExtractionError(
+            u'unable to read lines with error: {0:s}'.format(exception))
+        continue
 
-      if tokens and start == 0:
+      if tokens:
         try:
           self.ParseRecord(parser_mediator, key, tokens)
         except (errors.ParseError, errors.TimestampError) as exception:
@@ -776,7 +1189,7 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
               u'unable parse record: {0:s} with error: {1:s}'.format(
                   key, exception))
 
-        self._text_reader.SkipAhead(file_object, end)
+        self._text_reader.SkipAhead(file_object, number_of_characters)
 
       else:
         odd_line = self._text_reader.ReadLine(file_object)
@@ -784,7 +1197,8 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
           if len(odd_line) > 80:
             odd_line = u'{0:s}...'.format(odd_line[:77])
           parser_mediator.ProduceExtractionError(
-              u'unable to parse log line: {0:s}'.format(repr(odd_line)))
+              u'unable to parse log line: {0:s} at offset {1:d}'.format(
+                  repr(odd_line), self._current_offset))
 
       try:
         self._text_reader.ReadLines(file_object)
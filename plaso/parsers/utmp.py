@@ -11,6 +11,7 @@ from dfdatetime import posix_time as dfdatetime_posix_time
 
 from plaso.containers import events
 from plaso.containers import time_events
+from plaso.lib import buffered_reader
 from plaso.lib import errors
 from plaso.lib import eventdata
 from plaso.parsers import interface
@@ -117,22 +118,18 @@ class UtmpParser(interface.FileObjectParser):
       return default_string
     return text
 
-  def _ReadEntry(self, parser_mediator, file_object):
-    """Reads an UTMP entry.
+  def _ParseEntry(self, parser_mediator, offset, data):
+    """Parses an UTMP entry.
 
     Args:
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfvfs.
-      file_object (dfvfs.FileIO): a file-like object.
+      offset (int): offset of the UTMP entry.
+      data (bytes): UTMP entry data.
 
     Returns:
-      bool: True if the UTMP entry was successfully read.
+      bool: True if the UTMP entry was successfully parsed.
     """
-    offset = file_object.tell()
-    data = file_object.read(self.LINUX_UTMP_ENTRY_SIZE)
-    if not data or len(data) != self.LINUX_UTMP_ENTRY_SIZE:
-      return False
-
     try:
       entry = self.LINUX_UTMP_ENTRY.parse(data)
     except (IOError, construct.FieldError):
@@ -205,8 +202,10 @@ class UtmpParser(interface.FileObjectParser):
     Raises:
       UnableToParseFile: when the file cannot be parsed.
     """
+    reader = buffered_reader.BufferedReader(file_object)
+
     try:
-      structure = self.LINUX_UTMP_ENTRY.parse_stream(file_object)
+      structure = self.LINUX_UTMP_ENTRY.parse_stream(reader)
     except (IOError, construct.FieldError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse UTMP Header with error: {0:s}'.format(exception))
@@ -246,9 +245,10 @@ class UtmpParser(interface.FileObjectParser):
       raise errors.UnableToParseFile(
           u'Not an UTMP file, no timestamp set in the first record.')
 
-    file_object.seek(0, os.SEEK_SET)
-    while self._ReadEntry(parser_mediator, file_object):
-      pass
+    reader.seek(0, os.SEEK_SET)
+    for offset, data in reader.ReadRecords(self.LINUX_UTMP_ENTRY_SIZE):
+      if not self._ParseEntry(parser_mediator, offset, data):
+        break
 
 
 manager.ParsersManager.RegisterParser(UtmpParser)
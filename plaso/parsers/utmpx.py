@@ -12,6 +12,7 @@ from dfdatetime import posix_time as dfdatetime_posix_time
 
 from plaso.containers import events
 from plaso.containers import time_events
+from plaso.lib import buffered_reader
 from plaso.lib import errors
 from plaso.lib import eventdata
 from plaso.parsers import interface
@@ -68,21 +69,18 @@ class UtmpxParser(interface.FileObjectParser):
 
   _STATUS_TYPE_SIGNATURE = 10
 
-  def _ReadEntry(self, parser_mediator, file_object):
-    """Reads an UTMPX entry.
+  def _ParseEntry(self, parser_mediator, offset, data):
+    """Parses an UTMPX entry.
 
     Args:
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfvfs.
-      file_object (dfvfs.FileIO): a file-like object.
+      offset (int): offset of the UTMPX entry.
+      data (bytes): UTMPX entry data.
 
     Returns:
-      bool: True if the UTMPX entry was successfully read.
+      bool: True if the UTMPX entry was successfully parsed.
     """
-    data = file_object.read(self._UTMPX_ENTRY_SIZE)
-    if len(data) != self._UTMPX_ENTRY_SIZE:
-      return False
-
     try:
       entry_struct = self._UTMPX_ENTRY.parse(data)
     except (IOError, construct.FieldError) as exception:
@@ -105,7 +103,7 @@ class UtmpxParser(interface.FileObjectParser):
 
     event_data = UtmpxMacOsXEventData()
     event_data.computer_name = computer_name
-    event_data.offset = file_object.tell()
+    event_data.offset = offset + self._UTMPX_ENTRY_SIZE
     event_data.status_type = entry_struct.status_type
     event_data.terminal = terminal
     event_data.user = user
@@ -170,12 +168,15 @@ class UtmpxParser(interface.FileObjectParser):
     Raises:
       UnableToParseFile: when the file cannot be parsed.
     """
-    if not self._VerifyStructure(file_object):
+    reader = buffered_reader.BufferedReader(file_object)
+
+    if not self._VerifyStructure(reader):
       raise errors.UnableToParseFile(
           u'The file is not an UTMPX file.')
 
-    while self._ReadEntry(parser_mediator, file_object):
-      pass
+    for offset, data in reader.ReadRecords(self._UTMPX_ENTRY_SIZE):
+      if not self._ParseEntry(parser_mediator, offset, data):
+        break
 
 
 manager.ParsersManager.RegisterParser(UtmpxParser)
@@ -64,6 +64,8 @@ class WinFirewallParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'winfirewall'
   DESCRIPTION = u'Parser for Windows Firewall Log files.'
 
+  FIRST_LINE_HINT = r'#Version: 1\.5'
+
   # TODO: Add support for custom field names. Currently this parser only
   # supports the default fields, which are:
   #   date time action protocol src-ip dst-ip src-port dst-port size
@@ -10,6 +10,7 @@ from dfdatetime import time_elements as dfdatetime_time_elements
 from plaso.containers import events
 from plaso.containers import time_events
 from plaso.lib import binary
+from plaso.lib import buffered_reader
 from plaso.lib import errors
 from plaso.lib import eventdata
 from plaso.parsers import interface
@@ -160,9 +161,13 @@ class WinJobParser(interface.FileObjectParser):
     Raises:
       UnableToParseFile: when the file cannot be parsed.
     """
+    # Construct reads the structures field by field, which the buffered
+    # reader serves from its buffer.
+    reader = buffered_reader.BufferedReader(file_object)
+
     try:
       header_struct = self._JOB_FIXED_LENGTH_SECTION_STRUCT.parse_stream(
-          file_object)
+          reader)
     except (IOError, construct.FieldError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse fixed-length section with error: {0:s}'.format(
@@ -179,7 +184,7 @@ class WinJobParser(interface.FileObjectParser):
               header_struct.format_version))
 
     try:
-      job_variable_struct = self._JOB_VARIABLE_STRUCT.parse_stream(file_object)
+      job_variable_struct = self._JOB_VARIABLE_STRUCT.parse_stream(reader)
     except (IOError, construct.FieldError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse variable-length section with error: {0:s}'.format(
@@ -216,7 +221,7 @@ class WinJobParser(interface.FileObjectParser):
 
     for index in range(job_variable_struct.number_of_triggers):
       try:
-        trigger_struct = self._TRIGGER_STRUCT.parse_stream(file_object)
+        trigger_struct = self._TRIGGER_STRUCT.parse_stream(reader)
       except (IOError, construct.FieldError) as exception:
         parser_mediator.ProduceExtractionError(
             u'unable to parse trigger: {0:d} with error: {1:s}'.format(
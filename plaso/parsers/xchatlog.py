@@ -93,6 +93,8 @@ class XChatLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'xchatlog'
   DESCRIPTION = u'Parser for XChat log files.'
 
+  FIRST_LINE_HINT = r'\*{4}'
+
   _ENCODING = u'UTF-8'
 
   # Common (header/footer/body) pyparsing structures.
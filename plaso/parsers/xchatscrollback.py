@@ -75,6 +75,8 @@ class XChatScrollbackParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'xchatscrollback'
   DESCRIPTION = u'Parser for XChat scrollback log files.'
 
+  FIRST_LINE_HINT = r'T\s*\d'
+
   _ENCODING = u'UTF-8'
 
   # Define how a log line should look like.
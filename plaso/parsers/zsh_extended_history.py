@@ -40,6 +40,8 @@ class ZshExtendedHistoryParser(text_parser.PyparsingMultiLineTextParser):
   NAME = u'zsh_extended_history'
   DESCRIPTION = u'Parser for ZSH extended history files'
 
+  FIRST_LINE_HINT = r':\s\d+:\d+;'
+
   _VERIFICATION_REGEX = re.compile(r'^:\s\d+:\d+;')
 
   _PYPARSING_COMPONENTS = {
@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+"""The binary serializer object implementation.
+
+The binary serialized form of an attribute container consists of:
++-----------+---------+----------------+-----------------+---------------------+
+| signature | version | path spec      | path spec table | attribute container |
+|           |         | table size     |                 |                     |
++-----------+---------+----------------+-----------------+---------------------+
+
+Where the path spec table and the attribute container are stored as compact
+JSON. Unlike marshal or pickle, the JSON decoder is safe to use on untrusted
+data, such as a storage file provided by a third party.
+
+The path spec table contains every distinct path specification, including
+the parents, used by the attribute container. The path specifications are
+stored in the table once and are referred to by their index in the table.
+A path specification is stored as a list of:
+[type indicator, parent index or null, properties]
+
+The attribute container is stored as a list of:
+[container type, attributes, typed attributes]
+
+Where attributes contains the attribute values that can be stored as-is and
+typed attributes contains the attribute values that need to be converted,
+such as byte strings, tuples and path specifications. The attributes are
+stored as a list of key and value pairs, where the key is the index of their
+name in the schema of the container type, or the name if the attribute is not
+part of the schema.
+"""
+
+import binascii
+import collections
+import json
+import struct
+
+from dfvfs.path import path_spec as dfvfs_path_spec
+from dfvfs.path import factory as dfvfs_path_spec_factory
+
+from plaso.containers import interface as containers_interface
+from plaso.containers import manager as containers_manager
+from plaso.lib import py2to3
+from plaso.serializer import interface
+
+
+class BinaryAttributeContainerSerializer(
+    interface.AttributeContainerSerializer):
+  """Class that implements the binary attribute container serializer."""
+
+  _SIGNATURE = b'plsc'
+
+  _FORMAT_VERSION = 2
+
+  _HEADER = struct.Struct('<4sBI')
+
+  _JSON_ENCODER = json.JSONEncoder(separators=(u',', u':'))
+
+  _PATH_SPEC_PROPERTY_NAMES = dfvfs_path_spec_factory.Factory.PROPERTY_NAMES
+
+  # The types of values that can be stored as-is.
+  _PLAIN_VALUE_TYPES = frozenset(
+      [bool, float, py2to3.UNICODE_TYPE, type(None)] +
+      list(py2to3.INTEGER_TYPES))
+
+  _VALUE_TYPE_PLAIN = 0
+  _VALUE_TYPE_LIST = 1
+  _VALUE_TYPE_TUPLE = 2
+  _VALUE_TYPE_DICT = 3
+  _VALUE_TYPE_COUNTER = 4
+  _VALUE_TYPE_PATH_SPEC = 5
+  _VALUE_TYPE_ATTRIBUTE_CONTAINER = 6
+  _VALUE_TYPE_BYTES = 7
+
+  # The attribute names per container type that are stored as an index
+  # instead of a string. Note that to remain compatible with previously
+  # serialized data attribute names can only be appended to a schema.
+  _SCHEMAS = {
+      u'event': (
+          u'data_type', u'display_name', u'filename', u'hostname', u'inode',
+          u'offset', u'pathspec', u'tag', u'timestamp', u'timestamp_desc',
+          u'parser', u'username', u'body', u'text', u'message', u'source_long',
+          u'source_short', u'url', u'user_sid', u'key_path', u'regvalue',
+          u'record_number', u'source_name', u'event_identifier',
+          u'event_level', u'computer_name', u'strings', u'xml_string',
+          u'path_spec_stream_number', u'path_spec_entry_index'),
+      u'event_source': (
+          u'data_type', u'file_entry_type', u'path_spec', u'data_size'),
+      u'event_tag': (
+          u'comment', u'event_entry_index', u'event_stream_number',
+          u'labels'),
+      u'extraction_error': (
+          u'message', u'parser_chain', u'path_spec'),
+      u'path_spec': (u'path_spec',),
+  }
+
+  _SCHEMA_INDEXES = {
+      container_type: {
+          attribute_name: attribute_index
+          for attribute_index, attribute_name in enumerate(schema)}
+      for container_type, schema in iter(_SCHEMAS.items())}
+
+  @classmethod
+  def _IsPlainValue(cls, value):
+    """Determines if a value can be stored as-is.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      bool: True if the value can be stored as-is.
+    """
+    value_type = type(value)
+    if value_type in cls._PLAIN_VALUE_TYPES:
+      return True
+
+    if value_type == list:
+      for list_element in value:
+        if type(list_element) not in cls._PLAIN_VALUE_TYPES:
+          return False
+      return True
+
+    return False
+
+  @classmethod
+  def _ReadAttributeContainer(cls, serialized_container, path_specs):
+    """Reads an attribute container from its JSON form.
+
+    Args:
+      serialized_container (list): JSON attribute container.
+      path_specs (list[dfvfs.PathSpec]): path spec table.
+
+    Returns:
+      AttributeContainer: attribute container.
+
+    Raises:
+      ValueError: if the container type is not supported.
+    """
+    container_type, attributes, typed_attributes = serialized_container
+
+    container_class = (
+        containers_manager.AttributeContainersManager.GetAttributeContainer(
+            container_type))
+    if not container_class:
+      raise ValueError(u'Unsupported container type: {0:s}'.format(
+          container_type))
+
+    container_object = container_class()
+    schema = cls._SCHEMAS.get(container_type, ())
+
+    # Be strict about which attributes to set in non events.
+    supported_attribute_names = None
+    if container_type != u'event':
+      supported_attribute_names = container_object.GetAttributeNames()
+
+    for attribute_key, attribute_value in attributes:
+      attribute_name = cls._ReadAttributeName(attribute_key, schema)
+      if (supported_attribute_names is not None and
+          attribute_name not in supported_attribute_names):
+        continue
+
+      setattr(container_object, attribute_name, attribute_value)
+
+    for attribute_key, attribute_value in typed_attributes:
+      attribute_name = cls._ReadAttributeName(attribute_key, schema)
+      if (supported_attribute_names is not None and
+          attribute_name not in supported_attribute_names):
+        continue
+
+      attribute_value = cls._ReadTypedValue(attribute_value, path_specs)
+      setattr(container_object, attribute_name, attribute_value)
+
+    return container_object
+
+  @classmethod
+  def _ReadAttributeName(cls, attribute_key, schema):
+    """Reads an attribute name.
+
+    Args:
+      attribute_key (int|str): index of the attribute name in the schema
+          or the attribute name.
+      schema (tuple[str]): attribute names of the container type.
+
+    Returns:
+      str: attribute name.
+    """
+    if isinstance(attribute_key, py2to3.STRING_TYPES):
+      return attribute_key
+
+    return schema[attribute_key]
+
+  @classmethod
+  def _ReadPathSpecTable(cls, serialized_path_specs):
+    """Reads a path spec table from its JSON form.
+
+    Args:
+      serialized_path_specs (list[list]): JSON path spec table.
+
+    Returns:
+      list[dfvfs.PathSpec]: path spec table.
+
+    Raises:
+      ValueError: if a path specification property is not supported.
+    """
+    path_specs = []
+    for type_indicator, parent_index, properties in serialized_path_specs:
+      for property_name in properties:
+        if property_name not in cls._PATH_SPEC_PROPERTY_NAMES:
+          raise ValueError(u'Unsupported path specification property.')
+
+      if parent_index is not None:
+        properties[u'parent'] = path_specs[parent_index]
+
+      path_spec = dfvfs_path_spec_factory.Factory.NewPathSpec(
+          type_indicator, **properties)
+      path_specs.append(path_spec)
+
+    return path_specs
+
+  @classmethod
+  def _ReadTypedValue(cls, typed_value, path_specs):
+    """Reads a typed value.
+
+    Args:
+      typed_value (list[int, object]): value type and JSON value.
+      path_specs (list[dfvfs.PathSpec]): path spec table.
+
+    Returns:
+      object: value.
+
+    Raises:
+      ValueError: if the value type is not supported.
+    """
+    value_type, value = typed_value
+
+    if value_type == cls._VALUE_TYPE_PLAIN:
+      return value
+
+    elif value_type == cls._VALUE_TYPE_PATH_SPEC:
+      return path_specs[value]
+
+    elif value_type in (cls._VALUE_TYPE_LIST, cls._VALUE_TYPE_TUPLE):
+      list_value = [
+          cls._ReadTypedValue(list_element, path_specs)
+          for list_element in value]
+
+      if value_type == cls._VALUE_TYPE_TUPLE:
+        return tuple(list_value)
+      return list_value
+
+    elif value_type == cls._VALUE_TYPE_BYTES:
+      return binascii.a2b_base64(value)
+
+    elif value_type in (cls._VALUE_TYPE_DICT, cls._VALUE_TYPE_COUNTER):
+      dict_value = {
+          cls._ReadTypedValue(key, path_specs): cls._ReadTypedValue(
+              key_value, path_specs)
+          for key, key_value in value}
+
+      if value_type == cls._VALUE_TYPE_COUNTER:
+        return collections.Counter(dict_value)
+      return dict_value
+
+    elif value_type == cls._VALUE_TYPE_ATTRIBUTE_CONTAINER:
+      return cls._ReadAttributeContainer(value, path_specs)
+
+    raise ValueError(u'Unsupported value type: {0!s}'.format(value_type))
+
+  @classmethod
+  def _WriteAttributeContainer(
+      cls, attribute_container, path_spec_indexes, path_spec_table):
+    """Writes an attribute container to its JSON form.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+      path_spec_indexes (dict[str, int]): path spec table index per
+          comparable path specification.
+      path_spec_table (list[tuple]): JSON path spec table.
+
+    Returns:
+      tuple: JSON attribute container.
+
+    Raises:
+      TypeError: if not an instance of AttributeContainer.
+      ValueError: if the attribute container type is not supported.
+    """
+    if not isinstance(
+        attribute_container, containers_interface.AttributeContainer):
+      raise TypeError(u'{0:s} is not an attribute container type.'.format(
+          type(attribute_container)))
+
+    container_type = getattr(attribute_container, u'CONTAINER_TYPE', None)
+    if not container_type:
+      raise ValueError(u'Unsupported attribute container type: {0:s}.'.format(
+          type(attribute_container)))
+
+    schema_indexes = cls._SCHEMA_INDEXES.get(container_type, {})
+
+    attributes = []
+    typed_attributes = []
+    for attribute_name, attribute_value in attribute_container.GetAttributes():
+      attribute_key = schema_indexes.get(attribute_name, attribute_name)
+
+      if cls._IsPlainValue(attribute_value):
+        attributes.append((attribute_key, attribute_value))
+      else:
+        typed_attributes.append((attribute_key, cls._WriteTypedValue(
+            attribute_value, path_spec_indexes, path_spec_table)))
+
+    return container_type, attributes, typed_attributes
+
+  @classmethod
+  def _WritePathSpec(cls, path_spec, path_spec_indexes, path_spec_table):
+    """Writes a path specification to the path spec table.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+      path_spec_indexes (dict[str, int]): path spec table index per
+          comparable path specification.
+      path_spec_table (list[tuple]): JSON path spec table.
+
+    Returns:
+      int: index of the path specification in the path spec table.
+    """
+    comparable = path_spec.comparable
+    path_spec_index = path_spec_indexes.get(comparable, None)
+    if path_spec_index is not None:
+      return path_spec_index
+
+    parent_index = None
+    if path_spec.HasParent():
+      parent_index = cls._WritePathSpec(
+          path_spec.parent, path_spec_indexes, path_spec_table)
+
+    # Note that the properties are read from __dict__ since this is
+    # significantly faster than probing every supported property name.
+    properties = {
+        property_name: property_value
+        for property_name, property_value in iter(path_spec.__dict__.items())
+        if property_value is not None and
+        property_name in cls._PATH_SPEC_PROPERTY_NAMES}
+
+    path_spec_index = len(path_spec_table)
+    path_spec_table.append(
+        (path_spec.type_indicator, parent_index, properties))
+    path_spec_indexes[comparable] = path_spec_index
+
+    return path_spec_index
+
+  @classmethod
+  def _WriteTypedValue(cls, value, path_spec_indexes, path_spec_table):
+    """Writes a value that cannot be stored as-is.
+
+    Args:
+      value (object): value.
+      path_spec_indexes (dict[str, int]): path spec table index per
+          comparable path specification.
+      path_spec_table (list[tuple]): JSON path spec table.
+
+    Returns:
+      tuple[int, object]: value type and JSON value.
+
+    Raises:
+      TypeError: if the value type is not supported.
+    """
+    if type(value) in cls._PLAIN_VALUE_TYPES:
+      return cls._VALUE_TYPE_PLAIN, value
+
+    elif isinstance(value, py2to3.BYTES_TYPE):
+      bytes_value = binascii.b2a_base64(value).rstrip(b'\n')
+      return cls._VALUE_TYPE_BYTES, bytes_value.decode(u'ascii')
+
+    elif isinstance(value, dfvfs_path_spec.PathSpec):
+      path_spec_index = cls._WritePathSpec(
+          value, path_spec_indexes, path_spec_table)
+      return cls._VALUE_TYPE_PATH_SPEC, path_spec_index
+
+    elif isinstance(value, (list, tuple)):
+      list_value = [
+          cls._WriteTypedValue(
+              list_element, path_spec_indexes, path_spec_table)
+          for list_element in value]
+
+      if isinstance(value, list):
+        return cls._VALUE_TYPE_LIST, list_value
+      return cls._VALUE_TYPE_TUPLE, list_value
+
+    elif isinstance(value, dict):
+      # Dictionaries are stored as key and value pairs since the keys of
+      # a JSON object can only be strings.
+      dict_value = [
+          (cls._WriteTypedValue(key, path_spec_indexes, path_spec_table),
+           cls._WriteTypedValue(key_value, path_spec_indexes, path_spec_table))
+          for key, key_value in iter(value.items())]
+
+      if isinstance(value, collections.Counter):
+        return cls._VALUE_TYPE_COUNTER, dict_value
+      return cls._VALUE_TYPE_DICT, dict_value
+
+    elif isinstance(value, containers_interface.AttributeContainer):
+      container_value = cls._WriteAttributeContainer(
+          value, path_spec_indexes, path_spec_table)
+      return cls._VALUE_TYPE_ATTRIBUTE_CONTAINER, container_value
+
+    raise TypeError(u'Unsupported value type: {0!s}.'.format(type(value)))
+
+  @classmethod
+  def ReadSerialized(cls, serialized):
+    """Reads an attribute container from serialized form.
+
+    Args:
+      serialized (bytes): serialized form.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+
+    Raises:
+      ValueError: if the serialized form cannot be read.
+    """
+    if not serialized:
+      return
+
+    try:
+      signature, format_version, path_spec_table_size = (
+          cls._HEADER.unpack_from(serialized, 0))
+    except struct.error as exception:
+      raise ValueError(u'Unable to read header with error: {0!s}'.format(
+          exception))
+
+    if signature != cls._SIGNATURE:
+      raise ValueError(u'Unsupported signature.')
+
+    if format_version != cls._FORMAT_VERSION:
+      raise ValueError(u'Unsupported format version: {0:d}.'.format(
+          format_version))
+
+    data_offset = cls._HEADER.size
+    container_offset = data_offset + path_spec_table_size
+
+    try:
+      path_specs = []
+      if path_spec_table_size:
+        serialized_path_specs = json.loads(
+            serialized[data_offset:container_offset])
+        path_specs = cls._ReadPathSpecTable(serialized_path_specs)
+
+      serialized_container = json.loads(serialized[container_offset:])
+      attribute_container = cls._ReadAttributeContainer(
+          serialized_container, path_specs)
+
+    # Since the serialized form can originate from an untrusted source any
+    # error caused by unexpected values is reported as unreadable data.
+    except (
+        AttributeError, IndexError, KeyError, RuntimeError, TypeError,
+        ValueError, binascii.Error) as exception:
+      raise ValueError(
+          u'Unable to read attribute container with error: {0!s}'.format(
+              exception))
+
+    return attribute_container
+
+  @classmethod
+  def WriteSerialized(cls, attribute_container):
+    """Writes an attribute container to serialized form.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      bytes: serialized form.
+
+    Raises:
+      TypeError: if the attribute container contains a value that is
+          not supported.
+    """
+    path_spec_indexes = {}
+    path_spec_table = []
+
+    serialized_container = cls._WriteAttributeContainer(
+        attribute_container, path_spec_indexes, path_spec_table)
+
+    try:
+      container_data = cls._JSON_ENCODER.encode(serialized_container)
+
+      path_spec_table_data = b''
+      if path_spec_table:
+        path_spec_table_data = cls._JSON_ENCODER.encode(path_spec_table)
+
+    except ValueError as exception:
+      raise TypeError(
+          u'Unable to write attribute container with error: {0!s}'.format(
+              exception))
+
+    header_data = cls._HEADER.pack(
+        cls._SIGNATURE, cls._FORMAT_VERSION, len(path_spec_table_data))
+
+    return b''.join([header_data, path_spec_table_data, container_data])
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Storage event constraints objects."""
+
+import json
+import os
+
+from plaso.storage import time_range as storage_time_range
+
+
+class EventConstraints(object):
+  """Class that defines constraints that events must meet to match a filter.
+
+  The constraints are derived from an event filter and allow a storage
+  reader to skip event streams and serialized events that cannot match
+  the filter, before the events are deserialized. Events that meet the
+  constraints do not necessarily match the filter, hence the filter still
+  needs to be applied to the events that are read.
+
+  Attributes:
+    data_types (frozenset[str]): data types of the events, where None
+        represents any data type.
+    filename_prefix (str): prefix of the filename of the events, where None
+        represents any filename.
+    parsers (frozenset[str]): parser chains that produced the events, where
+        None represents any parser chain.
+    time_range (TimeRange): time range of the events, where None represents
+        any time.
+  """
+
+  def __init__(
+      self, data_types=None, filename_prefix=None, parsers=None,
+      time_range=None):
+    """Initializes event constraints.
+
+    Args:
+      data_types (Optional[set[str]]): data types of the events, where None
+          represents any data type.
+      filename_prefix (Optional[str]): prefix of the filename of the events,
+          where None represents any filename.
+      parsers (Optional[set[str]]): parser chains that produced the events,
+          where None represents any parser chain.
+      time_range (Optional[TimeRange]): time range of the events, where None
+          represents any time.
+    """
+    if data_types is not None:
+      data_types = frozenset(data_types)
+    if parsers is not None:
+      parsers = frozenset(parsers)
+
+    super(EventConstraints, self).__init__()
+    self._serialized_data_patterns = None
+    self.data_types = data_types
+    self.filename_prefix = filename_prefix or None
+    self.parsers = parsers
+    self.time_range = time_range
+
+  def _GetSerializedDataPatterns(self):
+    """Retrieves the patterns of the constraints in JSON serialized events.
+
+    The patterns correspond with the way the JSON serializer writes
+    the attribute names and string values of an event.
+
+    Returns:
+      list[tuple[bytes]]: patterns per constraint, where a serialized event
+          meets a constraint if it contains any of the patterns.
+    """
+    if self._serialized_data_patterns is None:
+      self._serialized_data_patterns = []
+
+      for attribute_name, values in (
+          (u'data_type', self.data_types), (u'parser', self.parsers)):
+        if values is None:
+          continue
+
+        patterns = []
+        for value in sorted(values):
+          json_string = json.dumps({attribute_name: value})
+          patterns.append(json_string[1:-1].encode(u'utf-8'))
+
+        self._serialized_data_patterns.append(tuple(patterns))
+
+      if self.filename_prefix:
+        json_string = json.dumps({u'filename': self.filename_prefix})
+        # Strip the closing quote of the value to match the prefix.
+        pattern = json_string[1:-2].encode(u'utf-8')
+        self._serialized_data_patterns.append((pattern, ))
+
+    return self._serialized_data_patterns
+
+  def HasConstraints(self):
+    """Determines if there are any constraints.
+
+    Returns:
+      bool: True if there are constraints.
+    """
+    return bool(
+        self.data_types is not None or self.filename_prefix or
+        self.parsers is not None or self.time_range)
+
+  def Intersect(self, event_constraints):
+    """Combines the constraints with constraints that must also be met.
+
+    Args:
+      event_constraints (EventConstraints): constraints that must also be met.
+
+    Returns:
+      EventConstraints: constraints that events must meet to meet both.
+    """
+    data_types = self.data_types
+    if data_types is None:
+      data_types = event_constraints.data_types
+    elif event_constraints.data_types is not None:
+      data_types = data_types & event_constraints.data_types
+
+    parsers = self.parsers
+    if parsers is None:
+      parsers = event_constraints.parsers
+    elif event_constraints.parsers is not None:
+      parsers = parsers & event_constraints.parsers
+
+    # Both prefixes must be met, hence if neither prefix is a prefix of
+    # the other no event can meet the constraints and either prefix will do.
+    filename_prefix = self.filename_prefix
+    if (not filename_prefix or (
+        event_constraints.filename_prefix and
+        event_constraints.filename_prefix.startswith(filename_prefix))):
+      filename_prefix = event_constraints.filename_prefix
+
+    time_range = self.time_range
+    if not time_range:
+      time_range = event_constraints.time_range
+    elif event_constraints.time_range:
+      start_timestamp = max(
+          time_range.start_timestamp,
+          event_constraints.time_range.start_timestamp)
+      end_timestamp = min(
+          time_range.end_timestamp, event_constraints.time_range.end_timestamp)
+      # If the time ranges do not overlap no event can meet the constraints
+      # and any time range within the original time ranges will do.
+      end_timestamp = max(start_timestamp, end_timestamp)
+      time_range = storage_time_range.TimeRange(start_timestamp, end_timestamp)
+
+    return EventConstraints(
+        data_types=data_types, filename_prefix=filename_prefix,
+        parsers=parsers, time_range=time_range)
+
+  def IsStreamRelevant(self, event_stream_summary):
+    """Determines if events in a stream can meet the constraints.
+
+    Args:
+      event_stream_summary (EventStreamSummary): event stream summary.
+
+    Returns:
+      bool: True if events in the stream can meet the constraints.
+    """
+    if self.time_range and not event_stream_summary.IsInTimeRange(
+        self.time_range):
+      return False
+
+    if (self.data_types is not None and
+        self.data_types.isdisjoint(event_stream_summary.data_types)):
+      return False
+
+    if (self.parsers is not None and
+        self.parsers.isdisjoint(event_stream_summary.parsers)):
+      return False
+
+    return True
+
+  def MatchesSerializedEvent(self, event_data):
+    """Determines if a JSON serialized event can meet the constraints.
+
+    This is a cheap check of the serialized data that does not require
+    the event to be deserialized. The time range is not checked.
+
+    Args:
+      event_data (bytes): JSON serialized event data.
+
+    Returns:
+      bool: True if the event can meet the constraints.
+    """
+    for patterns in self._GetSerializedDataPatterns():
+      for pattern in patterns:
+        if pattern in event_data:
+          break
+      else:
+        return False
+
+    return True
+
+  def Union(self, event_constraints):
+    """Combines the constraints with alternative constraints.
+
+    Args:
+      event_constraints (EventConstraints): alternative constraints.
+
+    Returns:
+      EventConstraints: constraints that events must meet to meet either.
+    """
+    data_types = None
+    if (self.data_types is not None and
+        event_constraints.data_types is not None):
+      data_types = self.data_types | event_constraints.data_types
+
+    parsers = None
+    if self.parsers is not None and event_constraints.parsers is not None:
+      parsers = self.parsers | event_constraints.parsers
+
+    filename_prefix = None
+    if self.filename_prefix and event_constraints.filename_prefix:
+      filename_prefix = os.path.commonprefix([
+          self.filename_prefix, event_constraints.filename_prefix])
+
+    time_range = None
+    if self.time_range and event_constraints.time_range:
+      time_range = storage_time_range.TimeRange(
+          min(self.time_range.start_timestamp,
+              event_constraints.time_range.start_timestamp),
+          max(self.time_range.end_timestamp,
+              event_constraints.time_range.end_timestamp))
+
+    return EventConstraints(
+        data_types=data_types, filename_prefix=filename_prefix,
+        parsers=parsers, time_range=time_range)
@@ -190,12 +190,16 @@ class GZIPStorageFile(interface.BaseFileStorage):
 
   # TODO: time_range is currently not operational, nor that events are
   # returned in chronological order. Fix this.
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, time_range=None, event_constraints=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter, before they are
+          deserialized. The constraints are a hint, hence events that do not
+          meet them can still be returned.
 
     Returns:
       generator(EventObject): event generator.
@@ -63,12 +63,16 @@ class BaseStorage(object):
     """
 
   @abc.abstractmethod
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, time_range=None, event_constraints=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter, before they are
+          deserialized. The constraints are a hint, hence events that do not
+          meet them can still be returned.
 
     Yields:
       EventObject: event.
@@ -313,12 +317,16 @@ class StorageReader(object):
     """
 
   @abc.abstractmethod
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, time_range=None, event_constraints=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter, before they are
+          deserialized. The constraints are a hint, hence events that do not
+          meet them can still be returned.
 
     Yields:
       EventObject: event.
@@ -397,17 +405,22 @@ class FileStorageReader(StorageReader):
     """
     return self._storage_file.GetErrors()
 
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, time_range=None, event_constraints=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter, before they are
+          deserialized. The constraints are a hint, hence events that do not
+          meet them can still be returned.
 
     Returns:
       generator(EventObject): event generator.
     """
-    return self._storage_file.GetEvents(time_range=time_range)
+    return self._storage_file.GetEvents(
+        time_range=time_range, event_constraints=event_constraints)
 
   def GetEventSources(self):
     """Retrieves the event sources.
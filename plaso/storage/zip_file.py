@@ -22,11 +22,20 @@ There are multiple types of streams:
   event source objects.
 * event_tag_data.#
   The event tag data streams contain the serialized event tag objects.
+* event_summary.#
+  The event summary streams contain a summary of the serialized events,
+  such as the first and last timestamp.
 * event_timestamps.#
   The event timestamps streams contain the timestamp of the serialized
   events.
 * metadata.txt
   Stream that contains the storage metadata.
+* path_spec_data.#
+  The path specification data streams contain the serialized path
+  specifications referred to by the events.
+* path_spec_index.#
+  The path specification index streams contain the stream offset to
+  the serialized path specifications.
 * preprocess.#
   Stream that contains the preprocessing information.
   Only applies to session-based storage.
@@ -82,8 +91,49 @@ An event data stream consists of an array of 64-bit integers:
 | timestamp | timestamp | ... |
 +-----------+-----------+-...-+
 
++ The event summary stream
+
+The event summary streams contain a summary of the serialized events stored
+in the corresponding event data stream. This allows to determine if an event
+data stream is relevant without having to read the stream.
+
+An event summary stream consists of a JSON serialized dictionary:
+{
+    "data_types": [...],
+    "first_timestamp": ...,
+    "last_timestamp": ...,
+    "number_of_events": ...,
+    "parsers": [...]
+}
+
+Where data_types and parsers contain the distinct data type and parser chain
+values of the events. The event summary stream is optional.
+
++ The path specification data streams
+
+Events originating from the same file entry have identical path
+specifications, including the chain of parent path specifications. To prevent
+the same path specification being serialized for every event, each distinct
+path specification is stored once in a path specification data stream. An
+event refers to its path specification by the path_spec_stream_number and
+path_spec_entry_index attributes, which are replaced by the pathspec
+attribute when the event is read.
+
++ Pre-merged task storage
+
+Task storages can be pre-merged into a ZIP-based storage file by a merge
+worker process. Multiple small task storages are pre-merged together, so that
+the pre-merged event stream is close to the maximum stream size. The event
+and path specification streams of the pre-merged task storages use a range
+of stream numbers reserved in the session storage, so that they can be added
+as-is to the session storage.
+
 + Version information
 
+Added in version 20170501:
+* path_spec_data.#
+* path_spec_index.#
+
 Deprecated in version 20170121:
 * event_tag_index.#
   The event tag index streams contain the stream offset to the serialized
@@ -114,9 +164,12 @@ Deprecated in version 20160511:
   events.
 """
 
+import collections
 import heapq
 import io
+import json
 import logging
+import multiprocessing
 import os
 import shutil
 import tempfile
@@ -131,15 +184,90 @@ except ImportError:
 
 import construct
 
+from dfvfs.path import path_spec as dfvfs_path_spec
+
+from plaso.containers import path_specs
 from plaso.containers import sessions
 from plaso.lib import definitions
 from plaso.lib import platform_specific
+from plaso.serializer import binary_serializer
 from plaso.serializer import json_serializer
+from plaso.storage import event_constraints as storage_event_constraints
 from plaso.storage import identifiers
 from plaso.storage import interface
 from plaso.storage import gzip_file
 
 
+def _DeserializeEventBlock(
+    serializer, stream_number, first_entry_index, serialized_events):
+  """Deserializes a block of consecutive serialized events.
+
+  This function is run by the worker processes of the parallel merge reader
+  and therefore is defined on module level.
+
+  Args:
+    serializer (type): attribute container serializer.
+    stream_number (int): number of the serialized event stream.
+    first_entry_index (int): entry index of the first serialized event
+        of the block.
+    serialized_events (list[bytes]): serialized events, where None represents
+        an event that was skipped.
+
+  Returns:
+    list[EventObject]: events.
+  """
+  events = []
+  for entry_index, event_data in enumerate(
+      serialized_events, start=first_entry_index):
+    if event_data is None:
+      continue
+
+    event = serializer.ReadSerialized(event_data)
+    if not event:
+      continue
+
+    event_identifier = identifiers.SerializedStreamIdentifier(
+        stream_number, entry_index)
+    event.SetIdentifier(event_identifier)
+    events.append(event)
+
+  return events
+
+
+def _PreMergeTaskStorages(
+    serialization_format, task_storage_paths, pre_merged_storage_path,
+    event_stream_numbers, path_spec_stream_numbers):
+  """Pre-merges task storages into a ZIP-based storage file.
+
+  This function is run by the merge worker processes of the session storage
+  writer and therefore is defined on module level.
+
+  Args:
+    serialization_format (str): serialization format of the session storage.
+    task_storage_paths (list[str]): paths of the task storage files.
+    pre_merged_storage_path (str): path of the pre-merged storage file.
+    event_stream_numbers (list[int]): consecutive event stream numbers
+        reserved in the session storage.
+    path_spec_stream_numbers (list[int]): consecutive path specification
+        stream numbers reserved in the session storage.
+
+  Returns:
+    collections.Counter: number of pre-merged events per parser name.
+  """
+  storage_file = ZIPStorageFile(
+      serialization_format=serialization_format,
+      storage_type=definitions.STORAGE_TYPE_TASK)
+  storage_file.Open(path=pre_merged_storage_path, read_only=False)
+
+  try:
+    parsers_counter = storage_file.PreMergeTaskStorages(
+        task_storage_paths, event_stream_numbers, path_spec_stream_numbers)
+  finally:
+    storage_file.Close()
+
+  return parsers_counter
+
+
 class _AttributeContainersList(object):
   """Class that defines the attribute containers list.
 
@@ -269,6 +397,8 @@ class _SerializedEventsHeap(object):
 
   Attributes:
     data_size (int): total data size of the serialized events on the heap.
+    data_types (set[str]): data types of the serialized events on the heap.
+    parsers (set[str]): parser chains of the serialized events on the heap.
   """
 
   def __init__(self):
@@ -276,6 +406,8 @@ class _SerializedEventsHeap(object):
     super(_SerializedEventsHeap, self).__init__()
     self._heap = []
     self.data_size = 0
+    self.data_types = set()
+    self.parsers = set()
 
   @property
   def number_of_events(self):
@@ -286,6 +418,8 @@ class _SerializedEventsHeap(object):
     """Empties the heap."""
     self._heap = []
     self.data_size = 0
+    self.data_types = set()
+    self.parsers = set()
 
   def PopEvent(self):
     """Pops an event from the heap.
@@ -305,18 +439,25 @@ class _SerializedEventsHeap(object):
     except IndexError:
       return None, None
 
-  def PushEvent(self, timestamp, event_data):
+  def PushEvent(self, timestamp, event_data, data_type=None, parser=None):
     """Pushes a serialized event onto the heap.
 
     Args:
       timestamp (int): event timestamp, which contains the number of
           micro seconds since January 1, 1970, 00:00:00 UTC.
       event_data (bytes): serialized event data.
+      data_type (Optional[str]): event data type indicator.
+      parser (Optional[str]): parser chain that produced the event.
     """
     heap_values = (timestamp, event_data)
     heapq.heappush(self._heap, heap_values)
     self.data_size += len(event_data)
 
+    if data_type:
+      self.data_types.add(data_type)
+    if parser:
+      self.parsers.add(parser)
+
 
 class _SerializedDataStream(object):
   """Class that defines a serialized data stream."""
@@ -530,7 +671,11 @@ class _SerializedDataStream(object):
 
 
 class _SerializedDataOffsetTable(object):
-  """Class that defines a serialized data offset table."""
+  """Class that defines a serialized data offset table.
+
+  The offsets of a table that was read are kept as the raw table data
+  and only the entries that are looked up are parsed.
+  """
 
   _TABLE = construct.GreedyRange(
       construct.ULInt32(u'offset'))
@@ -548,14 +693,33 @@ class _SerializedDataOffsetTable(object):
       stream_name (str): name of the stream.
     """
     super(_SerializedDataOffsetTable, self).__init__()
+    self._number_of_table_entries = 0
     self._offsets = []
     self._stream_name = stream_name
+    self._table_data = b''
     self._zip_file = zip_file
 
   @property
   def number_of_offsets(self):
     """int: number of offsets."""
-    return len(self._offsets)
+    return self._number_of_table_entries + len(self._offsets)
+
+  def _GetTableEntryOffset(self, entry_index):
+    """Retrieves the offset of a specific entry in the table data.
+
+    Args:
+      entry_index (int): table entry index, which must be in bounds of
+          the table data.
+
+    Returns:
+      int: serialized data offset.
+    """
+    data_offset = entry_index * self._TABLE_ENTRY_SIZE
+    entry_data = self._table_data[
+        data_offset:data_offset + self._TABLE_ENTRY_SIZE]
+
+    table_entry = self._TABLE_ENTRY.parse(entry_data)
+    return table_entry.offset
 
   def AddOffset(self, offset):
     """Adds an offset.
@@ -577,7 +741,17 @@ class _SerializedDataOffsetTable(object):
     Raises:
       IndexError: if the table entry index is out of bounds.
     """
-    return self._offsets[entry_index]
+    number_of_offsets = self.number_of_offsets
+    if entry_index < 0:
+      entry_index += number_of_offsets
+
+    if entry_index < 0 or entry_index >= number_of_offsets:
+      raise IndexError(u'Table entry index out of bounds.')
+
+    if entry_index < self._number_of_table_entries:
+      return self._GetTableEntryOffset(entry_index)
+
+    return self._offsets[entry_index - self._number_of_table_entries]
 
   def Read(self):
     """Reads the serialized data offset table.
@@ -592,32 +766,38 @@ class _SerializedDataOffsetTable(object):
           u'Unable to open stream with error: {0:s}'.format(exception))
 
     try:
-      entry_data = file_object.read(self._TABLE_ENTRY_SIZE)
-      while entry_data:
-        table_entry = self._TABLE_ENTRY.parse(entry_data)
-
-        self._offsets.append(table_entry.offset)
-        entry_data = file_object.read(self._TABLE_ENTRY_SIZE)
-
-    except construct.FieldError as exception:
-      raise IOError(
-          u'Unable to read table entry with error: {0:s}'.format(exception))
-
+      table_data = file_object.read()
     finally:
       file_object.close()
 
+    if len(table_data) % self._TABLE_ENTRY_SIZE != 0:
+      raise IOError(u'Unable to read table data size value out of bounds.')
+
+    self._number_of_table_entries = len(table_data) // self._TABLE_ENTRY_SIZE
+    self._offsets = []
+    self._table_data = table_data
+
   def Write(self):
     """Writes the offset table.
 
     Raises:
       IOError: if the offset table cannot be written.
     """
-    table_data = self._TABLE.build(self._offsets)
+    table_data = self._table_data
+    if self._offsets:
+      table_data = b''.join([table_data, self._TABLE.build(self._offsets)])
+
     self._zip_file.writestr(self._stream_name, table_data)
 
 
 class _SerializedDataTimestampTable(object):
-  """Class that defines a serialized data timestamp table."""
+  """Class that defines a serialized data timestamp table.
+
+  The timestamps of a table that was read are kept as the raw table data
+  and only the entries that are looked up are parsed. This allows to binary
+  search the table, which is sorted by timestamp, without having to parse
+  every entry.
+  """
 
   _TABLE = construct.GreedyRange(
       construct.SLInt64(u'timestamp'))
@@ -635,14 +815,34 @@ class _SerializedDataTimestampTable(object):
       stream_name (str): name of the stream.
     """
     super(_SerializedDataTimestampTable, self).__init__()
+    self._number_of_table_entries = 0
     self._stream_name = stream_name
+    self._table_data = b''
     self._timestamps = []
     self._zip_file = zip_file
 
   @property
   def number_of_timestamps(self):
     """int: number of timestamps."""
-    return len(self._timestamps)
+    return self._number_of_table_entries + len(self._timestamps)
+
+  def _GetTableEntryTimestamp(self, entry_index):
+    """Retrieves the timestamp of a specific entry in the table data.
+
+    Args:
+      entry_index (int): table entry index, which must be in bounds of
+          the table data.
+
+    Returns:
+      int: event timestamp, which contains the number of micro seconds since
+          January 1, 1970, 00:00:00 UTC.
+    """
+    data_offset = entry_index * self._TABLE_ENTRY_SIZE
+    entry_data = self._table_data[
+        data_offset:data_offset + self._TABLE_ENTRY_SIZE]
+
+    table_entry = self._TABLE_ENTRY.parse(entry_data)
+    return table_entry.timestamp
 
   def AddTimestamp(self, timestamp):
     """Adds a timestamp.
@@ -653,6 +853,33 @@ class _SerializedDataTimestampTable(object):
     """
     self._timestamps.append(timestamp)
 
+  def GetEntryIndexOfTimestamp(self, timestamp):
+    """Retrieves the index of the first entry with a specific timestamp.
+
+    Since the table is sorted by timestamp a binary search is used to
+    determine the index of the first entry with a timestamp larger than
+    or equal to the timestamp.
+
+    Args:
+      timestamp (int): event timestamp, which contains the number of
+          micro seconds since January 1, 1970, 00:00:00 UTC.
+
+    Returns:
+      int: table entry index or the number of timestamps if all timestamps
+          in the table are smaller than the timestamp.
+    """
+    lower_index = 0
+    upper_index = self.number_of_timestamps
+
+    while lower_index < upper_index:
+      middle_index = (lower_index + upper_index) // 2
+      if self.GetTimestamp(middle_index) < timestamp:
+        lower_index = middle_index + 1
+      else:
+        upper_index = middle_index
+
+    return lower_index
+
   def GetTimestamp(self, entry_index):
     """Retrieves a specific timestamp.
 
@@ -666,7 +893,17 @@ class _SerializedDataTimestampTable(object):
     Raises:
       IndexError: if the table entry index is out of bounds.
     """
-    return self._timestamps[entry_index]
+    number_of_timestamps = self.number_of_timestamps
+    if entry_index < 0:
+      entry_index += number_of_timestamps
+
+    if entry_index < 0 or entry_index >= number_of_timestamps:
+      raise IndexError(u'Table entry index out of bounds.')
+
+    if entry_index < self._number_of_table_entries:
+      return self._GetTableEntryTimestamp(entry_index)
+
+    return self._timestamps[entry_index - self._number_of_table_entries]
 
   def Read(self):
     """Reads the serialized data timestamp table.
@@ -681,30 +918,132 @@ class _SerializedDataTimestampTable(object):
           u'Unable to open stream with error: {0:s}'.format(exception))
 
     try:
-      entry_data = file_object.read(self._TABLE_ENTRY_SIZE)
-      while entry_data:
-        table_entry = self._TABLE_ENTRY.parse(entry_data)
-
-        self._timestamps.append(table_entry.timestamp)
-        entry_data = file_object.read(self._TABLE_ENTRY_SIZE)
-
-    except construct.FieldError as exception:
-      raise IOError(
-          u'Unable to read table entry with error: {0:s}'.format(exception))
-
+      table_data = file_object.read()
     finally:
       file_object.close()
 
+    if len(table_data) % self._TABLE_ENTRY_SIZE != 0:
+      raise IOError(u'Unable to read table data size value out of bounds.')
+
+    self._number_of_table_entries = len(table_data) // self._TABLE_ENTRY_SIZE
+    self._table_data = table_data
+    self._timestamps = []
+
   def Write(self):
     """Writes the timestamp table.
 
     Raises:
       IOError: if the timestamp table cannot be written.
     """
-    table_data = self._TABLE.build(self._timestamps)
+    table_data = self._table_data
+    if self._timestamps:
+      table_data = b''.join([table_data, self._TABLE.build(self._timestamps)])
+
     self._zip_file.writestr(self._stream_name, table_data)
 
 
+class EventStreamSummary(object):
+  """Class that defines an event stream summary.
+
+  Attributes:
+    data_types (set[str]): data types of the events in the stream.
+    first_timestamp (int): timestamp of the first event in the stream,
+        which contains the number of micro seconds since January 1, 1970,
+        00:00:00 UTC.
+    last_timestamp (int): timestamp of the last event in the stream,
+        which contains the number of micro seconds since January 1, 1970,
+        00:00:00 UTC.
+    number_of_events (int): number of events in the stream.
+    parsers (set[str]): parser chains of the events in the stream.
+    stream_number (int): number of the serialized event stream.
+  """
+
+  def __init__(self, stream_number):
+    """Initializes an event stream summary.
+
+    Args:
+      stream_number (int): number of the serialized event stream.
+    """
+    super(EventStreamSummary, self).__init__()
+    self.data_types = set()
+    self.first_timestamp = None
+    self.last_timestamp = None
+    self.number_of_events = 0
+    self.parsers = set()
+    self.stream_number = stream_number
+
+  def AddTimestamp(self, timestamp):
+    """Adds the timestamp of an event to the summary.
+
+    The events are expected to be added in increasing chronological order.
+
+    Args:
+      timestamp (int): event timestamp, which contains the number of
+          micro seconds since January 1, 1970, 00:00:00 UTC.
+    """
+    if self.first_timestamp is None:
+      self.first_timestamp = timestamp
+
+    self.last_timestamp = timestamp
+    self.number_of_events += 1
+
+  def IsInTimeRange(self, time_range):
+    """Determines if events in the stream can fall in a time range.
+
+    Args:
+      time_range (TimeRange): time range.
+
+    Returns:
+      bool: True if events in the stream can fall in the time range.
+    """
+    if not self.number_of_events:
+      return False
+
+    return (time_range.start_timestamp <= self.last_timestamp and
+            time_range.end_timestamp >= self.first_timestamp)
+
+  def Read(self, stream_data):
+    """Reads the event stream summary.
+
+    Args:
+      stream_data (bytes): data of the steam.
+
+    Raises:
+      IOError: if the event stream summary cannot be read.
+    """
+    try:
+      json_dict = json.loads(stream_data.decode(u'utf-8'))
+    except (UnicodeDecodeError, ValueError) as exception:
+      raise IOError(
+          u'Unable to read event stream summary with error: {0!s}'.format(
+              exception))
+
+    if not isinstance(json_dict, dict):
+      raise IOError(u'Unsupported event stream summary.')
+
+    self.data_types = set(json_dict.get(u'data_types', []))
+    self.first_timestamp = json_dict.get(u'first_timestamp', None)
+    self.last_timestamp = json_dict.get(u'last_timestamp', None)
+    self.number_of_events = json_dict.get(u'number_of_events', 0)
+    self.parsers = set(json_dict.get(u'parsers', []))
+
+  def Write(self):
+    """Writes the event stream summary.
+
+    Returns:
+      bytes: data of the stream.
+    """
+    json_dict = {
+        u'data_types': sorted(self.data_types),
+        u'first_timestamp': self.first_timestamp,
+        u'last_timestamp': self.last_timestamp,
+        u'number_of_events': self.number_of_events,
+        u'parsers': sorted(self.parsers)}
+
+    json_string = json.dumps(json_dict, sort_keys=True)
+    return json_string.encode(u'utf-8')
+
+
 class _StorageMetadata(object):
   """Class that implements storage metadata.
 
@@ -789,7 +1128,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
   NEXT_AVAILABLE_ENTRY = -1
 
   # The format version.
-  _FORMAT_VERSION = 20170121
+  _FORMAT_VERSION = 20170501
 
   # The earliest format version, stored in-file, that this class
   # is able to read.
@@ -802,14 +1141,44 @@ class ZIPStorageFile(interface.BaseFileStorage):
   # The maximum number of cached tables.
   _MAXIMUM_NUMBER_OF_CACHED_TABLES = 5
 
+  # The maximum number of cached path specifications.
+  _MAXIMUM_NUMBER_OF_CACHED_PATH_SPECS = 16 * 1024
+
+  # The number of serialized events in a block that is deserialized by
+  # a merge worker process.
+  _MERGE_BLOCK_SIZE = 1024
+
+  # The maximum number of blocks of all streams together that are
+  # deserialized ahead of the merge. Every stream can have one pending block
+  # regardless, since it is needed to continue the merge.
+  _MAXIMUM_NUMBER_OF_PENDING_MERGE_BLOCKS = 32
+
+  # The maximum number of blocks per stream that are deserialized ahead
+  # of the merge.
+  _MAXIMUM_NUMBER_OF_PENDING_MERGE_BLOCKS_PER_STREAM = 4
+
   # The maximum serialized report size (32 MiB).
   _MAXIMUM_SERIALIZED_REPORT_SIZE = 32 * 1024 * 1024
 
   _MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS = 5
   _LOCKED_FILE_SLEEP_TIME = 0.5
 
+  # The prefixes of the names of the streams of a pre-merged task storage
+  # that are added as-is to the session storage.
+  _PRE_MERGED_STREAM_NAME_PREFIXES = frozenset([
+      u'event_data', u'event_index', u'event_summary', u'event_timestamps',
+      u'path_spec_data', u'path_spec_index'])
+
+  _SERIALIZERS = {
+      definitions.SERIALIZER_FORMAT_BINARY: (
+          binary_serializer.BinaryAttributeContainerSerializer),
+      definitions.SERIALIZER_FORMAT_JSON: (
+          json_serializer.JSONAttributeContainerSerializer),
+  }
+
   def __init__(
       self, maximum_buffer_size=0,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
       storage_type=definitions.STORAGE_TYPE_SESSION):
     """Initializes a ZIP-based storage file.
 
@@ -817,15 +1186,23 @@ class ZIPStorageFile(interface.BaseFileStorage):
       maximum_buffer_size (Optional[int]):
           maximum size of a single storage stream. A value of 0 indicates
           the limit is _MAXIMUM_BUFFER_SIZE.
+      serialization_format (Optional[str]): serialization format used when
+          creating a new storage file. The serialization format of an
+          existing storage file is read from the storage metadata.
       storage_type (Optional[str]): storage type.
 
     Raises:
-      ValueError: if the maximum buffer size value is out of bounds.
+      ValueError: if the maximum buffer size value is out of bounds or
+          the serialization format is not supported.
     """
     if (maximum_buffer_size < 0 or
         maximum_buffer_size > self._MAXIMUM_BUFFER_SIZE):
       raise ValueError(u'Maximum buffer size value out of bounds.')
 
+    if serialization_format not in self._SERIALIZERS:
+      raise ValueError(u'Unsupported serialization format: {0:s}.'.format(
+          serialization_format))
+
     if not maximum_buffer_size:
       maximum_buffer_size = self._MAXIMUM_BUFFER_SIZE
 
@@ -849,6 +1226,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._event_tag_streams = {}
     self._event_tag_stream_number = 1
     self._event_tags_list = _AttributeContainersList()
+    self._event_stream_summaries = {}
     self._event_timestamp_tables = {}
     self._event_timestamp_tables_lfu = []
     self._event_heap = None
@@ -856,6 +1234,16 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._last_session = 0
     self._last_task = 0
     self._maximum_buffer_size = maximum_buffer_size
+    self._path_spec_identifiers = collections.OrderedDict()
+    self._path_spec_offset_tables = {}
+    self._path_spec_offset_tables_lfu = []
+    self._path_spec_stream_number = 1
+    self._path_spec_streams = {}
+    self._path_specs_cache = collections.OrderedDict()
+    self._number_of_pending_merge_blocks = 0
+    self._path_specs_list = _AttributeContainersList()
+    self._reserved_event_stream_numbers = set()
+    self._reserved_path_spec_stream_numbers = set()
     self._serialized_event_tags = []
     self._serialized_event_tags_size = 0
     self._serialized_events_heap = _SerializedEventsHeap()
@@ -864,9 +1252,46 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._zipfile_path = None
 
     self.format_version = self._FORMAT_VERSION
-    self.serialization_format = definitions.SERIALIZER_FORMAT_JSON
+    self.serialization_format = serialization_format
     self.storage_type = storage_type
 
+  def _AddPathSpec(self, path_spec):
+    """Adds a path specification.
+
+    A path specification that was recently added is not added again, instead
+    the identifier of the previously added path specification is returned.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+
+    Returns:
+      SerializedStreamIdentifier: identifier of the path specification.
+
+    Raises:
+      IOError: if the path specification cannot be serialized.
+    """
+    lookup_key = path_spec.comparable
+    path_spec_identifier = self._path_spec_identifiers.pop(lookup_key, None)
+    if not path_spec_identifier:
+      path_spec_container = path_specs.PathSpecContainer(path_spec=path_spec)
+      path_spec_data = self._SerializeAttributeContainer(path_spec_container)
+
+      path_spec_identifier = identifiers.SerializedStreamIdentifier(
+          self._path_spec_stream_number,
+          self._path_specs_list.number_of_attribute_containers)
+      self._path_specs_list.PushAttributeContainer(path_spec_data)
+
+      if (len(self._path_spec_identifiers) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_PATH_SPECS):
+        self._path_spec_identifiers.popitem(last=False)
+
+    self._path_spec_identifiers[lookup_key] = path_spec_identifier
+
+    if self._path_specs_list.data_size > self._maximum_buffer_size:
+      self._WriteSerializedPathSpecs()
+
+    return path_spec_identifier
+
   def _BuildEventTagIndex(self):
     """Builds the event tag index.
 
@@ -879,7 +1304,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
       lookup_key = event_identifier.CopyToString()
       self._event_tag_index[lookup_key] = event_tag.GetIdentifier()
 
-  def _FillEventHeapFromStream(self, stream_number):
+  def _FillEventHeapFromStream(self, stream_number, event_constraints=None):
     """Fills the event heap with the next events from the stream.
 
     This function will read events starting at the current stream entry that
@@ -891,8 +1316,11 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     Args:
       stream_number (int): serialized data stream number.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
     """
-    event = self._GetEvent(stream_number)
+    event = self._GetEvent(
+        stream_number, event_constraints=event_constraints)
     if not event:
       return
 
@@ -900,13 +1328,16 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     reference_timestamp = event.timestamp
     while event.timestamp == reference_timestamp:
-      event = self._GetEvent(stream_number)
+      event = self._GetEvent(
+          stream_number, event_constraints=event_constraints)
       if not event:
         break
 
       self._event_heap.PushEvent(event)
 
-  def _GetEvent(self, stream_number, entry_index=NEXT_AVAILABLE_ENTRY):
+  def _GetEvent(
+      self, stream_number, entry_index=NEXT_AVAILABLE_ENTRY,
+      event_constraints=None):
     """Reads an event from a specific stream.
 
     Args:
@@ -914,12 +1345,23 @@ class ZIPStorageFile(interface.BaseFileStorage):
       entry_index (Optional[int]): number of the serialized event within
           the stream, where NEXT_AVAILABLE_ENTRY represents the next available
           event.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter. Skipped events are
+          not deserialized and the next event that can match is read instead.
 
     Returns:
       EventObject: event or None.
     """
+    # Only JSON serialized events can be checked without deserializing them.
+    if self.serialization_format != definitions.SERIALIZER_FORMAT_JSON:
+      event_constraints = None
+
     event_data, entry_index = self._GetEventSerializedData(
         stream_number, entry_index=entry_index)
+    while (event_data and event_constraints and
+           not event_constraints.MatchesSerializedEvent(event_data)):
+      event_data, entry_index = self._GetEventSerializedData(stream_number)
+
     if not event_data:
       return
 
@@ -928,8 +1370,103 @@ class ZIPStorageFile(interface.BaseFileStorage):
       event_identifier = identifiers.SerializedStreamIdentifier(
           stream_number, entry_index)
       event.SetIdentifier(event_identifier)
+      self._SetEventPathSpec(event)
     return event
 
+  def _GetDeserializedEvents(
+      self, pool, stream_number, entry_range, time_range=None,
+      event_constraints=None):
+    """Retrieves the events of a stream deserialized by worker processes.
+
+    Blocks are handed to the worker processes ahead of the merge only when
+    a block of the stream has been consumed and the number of pending blocks
+    of all streams together allows it, so that the number of deserialized
+    events held by the main process does not grow with the number of
+    streams.
+
+    Args:
+      pool (multiprocessing.Pool): pool of merge worker processes.
+      stream_number (int): number of the serialized event stream.
+      entry_range (tuple[int, int]): entry index of the first event and of
+          the event following the last event, where the latter can be None
+          if not known.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
+
+    Yields:
+      EventObject: event.
+    """
+    block_generator = self._ReadSerializedEventBlocks(
+        stream_number, entry_range, event_constraints=event_constraints)
+
+    pending_blocks = collections.deque()
+    while True:
+      while not pending_blocks or (
+          len(pending_blocks) <
+          self._MAXIMUM_NUMBER_OF_PENDING_MERGE_BLOCKS_PER_STREAM and
+          self._number_of_pending_merge_blocks <
+          self._MAXIMUM_NUMBER_OF_PENDING_MERGE_BLOCKS):
+        block = next(block_generator, None)
+        if not block:
+          break
+
+        first_entry_index, serialized_events = block
+        async_result = pool.apply_async(_DeserializeEventBlock, (
+            self._serializer, stream_number, first_entry_index,
+            serialized_events))
+        pending_blocks.append(async_result)
+        self._number_of_pending_merge_blocks += 1
+
+      if not pending_blocks:
+        break
+
+      async_result = pending_blocks.popleft()
+      self._number_of_pending_merge_blocks -= 1
+      for event in async_result.get():
+        # Check the lower bound in case no timestamp table was available.
+        if time_range and event.timestamp < time_range.start_timestamp:
+          continue
+
+        # The path specifications are resolved by the main process so that
+        # the decoded path specifications are cached across blocks.
+        self._SetEventPathSpec(event)
+        yield event
+
+  def _GetEventConstraints(self, time_range, event_constraints):
+    """Combines a time range with event constraints.
+
+    Args:
+      time_range (TimeRange): time range used to filter events that fall
+          in a specific period or None.
+      event_constraints (EventConstraints): constraints used to skip events
+          that cannot match an event filter or None.
+
+    Returns:
+      tuple: contains:
+
+        TimeRange: time range of the events that can meet both or None.
+        EventConstraints: constraints without the time range or None.
+    """
+    if not event_constraints:
+      return time_range, None
+
+    if time_range:
+      event_constraints = event_constraints.Intersect(
+          storage_event_constraints.EventConstraints(time_range=time_range))
+
+    time_range = event_constraints.time_range
+    event_constraints = storage_event_constraints.EventConstraints(
+        data_types=event_constraints.data_types,
+        filename_prefix=event_constraints.filename_prefix,
+        parsers=event_constraints.parsers)
+
+    if not event_constraints.HasConstraints():
+      event_constraints = None
+
+    return time_range, event_constraints
+
   def _GetEventSerializedData(
       self, stream_number, entry_index=NEXT_AVAILABLE_ENTRY):
     """Retrieves specific event serialized data.
@@ -959,7 +1496,9 @@ class ZIPStorageFile(interface.BaseFileStorage):
     if entry_index is None:
       raise ValueError(u'Invalid entry index.')
 
-    if stream_number < 1 or stream_number > self._event_stream_number:
+    if stream_number < 1 or (
+        stream_number > self._event_stream_number and
+        stream_number not in self._reserved_event_stream_numbers):
       raise ValueError(u'Stream number: {0:d} out of bounds.'.format(
           stream_number))
 
@@ -998,6 +1537,99 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     return event_data, event_entry_index
 
+  def _GetEventStreamEntryRange(
+      self, stream_number, time_range=None, event_constraints=None):
+    """Determines the range of entries of an event stream in a time range.
+
+    Args:
+      stream_number (int): number of the serialized event stream.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
+
+    Returns:
+      tuple: contains:
+
+        int: entry index of the first event in the time range, where
+            NEXT_AVAILABLE_ENTRY represents the first event of the stream.
+        int: entry index of the event following the last event in the time
+            range or None if not known.
+
+      or None if the stream contains no events in the time range or no
+      events that can meet the constraints.
+    """
+    if not time_range and not event_constraints:
+      return self.NEXT_AVAILABLE_ENTRY, None
+
+    # Skip the stream if its summary indicates that its events do not
+    # overlap with the time range or cannot meet the constraints.
+    event_stream_summary = self._GetEventStreamSummary(stream_number)
+    if event_stream_summary:
+      if time_range and not event_stream_summary.IsInTimeRange(time_range):
+        return
+
+      if (event_constraints and
+          not event_constraints.IsStreamRelevant(event_stream_summary)):
+        return
+
+    if not time_range:
+      return self.NEXT_AVAILABLE_ENTRY, None
+
+    stream_name = u'event_timestamps.{0:06d}'.format(stream_number)
+    if not self._HasStream(stream_name):
+      return self.NEXT_AVAILABLE_ENTRY, None
+
+    try:
+      timestamp_table = self._GetSerializedEventTimestampTable(stream_number)
+    except IOError as exception:
+      logging.error((
+          u'Unable to read timestamp table from stream: {0:s} '
+          u'with error: {1:s}.').format(stream_name, exception))
+      return self.NEXT_AVAILABLE_ENTRY, None
+
+    if not timestamp_table.number_of_timestamps:
+      return
+
+    # Skip the stream if its timestamps do not overlap with the time range.
+    if (time_range.start_timestamp > timestamp_table.GetTimestamp(-1) or
+        time_range.end_timestamp < timestamp_table.GetTimestamp(0)):
+      return
+
+    first_entry_index = timestamp_table.GetEntryIndexOfTimestamp(
+        time_range.start_timestamp)
+    last_entry_index = timestamp_table.GetEntryIndexOfTimestamp(
+        time_range.end_timestamp + 1)
+    return first_entry_index, last_entry_index
+
+  def _GetEventStreamSummary(self, stream_number):
+    """Retrieves the summary of a specific serialized event stream.
+
+    Args:
+      stream_number (int): number of the serialized event stream.
+
+    Returns:
+      EventStreamSummary: event stream summary or None if not available.
+    """
+    if stream_number in self._event_stream_summaries:
+      return self._event_stream_summaries[stream_number]
+
+    event_stream_summary = None
+
+    stream_name = u'event_summary.{0:06d}'.format(stream_number)
+    if self._HasStream(stream_name):
+      event_stream_summary = EventStreamSummary(stream_number)
+      try:
+        event_stream_summary.Read(self._ReadStream(stream_name))
+      except IOError as exception:
+        logging.error((
+            u'Unable to read event stream summary from stream: {0:s} '
+            u'with error: {1!s}.').format(stream_name, exception))
+        event_stream_summary = None
+
+    self._event_stream_summaries[stream_number] = event_stream_summary
+    return event_stream_summary
+
   def _GetEventSource(self, stream_number, entry_index=NEXT_AVAILABLE_ENTRY):
     """Reads an event source from a specific stream.
 
@@ -1243,29 +1875,98 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     return last_stream_number + 1
 
-  def _GetSerializedDataStream(
-      self, streams_cache, stream_name_prefix, stream_number):
-    """Retrieves the serialized data stream.
+  def _GetNextStreamNumber(self, stream_number, reserved_stream_numbers):
+    """Retrieves the stream number that follows a written stream.
+
+    Stream numbers that are reserved for pre-merged task storages are
+    skipped.
 
     Args:
-      streams_cache (dict): streams cache.
-      stream_name_prefix (str): stream name prefix.
-      stream_number (int): number of the stream.
+      stream_number (int): number of the written stream.
+      reserved_stream_numbers (set[int]): reserved stream numbers, from which
+          the skipped stream numbers are removed.
 
     Returns:
-      _SerializedDataStream: serialized data stream.
+      int: next stream number.
+    """
+    stream_number += 1
+    while stream_number in reserved_stream_numbers:
+      reserved_stream_numbers.remove(stream_number)
+      stream_number += 1
+
+    return stream_number
+
+  def _GetPathSpec(self, stream_number, entry_index):
+    """Retrieves a specific path specification.
+
+    Recently retrieved path specifications are cached, so that the path
+    specification of events originating from the same file entry is only
+    deserialized once.
+
+    Args:
+      stream_number (int): number of the serialized path specification stream.
+      entry_index (int): number of the serialized path specification within
+          the stream.
+
+    Returns:
+      dfvfs.PathSpec: path specification or None.
 
     Raises:
       IOError: if the stream cannot be opened.
+      IndexError: if the entry index is out of bounds.
     """
-    data_stream = streams_cache.get(stream_number, None)
-    if not data_stream:
-      stream_name = u'{0:s}.{1:06d}'.format(stream_name_prefix, stream_number)
-      if not self._HasStream(stream_name):
-        raise IOError(u'No such stream: {0:s}'.format(stream_name))
+    lookup_key = (stream_number, entry_index)
+    path_spec = self._path_specs_cache.pop(lookup_key, None)
+    if not path_spec:
+      if stream_number == self._path_spec_stream_number:
+        path_spec_data = self._path_specs_list.GetAttributeContainerByIndex(
+            entry_index)
 
-      data_stream = _SerializedDataStream(
-          self._zipfile, self._zipfile_path, stream_name)
+      else:
+        data_stream = self._GetSerializedPathSpecStream(stream_number)
+        offset_table = self._GetSerializedPathSpecOffsetTable(stream_number)
+        stream_offset = offset_table.GetOffset(entry_index)
+
+        data_stream.SeekEntryAtOffset(entry_index, stream_offset)
+        path_spec_data = data_stream.ReadEntry()
+
+      path_spec_container = self._DeserializeAttributeContainer(
+          path_spec_data, u'path_spec')
+      if not path_spec_container:
+        return
+
+      path_spec = path_spec_container.path_spec
+
+      if (len(self._path_specs_cache) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_PATH_SPECS):
+        self._path_specs_cache.popitem(last=False)
+
+    self._path_specs_cache[lookup_key] = path_spec
+    return path_spec
+
+  def _GetSerializedDataStream(
+      self, streams_cache, stream_name_prefix, stream_number):
+    """Retrieves the serialized data stream.
+
+    Args:
+      streams_cache (dict): streams cache.
+      stream_name_prefix (str): stream name prefix.
+      stream_number (int): number of the stream.
+
+    Returns:
+      _SerializedDataStream: serialized data stream.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    data_stream = streams_cache.get(stream_number, None)
+    if not data_stream:
+      stream_name = u'{0:s}.{1:06d}'.format(stream_name_prefix, stream_number)
+      if not self._HasStream(stream_name):
+        raise IOError(u'No such stream: {0:s}'.format(stream_name))
+
+      data_stream = _SerializedDataStream(
+          self._zipfile, self._zipfile_path, stream_name)
       streams_cache[stream_number] = data_stream
 
     return data_stream
@@ -1369,6 +2070,37 @@ class ZIPStorageFile(interface.BaseFileStorage):
         self._event_source_offset_tables, self._event_source_offset_tables_lfu,
         u'event_source_index', stream_number)
 
+  def _GetSerializedPathSpecOffsetTable(self, stream_number):
+    """Retrieves the serialized path specification stream offset table.
+
+    Args:
+      stream_number (int): number of the stream.
+
+    Returns:
+      _SerializedDataOffsetTable: serialized data offset table.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    return self._GetSerializedDataOffsetTable(
+        self._path_spec_offset_tables, self._path_spec_offset_tables_lfu,
+        u'path_spec_index', stream_number)
+
+  def _GetSerializedPathSpecStream(self, stream_number):
+    """Retrieves the serialized path specification stream.
+
+    Args:
+      stream_number (int): number of the stream.
+
+    Returns:
+      _SerializedDataStream: serialized data stream.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    return self._GetSerializedDataStream(
+        self._path_spec_streams, u'path_spec_data', stream_number)
+
   def _GetSerializedEventSourceStream(self, stream_number):
     """Retrieves the serialized event source stream.
 
@@ -1490,18 +2222,21 @@ class ZIPStorageFile(interface.BaseFileStorage):
       for stream_name in self._zipfile.namelist():
         yield stream_name
 
-  def _GetSortedEvent(self, time_range=None):
+  def _GetSortedEvent(self, time_range=None, event_constraints=None):
     """Retrieves the next event in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
 
     Returns:
       EventObject: event.
     """
     if not self._event_heap:
-      self._InitializeMergeBuffer(time_range=time_range)
+      self._InitializeMergeBuffer(
+          time_range=time_range, event_constraints=event_constraints)
       if not self._event_heap:
         return
 
@@ -1518,7 +2253,8 @@ class ZIPStorageFile(interface.BaseFileStorage):
     next_event, next_stream_number = self._event_heap.PeekEvent()
     if (not next_event or next_stream_number != stream_number or
         next_event.timestamp != event.timestamp):
-      self._FillEventHeapFromStream(stream_number)
+      self._FillEventHeapFromStream(
+          stream_number, event_constraints=event_constraints)
 
     event_identifier = event.GetIdentifier()
     event.tag = self._GetEventTagByIdentifier(event_identifier)
@@ -1541,7 +2277,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
     file_object.close()
     return True
 
-  def _InitializeMergeBuffer(self, time_range=None):
+  def _InitializeMergeBuffer(self, time_range=None, event_constraints=None):
     """Initializes the events into the merge buffer.
 
     This function fills the merge buffer with the first relevant event
@@ -1550,41 +2286,28 @@ class ZIPStorageFile(interface.BaseFileStorage):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
     """
     self._event_heap = _EventsHeap()
 
     number_range = self._GetSerializedEventStreamNumbers()
     for stream_number in number_range:
-      entry_index = self.NEXT_AVAILABLE_ENTRY
-      if time_range:
-        stream_name = u'event_timestamps.{0:06d}'.format(stream_number)
-        if self._HasStream(stream_name):
-          try:
-            timestamp_table = self._GetSerializedEventTimestampTable(
-                stream_number)
-          except IOError as exception:
-            logging.error((
-                u'Unable to read timestamp table from stream: {0:s} '
-                u'with error: {1:s}.').format(stream_name, exception))
-
-          # If the start timestamp of the time range filter is larger than the
-          # last timestamp in the timestamp table skip this stream.
-          timestamp_compare = timestamp_table.GetTimestamp(
-              self.NEXT_AVAILABLE_ENTRY)
-          if time_range.start_timestamp > timestamp_compare:
-            continue
-
-          for table_index in range(timestamp_table.number_of_timestamps - 1):
-            timestamp_compare = timestamp_table.GetTimestamp(table_index)
-            if time_range.start_timestamp >= timestamp_compare:
-              entry_index = table_index
-              break
-
-      event = self._GetEvent(stream_number, entry_index=entry_index)
+      entry_range = self._GetEventStreamEntryRange(
+          stream_number, time_range=time_range,
+          event_constraints=event_constraints)
+      if not entry_range:
+        continue
+
+      entry_index, _ = entry_range
+      event = self._GetEvent(
+          stream_number, entry_index=entry_index,
+          event_constraints=event_constraints)
       # Check the lower bound in case no timestamp table was available.
       while (event and time_range and
              event.timestamp < time_range.start_timestamp):
-        event = self._GetEvent(stream_number)
+        event = self._GetEvent(
+            stream_number, event_constraints=event_constraints)
 
       if event:
         if time_range and event.timestamp > time_range.end_timestamp:
@@ -1594,7 +2317,8 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
         reference_timestamp = event.timestamp
         while event.timestamp == reference_timestamp:
-          event = self._GetEvent(stream_number)
+          event = self._GetEvent(
+              stream_number, event_constraints=event_constraints)
           if not event:
             break
 
@@ -1613,11 +2337,12 @@ class ZIPStorageFile(interface.BaseFileStorage):
       if stored_serialization_format:
         self.serialization_format = stored_serialization_format
 
-    if self.serialization_format != definitions.SERIALIZER_FORMAT_JSON:
+    serializer = self._SERIALIZERS.get(self.serialization_format, None)
+    if not serializer:
       raise IOError(u'Unsupported serialization format: {0:s}'.format(
           self.serialization_format))
 
-    self._serializer = json_serializer.JSONAttributeContainerSerializer
+    self._serializer = serializer
 
     # TODO: create a single function to determin last stream numbers.
     self._error_stream_number = self._GetLastStreamNumber(u'error_data.')
@@ -1626,6 +2351,8 @@ class ZIPStorageFile(interface.BaseFileStorage):
         u'event_source_data.')
     self._event_tag_stream_number = self._GetLastStreamNumber(
         u'event_tag_data.')
+    self._path_spec_stream_number = self._GetLastStreamNumber(
+        u'path_spec_data.')
 
     self._analysis_report_stream_number = self._GetLastStreamNumber(
         u'analysis_report_data.')
@@ -1757,6 +2484,65 @@ class ZIPStorageFile(interface.BaseFileStorage):
       attribute_container = self._ReadAttributeContainerFromStreamEntry(
           data_stream, container_type)
 
+  def _ReadSerializedEventBlocks(
+      self, stream_number, entry_range, event_constraints=None):
+    """Reads blocks of consecutive serialized events from a stream.
+
+    Args:
+      stream_number (int): number of the serialized event stream.
+      entry_range (tuple[int, int]): entry index of the first event and of
+          the event following the last event, where the latter can be None
+          if not known.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
+
+    Yields:
+      tuple: contains:
+
+        int: entry index of the first serialized event of the block.
+        list[bytes]: serialized events, where None represents an event
+            that cannot meet the constraints.
+    """
+    # Only JSON serialized events can be checked without deserializing them.
+    if self.serialization_format != definitions.SERIALIZER_FORMAT_JSON:
+      event_constraints = None
+
+    entry_index, last_entry_index = entry_range
+
+    event_data, entry_index = self._GetEventSerializedData(
+        stream_number, entry_index=entry_index)
+
+    first_entry_index = entry_index
+    serialized_events = []
+    number_of_matching_events = 0
+    while event_data:
+      # The entry of an event that cannot meet the constraints is kept as
+      # None, so that the entry indexes of the other events are preserved.
+      if (event_constraints and
+          not event_constraints.MatchesSerializedEvent(event_data)):
+        event_data = None
+      else:
+        number_of_matching_events += 1
+
+      serialized_events.append(event_data)
+      entry_index += 1
+
+      if last_entry_index is not None and entry_index >= last_entry_index:
+        break
+
+      if len(serialized_events) >= self._MERGE_BLOCK_SIZE:
+        if number_of_matching_events:
+          yield first_entry_index, serialized_events
+
+        first_entry_index = entry_index
+        serialized_events = []
+        number_of_matching_events = 0
+
+      event_data, _ = self._GetEventSerializedData(stream_number)
+
+    if number_of_matching_events:
+      yield first_entry_index, serialized_events
+
   def _ReadSerializerStream(self):
     """Reads the serializer stream.
 
@@ -1812,7 +2598,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
               storage_metadata.format_version))
 
     serialization_format = storage_metadata.serialization_format
-    if serialization_format != definitions.SERIALIZER_FORMAT_JSON:
+    if serialization_format not in definitions.SERIALIZER_FORMATS:
       raise IOError(u'Unsupported serialization format: {0:s}'.format(
           serialization_format))
 
@@ -1846,6 +2632,30 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     return data
 
+  def _SetEventPathSpec(self, event):
+    """Sets the path specification of an event read from storage.
+
+    Events that refer to a stored path specification have the reference
+    replaced by the path specification.
+
+    Args:
+      event (EventObject): event.
+    """
+    stream_number = getattr(event, u'path_spec_stream_number', None)
+    entry_index = getattr(event, u'path_spec_entry_index', None)
+    if stream_number is None or entry_index is None:
+      return
+
+    del event.path_spec_stream_number
+    del event.path_spec_entry_index
+
+    try:
+      event.pathspec = self._GetPathSpec(stream_number, entry_index)
+    except (IOError, IndexError) as exception:
+      logging.error((
+          u'Unable to read path specification: {0:d}.{1:d} with error: '
+          u'{2!s}').format(stream_number, entry_index, exception))
+
   def _WriteAttributeContainersList(
       self, attribute_containers_list, stream_name_prefix, stream_number):
     """Writes the contents of an attribute containers list.
@@ -1909,10 +2719,15 @@ class ZIPStorageFile(interface.BaseFileStorage):
     if not self._serialized_events_heap.data_size:
       return
 
+    # Write the path specifications first so that the events written
+    # never refer to path specifications that are not yet written.
+    self._WriteSerializedPathSpecs()
+
     self._WriteSerializedEventsHeap(
         self._serialized_events_heap, self._event_stream_number)
 
-    self._event_stream_number += 1
+    self._event_stream_number = self._GetNextStreamNumber(
+        self._event_stream_number, self._reserved_event_stream_numbers)
     self._serialized_events_heap.Empty()
 
   def _WriteSerializedEventsHeap(self, serialized_events_heap, stream_number):
@@ -1932,6 +2747,10 @@ class ZIPStorageFile(interface.BaseFileStorage):
     data_stream = _SerializedDataStream(
         self._zipfile, self._zipfile_path, stream_name)
 
+    event_stream_summary = EventStreamSummary(stream_number)
+    event_stream_summary.data_types = set(serialized_events_heap.data_types)
+    event_stream_summary.parsers = set(serialized_events_heap.parsers)
+
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(u'write')
 
@@ -1941,6 +2760,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
       for _ in range(serialized_events_heap.number_of_events):
         timestamp, entry_data = serialized_events_heap.PopEvent()
 
+        event_stream_summary.AddTimestamp(timestamp)
         timestamp_table.AddTimestamp(timestamp)
         offset_table.AddOffset(entry_data_offset)
 
@@ -1958,6 +2778,10 @@ class ZIPStorageFile(interface.BaseFileStorage):
     data_stream.WriteFinalize()
     timestamp_table.Write()
 
+    stream_name = u'event_summary.{0:06d}'.format(stream_number)
+    self._WriteStream(stream_name, event_stream_summary.Write())
+    self._event_stream_summaries[stream_number] = event_stream_summary
+
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(u'write')
 
@@ -1984,6 +2808,18 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._event_tag_stream_number += 1
     self._event_tags_list.Empty()
 
+  def _WriteSerializedPathSpecs(self):
+    """Writes the serialized path specifications."""
+    if not self._path_specs_list.data_size:
+      return
+
+    self._WriteAttributeContainersList(
+        self._path_specs_list, u'path_spec', self._path_spec_stream_number)
+
+    self._path_spec_stream_number = self._GetNextStreamNumber(
+        self._path_spec_stream_number, self._reserved_path_spec_stream_numbers)
+    self._path_specs_list.Empty()
+
   def _WriteSessionCompletion(self, session_completion):
     """Writes a session completion attribute container.
 
@@ -2204,11 +3040,33 @@ class ZIPStorageFile(interface.BaseFileStorage):
         self._serialized_events_heap.number_of_events)
     event.SetIdentifier(event_identifier)
 
+    # The path specification is stored separately and the event refers
+    # to it, which requires the event to be temporarily changed.
+    path_spec = getattr(event, u'pathspec', None)
+    if not isinstance(path_spec, dfvfs_path_spec.PathSpec):
+      path_spec = None
+
+    if path_spec:
+      path_spec_identifier = self._AddPathSpec(path_spec)
+
+      event.pathspec = None
+      event.path_spec_stream_number = path_spec_identifier.stream_number
+      event.path_spec_entry_index = path_spec_identifier.entry_index
+
     # We try to serialize the event first, so we can skip some
     # processing if it is invalid.
-    event_data = self._SerializeAttributeContainer(event)
+    try:
+      event_data = self._SerializeAttributeContainer(event)
+
+    finally:
+      if path_spec:
+        event.pathspec = path_spec
+        del event.path_spec_stream_number
+        del event.path_spec_entry_index
 
-    self._serialized_events_heap.PushEvent(event.timestamp, event_data)
+    self._serialized_events_heap.PushEvent(
+        event.timestamp, event_data, data_type=event.data_type,
+        parser=getattr(event, u'parser', None))
 
     if self._serialized_events_heap.data_size > self._maximum_buffer_size:
       self._WriteSerializedEvents()
@@ -2317,6 +3175,34 @@ class ZIPStorageFile(interface.BaseFileStorage):
     for event_tag in event_tags:
       self.AddEventTag(event_tag)
 
+  def AddPreMergedEventStreams(self, storage_file):
+    """Adds the event streams of pre-merged task storages.
+
+    The event and path specification streams of the pre-merged task storages
+    are added as-is, since they were written with the stream numbers reserved
+    by ReservePreMergeStreamNumbers.
+
+    Args:
+      storage_file (ZIPStorageFile): pre-merged task storages file.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    if not self._is_open:
+      raise IOError(u'Unable to write to closed storage file.')
+
+    if self._read_only:
+      raise IOError(u'Unable to write to read-only storage file.')
+
+    # pylint: disable=protected-access
+    for stream_name in storage_file._GetStreamNames():
+      stream_name_prefix, _, _ = stream_name.partition(u'.')
+      if stream_name_prefix not in self._PRE_MERGED_STREAM_NAME_PREFIXES:
+        continue
+
+      stream_data = storage_file._ReadStream(stream_name)
+      self._WriteStream(stream_name, stream_data)
+
   def Close(self):
     """Closes the storage file.
 
@@ -2351,9 +3237,16 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._event_tag_offset_tables_lfu = []
     self._event_tag_streams = {}
 
+    self._event_stream_summaries = {}
     self._event_timestamp_tables = {}
     self._event_timestamp_tables_lfu = []
 
+    self._path_spec_identifiers = collections.OrderedDict()
+    self._path_spec_offset_tables = {}
+    self._path_spec_offset_tables_lfu = []
+    self._path_spec_streams = {}
+    self._path_specs_cache = collections.OrderedDict()
+
     self._zipfile.close()
     self._zipfile = None
     self._is_open = False
@@ -2394,6 +3287,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     if not self._read_only:
       self._WriteSerializedEventSources()
+      self._WriteSerializedPathSpecs()
       self._WriteSerializedEvents()
       self._WriteSerializedEventTags()
       self._WriteSerializedErrors()
@@ -2443,20 +3337,134 @@ class ZIPStorageFile(interface.BaseFileStorage):
         error.SetIdentifier(error_identifier)
         yield error
 
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, time_range=None, event_constraints=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
 
     Yields:
       EventObject: event.
     """
-    event = self._GetSortedEvent(time_range=time_range)
+    time_range, event_constraints = self._GetEventConstraints(
+        time_range, event_constraints)
+
+    event = self._GetSortedEvent(
+        time_range=time_range, event_constraints=event_constraints)
     while event:
       yield event
-      event = self._GetSortedEvent(time_range=time_range)
+      event = self._GetSortedEvent(
+          time_range=time_range, event_constraints=event_constraints)
+
+  def GetUnsortedEvents(self):
+    """Retrieves the events in the order they were stored.
+
+    The events are read stream by stream, which avoids merging the event
+    streams in chronological order.
+
+    Yields:
+      EventObject: event.
+    """
+    for stream_number in self._GetSerializedEventStreamNumbers():
+      event = self._GetEvent(stream_number, entry_index=0)
+      while event:
+        event_identifier = event.GetIdentifier()
+        event.tag = self._GetEventTagByIdentifier(event_identifier)
+        yield event
+        event = self._GetEvent(stream_number)
+
+  def GetEventsInParallel(
+      self, number_of_workers, time_range=None, event_constraints=None):
+    """Retrieves the events in increasing chronological order.
+
+    The serialized events are deserialized in blocks by a pool of worker
+    processes, while the main process only merges the deserialized events
+    of the individual streams. The events are returned in the same order
+    as by GetEvents.
+
+    Args:
+      number_of_workers (int): number of worker processes, where a value
+          of 1 or less represents that no worker processes should be used.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
+
+    Yields:
+      EventObject: event.
+    """
+    if number_of_workers <= 1:
+      for event in self.GetEvents(
+          time_range=time_range, event_constraints=event_constraints):
+        yield event
+      return
+
+    time_range, event_constraints = self._GetEventConstraints(
+        time_range, event_constraints)
+
+    pool = multiprocessing.Pool(processes=number_of_workers)
+
+    # Pending blocks of a previous retrieval that was not completed are
+    # discarded together with the pool.
+    self._number_of_pending_merge_blocks = 0
+
+    try:
+      events_generators = {}
+      events_heap = _EventsHeap()
+
+      for stream_number in self._GetSerializedEventStreamNumbers():
+        entry_range = self._GetEventStreamEntryRange(
+            stream_number, time_range=time_range,
+            event_constraints=event_constraints)
+        if not entry_range:
+          continue
+
+        events_generator = self._GetDeserializedEvents(
+            pool, stream_number, entry_range, time_range=time_range,
+            event_constraints=event_constraints)
+        events_generators[stream_number] = events_generator
+
+        event = next(events_generator, None)
+        if event:
+          events_heap.PushEvent(event)
+
+      event, stream_number = events_heap.PopEvent()
+      while event:
+        # Stop as soon as we hit the upper bound.
+        if time_range and event.timestamp > time_range.end_timestamp:
+          break
+
+        next_event = next(events_generators[stream_number], None)
+        if next_event:
+          events_heap.PushEvent(next_event)
+
+        event_identifier = event.GetIdentifier()
+        event.tag = self._GetEventTagByIdentifier(event_identifier)
+        yield event
+
+        event, stream_number = events_heap.PopEvent()
+
+    finally:
+      pool.terminate()
+      pool.join()
+
+  def GetEventStreamSummaries(self):
+    """Retrieves the event stream summaries.
+
+    The event stream summaries can be used to determine which event streams
+    are relevant without reading the streams. Note that event streams
+    written by older versions do not have a summary.
+
+    Yields:
+      EventStreamSummary: event stream summary.
+    """
+    for stream_number in self._GetSerializedEventStreamNumbers():
+      event_stream_summary = self._GetEventStreamSummary(stream_number)
+      if event_stream_summary:
+        yield event_stream_summary
 
   def GetEventSourceByIndex(self, index):
     """Retrieves a specific event source.
@@ -2697,6 +3705,96 @@ class ZIPStorageFile(interface.BaseFileStorage):
     if not read_only:
       self._OpenWrite()
 
+  def PreMergeTaskStorages(
+      self, task_storage_paths, event_stream_numbers,
+      path_spec_stream_numbers):
+    """Pre-merges task storages.
+
+    The events of the task storages are written to event streams and their
+    path specifications to path specification streams, using the stream
+    numbers reserved in the session storage. The buffers are written when
+    they exceed the maximum buffer size, as when writing a session storage.
+    The other attribute containers of the task storages are stored as well
+    and need to be added to the session storage separately.
+
+    Args:
+      task_storage_paths (list[str]): paths of the task storage files.
+      event_stream_numbers (list[int]): consecutive event stream numbers
+          reserved in the session storage.
+      path_spec_stream_numbers (list[int]): consecutive path specification
+          stream numbers reserved in the session storage.
+
+    Returns:
+      collections.Counter: number of pre-merged events per parser name,
+          where "total" contains the total number of events.
+
+    Raises:
+      IOError: when the storage file is closed or read-only or
+          if the events or path specifications need more streams than
+          reserved.
+    """
+    if not self._is_open:
+      raise IOError(u'Unable to write to closed storage file.')
+
+    if self._read_only:
+      raise IOError(u'Unable to write to read-only storage file.')
+
+    # The stream numbers are consecutive, so that written streams are
+    # followed by the next reserved stream number.
+    self._event_stream_number = event_stream_numbers[0]
+    self._path_spec_stream_number = path_spec_stream_numbers[0]
+
+    # The stream number that follows the last reserved stream number.
+    maximum_event_stream_number = event_stream_numbers[-1] + 1
+    maximum_path_spec_stream_number = path_spec_stream_numbers[-1] + 1
+
+    parsers_counter = collections.Counter()
+
+    for task_storage_path in task_storage_paths:
+      task_storage_reader = gzip_file.GZIPStorageFileReader(task_storage_path)
+      try:
+        for event_source in task_storage_reader.GetEventSources():
+          self.AddEventSource(event_source)
+
+        for event in task_storage_reader.GetEvents():
+          self.AddEvent(event)
+
+          # Here we want the name of the parser or plugin not the parser chain.
+          parser_name = getattr(event, u'parser', u'')
+          _, _, parser_name = parser_name.rpartition(u'/')
+          if not parser_name:
+            parser_name = u'N/A'
+
+          parsers_counter[u'total'] += 1
+          parsers_counter[parser_name] += 1
+
+        for event_tag in task_storage_reader.GetEventTags():
+          self.AddEventTag(event_tag)
+
+        for error in task_storage_reader.GetErrors():
+          self.AddError(error)
+
+        for analysis_report in task_storage_reader.GetAnalysisReports():
+          self.AddAnalysisReport(analysis_report)
+
+      finally:
+        task_storage_reader.Close()
+
+      if (self._event_stream_number > maximum_event_stream_number or
+          self._path_spec_stream_number > maximum_path_spec_stream_number):
+        raise IOError(u'Unable to pre-merge task storages: too many streams.')
+
+    # The buffers are written before the stream numbers are checked, since
+    # otherwise they would be written on close.
+    self._WriteSerializedEvents()
+    self._WriteSerializedPathSpecs()
+
+    if (self._event_stream_number > maximum_event_stream_number or
+        self._path_spec_stream_number > maximum_path_spec_stream_number):
+      raise IOError(u'Unable to pre-merge task storages: too many streams.')
+
+    return parsers_counter
+
   def ReadPreprocessingInformation(self, knowledge_base):
     """Reads preprocessing information.
 
@@ -2723,6 +3821,49 @@ class ZIPStorageFile(interface.BaseFileStorage):
       knowledge_base.ReadSystemConfigurationArtifact(
           system_configuration, session_identifier=stream_number)
 
+  def ReservePreMergeStreamNumbers(self, number_of_streams):
+    """Reserves stream numbers for pre-merged task storages.
+
+    The reserved stream numbers follow the stream numbers of the buffered
+    events and path specifications, so that the buffers do not need to be
+    written. The reserved stream numbers are skipped when the buffers are
+    written.
+
+    Args:
+      number_of_streams (int): number of consecutive event and path
+          specification stream numbers to reserve.
+
+    Returns:
+      tuple: contains:
+
+        list[int]: reserved event stream numbers.
+        list[int]: reserved path specification stream numbers.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    if not self._is_open:
+      raise IOError(u'Unable to write to closed storage file.')
+
+    if self._read_only:
+      raise IOError(u'Unable to write to read-only storage file.')
+
+    event_stream_number = max(
+        [self._event_stream_number] +
+        list(self._reserved_event_stream_numbers)) + 1
+    event_stream_numbers = list(range(
+        event_stream_number, event_stream_number + number_of_streams))
+    self._reserved_event_stream_numbers.update(event_stream_numbers)
+
+    path_spec_stream_number = max(
+        [self._path_spec_stream_number] +
+        list(self._reserved_path_spec_stream_numbers)) + 1
+    path_spec_stream_numbers = list(range(
+        path_spec_stream_number, path_spec_stream_number + number_of_streams))
+    self._reserved_path_spec_stream_numbers.update(path_spec_stream_numbers)
+
+    return event_stream_numbers, path_spec_stream_numbers
+
   def WritePreprocessingInformation(self, knowledge_base):
     """Writes preprocessing information.
 
@@ -2832,25 +3973,279 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._WriteTaskStart(task_start)
 
 
+class ZIPStoragePreMergeReader(interface.StorageMergeReader):
+  """Class that implements a ZIP-based storage reader for merging.
+
+  The task storages are pre-merged together by a merge worker process. Once
+  the task storages have been pre-merged, the event streams are added as-is
+  to the session storage and the remaining attribute containers are merged.
+  """
+
+  _MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS = 4
+  _LOCKED_FILE_SLEEP_TIME = 0.5
+
+  def __init__(
+      self, storage_writer, task_storage_paths, pre_merged_storage_path,
+      async_result):
+    """Initializes a storage merge reader.
+
+    Args:
+      storage_writer (StorageWriter): storage writer.
+      task_storage_paths (list[str]): paths of the task storage files.
+      pre_merged_storage_path (str): path of the pre-merged storage file.
+      async_result (multiprocessing.pool.AsyncResult): result of the
+          pre-merge by the merge worker process.
+    """
+    super(ZIPStoragePreMergeReader, self).__init__(storage_writer)
+    self._async_result = async_result
+    self._attribute_containers = None
+    self._pre_merged_storage_file = None
+    self._pre_merged_storage_path = pre_merged_storage_path
+    self._storage_merge_reader = None
+    self._task_storage_paths = task_storage_paths
+    self._unmerged_task_storage_paths = []
+
+  def _AddAttributeContainer(self, attribute_container):
+    """Adds a single attribute container to the storage writer.
+
+    Args:
+      attribute_container (AttributeContainer): container
+
+    Raises:
+      RuntimeError: if the attribute container type is not supported.
+    """
+    container_type = attribute_container.CONTAINER_TYPE
+    if container_type == u'event_source':
+      self._storage_writer.AddEventSource(attribute_container)
+
+    elif container_type == u'event_tag':
+      self._storage_writer.AddEventTag(attribute_container)
+
+    elif container_type == u'extraction_error':
+      self._storage_writer.AddError(attribute_container)
+
+    elif container_type == u'analysis_report':
+      self._storage_writer.AddAnalysisReport(attribute_container)
+
+    else:
+      raise RuntimeError(u'Unsupported container type: {0:s}'.format(
+          container_type))
+
+  def _GetAttributeContainers(self):
+    """Retrieves the attribute containers of the pre-merged storage file.
+
+    Yields:
+      AttributeContainer: attribute container.
+    """
+    for event_source in self._pre_merged_storage_file.GetEventSources():
+      yield event_source
+
+    for event_tag in self._pre_merged_storage_file.GetEventTags():
+      yield event_tag
+
+    for error in self._pre_merged_storage_file.GetErrors():
+      yield error
+
+    for analysis_report in self._pre_merged_storage_file.GetAnalysisReports():
+      yield analysis_report
+
+  def _MergeTaskStorages(self, maximum_number_of_containers=0):
+    """Merges the task storages that could not be pre-merged.
+
+    Args:
+      maximum_number_of_containers (Optional[int]): maximum number of
+          containers to merge, where 0 represent no limit.
+
+    Returns:
+      bool: True if the entire task storage files have been merged.
+    """
+    while self._storage_merge_reader or self._unmerged_task_storage_paths:
+      if not self._storage_merge_reader:
+        task_storage_path = self._unmerged_task_storage_paths.pop(0)
+        self._storage_merge_reader = gzip_file.GZIPStorageMergeReader(
+            self._storage_writer, task_storage_path)
+
+      fully_merged = self._storage_merge_reader.MergeAttributeContainers(
+          maximum_number_of_containers=maximum_number_of_containers)
+      if not fully_merged:
+        return False
+
+      self._storage_merge_reader = None
+
+    return True
+
+  def _RemoveFile(self, path):
+    """Removes a file.
+
+    Args:
+      path (str): path of the file.
+
+    Raises:
+      OSError: if the file cannot be deleted.
+    """
+    if not os.path.exists(path):
+      return
+
+    # On Windows the file can sometimes be in use and we have to wait.
+    for attempt in range(1, self._MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS):
+      try:
+        os.remove(path)
+        break
+      except OSError:
+        if attempt == (self._MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS - 1):
+          raise
+        time.sleep(self._LOCKED_FILE_SLEEP_TIME)
+
+  def _StartMerge(self):
+    """Starts merging the pre-merged storage file.
+
+    If the task storages could not be pre-merged, the task storages are
+    merged one after the other by gzip-based storage merge readers instead.
+    """
+    try:
+      parsers_counter = self._async_result.get()
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.error((
+          u'Unable to pre-merge task storages: {0:s} with error: {1!s}, '
+          u'merging task storages instead.').format(
+              u', '.join(self._task_storage_paths), exception))
+      parsers_counter = None
+
+    self._async_result = None
+
+    if parsers_counter is None:
+      self._RemoveFile(self._pre_merged_storage_path)
+      self._unmerged_task_storage_paths = list(self._task_storage_paths)
+      return
+
+    self._pre_merged_storage_file = ZIPStorageFile()
+    self._pre_merged_storage_file.Open(path=self._pre_merged_storage_path)
+
+    self._storage_writer.AddPreMergedEventStreams(
+        self._pre_merged_storage_file, parsers_counter)
+
+    self._attribute_containers = self._GetAttributeContainers()
+
+  @property
+  def is_pre_merged(self):
+    """bool: True if the merge worker process completed the pre-merge."""
+    return not self._async_result or self._async_result.ready()
+
+  def MergeAttributeContainers(self, maximum_number_of_containers=0):
+    """Reads attribute containers from a task storage file into the writer.
+
+    Args:
+      maximum_number_of_containers (Optional[int]): maximum number of
+          containers to merge, where 0 represent no limit.
+
+    Returns:
+      bool: True if the entire task storage file has been merged.
+
+    Raises:
+      OSError: if the task storage file cannot be deleted.
+    """
+    if not self.is_pre_merged:
+      return False
+
+    if self._async_result:
+      self._StartMerge()
+
+    if self._storage_merge_reader or self._unmerged_task_storage_paths:
+      return self._MergeTaskStorages(
+          maximum_number_of_containers=maximum_number_of_containers)
+
+    number_of_containers = 0
+    for attribute_container in self._attribute_containers:
+      self._AddAttributeContainer(attribute_container)
+      number_of_containers += 1
+
+      if (maximum_number_of_containers > 0 and
+          number_of_containers >= maximum_number_of_containers):
+        return False
+
+    self._pre_merged_storage_file.Close()
+    self._pre_merged_storage_file = None
+
+    self._RemoveFile(self._pre_merged_storage_path)
+    for task_storage_path in self._task_storage_paths:
+      self._RemoveFile(task_storage_path)
+
+    return True
+
+
 class ZIPStorageFileReader(interface.FileStorageReader):
   """Class that implements the ZIP-based storage file reader."""
 
-  def __init__(self, path):
+  def __init__(self, path, number_of_merge_workers=1):
     """Initializes a storage reader.
 
     Args:
       path (str): path to the input file.
+      number_of_merge_workers (Optional[int]): number of worker processes
+          used to deserialize events while retrieving the events in
+          chronological order, where 0 represents the number of available
+          system CPUs minus one and 1 represents that no worker processes
+          should be used.
     """
+    if not number_of_merge_workers:
+      number_of_merge_workers = max(multiprocessing.cpu_count() - 1, 1)
+
     super(ZIPStorageFileReader, self).__init__(path)
+    self._number_of_merge_workers = number_of_merge_workers
     self._storage_file = ZIPStorageFile()
     self._storage_file.Open(path=path)
 
+  def GetEvents(self, time_range=None, event_constraints=None):
+    """Retrieves the events in increasing chronological order.
+
+    Args:
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+      event_constraints (Optional[EventConstraints]): constraints used to
+          skip events that cannot match an event filter.
+
+    Returns:
+      generator(EventObject): event generator.
+    """
+    return self._storage_file.GetEventsInParallel(
+        self._number_of_merge_workers, time_range=time_range,
+        event_constraints=event_constraints)
+
+  def GetEventStreamSummaries(self):
+    """Retrieves the event stream summaries.
+
+    Returns:
+      generator(EventStreamSummary): event stream summary generator.
+    """
+    return self._storage_file.GetEventStreamSummaries()
+
+  def GetUnsortedEvents(self):
+    """Retrieves the events in the order they were stored.
+
+    Returns:
+      generator(EventObject): event generator.
+    """
+    return self._storage_file.GetUnsortedEvents()
+
 
 class ZIPStorageFileWriter(interface.StorageWriter):
   """Class that implements the ZIP-based storage file writer."""
 
+  # The maximum size of the task storage files that are pre-merged together
+  # by a merge worker process (8 MiB). Larger task storage files are merged
+  # by the main process. Note that the events of 8 MiB of compressed task
+  # storage files approximately fill an event stream of the maximum size.
+  _MAXIMUM_PRE_MERGE_TASK_STORAGE_SIZE = 8 * 1024 * 1024
+
+  # The number of event and path specification stream numbers that are
+  # reserved per pre-merge. Task storages that need more streams are merged
+  # by the main process instead. Reserved stream numbers that are not used
+  # are skipped.
+  _NUMBER_OF_PRE_MERGE_STREAMS = 4
+
   def __init__(
       self, session, output_file, buffer_size=0,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
       storage_type=definitions.STORAGE_TYPE_SESSION, task=None):
     """Initializes a storage writer.
 
@@ -2858,18 +4253,84 @@ class ZIPStorageFileWriter(interface.StorageWriter):
       session (Session): session the storage changes are part of.
       output_file (str): path to the output file.
       buffer_size (Optional[int]): estimated size of a protobuf file.
+      serialization_format (Optional[str]): serialization format of
+          a new session storage file. Task storage files are always
+          serialized as JSON.
       storage_type (Optional[str]): storage type.
       task(Optional[Task]): task.
     """
     super(ZIPStorageFileWriter, self).__init__(
         session, storage_type=storage_type, task=task)
     self._buffer_size = buffer_size
+    self._merge_process_pool = None
     self._merge_task_storage_path = u''
     self._output_file = output_file
+    self._serialization_format = serialization_format
     self._storage_file = None
     self._serializers_profiler = None
     self._task_storage_path = None
 
+  def _GetMergeTaskStorageFilePath(self, task):
+    """Retrieves the path of a task storage file to merge.
+
+    Args:
+      task (Task): task.
+
+    Returns:
+      str: path of the task storage file.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          if the temporary path for the task storage does not exist or
+          if the temporary path for the task storage doe not refers to a file.
+    """
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError(u'Unsupported storage type.')
+
+    if not self._merge_task_storage_path:
+      raise IOError(u'Missing merge task storage path.')
+
+    storage_file_path = os.path.join(
+        self._merge_task_storage_path, u'{0:s}.plaso'.format(task.identifier))
+
+    if not os.path.isfile(storage_file_path):
+      raise IOError(u'Merge task storage path is not a file.')
+
+    return storage_file_path
+
+  def _StartPreMergeTaskStorages(self, tasks, storage_file_paths):
+    """Starts a pre-merge of task storages by a merge worker process.
+
+    Args:
+      tasks (list[Task]): tasks.
+      storage_file_paths (list[str]): paths of the task storage files.
+
+    Returns:
+      ZIPStoragePreMergeReader: storage merge reader of the task storages.
+
+    Raises:
+      IOError: if the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError(u'Unable to write to closed storage writer.')
+
+    pre_merged_storage_file_path = os.path.join(
+        self._merge_task_storage_path, u'{0:s}.pre_merged.plaso'.format(
+            tasks[0].identifier))
+
+    event_stream_numbers, path_spec_stream_numbers = (
+        self._storage_file.ReservePreMergeStreamNumbers(
+            self._NUMBER_OF_PRE_MERGE_STREAMS))
+
+    async_result = self._merge_process_pool.apply_async(
+        _PreMergeTaskStorages, (
+            self._storage_file.serialization_format, storage_file_paths,
+            pre_merged_storage_file_path, event_stream_numbers,
+            path_spec_stream_numbers))
+
+    return ZIPStoragePreMergeReader(
+        self, storage_file_paths, pre_merged_storage_file_path, async_result)
+
   def _UpdateCounters(self, event):
     """Updates the counters.
 
@@ -2970,6 +4431,25 @@ class ZIPStorageFileWriter(interface.StorageWriter):
       self._session.event_labels_counter[label] += 1
     self.number_of_event_tags += 1
 
+  def AddPreMergedEventStreams(self, storage_file, parsers_counter):
+    """Adds the event streams of a pre-merged task storage.
+
+    Args:
+      storage_file (ZIPStorageFile): pre-merged task storage file.
+      parsers_counter (collections.Counter): number of pre-merged events per
+          parser name, where "total" contains the total number of events.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError(u'Unable to write to closed storage writer.')
+
+    self._storage_file.AddPreMergedEventStreams(storage_file)
+    self.number_of_events += parsers_counter[u'total']
+
+    self._session.parsers_counter.update(parsers_counter)
+
   def CheckTaskReadyForMerge(self, task):
     """Checks if a task is ready for merging with this session storage.
 
@@ -3114,6 +4594,7 @@ class ZIPStorageFileWriter(interface.StorageWriter):
     else:
       self._storage_file = ZIPStorageFile(
           maximum_buffer_size=self._buffer_size,
+          serialization_format=self._serialization_format,
           storage_type=self._storage_type)
 
     if self._serializers_profiler:
@@ -3198,23 +4679,86 @@ class ZIPStorageFileWriter(interface.StorageWriter):
           if the temporary path for the task storage does not exist or
           if the temporary path for the task storage doe not refers to a file.
     """
-    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
-      raise IOError(u'Unsupported storage type.')
+    storage_file_path = self._GetMergeTaskStorageFilePath(task)
 
-    if not self._merge_task_storage_path:
-      raise IOError(u'Missing merge task storage path.')
+    storage_file_size = task.storage_file_size or 0
+    if (not self._merge_process_pool or
+        storage_file_size > self._MAXIMUM_PRE_MERGE_TASK_STORAGE_SIZE):
+      return gzip_file.GZIPStorageMergeReader(self, storage_file_path)
 
-    storage_file_path = os.path.join(
-        self._merge_task_storage_path, u'{0:s}.plaso'.format(task.identifier))
+    return self._StartPreMergeTaskStorages([task], [storage_file_path])
 
-    if not os.path.isfile(storage_file_path):
-      raise IOError(u'Merge task storage path is not a file.')
+  def StartMergeTaskStorages(self, tasks):
+    """Starts a merge of multiple task storages with the session storage.
+
+    The task storages are pre-merged together by a merge worker process,
+    up to the maximum size of the task storages that are pre-merged, so that
+    the session storage does not get separate event streams per task storage.
+    Larger task storages are merged individually.
+
+    Args:
+      tasks (list[Task]): tasks.
+
+    Returns:
+      list[tuple[list[Task], StorageMergeReader]]: tasks and storage merge
+          reader of their task storages.
+
+    Raises:
+      IOError: if the storage file cannot be opened or
+          if the storage type is not supported or
+          if the temporary path for a task storage does not exist or
+          if the temporary path for a task storage doe not refers to a file.
+    """
+    # The paths are determined first, so that no merge is started if one
+    # of the task storages cannot be merged.
+    storage_file_paths = [
+        self._GetMergeTaskStorageFilePath(task) for task in tasks]
+
+    storage_merge_readers = []
+    pre_merge_tasks = []
+    pre_merge_storage_file_paths = []
+    pre_merge_storage_file_size = 0
+
+    for task, storage_file_path in zip(tasks, storage_file_paths):
+      storage_file_size = task.storage_file_size or 0
+      if (not self._merge_process_pool or
+          storage_file_size > self._MAXIMUM_PRE_MERGE_TASK_STORAGE_SIZE):
+        storage_merge_reader = gzip_file.GZIPStorageMergeReader(
+            self, storage_file_path)
+        storage_merge_readers.append(([task], storage_merge_reader))
+        continue
+
+      if (pre_merge_tasks and
+          pre_merge_storage_file_size + storage_file_size >
+          self._MAXIMUM_PRE_MERGE_TASK_STORAGE_SIZE):
+        storage_merge_reader = self._StartPreMergeTaskStorages(
+            pre_merge_tasks, pre_merge_storage_file_paths)
+        storage_merge_readers.append((pre_merge_tasks, storage_merge_reader))
+
+        pre_merge_tasks = []
+        pre_merge_storage_file_paths = []
+        pre_merge_storage_file_size = 0
+
+      pre_merge_tasks.append(task)
+      pre_merge_storage_file_paths.append(storage_file_path)
+      pre_merge_storage_file_size += storage_file_size
+
+    if pre_merge_tasks:
+      storage_merge_reader = self._StartPreMergeTaskStorages(
+          pre_merge_tasks, pre_merge_storage_file_paths)
+      storage_merge_readers.append((pre_merge_tasks, storage_merge_reader))
 
-    return gzip_file.GZIPStorageMergeReader(self, storage_file_path)
+    return storage_merge_readers
 
-  def StartTaskStorage(self):
+  def StartTaskStorage(self, number_of_merge_processes=0):
     """Creates a temporary path for the task storage.
 
+    Args:
+      number_of_merge_processes (Optional[int]): number of worker processes
+          that pre-merge task storage files, where 0 represents that the task
+          storage files are only merged by the main process. Note that
+          the worker processes are started by this function.
+
     Raises:
       IOError: if the storage type is not supported or
           if the temporary path for the task storage already exists.
@@ -3232,6 +4776,10 @@ class ZIPStorageFileWriter(interface.StorageWriter):
         self._task_storage_path, u'merge')
     os.mkdir(self._merge_task_storage_path)
 
+    if number_of_merge_processes > 0:
+      self._merge_process_pool = multiprocessing.Pool(
+          processes=number_of_merge_processes)
+
   def StopTaskStorage(self, abort=False):
     """Removes the temporary path for the task storage.
 
@@ -3248,6 +4796,14 @@ class ZIPStorageFileWriter(interface.StorageWriter):
     if not self._task_storage_path:
       raise IOError(u'Missing task storage path.')
 
+    if self._merge_process_pool:
+      if abort:
+        self._merge_process_pool.terminate()
+      else:
+        self._merge_process_pool.close()
+      self._merge_process_pool.join()
+      self._merge_process_pool = None
+
     if os.path.isdir(self._merge_task_storage_path):
       if abort:
         shutil.rmtree(self._merge_task_storage_path)
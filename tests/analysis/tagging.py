@@ -4,9 +4,12 @@
 
 import unittest
 
+from plaso.analysis import mediator as analysis_mediator
 from plaso.analysis import tagging
 from plaso.lib import timelib
 from plaso.containers import events
+from plaso.containers import sessions
+from plaso.storage import fake_storage
 
 from tests import test_lib as shared_test_lib
 from tests.analysis import test_lib
@@ -123,6 +126,98 @@ class TaggingAnalysisPluginTest(test_lib.AnalysisPluginTestCase):
     # This is from a rule using the "contains" operator
     self.assertIn(u'text_contains', labels)
 
+  def testGetRuleConstraints(self):
+    """Tests the _GetRuleConstraints function."""
+    plugin = tagging.TaggingAnalysisPlugin()
+
+    rule = plugin._ParseRule(u'data_type is \'windows:prefetch\'')
+    constraints = plugin._GetRuleConstraints(rule.root)
+    self.assertEqual(
+        constraints, {u'data_type': frozenset([u'windows:prefetch'])})
+
+    rule = plugin._ParseRule(
+        u'data_type == \'windows:evt:record\' and parser == \'winevt\' and '
+        u'source_name == \'Security\'')
+    constraints = plugin._GetRuleConstraints(rule.root)
+    self.assertEqual(constraints, {
+        u'data_type': frozenset([u'windows:evt:record']),
+        u'parser': frozenset([u'winevt'])})
+
+    rule = plugin._ParseRule(
+        u'data_type is \'fs:stat\' and data_type is \'windows:prefetch\'')
+    constraints = plugin._GetRuleConstraints(rule.root)
+    self.assertEqual(constraints, {u'data_type': frozenset()})
+
+    rule = plugin._ParseRule(
+        u'(data_type is \'fs:stat\' and filename contains \'Tasks\') or '
+        u'data_type is \'windows:tasks:job\'')
+    constraints = plugin._GetRuleConstraints(rule.root)
+    self.assertEqual(
+        constraints,
+        {u'data_type': frozenset([u'fs:stat', u'windows:tasks:job'])})
+
+    rule = plugin._ParseRule(
+        u'data_type is \'fs:stat\' or filename contains \'Tasks\'')
+    constraints = plugin._GetRuleConstraints(rule.root)
+    self.assertEqual(constraints, {})
+
+    rule = plugin._ParseRule(u'body contains \'a message\'')
+    constraints = plugin._GetRuleConstraints(rule.root)
+    self.assertEqual(constraints, {})
+
+  @shared_test_lib.skipUnlessHasTestFile([u'test_tag_file.txt'])
+  def testGetTagRules(self):
+    """Tests the _GetTagRules function."""
+    test_file = self._GetTestFilePath([self._TEST_TAG_FILE_NAME])
+    plugin = tagging.TaggingAnalysisPlugin()
+    plugin.SetAndLoadTagFile(test_file)
+
+    event = self._CreateTestEventObject(self._TEST_EVENTS[0])
+    tag_rules = plugin._GetTagRules(event)
+    # The application_execution, file_downloaded and text_contains labels
+    # have rules that can match a prefetch event.
+    self.assertEqual(len(tag_rules.children), 3)
+
+    # The rules are cached per data type and parser.
+    self.assertIs(plugin._GetTagRules(event), tag_rules)
+
+    event = self._CreateTestEventObject(self._TEST_EVENTS[3])
+    tag_rules = plugin._GetTagRules(event)
+    self.assertEqual(len(tag_rules.children), 4)
+
+  @shared_test_lib.skipUnlessHasTestFile([u'test_tag_file.txt'])
+  def testExamineEvents(self):
+    """Tests the ExamineEvents function."""
+    test_events = []
+    for event_dictionary in self._TEST_EVENTS:
+      event = self._CreateTestEventObject(event_dictionary)
+      test_events.append(event)
+
+    test_file = self._GetTestFilePath([self._TEST_TAG_FILE_NAME])
+    plugin = tagging.TaggingAnalysisPlugin()
+    plugin.SetAndLoadTagFile(test_file)
+
+    knowledge_base_object = self._SetUpKnowledgeBase()
+
+    session = sessions.Session()
+    storage_writer = fake_storage.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    mediator = analysis_mediator.AnalysisMediator(
+        storage_writer, knowledge_base_object)
+
+    plugin.ExamineEvents(mediator, test_events)
+
+    self.assertEqual(len(storage_writer.event_tags), 4)
+
+    expected_labels = [
+        [u'application_execution'],
+        [u'file_downloaded'],
+        [u'login_attempt', u'security_event'],
+        [u'text_contains']]
+    labels = [event_tag.labels for event_tag in storage_writer.event_tags]
+    self.assertEqual(labels, expected_labels)
+
   @shared_test_lib.skipUnlessHasTestFile([u'test_tag_file.txt'])
   @shared_test_lib.skipUnlessHasTestFile([u'invalid_test_tag_file.txt'])
   def testParseTaggingFile(self):
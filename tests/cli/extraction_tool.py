@@ -136,6 +136,18 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
       u'                        "processing" or "serializers".',
       u''])
 
+  _EXPECTED_STORAGE_OPTIONS = u'\n'.join([
+      u'usage: extraction_tool_test.py [--serializer_format FORMAT]',
+      u'',
+      u'Test argument parser.',
+      u'',
+      u'optional arguments:',
+      u'  --serializer_format FORMAT, --serializer-format FORMAT',
+      (u'                        The storage serializer format: "binary" or '
+       u'"json"'),
+      u'                        [defaults to "json"].',
+      u''])
+
   def testAddExtractionOptions(self):
     """Tests the AddExtractionOptions function."""
     argument_parser = argparse.ArgumentParser(
@@ -172,6 +184,18 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
     output = self._RunArgparseFormatHelp(argument_parser)
     self.assertEqual(output, self._EXPECTED_PROFILING_OPTIONS)
 
+  def testAddStorageOptions(self):
+    """Tests the AddStorageOptions function."""
+    argument_parser = argparse.ArgumentParser(
+        prog=u'extraction_tool_test.py', description=u'Test argument parser.',
+        add_help=False, formatter_class=test_lib.SortedArgumentsHelpFormatter)
+
+    test_tool = extraction_tool.ExtractionTool()
+    test_tool.AddStorageOptions(argument_parser)
+
+    output = self._RunArgparseFormatHelp(argument_parser)
+    self.assertEqual(output, self._EXPECTED_STORAGE_OPTIONS)
+
   @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
   def testParseOptions(self):
     """Tests the ParseOptions function."""
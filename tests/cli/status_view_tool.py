@@ -95,6 +95,49 @@ class StatusViewToolTest(test_lib.CLIToolTestCase):
         b'']
     self.assertEqual(string.split(b'\n'), expected_lines)
 
+    process_status.UpdateCollectionStatus(u'collecting', 12)
+    status_view_tool._PrintStatusUpdate(process_status)
+    string = output_writer.ReadOutput()
+
+    expected_lines = [
+        b'plaso -  version {0:s}'.format(plaso_version),
+        b'',
+        b'Source path\t: /test/source/path',
+        b'Source type\t: TESTSOURCE',
+        b'',
+        b'Collection\t: collecting (12 path specifications)',
+        b'',
+        table_header,
+        (b'f_identifier\t123\tf_status\t0 B\t\t29 (29)\t\t456 (456)\t'
+         b'f_test_file'),
+        b'w_identifier\t123\tw_status\t0 B\t\t2 (2)\t\t4 (4)\t\tw_test_file',
+        b'',
+        b'']
+    self.assertEqual(string.split(b'\n'), expected_lines)
+
+    process_status.UpdateMergeStatus(3, 7, 1250.0)
+    status_view_tool._PrintStatusUpdate(process_status)
+    string = output_writer.ReadOutput()
+
+    expected_lines = [
+        b'plaso -  version {0:s}'.format(plaso_version),
+        b'',
+        b'Source path\t: /test/source/path',
+        b'Source type\t: TESTSOURCE',
+        b'',
+        b'Collection\t: collecting (12 path specifications)',
+        b'',
+        (b'Merge\t\t: 3 task storage files pending (7 merged, '
+         b'1250.0 events/s)'),
+        b'',
+        table_header,
+        (b'f_identifier\t123\tf_status\t0 B\t\t29 (29)\t\t456 (456)\t'
+         b'f_test_file'),
+        b'w_identifier\t123\tw_status\t0 B\t\t2 (2)\t\t4 (4)\t\tw_test_file',
+        b'',
+        b'']
+    self.assertEqual(string.split(b'\n'), expected_lines)
+
   def testPrintStatusUpdateStream(self):
     """Tests the PrintStatusUpdateStream function."""
     input_reader = tools.StdinInputReader(encoding=u'ascii')
@@ -0,0 +1,199 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the cached data stream file-like object."""
+
+import os
+import unittest
+
+from dfvfs.analyzer import analyzer
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.resolver import context
+
+from plaso.engine import cached_data_stream
+
+from tests import test_lib as shared_test_lib
+
+
+class TestCachedDataStream(cached_data_stream.CachedDataStream):
+  """Class that implements a cached data stream with small blocks."""
+
+  _BLOCK_SIZE = 1024
+  _HEADER_DATA_SIZE = 1024
+  _FOOTER_DATA_SIZE = 1024
+
+
+class CachedDataStreamTest(shared_test_lib.BaseTestCase):
+  """Tests for the cached data stream file-like object."""
+
+  # pylint: disable=protected-access
+
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testReadAndSeek(self):
+    """Tests the read and seek functions."""
+    test_file_path = self._GetTestFilePath([u'ímynd.dd'])
+    with open(test_file_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    file_entry = self._GetTestFileEntry([u'ímynd.dd'])
+    file_object = cached_data_stream.CachedDataStream(
+        file_entry.GetFileObject())
+
+    try:
+      self.assertEqual(file_object.get_size(), 102400)
+
+      data = file_object.read()
+      self.assertEqual(data, expected_data)
+      self.assertEqual(file_object.get_offset(), 102400)
+      self.assertEqual(file_object.number_of_bytes_read, 102400)
+
+      data = file_object.read(16)
+      self.assertEqual(data, b'')
+
+      file_object.seek(32760, os.SEEK_SET)
+      data = file_object.read(16)
+      self.assertEqual(data, expected_data[32760:32776])
+      self.assertEqual(file_object.tell(), 32776)
+
+      file_object.seek(-16, os.SEEK_CUR)
+      data = file_object.read(4)
+      self.assertEqual(data, expected_data[32760:32764])
+
+      file_object.seek(-100, os.SEEK_END)
+      data = file_object.read()
+      self.assertEqual(data, expected_data[-100:])
+
+      # The data stream fits in the cache and is read only once.
+      file_object.seek(0, os.SEEK_SET)
+      data = file_object.read()
+      self.assertEqual(data, expected_data)
+      self.assertEqual(file_object.number_of_bytes_read, 102400)
+      self.assertEqual(file_object.number_of_bytes_requested, 204920)
+
+      with self.assertRaises(IOError):
+        file_object.seek(-1, os.SEEK_SET)
+
+    finally:
+      file_object.close()
+
+    with self.assertRaises(IOError):
+      file_object.read()
+
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testReadWithEviction(self):
+    """Tests the read function with blocks evicted from the cache."""
+    test_file_path = self._GetTestFilePath([u'ímynd.dd'])
+    with open(test_file_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    file_entry = self._GetTestFileEntry([u'ímynd.dd'])
+    file_object = TestCachedDataStream(
+        file_entry.GetFileObject(), maximum_cached_data_size=4096)
+
+    try:
+      data = file_object.read()
+      self.assertEqual(data, expected_data)
+      self.assertEqual(len(file_object._blocks), 4)
+      self.assertEqual(len(file_object._pinned_blocks), 2)
+
+      # The header and footer blocks remain cached.
+      file_object.seek(0, os.SEEK_SET)
+      data = file_object.read(1024)
+      self.assertEqual(data, expected_data[:1024])
+
+      file_object.seek(-1024, os.SEEK_END)
+      data = file_object.read(1024)
+      self.assertEqual(data, expected_data[-1024:])
+      self.assertEqual(file_object.number_of_bytes_read, 102400)
+
+      # Blocks that were evicted are read again.
+      file_object.seek(2048, os.SEEK_SET)
+      data = file_object.read(2048)
+      self.assertEqual(data, expected_data[2048:4096])
+      self.assertEqual(file_object.number_of_bytes_read, 104448)
+
+    finally:
+      file_object.close()
+
+
+class CachedDataStreamFileIOTest(shared_test_lib.BaseTestCase):
+  """Tests for the dfVFS file-like object of a cached data stream."""
+
+  @shared_test_lib.skipUnlessHasTestFile([u'syslog.gz'])
+  def testGetTypeIndicators(self):
+    """Tests the dfVFS analyzer reading the cached data stream."""
+    file_entry = self._GetTestFileEntry([u'syslog.gz'])
+    data_stream = cached_data_stream.CachedDataStream(
+        file_entry.GetFileObject())
+
+    resolver_context = context.Context()
+    file_object = cached_data_stream.CachedDataStreamFileIO(
+        resolver_context, data_stream)
+    file_object.open(path_spec=file_entry.path_spec)
+
+    try:
+      type_indicators = analyzer.Analyzer.GetCompressedStreamTypeIndicators(
+          file_entry.path_spec, resolver_context=resolver_context)
+      self.assertEqual(
+          type_indicators, [dfvfs_definitions.TYPE_INDICATOR_GZIP])
+
+      type_indicators = analyzer.Analyzer.GetArchiveTypeIndicators(
+          file_entry.path_spec, resolver_context=resolver_context)
+      self.assertEqual(type_indicators, [])
+
+      # The data stream is read only once.
+      self.assertEqual(data_stream.number_of_bytes_read, data_stream.get_size())
+
+    finally:
+      file_object.close()
+
+    # Closing the file-like object does not close the cached data stream.
+    data_stream.seek(0, os.SEEK_SET)
+    self.assertEqual(data_stream.read(2), b'\x1f\x8b')
+    self.assertEqual(resolver_context.GetFileObject(file_entry.path_spec), None)
+
+    data_stream.close()
+
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testReadAndSeek(self):
+    """Tests the read and seek functions."""
+    test_file_path = self._GetTestFilePath([u'ímynd.dd'])
+    with open(test_file_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    file_entry = self._GetTestFileEntry([u'ímynd.dd'])
+    data_stream = cached_data_stream.CachedDataStream(
+        file_entry.GetFileObject())
+
+    file_object = cached_data_stream.CachedDataStreamFileIO(
+        context.Context(), data_stream)
+    file_object.open()
+
+    try:
+      self.assertEqual(file_object.get_size(), 102400)
+
+      file_object.seek(32760, os.SEEK_SET)
+
+      # The current offset is independent of the cached data stream.
+      data_stream.seek(0, os.SEEK_SET)
+
+      data = file_object.read(16)
+      self.assertEqual(data, expected_data[32760:32776])
+      self.assertEqual(file_object.get_offset(), 32776)
+
+      file_object.seek(-100, os.SEEK_END)
+      data = file_object.read()
+      self.assertEqual(data, expected_data[-100:])
+
+      with self.assertRaises(IOError):
+        file_object.seek(-1, os.SEEK_SET)
+
+    finally:
+      file_object.close()
+      data_stream.close()
+
+    with self.assertRaises(IOError):
+      file_object.read()
+
+
+if __name__ == '__main__':
+  unittest.main()
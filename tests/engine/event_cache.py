@@ -0,0 +1,181 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the event cache."""
+
+import os
+import unittest
+import zlib
+
+from plaso.engine import event_cache
+
+from tests import test_lib as shared_test_lib
+
+
+class EventCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the event cache."""
+
+  # pylint: disable=protected-access
+
+  _RECORDED_EVENTS = [
+      (u'syslog', None, u'{"data_type": "syslog:line"}'),
+      (u'sqlite/chrome_history', u'SELECT * FROM urls', u'{"url": "a"}')]
+
+  def testGetKey(self):
+    """Tests the GetKey function."""
+    test_cache = event_cache.EventCache(u'cache.db')
+
+    key = test_cache.GetKey(u'0123', u'syslog', None, (u'cp1252', u'UTC'))
+    self.assertEqual(len(key), 64)
+
+    self.assertEqual(
+        test_cache.GetKey(u'0123', u'syslog', u'', (u'cp1252', u'UTC')), key)
+
+    self.assertNotEqual(
+        test_cache.GetKey(u'4567', u'syslog', None, (u'cp1252', u'UTC')), key)
+    self.assertNotEqual(
+        test_cache.GetKey(u'0123', u'syslog.1', None, (u'cp1252', u'UTC')),
+        key)
+    self.assertNotEqual(
+        test_cache.GetKey(u'0123', u'syslog', u'linux', (u'cp1252', u'UTC')),
+        key)
+    self.assertNotEqual(
+        test_cache.GetKey(
+            u'0123', u'syslog', None, (u'cp1252', u'Europe/Amsterdam')), key)
+
+  def testOpenClose(self):
+    """Tests the Open and Close functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_path = os.path.join(temp_directory, u'cache.db')
+      test_cache = event_cache.EventCache(test_path)
+
+      with self.assertRaises(IOError):
+        test_cache.Close()
+
+      test_cache.Open()
+
+      with self.assertRaises(IOError):
+        test_cache.Open()
+
+      test_cache.Close()
+
+      with self.assertRaises(IOError):
+        test_cache.GetEvents(u'key')
+
+  def testGetAndSetEvents(self):
+    """Tests the GetEvents and SetEvents functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_path = os.path.join(temp_directory, u'cache.db')
+      test_cache = event_cache.EventCache(test_path)
+      test_cache.Open()
+
+      self.assertIsNone(test_cache.GetEvents(u'key1'))
+
+      test_cache.SetEvents(u'key1', self._RECORDED_EVENTS)
+      test_cache.SetEvents(u'key2', [])
+      test_cache.Close()
+
+      # The events are retained when the cache is opened again.
+      test_cache = event_cache.EventCache(test_path)
+      test_cache.Open()
+
+      recorded_events = test_cache.GetEvents(u'key1')
+      self.assertEqual(recorded_events, self._RECORDED_EVENTS)
+
+      recorded_events = test_cache.GetEvents(u'key2')
+      self.assertEqual(recorded_events, [])
+
+      self.assertEqual(test_cache.number_of_hits, 2)
+      self.assertEqual(test_cache.number_of_misses, 0)
+
+      test_cache.Close()
+
+  def testGetEventsWithCorruptEntry(self):
+    """Tests the GetEvents function with corrupt entries."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_path = os.path.join(temp_directory, u'cache.db')
+      test_cache = event_cache.EventCache(test_path)
+      test_cache.Open()
+
+      test_cache.SetEvents(u'key1', self._RECORDED_EVENTS)
+      test_cache.SetEvents(u'key2', self._RECORDED_EVENTS)
+      test_cache.SetEvents(u'key3', self._RECORDED_EVENTS)
+
+      cursor = test_cache._connection.cursor()
+      cursor.execute(
+          u'UPDATE events SET data = ? WHERE key = ?',
+          (event_cache.sqlite3.Binary(b'\x78\x9c\xff'), u'key1'))
+      cursor.execute(
+          u'UPDATE events SET data = ? WHERE key = ?',
+          (event_cache.sqlite3.Binary(zlib.compress(b'{"bogus')), u'key2'))
+      cursor.execute(
+          u'UPDATE events SET data = ? WHERE key = ?',
+          (event_cache.sqlite3.Binary(zlib.compress(b'[[1, 2]]')), u'key3'))
+      test_cache._connection.commit()
+
+      self.assertIsNone(test_cache.GetEvents(u'key1'))
+      self.assertIsNone(test_cache.GetEvents(u'key2'))
+      self.assertIsNone(test_cache.GetEvents(u'key3'))
+
+      self.assertEqual(test_cache.number_of_hits, 0)
+      self.assertEqual(test_cache.number_of_misses, 3)
+
+      # The corrupt entries are deleted.
+      cursor.execute(u'SELECT COUNT(*) FROM events')
+      self.assertEqual(cursor.fetchone()[0], 0)
+
+      test_cache.Close()
+
+  def testUpdateLastUsed(self):
+    """Tests the _UpdateLastUsed function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_path = os.path.join(temp_directory, u'cache.db')
+      test_cache = event_cache.EventCache(test_path)
+      test_cache.Open()
+
+      test_cache.SetEvents(u'key1', self._RECORDED_EVENTS)
+
+      cursor = test_cache._connection.cursor()
+      cursor.execute(u'UPDATE events SET last_used = 0')
+      test_cache._connection.commit()
+
+      # The last used time is not updated on every read.
+      self.assertIsNotNone(test_cache.GetEvents(u'key1'))
+      self.assertEqual(test_cache._last_used_keys, set([u'key1']))
+
+      cursor.execute(u'SELECT last_used FROM events')
+      self.assertEqual(cursor.fetchone()[0], 0)
+
+      test_cache._UpdateLastUsed()
+      self.assertEqual(test_cache._last_used_keys, set())
+
+      cursor.execute(u'SELECT last_used FROM events')
+      self.assertGreater(cursor.fetchone()[0], 0)
+
+      test_cache.Close()
+
+  def testEvictEntries(self):
+    """Tests the _EvictEntries function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_path = os.path.join(temp_directory, u'cache.db')
+      test_cache = event_cache.EventCache(test_path, maximum_size=1024)
+      test_cache._EVICTION_CHECK_INTERVAL = 1
+      test_cache.Open()
+
+      for index in range(64):
+        recorded_events = [(u'test', None, u'{{"index": {0:d}}}'.format(index))]
+        test_cache.SetEvents(u'key{0:d}'.format(index), recorded_events)
+
+      cursor = test_cache._connection.cursor()
+      cursor.execute(u'SELECT SUM(data_size) FROM events')
+      total_size = cursor.fetchone()[0]
+      self.assertLessEqual(total_size, 1024)
+
+      # The least recently used entries are evicted first.
+      self.assertIsNone(test_cache.GetEvents(u'key0'))
+      self.assertIsNotNone(test_cache.GetEvents(u'key63'))
+
+      test_cache.Close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the extractor classes."""
 
+import io
 import os
 import shutil
 import unittest
@@ -16,7 +17,32 @@ from plaso.engine import extractors
 from tests import test_lib as shared_test_lib
 
 
-# TODO: add EventExtractorTest
+class EventExtractorTest(shared_test_lib.BaseTestCase):
+  """Tests for the event extractor."""
+
+  def testGetFirstLineHintMatchParserNames(self):
+    """Tests the _GetFirstLineHintMatchParserNames function."""
+    test_extractor = extractors.EventExtractor(
+        parser_filter_expression=u'bash,dpkg,syslog')
+
+    file_object = io.BytesIO(
+        b'Jan 22 07:52:33 myhostname.myhost.com client[30840]: INFO\n')
+    parser_names = test_extractor._GetFirstLineHintMatchParserNames(
+        file_object)
+    self.assertEqual(sorted(parser_names), [u'bash', u'syslog'])
+
+    # Leading white space and a byte order mark are ignored.
+    file_object = io.BytesIO(
+        b'\xef\xbb\xbf\n\n2009-02-25 11:45:23 status installed base-passwd\n')
+    parser_names = test_extractor._GetFirstLineHintMatchParserNames(
+        file_object)
+    self.assertEqual(sorted(parser_names), [u'bash', u'dpkg'])
+
+    # Parsers without a first line hint are always applied.
+    file_object = io.BytesIO(b'\x00\x01\x02\x03')
+    parser_names = test_extractor._GetFirstLineHintMatchParserNames(
+        file_object)
+    self.assertEqual(parser_names, [u'bash'])
 
 
 class PathSpecExtractorTest(shared_test_lib.BaseTestCase):
@@ -0,0 +1,38 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests the queue management implementation."""
+
+import unittest
+
+from plaso.engine import plaso_queue
+
+from tests import test_lib as shared_test_lib
+from tests.containers import test_lib as containers_test_lib
+
+
+class QueueEventBatchTest(shared_test_lib.BaseTestCase):
+  """Tests the batch of events on a queue."""
+
+  def testGetEvents(self):
+    """Tests the GetEvents function."""
+    test_events = containers_test_lib.CreateTestEvents()
+
+    event_batch = plaso_queue.QueueEventBatch(test_events)
+    self.assertEqual(event_batch.number_of_events, len(test_events))
+
+    events = event_batch.GetEvents()
+    self.assertEqual(len(events), len(test_events))
+
+    for event, test_event in zip(events, test_events):
+      self.assertIsNot(event, test_event)
+      self.assertEqual(event.CopyToDict(), test_event.CopyToDict())
+
+    # Changing an event does not change the batch.
+    test_events[0].hostname = u'changed'
+
+    events = event_batch.GetEvents()
+    self.assertNotEqual(events[0].hostname, u'changed')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the profiler classes."""
 
+import os
 import time
 import unittest
 
@@ -10,6 +11,7 @@ try:
 except ImportError:
   hpy = None
 
+from plaso.containers import tasks
 from plaso.engine import profiler
 
 from tests import test_lib as shared_test_lib
@@ -32,6 +34,102 @@ class CPUTimeProfilerTest(shared_test_lib.BaseTestCase):
       test_profiler.Write()
 
 
+class ParsersProfilerTest(shared_test_lib.BaseTestCase):
+  """Tests for the parsers profiler."""
+
+  def testSampleFirstLineHintAndParseResult(self):
+    """Tests the SampleFirstLineHint, SampleParseResult and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_profiler = profiler.ParsersProfiler(
+          u'unittest', path=temp_directory)
+
+      test_profiler.SampleFirstLineHint(u'dpkg', False)
+      test_profiler.SampleFirstLineHint(u'dpkg', False)
+      test_profiler.SampleFirstLineHint(u'dpkg', False)
+      test_profiler.SampleFirstLineHint(u'dpkg', True)
+      test_profiler.SampleParseResult(u'dpkg', False)
+      test_profiler.SampleParseResult(u'bash', True)
+
+      test_profiler.Write()
+
+      sample_file = os.path.join(temp_directory, u'hints-unittest.csv')
+      with open(sample_file, 'rb') as file_object:
+        lines = file_object.read().split(b'\n')
+
+      self.assertEqual(len(lines), 4)
+      self.assertEqual(lines[1], b'bash\t0\t0\t0.00\t1\t0\t0.00')
+      self.assertEqual(lines[2], b'dpkg\t1\t3\t0.75\t1\t1\t1.00')
+
+
+class ProcessingProfilerTest(shared_test_lib.BaseTestCase):
+  """Tests for the processing profiler."""
+
+  def testSampleDataStreamReads(self):
+    """Tests the SampleDataStreamReads and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_profiler = profiler.ProcessingProfiler(
+          u'unittest', path=temp_directory)
+
+      test_profiler.SampleDataStreamReads(1024, 3072, 1024)
+      test_profiler.SampleDataStreamReads(1024, 1024, 2048)
+
+      test_profiler.Write()
+
+      sample_file = os.path.join(temp_directory, u'reads-unittest.csv')
+      with open(sample_file, 'rb') as file_object:
+        lines = file_object.read().split(b'\n')
+
+      self.assertEqual(len(lines), 3)
+      self.assertEqual(lines[1], b'2\t2048\t4096\t3072\t2.00\t1.50')
+
+
+  def testSampleEventCacheLookup(self):
+    """Tests the SampleEventCacheLookup and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_profiler = profiler.ProcessingProfiler(
+          u'unittest', path=temp_directory)
+
+      test_profiler.SampleEventCacheLookup(True)
+      test_profiler.SampleEventCacheLookup(True)
+      test_profiler.SampleEventCacheLookup(True)
+      test_profiler.SampleEventCacheLookup(False)
+
+      test_profiler.Write()
+
+      sample_file = os.path.join(temp_directory, u'event_cache-unittest.csv')
+      with open(sample_file, 'rb') as file_object:
+        lines = file_object.read().split(b'\n')
+
+      self.assertEqual(len(lines), 3)
+      self.assertEqual(lines[1], b'4\t3\t1\t0.75')
+
+
+class TasksProfilerTest(shared_test_lib.BaseTestCase):
+  """Tests for the tasks profiler."""
+
+  def testTasksProfiler(self):
+    """Tests the Sample and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_profiler = profiler.TasksProfiler(u'unittest', path=temp_directory)
+
+      task = tasks.Task()
+      task.data_size = 1024
+      task.path_spec = u'path_spec'
+
+      for _ in range(5):
+        test_profiler.Sample(task, 0.01)
+
+      test_profiler.Write()
+
+      sample_file = os.path.join(temp_directory, u'tasks-unittest.csv')
+      with open(sample_file, 'rb') as file_object:
+        lines = file_object.read().split(b'\n')
+
+      self.assertEqual(len(lines), 7)
+      self.assertEqual(
+          lines[1], b'{0:s}\t1\t1024\t0.01'.format(task.identifier))
+
+
 # Note that this test can be extremely slow with guppy version 0.1.9
 # use version 0.1.10 or later.
 @unittest.skipIf(not hpy, 'missing guppy.hpy')
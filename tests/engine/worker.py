@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests the worker."""
 
+import os
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
@@ -107,6 +108,42 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
     event_attribute = mediator._extra_event_attributes.get(u'test_result', None)
     self.assertEqual(event_attribute, u'is_vegetable')
 
+  @shared_test_lib.skipUnlessHasTestFile([u'wintask.job'])
+  def testProcessFileEntryDataStreamWithOpenError(self):
+    """Tests processing a data stream that cannot be opened."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    knowledge_base_object.SetValue(u'year', 2016)
+
+    session = sessions.Session()
+    storage_writer = fake_storage.FakeStorageWriter(session)
+    mediator = parsers_mediator.ParserMediator(
+        storage_writer, knowledge_base_object,
+        resolver_context=context.Context())
+
+    extraction_worker = worker.EventExtractionWorker(
+        parser_filter_expression=u'filestat')
+
+    file_entry = self._GetTestFileEntry([u'wintask.job'])
+
+    def _GetFileObject(data_stream_name=u''):  # pylint: disable=unused-argument
+      """Raises an IOError instead of returning a file-like object."""
+      raise IOError(u'Unable to open file.')
+
+    file_entry.GetFileObject = _GetFileObject
+
+    storage_writer.Open()
+    mediator.SetFileEntry(file_entry)
+    extraction_worker._ProcessFileEntryDataStream(mediator, file_entry, u'')
+    mediator.ResetFileEntry()
+    storage_writer.Close()
+
+    # The file stat events are extracted even if the data stream cannot be
+    # opened.
+    self.assertGreater(storage_writer.number_of_events, 0)
+    self.assertEqual(storage_writer.number_of_errors, 1)
+
+    self.assertIn(u'Unable to open file.', storage_writer.errors[0].message)
+
   @shared_test_lib.skipUnlessHasTestFile([u'syslog'])
   def testProcessPathSpecFile(self):
     """Tests the ProcessPathSpec function on a file."""
@@ -232,6 +269,54 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(storage_writer.number_of_events, 18)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'wintask.job'])
+  def testExtractionWorkerEventCache(self):
+    """Tests that the worker reuses the events stored in the event cache."""
+    knowledge_base_values = {u'year': 2016}
+    path_spec = self._GetTestFilePathSpec([u'wintask.job'])
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      configuration = configurations.ExtractionConfiguration()
+      configuration.event_cache_path = os.path.join(
+          temp_directory, u'event_cache.db')
+
+      extraction_worker = worker.EventExtractionWorker(
+          parser_filter_expression=u'winjob')
+      extraction_worker.SetExtractionConfiguration(configuration)
+
+      session = sessions.Session()
+      storage_writer = fake_storage.FakeStorageWriter(session)
+      self._TestProcessPathSpec(
+          storage_writer, path_spec, extraction_worker=extraction_worker,
+          knowledge_base_values=knowledge_base_values)
+
+      self.assertEqual(extraction_worker._event_cache.number_of_hits, 0)
+      self.assertEqual(extraction_worker._event_cache.number_of_misses, 1)
+
+      extraction_worker = worker.EventExtractionWorker(
+          parser_filter_expression=u'winjob')
+      extraction_worker.SetExtractionConfiguration(configuration)
+
+      session = sessions.Session()
+      cached_storage_writer = fake_storage.FakeStorageWriter(session)
+      self._TestProcessPathSpec(
+          cached_storage_writer, path_spec,
+          extraction_worker=extraction_worker,
+          knowledge_base_values=knowledge_base_values)
+
+      self.assertEqual(extraction_worker._event_cache.number_of_hits, 1)
+
+      extraction_worker.CloseEventCache()
+      self.assertIsNone(extraction_worker._event_cache)
+
+    self.assertEqual(
+        cached_storage_writer.number_of_events,
+        storage_writer.number_of_events)
+
+    for event, cached_event in zip(
+        storage_writer.events, cached_storage_writer.events):
+      self.assertEqual(cached_event.CopyToDict(), event.CopyToDict())
+
   @shared_test_lib.skipUnlessHasTestFile([u'empty_file'])
   def testExtractionWorkerHashing(self):
     """Test that the worker sets up and runs hashing code correctly."""
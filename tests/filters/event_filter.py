@@ -6,6 +6,7 @@ import unittest
 
 from plaso.filters import event_filter
 from plaso.lib import errors
+from plaso.lib import timelib
 
 from tests.filters import test_lib
 
@@ -36,6 +37,61 @@ class EventObjectFilterTest(test_lib.FilterTestCase):
       test_filter.CompileFilter(
           u'some_stuff is "random" and other_stuff ')
 
+  def testGetEventConstraints(self):
+    """Tests the GetEventConstraints function."""
+    test_filter = event_filter.EventObjectFilter()
+    self.assertIsNone(test_filter.GetEventConstraints())
+
+    test_filter.CompileFilter(
+        u'date > "2012-04-30 06:41:49" and data_type is "syslog:line" and '
+        u'message contains "cron"')
+
+    event_constraints = test_filter.GetEventConstraints()
+    self.assertIsNotNone(event_constraints)
+    self.assertEqual(event_constraints.data_types, frozenset([u'syslog:line']))
+    self.assertIsNone(event_constraints.filename_prefix)
+    self.assertIsNone(event_constraints.parsers)
+
+    expected_timestamp = timelib.Timestamp.CopyFromString(
+        u'2012-04-30 06:41:49')
+    self.assertEqual(
+        event_constraints.time_range.start_timestamp, expected_timestamp + 1)
+
+    test_filter.CompileFilter(
+        u'parser is "syslog" or parser inlist "webhist"')
+
+    event_constraints = test_filter.GetEventConstraints()
+    self.assertIsNotNone(event_constraints)
+    self.assertIn(u'syslog', event_constraints.parsers)
+    self.assertIn(u'sqlite/chrome_history', event_constraints.parsers)
+
+    test_filter.CompileFilter(
+        u'filename regexp "^/var/log/sys.*" or filename is "/var/lib/dpkg"')
+
+    event_constraints = test_filter.GetEventConstraints()
+    self.assertIsNotNone(event_constraints)
+    self.assertEqual(event_constraints.filename_prefix, u'/var/l')
+
+    test_filter.CompileFilter(u'filename regexp "^/var/log/s?yslog"')
+
+    event_constraints = test_filter.GetEventConstraints()
+    self.assertIsNotNone(event_constraints)
+    self.assertEqual(event_constraints.filename_prefix, u'/var/log/')
+
+    # Filters that match events that do not meet any constraint.
+    test_filter.CompileFilter(
+        u'data_type is "syslog:line" or message contains "cron"')
+    self.assertIsNone(test_filter.GetEventConstraints())
+
+    test_filter.CompileFilter(u'data_type is not "syslog:line"')
+    self.assertIsNone(test_filter.GetEventConstraints())
+
+    test_filter.CompileFilter(u'filename regexp "/var/log"')
+    self.assertIsNone(test_filter.GetEventConstraints())
+
+    test_filter.CompileFilter(u'filename regexp "^/var/log|syslog"')
+    self.assertIsNone(test_filter.GetEventConstraints())
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -97,6 +97,39 @@ class ObjectFilterTest(test_lib.FilterTestCase):
 
     self._CreateFilterFileAndCompileFilter(test_filter, collection)
 
+  def testGetEventConstraints(self):
+    """Tests the GetEventConstraints function."""
+    test_filter = filter_list.ObjectFilterList()
+
+    collection = u'\n'.join([
+        u'Syslog_Rule:',
+        u'  description: Syslog lines',
+        u'  filter: data_type is "syslog:line" and message contains "cron"',
+        u'',
+        u'Filestat_Rule:',
+        u'  description: File system events',
+        u'  filter: data_type is "fs:stat"'])
+
+    self._CreateFilterFileAndCompileFilter(test_filter, collection)
+
+    event_constraints = test_filter.GetEventConstraints()
+    self.assertIsNotNone(event_constraints)
+    self.assertEqual(
+        event_constraints.data_types, frozenset([u'fs:stat', u'syslog:line']))
+
+    collection = u'\n'.join([
+        u'Syslog_Rule:',
+        u'  description: Syslog lines',
+        u'  filter: data_type is "syslog:line"',
+        u'',
+        u'Message_Rule:',
+        u'  description: Messages about cron',
+        u'  filter: message contains "cron"'])
+
+    self._CreateFilterFileAndCompileFilter(test_filter, collection)
+
+    self.assertIsNone(test_filter.GetEventConstraints())
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -39,6 +39,16 @@ class ConditionalTestEventFormatter(interface.ConditionalEventFormatter):
   SOURCE_LONG = u'Some Text File.'
 
 
+class ShortTestEventFormatter(interface.EventFormatter):
+  """An event formatter for testing with a short format string."""
+  DATA_TYPE = u'test:event'
+  FORMAT_STRING = u'{text} (size: {size:d})'
+  FORMAT_STRING_SHORT = u'{text:.10s}'
+
+  SOURCE_SHORT = u'FILE'
+  SOURCE_LONG = u'Weird Log File'
+
+
 class WrongEventFormatter(interface.EventFormatter):
   """An event formatter for testing."""
   DATA_TYPE = u'test:wrong'
@@ -69,7 +79,38 @@ class EventFormatterTest(unittest.TestCase):
     attribute_names = event_formatter.GetFormatStringAttributeNames()
     self.assertEqual(sorted(attribute_names), expected_attribute_names)
 
-  # TODO: add test for GetMessages.
+  def testCompileFormatStrings(self):
+    """Tests the CompileFormatStrings function."""
+    # pylint: disable=protected-access
+    event_formatter = ShortTestEventFormatter()
+    event_formatter.CompileFormatStrings()
+
+    expected_attribute_names = (
+        u'data_type', u'display_name', u'parser', u'size', u'text', u'uuid')
+    self.assertEqual(
+        event_formatter._compiled_attribute_names, expected_attribute_names)
+
+  def testGetMessages(self):
+    """Tests the GetMessages function."""
+    formatter_mediator = mediator.FormatterMediator()
+    event_formatter = ShortTestEventFormatter()
+
+    event = containers_test_lib.TestEvent(1335791207939596, {
+        u'size': 512, u'text': u'This is a line of text\r\n'})
+
+    message, message_short = event_formatter.GetMessages(
+        formatter_mediator, event)
+    self.assertEqual(message, u'This is a line of text (size: 512)')
+    self.assertEqual(message_short, u'This is a ')
+
+    # An event that is missing an attribute is formatted from all its values.
+    event = containers_test_lib.TestEvent(1335791207939596, {
+        u'text': u'This is a line of text'})
+
+    message, _ = event_formatter.GetMessages(formatter_mediator, event)
+    self.assertIn(u'text: This is a line of text', message)
+    self.assertIn(u'timestamp: 1335791207939596', message)
+
   # TODO: add test for GetSources.
 
 
@@ -113,6 +154,22 @@ class ConditionalEventFormatterTest(unittest.TestCase):
         formatter_mediator, self._event_object)
     self.assertEqual(message, expected_message)
 
+    event = ConditionalTestEvent(1335791207939596, {
+        u'numeric': 0, u'optional': u'', u'text': u'text'})
+
+    message, _ = event_formatter.GetMessages(formatter_mediator, event)
+    self.assertEqual(message, u'Comment Value: 0x00 Text: text')
+
+    # The conditional format strings are reused by events with the same
+    # attributes.
+    # pylint: disable=protected-access
+    self.assertEqual(len(event_formatter._conditional_format_strings), 2)
+
+    message, _ = event_formatter.GetMessages(
+        formatter_mediator, self._event_object)
+    self.assertEqual(message, expected_message)
+    self.assertEqual(len(event_formatter._conditional_format_strings), 2)
+
   # TODO: add test for GetSources.
 
 
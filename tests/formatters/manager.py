@@ -34,6 +34,25 @@ class FormattersManagerTest(shared_test_lib.BaseTestCase):
         len(manager.FormattersManager._formatter_classes),
         number_of_formatters)
 
+  def testGetFormatterObject(self):
+    """Tests the GetFormatterObject function."""
+    # pylint: disable=protected-access
+    manager.FormattersManager.RegisterFormatter(test_lib.TestEventFormatter)
+
+    try:
+      formatter_object = manager.FormattersManager.GetFormatterObject(
+          u'TEST:event')
+      self.assertIsInstance(formatter_object, test_lib.TestEventFormatter)
+      self.assertIn(u'text', formatter_object._compiled_attribute_names)
+
+      self.assertIs(
+          manager.FormattersManager.GetFormatterObject(u'test:event'),
+          formatter_object)
+
+    finally:
+      manager.FormattersManager.DeregisterFormatter(
+          test_lib.TestEventFormatter)
+
   def testMessageStrings(self):
     """Tests the GetMessageStrings and GetSourceStrings functions."""
     manager.FormattersManager.RegisterFormatter(test_lib.TestEventFormatter)
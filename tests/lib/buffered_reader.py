@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the buffered reader of file-like objects."""
+
+import os
+import struct
+import unittest
+
+from plaso.lib import buffered_reader
+
+from tests import test_lib as shared_test_lib
+
+
+class BufferedReaderTest(shared_test_lib.BaseTestCase):
+  """Tests for the buffered reader of file-like objects."""
+
+  # pylint: disable=protected-access
+
+  def _GetTestData(self):
+    """Retrieves the data of the test file.
+
+    Returns:
+      bytes: data of the test file.
+    """
+    test_file_path = self._GetTestFilePath([u'utmp'])
+    with open(test_file_path, 'rb') as file_object:
+      return file_object.read()
+
+  @shared_test_lib.skipUnlessHasTestFile([u'utmp'])
+  def testRead(self):
+    """Tests the read function."""
+    test_data = self._GetTestData()
+
+    file_object = self._GetTestFileEntry([u'utmp']).GetFileObject()
+    reader = buffered_reader.BufferedReader(file_object, buffer_size=512)
+
+    data = reader.read(4)
+    self.assertEqual(data, test_data[:4])
+    self.assertEqual(reader.tell(), 4)
+
+    # Read data that crosses a buffer boundary.
+    reader.seek(500, os.SEEK_SET)
+    data = reader.read(100)
+    self.assertEqual(data, test_data[500:600])
+    self.assertEqual(reader._buffer_offset, 500)
+    self.assertEqual(len(reader._buffer), 524)
+
+    # Read data that is larger than the buffer size.
+    reader.seek(1000, os.SEEK_SET)
+    data = reader.read(2000)
+    self.assertEqual(data, test_data[1000:3000])
+
+    reader.seek(-10, os.SEEK_END)
+    data = reader.read(100)
+    self.assertEqual(data, test_data[-10:])
+    self.assertEqual(reader.read(1), b'')
+
+    reader.seek(5000, os.SEEK_SET)
+    self.assertEqual(reader.read(), test_data[5000:])
+
+    reader.seek(6000, os.SEEK_SET)
+    self.assertEqual(reader.read(16), b'')
+
+    with self.assertRaises(IOError):
+      reader.seek(-1, os.SEEK_SET)
+
+    file_object.close()
+
+  @shared_test_lib.skipUnlessHasTestFile([u'utmp'])
+  def testReadArray(self):
+    """Tests the ReadArray function."""
+    test_data = self._GetTestData()
+
+    file_object = self._GetTestFileEntry([u'utmp']).GetFileObject()
+    reader = buffered_reader.BufferedReader(file_object, buffer_size=512)
+
+    reader.seek(508, os.SEEK_SET)
+    values = reader.ReadArray(b'<I', 4)
+    expected_values = struct.unpack(b'<4I', test_data[508:524])
+    self.assertEqual(values, expected_values)
+    self.assertEqual(reader.tell(), 524)
+
+    reader.seek(-6, os.SEEK_END)
+    values = reader.ReadArray(b'<H', 8)
+    self.assertEqual(len(values), 3)
+    self.assertEqual(reader.get_offset(), len(test_data))
+
+    self.assertEqual(reader.ReadArray(b'<I', 0), ())
+    self.assertEqual(reader.ReadArray(b'<I', -4), ())
+    self.assertEqual(reader.get_offset(), len(test_data))
+
+    file_object.close()
+
+  @shared_test_lib.skipUnlessHasTestFile([u'utmp'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_data = self._GetTestData()
+
+    file_object = self._GetTestFileEntry([u'utmp']).GetFileObject()
+    reader = buffered_reader.BufferedReader(file_object, buffer_size=512)
+
+    records = list(reader.ReadRecords(384))
+    self.assertEqual(len(records), 14)
+
+    for index, (offset, data) in enumerate(records):
+      self.assertEqual(offset, index * 384)
+      self.assertEqual(data, test_data[offset:offset + 384])
+
+    reader.seek(1000, os.SEEK_SET)
+    records = list(reader.ReadRecords(1000))
+    self.assertEqual(len(records), 4)
+    self.assertEqual(reader.tell(), 5000)
+
+    reader.seek(0, os.SEEK_SET)
+    records = list(reader.ReadRecords(16, maximum_number_of_records=2))
+    self.assertEqual(len(records), 2)
+    self.assertEqual(reader.tell(), 32)
+
+    file_object.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -176,15 +176,20 @@ class ObjectFilterTest(unittest.TestCase):
       }
 
   def testBinaryOperators(self):
+    filter_compiler = objectfilter.FilterCompiler()
     for operator, test_data in self.operator_tests.items():
       for test_unit in test_data:
         kwargs = {'arguments': test_unit[1],
                   'value_expander': self.value_expander}
         ops = operator(**kwargs)
         self.assertEqual(test_unit[0], ops.Matches(self.file))
+        compiled_ops = filter_compiler.Compile(ops)
+        self.assertEqual(test_unit[0], compiled_ops.Matches(self.file))
         if hasattr(ops, 'FlipBool'):
           ops.FlipBool()
           self.assertEqual(not test_unit[0], ops.Matches(self.file))
+          compiled_ops = filter_compiler.Compile(ops)
+          self.assertEqual(not test_unit[0], compiled_ops.Matches(self.file))
 
   def testExpand(self):
     # Case insensitivity.
@@ -332,6 +337,64 @@ class ObjectFilterTest(unittest.TestCase):
     filter_ = filter_.Compile(self.filter_imp)
     self.assertEqual(True, filter_.Matches(self.file))
 
+    # The context is evaluated by the interpreter of a compiled filter.
+    filter_compiler = objectfilter.FilterCompiler()
+    compiled_filter = filter_compiler.Compile(filter_)
+    self.assertEqual(True, compiled_filter.Matches(self.file))
+
+  def testFilterCompiler(self):
+    filter_compiler = objectfilter.FilterCompiler()
+
+    queries = [
+        'name is "boot.ini" and size > 5',
+        'name is "boot.ini" and size > 50',
+        'name is "autoexec.bat" or size < 50',
+        'name regexp "^BOOT" or name iregexp "^BOOT"',
+        'name contains "OOT" and name not contains "exe"',
+        'attributes inset "ArchiveBackup" and name != "boot.ini"',
+        'imported_dlls.imported_functions contains "FindWindow"',
+        'non_callable.md5 is "123abc" and non_callable_leaf is "yoda"',
+        'nonexisting is "value" or nonexisting is not "value"']
+
+    for query in queries:
+      filter_ = objectfilter.Parser(query).Parse().Compile(self.filter_imp)
+      compiled_filter = filter_compiler.Compile(filter_)
+      self.assertIsInstance(compiled_filter, objectfilter.CompiledFilter)
+      self.assertIs(compiled_filter.filter, filter_)
+      self.assertEqual(
+          compiled_filter.Matches(self.file), filter_.Matches(self.file))
+
+    # Compiling a compiled filter returns the same compiled filter.
+    self.assertIs(filter_compiler.Compile(compiled_filter), compiled_filter)
+
+    # The values of an attribute referenced by multiple operators are
+    # expanded once per object.
+    class CountingObject(object):
+      def __init__(self):
+        self.number_of_reads = 0
+
+      @property
+      def size(self):
+        self.number_of_reads += 1
+        return 10
+
+    query = 'size > 1 and size < 100 and size != 20'
+    filter_ = objectfilter.Parser(query).Parse().Compile(self.filter_imp)
+    compiled_filter = filter_compiler.Compile(filter_)
+
+    counting_object = CountingObject()
+    self.assertEqual(True, filter_.Matches(counting_object))
+    self.assertEqual(counting_object.number_of_reads, 3)
+
+    counting_object = CountingObject()
+    self.assertEqual(True, compiled_filter.Matches(counting_object))
+    self.assertEqual(counting_object.number_of_reads, 1)
+
+    counting_object = CountingObject()
+    self.assertEqual(True, compiled_filter.Matches(counting_object))
+    self.assertEqual(True, compiled_filter.Matches(counting_object))
+    self.assertEqual(counting_object.number_of_reads, 2)
+
   def testRegexpRaises(self):
     with self.assertRaises(ValueError):
       objectfilter.Regexp(
@@ -37,6 +37,11 @@ class PFilterTest(unittest.TestCase):
 
     self.assertEqual(result, matcher.Matches(event))
 
+    filter_compiler = pfilter.PlasoFilterCompiler()
+    compiled_matcher = filter_compiler.Compile(matcher)
+
+    self.assertEqual(result, compiled_matcher.Matches(event))
+
   def testPlasoEvents(self):
     """Test plaso EventObjects, both Python and Protobuf version.
 
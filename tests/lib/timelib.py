@@ -265,6 +265,41 @@ class TimeLibTest(unittest.TestCase):
         2013, 3, 14, 21, 20, 8, 850041, tzinfo=timezone)
     self.assertEqual(datetime_object, expected_datetime_object)
 
+  def testCopyToDatetimes(self):
+    """Tests the CopyToDatetimes function."""
+    timestamps = [
+        timelib.Timestamp.CopyFromString(u'2013-03-14 20:20:08.850041'),
+        timelib.Timestamp.CopyFromString(u'2013-03-14 20:20:08.850041'),
+        timelib.Timestamp.CopyFromString(u'2013-07-01 12:00:00'),
+        timelib.Timestamp.CopyFromString(u'1970-01-01 00:00:00'),
+        timelib.Timestamp.CopyFromString(u'2013-03-14 20:20:08.850041'),
+        timelib.Timestamp.TIMESTAMP_MAX_MICRO_SECONDS,
+        None]
+
+    for timezone_name in (u'CET', u'EST', u'UTC'):
+      timezone = pytz.timezone(timezone_name)
+
+      datetime_objects = timelib.Timestamp.CopyToDatetimes(
+          timestamps, timezone)
+      self.assertEqual(len(datetime_objects), 7)
+
+      for timestamp, datetime_object in zip(
+          timestamps[:5], datetime_objects[:5]):
+        expected_datetime_object = timelib.Timestamp.CopyToDatetime(
+            timestamp, timezone)
+        self.assertEqual(
+            datetime_object.isoformat(), expected_datetime_object.isoformat())
+        self.assertIs(datetime_object.tzinfo, expected_datetime_object.tzinfo)
+
+      self.assertIs(datetime_objects[1], datetime_objects[0])
+      self.assertIsNone(datetime_objects[5])
+      self.assertIsNone(datetime_objects[6])
+
+    datetime_objects = timelib.Timestamp.CopyToDatetimes(
+        timestamps[:2], pytz.timezone(u'Europe/Amsterdam'))
+    self.assertEqual(
+        datetime_objects[0].isoformat(), u'2013-03-14T21:20:08.850041+01:00')
+
   def testCopyToPosix(self):
     """Test converting microseconds to seconds."""
     timestamp = timelib.Timestamp.CopyFromString(u'2013-10-01 12:00:00')
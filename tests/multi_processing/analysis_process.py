@@ -2,13 +2,48 @@
 # -*- coding: utf-8 -*-
 """Tests for the multi-processing analysis process."""
 
+import os
 import unittest
 
+from plaso.analysis import interface as analysis_interface
 from plaso.multi_processing import analysis_process
 
 from tests import test_lib as shared_test_lib
 
 
+class TestAnalysisPlugin(analysis_interface.AnalysisPlugin):
+  """Class that defines an analysis plugin for testing."""
+
+  REQUIRES_SORTED_EVENTS = False
+
+  def __init__(self):
+    """Initializes an analysis plugin for testing."""
+    super(TestAnalysisPlugin, self).__init__()
+    self.timestamps = []
+
+  def CompileReport(self, mediator):
+    """Compiles a report of the analysis.
+
+    Args:
+      mediator (AnalysisMediator): mediates interactions between
+          analysis plugins and other components, such as storage and dfvfs.
+
+    Returns:
+      AnalysisReport: report, which will be None for testing.
+    """
+    return
+
+  def ExamineEvent(self, mediator, event):
+    """Analyzes an event object.
+
+    Args:
+      mediator (AnalysisMediator): mediates interactions between
+          analysis plugins and other components, such as storage and dfvfs.
+      event (EventObject): event.
+    """
+    self.timestamps.append(event.timestamp)
+
+
 class AnalysisProcessTest(shared_test_lib.BaseTestCase):
   """Tests the multi-processing analysis process."""
 
@@ -31,6 +66,45 @@ class AnalysisProcessTest(shared_test_lib.BaseTestCase):
 
   # TODO: add test for _Main.
   # TODO: add test for _ProcessEvent.
+  # TODO: add test for _ProcessEventQueue.
+
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testProcessStorageFile(self):
+    """Tests the _ProcessStorageFile function."""
+    storage_file_path = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    analysis_plugin = TestAnalysisPlugin()
+    test_process = analysis_process.AnalysisProcess(
+        None, None, None, analysis_plugin, name=u'TestAnalysis',
+        storage_file_path=storage_file_path)
+    test_process._pid = os.getpid()
+    test_process._ProcessStorageFile()
+
+    self.assertEqual(test_process._number_of_consumed_events, 38)
+    self.assertEqual(len(analysis_plugin.timestamps), 38)
+
+    # The events are read in chronological order if the plugin requires so.
+    analysis_plugin = TestAnalysisPlugin()
+    analysis_plugin.REQUIRES_SORTED_EVENTS = True
+    test_process = analysis_process.AnalysisProcess(
+        None, None, None, analysis_plugin, name=u'TestAnalysis',
+        storage_file_path=storage_file_path)
+    test_process._pid = os.getpid()
+    test_process._ProcessStorageFile()
+
+    self.assertEqual(len(analysis_plugin.timestamps), 38)
+    self.assertEqual(
+        analysis_plugin.timestamps, sorted(analysis_plugin.timestamps))
+
+    analysis_plugin = TestAnalysisPlugin()
+    test_process = analysis_process.AnalysisProcess(
+        None, None, None, analysis_plugin, name=u'TestAnalysis',
+        event_filter_expression=u'timestamp > \'2012-04-30 06:41:49\'',
+        storage_file_path=storage_file_path)
+    test_process._pid = os.getpid()
+    test_process._ProcessStorageFile()
+
+    self.assertEqual(test_process._number_of_consumed_events, 24)
 
   def testSignalAbort(self):
     """Tests the SignalAbort function."""
@@ -6,14 +6,17 @@ import os
 import shutil
 import unittest
 
+from plaso.analysis import file_hashes
 from plaso.analysis import interface as analysis_interface
 from plaso.analysis import tagging
 from plaso.containers import events
 from plaso.containers import sessions
 from plaso.engine import knowledge_base
+from plaso.engine import plaso_queue
 from plaso.formatters import interface as formatters_interface
 from plaso.formatters import manager as formatters_manager
 from plaso.formatters import mediator as formatters_mediator
+from plaso.multi_processing import multi_process_queue
 from plaso.multi_processing import psort
 from plaso.output import dynamic
 from plaso.output import event_buffer as output_event_buffer
@@ -164,6 +167,54 @@ class TestEventBuffer(output_event_buffer.EventBuffer):
     self._events_per_key = {}
 
 
+class TestProcess(object):
+  """Class that defines a process for testing."""
+
+  def __init__(self, name, alive=True):
+    """Initializes a process.
+
+    Args:
+      name (str): name of the process.
+      alive (Optional[bool]): True if the process is alive.
+    """
+    super(TestProcess, self).__init__()
+    self._alive = alive
+    self.name = name
+
+  def is_alive(self):
+    """Determines if the process is alive.
+
+    Returns:
+      bool: True if the process is alive.
+    """
+    return self._alive
+
+
+class TestStorageWriter(object):
+  """Class that defines a storage writer for testing."""
+
+  def __init__(self, ready_task_identifiers):
+    """Initializes a storage writer.
+
+    Args:
+      ready_task_identifiers (list[str]): identifiers of the tasks that are
+          ready for merge.
+    """
+    super(TestStorageWriter, self).__init__()
+    self._ready_task_identifiers = ready_task_identifiers
+
+  def CheckTaskReadyForMerge(self, task):
+    """Checks if a task is ready for merging with this session storage.
+
+    Args:
+      task (Task): task.
+
+    Returns:
+      bool: True if the task is ready to be merged.
+    """
+    return task.identifier in self._ready_task_identifiers
+
+
 class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
   """Tests for the multi-processing engine."""
 
@@ -238,6 +289,57 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
 
   # TODO: add test for _CheckStatusAnalysisProcess.
 
+  def testInternalPushEventBatch(self):
+    """Tests the _PushEventBatch function."""
+    test_engine = psort.PsortMultiProcessEngine()
+
+    test_events = [TestEvent(5134324321), TestEvent(5134324322)]
+
+    event_queues = []
+    for plugin_name in (u'first', u'second'):
+      event_queue = multi_process_queue.MultiProcessingQueue(timeout=1)
+      event_queues.append(event_queue)
+      test_engine._event_queues[plugin_name] = event_queue
+
+    test_engine._PushEventBatch(test_events)
+
+    for event_queue in event_queues:
+      event_batch = event_queue.PopItem()
+      self.assertIsInstance(event_batch, plaso_queue.QueueEventBatch)
+      self.assertEqual(event_batch.number_of_events, 2)
+
+      events = event_batch.GetEvents()
+      self.assertEqual(events[1].timestamp, 5134324322)
+
+      event_queue.Close(abort=True)
+
+  def testInternalWaitForAnalysisTasks(self):
+    """Tests the _WaitForAnalysisTasks function."""
+    file_hashes_plugin = file_hashes.FileHashesPlugin()
+    tagging_plugin = tagging.TaggingAnalysisPlugin()
+
+    test_engine = psort.PsortMultiProcessEngine()
+    test_engine._processes_per_pid[1] = TestProcess(
+        file_hashes_plugin.plugin_name)
+    test_engine._processes_per_pid[2] = TestProcess(
+        tagging_plugin.plugin_name, alive=False)
+
+    storage_writer = TestStorageWriter([file_hashes_plugin.plugin_name])
+
+    # The analysis plugin of which the process is no longer alive is skipped.
+    ready_analysis_plugins = test_engine._WaitForAnalysisTasks(
+        storage_writer, [file_hashes_plugin, tagging_plugin])
+    self.assertEqual(ready_analysis_plugins, [file_hashes_plugin])
+
+    storage_writer = TestStorageWriter([
+        file_hashes_plugin.plugin_name, tagging_plugin.plugin_name])
+
+    # The task of an analysis process that has exited is merged when ready.
+    ready_analysis_plugins = test_engine._WaitForAnalysisTasks(
+        storage_writer, [file_hashes_plugin, tagging_plugin])
+    self.assertEqual(
+        ready_analysis_plugins, [file_hashes_plugin, tagging_plugin])
+
   def testInternalExportEvents(self):
     """Tests the _ExportEvents function."""
     knowledge_base_object = knowledge_base.KnowledgeBase()
@@ -343,6 +445,39 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
 
     # TODO: add bogus data location test.
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testAnalyzeEventsWithStorageFilePath(self):
+    """Tests the AnalyzeEvents function with direct storage access."""
+    storage_file_path = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    session = sessions.Session()
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    data_location = u''
+    analysis_plugin = file_hashes.FileHashesPlugin()
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      shutil.copyfile(storage_file_path, temp_file)
+
+      with storage_zip_file.ZIPStorageFileReader(temp_file) as storage_reader:
+        number_of_analysis_reports = (
+            storage_reader.GetNumberOfAnalysisReports())
+
+      storage_writer = storage_zip_file.ZIPStorageFileWriter(
+          session, temp_file)
+
+      test_engine.AnalyzeEvents(
+          knowledge_base_object, storage_writer, data_location,
+          [analysis_plugin], storage_file_path=temp_file)
+
+      with storage_zip_file.ZIPStorageFileReader(temp_file) as storage_reader:
+        self.assertEqual(
+            storage_reader.GetNumberOfAnalysisReports(),
+            number_of_analysis_reports + 1)
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   def testExportEvents(self):
     """Tests the ExportEvents function."""
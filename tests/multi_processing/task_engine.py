@@ -8,17 +8,238 @@ import unittest
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
+from plaso.containers import event_sources
 from plaso.containers import sessions
 from plaso.engine import configurations
+from plaso.lib import definitions
 from plaso.multi_processing import task_engine
+from plaso.storage import fake_storage
 from plaso.storage import zip_file as storage_zip_file
 
 from tests import test_lib as shared_test_lib
 
 
+class EventSourceHeapTest(shared_test_lib.BaseTestCase):
+  """Tests for the event source heap."""
+
+  # pylint: disable=protected-access
+
+  def _CreateEventSource(
+      self, location, data_size=None,
+      file_entry_type=dfvfs_definitions.FILE_ENTRY_TYPE_FILE, parent=None):
+    """Creates an event source.
+
+    Args:
+      location (str): location of the path specification.
+      data_size (Optional[int]): data size.
+      file_entry_type (Optional[str]): dfVFS file entry type.
+      parent (Optional[dfvfs.PathSpec]): parent path specification.
+
+    Returns:
+      EventSource: event source.
+    """
+    if parent:
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_TSK, location=location,
+          parent=parent)
+    else:
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=location)
+
+    event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+    event_source.data_size = data_size
+    event_source.file_entry_type = file_entry_type
+    return event_source
+
+  def testGetWeight(self):
+    """Tests the GetWeight function."""
+    event_source_heap = task_engine._EventSourceHeap()
+
+    event_source = self._CreateEventSource(u'/test/file')
+    self.assertEqual(event_source_heap.GetWeight(event_source), 0)
+
+    event_source = self._CreateEventSource(u'/test/file', data_size=1024)
+    self.assertEqual(event_source_heap.GetWeight(event_source), 1024)
+
+    event_source = self._CreateEventSource(u'/$MFT', data_size=1024)
+    self.assertEqual(event_source_heap.GetWeight(event_source), 4096)
+
+    event_source = self._CreateEventSource(u'/test/file.evtx', data_size=1024)
+    self.assertEqual(event_source_heap.GetWeight(event_source), 2048)
+
+  def testPushAndPopEventSource(self):
+    """Tests the PushEventSource and PopEventSource functions."""
+    event_source_heap = task_engine._EventSourceHeap()
+
+    small_file = self._CreateEventSource(u'/small', data_size=10)
+    large_file = self._CreateEventSource(u'/large', data_size=10000)
+    directory = self._CreateEventSource(
+        u'/directory',
+        file_entry_type=dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY)
+    unknown_file = self._CreateEventSource(u'/unknown')
+
+    event_source_heap.PushEventSource(small_file)
+    event_source_heap.PushEventSource(unknown_file)
+    event_source_heap.PushEventSource(large_file)
+    event_source_heap.PushEventSource(directory)
+
+    self.assertEqual(event_source_heap.PopEventSource(), directory)
+    self.assertEqual(event_source_heap.PopEventSource(), large_file)
+    self.assertEqual(event_source_heap.PopEventSource(), small_file)
+    self.assertEqual(event_source_heap.PopEventSource(), unknown_file)
+    self.assertIsNone(event_source_heap.PopEventSource())
+
+  def testPushAndPopEventSourceGroupByParent(self):
+    """Tests the PushEventSource and PopEventSource functions with grouping."""
+    event_source_heap = task_engine._EventSourceHeap(group_by_parent=True)
+
+    parent1 = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/image1.raw')
+    parent2 = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/image2.raw')
+
+    file1 = self._CreateEventSource(u'/file1', data_size=1000, parent=parent1)
+    file2 = self._CreateEventSource(u'/file2', data_size=1001, parent=parent2)
+    file3 = self._CreateEventSource(u'/file3', data_size=1002, parent=parent1)
+
+    event_source_heap.PushEventSource(file1)
+    event_source_heap.PushEventSource(file2)
+    event_source_heap.PushEventSource(file3)
+
+    self.assertEqual(event_source_heap.PopEventSource(), file3)
+    self.assertEqual(event_source_heap.PopEventSource(), file1)
+    self.assertEqual(event_source_heap.PopEventSource(), file2)
+
+
 class TaskMultiProcessEngineTest(shared_test_lib.BaseTestCase):
   """Tests for the task multi-process engine."""
 
+  # pylint: disable=protected-access
+
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testAddCollectedEventSources(self):
+    """Tests the _AddCollectedEventSources function."""
+    test_engine = task_engine.TaskMultiProcessEngine(
+        maximum_number_of_tasks=100)
+
+    source_path = self._GetTestFilePath([u'ímynd.dd'])
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    source_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=os_path_spec)
+
+    session = sessions.Session()
+    storage_writer = fake_storage.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    test_engine._StartCollectorThread([source_path_spec])
+
+    while test_engine._IsCollecting():
+      test_engine._AddCollectedEventSources(storage_writer, block=True)
+
+    test_engine._StopCollectorThread()
+
+    self.assertEqual(
+        test_engine._collection_status, definitions.PROCESSING_STATUS_COMPLETED)
+    self.assertGreater(test_engine._number_of_collected_path_specs, 0)
+    self.assertEqual(
+        storage_writer.number_of_event_sources,
+        test_engine._number_of_collected_path_specs)
+
+    processing_status = test_engine._processing_status
+    self.assertEqual(
+        processing_status.collection_status,
+        definitions.PROCESSING_STATUS_COMPLETED)
+    self.assertEqual(
+        processing_status.number_of_collected_path_specs,
+        test_engine._number_of_collected_path_specs)
+
+    storage_writer.Close()
+
+  def testCreateTask(self):
+    """Tests the _CreateTask function."""
+    test_engine = task_engine.TaskMultiProcessEngine(
+        maximum_number_of_tasks=100)
+    test_engine._session_identifier = u'test_session'
+
+    event_source_heap = task_engine._EventSourceHeap()
+
+    test_event_sources = []
+    for index, data_size in enumerate([1024, 2048, 4096, 8 * 1024 * 1024]):
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS,
+          location=u'/test/file{0:d}'.format(index))
+      event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+      event_source.data_size = data_size
+      event_source.file_entry_type = dfvfs_definitions.FILE_ENTRY_TYPE_FILE
+      test_event_sources.append(event_source)
+
+    # Test with task batching disabled.
+    task, event_source = test_engine._CreateTask(
+        test_event_sources[0], event_source_heap)
+    self.assertIsNone(event_source)
+    self.assertEqual(task.path_spec, test_event_sources[0].path_spec)
+    self.assertIsNone(task.path_specs)
+
+    # Test with task batching enabled.
+    test_engine._task_batch_size = 3
+
+    event_source_heap.PushEventSource(test_event_sources[1])
+    event_source_heap.PushEventSource(test_event_sources[2])
+
+    task, event_source = test_engine._CreateTask(
+        test_event_sources[0], event_source_heap)
+    self.assertIsNone(event_source)
+    self.assertEqual(len(task.path_specs), 3)
+    self.assertEqual(len(task.GetPathSpecs()), 3)
+
+    # Test with a file that exceeds the batch data size.
+    event_source_heap.PushEventSource(test_event_sources[3])
+
+    task, event_source = test_engine._CreateTask(
+        test_event_sources[0], event_source_heap)
+    self.assertEqual(event_source, test_event_sources[3])
+    self.assertEqual(task.path_spec, test_event_sources[0].path_spec)
+    self.assertIsNone(task.path_specs)
+
+  def testGetTasksToPreMerge(self):
+    """Tests the _GetTasksToPreMerge function."""
+    test_engine = task_engine.TaskMultiProcessEngine(
+        maximum_number_of_tasks=100)
+
+    test_tasks = []
+    for storage_file_size in [1024, 2048, 8 * 1024 * 1024]:
+      task = test_engine._task_manager.CreateTask(u'test_session')
+      task.storage_file_size = storage_file_size
+      test_engine._task_manager.UpdateTaskAsProcessing(task)
+      test_tasks.append(task)
+
+    test_engine._task_manager.UpdateTaskAsPendingMerge(test_tasks[0])
+    test_engine._task_manager.UpdateTaskAsPendingMerge(test_tasks[1])
+
+    # Small task storages are held back while tasks are being processed.
+    self.assertIsNone(test_engine._GetTasksToPreMerge())
+    self.assertEqual(len(test_engine._tasks_pending_pre_merge), 2)
+    self.assertEqual(test_engine._GetMergeBacklog(), 2)
+
+    # Task storages are pre-merged once the pre-merge size is reached.
+    test_engine._task_manager.UpdateTaskAsPendingMerge(test_tasks[2])
+
+    tasks = test_engine._GetTasksToPreMerge()
+    self.assertEqual(len(tasks), 3)
+    self.assertEqual(len(test_engine._tasks_pending_pre_merge), 0)
+    self.assertIsNone(test_engine._GetTasksToPreMerge())
+
+    # Small task storages are pre-merged once no tasks are being processed.
+    task = test_engine._task_manager.CreateTask(u'test_session')
+    task.storage_file_size = 1024
+    test_engine._task_manager.UpdateTaskAsProcessing(task)
+    test_engine._task_manager.UpdateTaskAsPendingMerge(task)
+
+    tasks = test_engine._GetTasksToPreMerge()
+    self.assertEqual(tasks, [task])
+
   @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
   def testProcessSources(self):
     """Tests the PreprocessSources and ProcessSources function."""
@@ -56,8 +56,11 @@ class TaskManagerTestCase(shared_test_lib.BaseTestCase):
 
     task.storage_file_size = 10
     manager.UpdateTaskAsPendingMerge(task)
+    self.assertEqual(manager.GetNumberOfTasksPendingMerge(), 1)
+
     task_pending_merge = manager.GetTaskPendingMerge(None)
     self.assertEqual(task, task_pending_merge)
+    self.assertEqual(manager.GetNumberOfTasksPendingMerge(), 0)
     manager.CompleteTask(task)
 
     small_task = manager.CreateTask(self._TEST_SESSION_IDENTIFIER)
@@ -137,6 +137,35 @@ class EventBufferTest(test_lib.OutputModuleTestCase):
     event_buffer_object.Append(TestEvent(123457, u'Now is different'))
     self._CheckBufferLength(event_buffer_object, 1)
 
+  def testWriteBlockEvents(self):
+    """Tests writing the events in blocks."""
+    output_mediator = self._CreateOutputMediator()
+    output_writer = cli_test_lib.TestOutputWriter()
+    output_module = test_lib.TestOutputModule(output_mediator)
+    output_module.SetOutputWriter(output_writer)
+    event_buffer_object = event_buffer.EventBuffer(output_module, False)
+    event_buffer_object._MAXIMUM_NUMBER_OF_BLOCK_EVENTS = 2
+
+    event_buffer_object.Append(TestEvent(123456, u'First'))
+    self.assertEqual(len(event_buffer_object._block_events), 1)
+
+    event_buffer_object.Append(TestEvent(123457, u'Second'))
+    self.assertEqual(len(event_buffer_object._block_events), 0)
+
+    event_buffer_object.Append(TestEvent(123458, u'Third'))
+    self.assertEqual(len(event_buffer_object._block_events), 1)
+
+    output = output_writer.ReadOutput()
+    self.assertIn(b'First', output)
+    self.assertIn(b'Second', output)
+    self.assertNotIn(b'Third', output)
+
+    event_buffer_object.Flush()
+    self.assertEqual(len(event_buffer_object._block_events), 0)
+
+    output = output_writer.ReadOutput()
+    self.assertIn(b'Third', output)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -61,6 +61,82 @@ class OutputMediatorTest(unittest.TestCase):
     formatters_manager.FormattersManager.DeregisterFormatter(
         TestEventFormatter)
 
+  def testGetFormattedEvent(self):
+    """Tests the GetFormattedEvent function."""
+    event_object = TestEvent()
+
+    formatters_manager.FormattersManager.RegisterFormatter(
+        TestEventFormatter)
+
+    formatted_event = self._output_mediator.GetFormattedEvent(event_object)
+    self.assertIsInstance(formatted_event, mediator.FormattedEvent)
+    self.assertIs(formatted_event.event, event_object)
+
+    expected_message = (
+        u'Reporter <CRON> PID: 8442'
+        u' (pam_unix(cron:session): session closed for user root)')
+
+    message, message_short = formatted_event.GetMessages()
+    self.assertEqual(message, expected_message)
+    self.assertEqual(message_short, expected_message)
+
+    source_short, source = formatted_event.GetSources()
+    self.assertEqual(source, u'Syslog')
+    self.assertEqual(source_short, u'LOG')
+
+    macb_representation = formatted_event.GetMACBRepresentation()
+    self.assertEqual(macb_representation, u'..C.')
+
+    date_time = formatted_event.GetDateTime()
+    self.assertEqual(date_time.isoformat(), u'2012-06-27T18:17:01+00:00')
+
+    # The formatted view is shared for the same event.
+    self.assertIs(
+        self._output_mediator.GetFormattedEvent(event_object), formatted_event)
+
+    self.assertIsNot(
+        self._output_mediator.GetFormattedEvent(TestEvent()), formatted_event)
+
+    formatters_manager.FormattersManager.DeregisterFormatter(
+        TestEventFormatter)
+
+    event_object = TestEvent()
+    event_object.timestamp = 2 ** 62
+
+    formatted_event = self._output_mediator.GetFormattedEvent(event_object)
+
+    with self.assertRaises(OverflowError):
+      formatted_event.GetDateTime(raise_error=True)
+
+    date_time = formatted_event.GetDateTime()
+    self.assertEqual(date_time.isoformat(), u'1970-01-01T00:00:00+00:00')
+
+  def testPrepareFormattedEvents(self):
+    """Tests the PrepareFormattedEvents function."""
+    event_objects = [TestEvent(), TestEvent()]
+    event_objects[1].timestamp = 2 ** 62
+
+    self._output_mediator.SetTimezone(u'Europe/Amsterdam')
+    self._output_mediator.PrepareFormattedEvents(event_objects)
+
+    formatted_event = self._output_mediator.GetFormattedEvent(
+        event_objects[0])
+    date_time = formatted_event.GetDateTime()
+    self.assertEqual(date_time.isoformat(), u'2012-06-27T20:17:01+02:00')
+
+    # A timestamp that cannot be converted in the block is reported when
+    # the date and time is retrieved.
+    formatted_event = self._output_mediator.GetFormattedEvent(
+        event_objects[1])
+
+    with self.assertRaises(OverflowError):
+      formatted_event.GetDateTime(raise_error=True)
+
+    # An event that is not part of the block gets a new formatted view.
+    event_object = TestEvent()
+    formatted_event = self._output_mediator.GetFormattedEvent(event_object)
+    self.assertIs(formatted_event.event, event_object)
+
   def testGetFormattedMessages(self):
     """Tests the GetFormattedMessages function."""
     event_object = TestEvent()
@@ -2,8 +2,13 @@
 # -*- coding: utf-8 -*-
 """Tests for the Chrome Cache files parser."""
 
+import os
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
 from plaso.formatters import chrome_cache  # pylint: disable=unused-import
 from plaso.lib import timelib
 from plaso.parsers import chrome_cache
@@ -12,6 +17,34 @@ from tests import test_lib as shared_test_lib
 from tests.parsers import test_lib
 
 
+class IndexFileTest(shared_test_lib.BaseTestCase):
+  """Tests for the Chrome Cache index file."""
+
+  @shared_test_lib.skipUnlessHasTestFile([u'chrome_cache', u'index'])
+  def testOpenTruncated(self):
+    """Tests the Open function on an index file truncated in the LRU data."""
+    test_file_path = self._GetTestFilePath([u'chrome_cache', u'index'])
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      for size in (256, 300):
+        path = os.path.join(temp_directory, u'index.{0:d}'.format(size))
+        with open(path, 'wb') as file_object:
+          file_object.write(data[:size])
+
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            dfvfs_definitions.TYPE_INDICATOR_OS, location=path)
+        file_object = path_spec_resolver.Resolver.OpenFileObject(path_spec)
+
+        index_file = chrome_cache.IndexFile()
+        try:
+          index_file.Open(file_object)
+          self.assertEqual(index_file.index_table, [])
+        finally:
+          index_file.Close()
+
+
 class ChromeCacheParserTest(test_lib.ParserTestCase):
   """Tests for the Chrome Cache files parser."""
 
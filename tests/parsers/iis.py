@@ -18,6 +18,50 @@ __author__ = 'Ashley Holtz (ashley.a.holtz@gmail.com)'
 class WinIISUnitTest(test_lib.ParserTestCase):
   """Tests for the Windows IIS parser."""
 
+  def testCreateRegularExpressionLineStructure(self):
+    """Tests the _CreateRegularExpressionLineStructure function."""
+    parser_object = iis.WinIISParser()
+
+    fields = [
+        u'date', u'time', u's-ip', u'cs-method', u'cs-uri-stem', u's-port',
+        u'c-ip', u'x-custom', u'sc-status']
+    line_structure = parser_object._CreateRegularExpressionLineStructure(
+        fields)
+
+    structure = line_structure.Match(
+        u'2013-07-30 00:00:05 10.10.10.100 GET /some/image.jpg 80 '
+        u'022.22.22.200 custom 404')
+    self.assertIsNotNone(structure)
+    self.assertEqual(structure.date_time, [2013, 7, 30, 0, 0, 5])
+    self.assertEqual(structure.dest_port, 80)
+    self.assertEqual(structure.http_status, 404)
+    self.assertEqual(structure.requested_uri_stem, u'/some/image.jpg')
+    self.assertEqual(structure.source_ip, u'22.22.22.200')
+    self.assertNotIn(u'x_custom', structure)
+
+    # An IPv4 address with an octet out of bounds is left to pyparsing.
+    structure = line_structure.Match(
+        u'2013-07-30 00:00:05 10.10.10.300 GET /some/image.jpg 80 '
+        u'22.22.22.200 custom 404')
+    self.assertIsNone(structure)
+
+    fields = [u'time', u'c-ip', u'date']
+    line_structure = parser_object._CreateRegularExpressionLineStructure(
+        fields)
+
+    structure = line_structure.Match(u'00:00:05 - 2013-07-30')
+    self.assertIsNotNone(structure)
+    self.assertEqual(structure.date, [2013, 7, 30])
+    self.assertEqual(structure.source_ip, u'-')
+    self.assertEqual(structure.time, [0, 0, 5])
+    self.assertNotIn(u'_date_year', structure)
+
+    # Fields that map to the same value are left to pyparsing.
+    fields = [u'date', u'time', u'cs(Referrer)', u'cs(Referer)']
+    line_structure = parser_object._CreateRegularExpressionLineStructure(
+        fields)
+    self.assertIsNone(line_structure)
+
   @shared_test_lib.skipUnlessHasTestFile([u'iis.log'])
   def testParse(self):
     """Tests the Parse function."""
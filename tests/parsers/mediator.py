@@ -8,6 +8,7 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
 
+from plaso.containers import events
 from plaso.containers import sessions
 from plaso.engine import configurations
 from plaso.storage import fake_storage
@@ -79,6 +80,61 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     # TODO: add test with relative path.
 
+  @shared_test_lib.skipUnlessHasTestFile([u'syslog'])
+  def testEventRecording(self):
+    """Tests the StartEventRecording and StopEventRecording functions."""
+    session = sessions.Session()
+    storage_writer = fake_storage.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    file_entry = self._GetTestFileEntry([u'syslog'])
+    parsers_mediator = self._CreateParserMediator(
+        storage_writer, file_entry=file_entry)
+
+    parsers_mediator.StartEventRecording()
+
+    event = events.EventObject()
+    event.data_type = u'test:event'
+    event.timestamp = 1483228800000000
+    parsers_mediator.ProduceEvent(event, query=u'test query')
+
+    recorded_events = parsers_mediator.StopEventRecording()
+    self.assertEqual(len(recorded_events), 1)
+
+    parser_chain, query, _ = recorded_events[0]
+    self.assertEqual(parser_chain, u'')
+    self.assertEqual(query, u'test query')
+
+    # The recorded events are produced as events of the active file entry.
+    parsers_mediator.ProduceRecordedEvents(recorded_events)
+    self.assertEqual(parsers_mediator.number_of_produced_events, 2)
+
+    produced_event = storage_writer.events[1]
+    self.assertEqual(produced_event.data_type, u'test:event')
+    self.assertEqual(produced_event.filename, event.filename)
+    self.assertEqual(produced_event.pathspec, file_entry.path_spec)
+    self.assertEqual(produced_event.query, u'test query')
+
+    # Events produced with information from the file entry cannot be reused.
+    parsers_mediator.StartEventRecording()
+
+    parsers_mediator.GetFileEntry()
+    parsers_mediator.ProduceEvent(events.EventObject())
+
+    recorded_events = parsers_mediator.StopEventRecording()
+    self.assertIsNone(recorded_events)
+
+    # Events with attribute values that cannot be serialized cannot be reused.
+    parsers_mediator.StartEventRecording()
+
+    event = events.EventObject()
+    event.data_type = u'test:event'
+    event.unserializable = object()
+    parsers_mediator.ProduceEvent(event)
+
+    recorded_events = parsers_mediator.StopEventRecording()
+    self.assertIsNone(recorded_events)
+
   # TODO: add more tests.
 
 
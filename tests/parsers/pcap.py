@@ -4,6 +4,8 @@
 
 import unittest
 
+import dpkt
+
 from plaso.formatters import pcap  # pylint: disable=unused-import
 from plaso.parsers import pcap
 
@@ -11,6 +13,105 @@ from tests import test_lib as shared_test_lib
 from tests.parsers import test_lib
 
 
+class StreamTableTest(shared_test_lib.BaseTestCase):
+  """Tests for the stream table."""
+
+  def _AddTCPPacket(
+      self, stream_table, packet_number, timestamp, source_port, close=False):
+    """Adds a TCP packet to a stream table.
+
+    Args:
+      stream_table (StreamTable): stream table.
+      packet_number (int): PCAP packet number.
+      timestamp (int): PCAP packet timestamp.
+      source_port (int): TCP source port, which identifies the stream.
+      close (Optional[bool]): True if the packet closes the stream.
+    """
+    tcp = dpkt.tcp.TCP(sport=source_port, dport=80, data=b'data')
+    packet_values = [timestamp, packet_number, tcp, 64]
+    stream_key = u'tcp: {0:d}'.format(source_port)
+    stream_table.AddPacket(
+        stream_key, packet_values, tcp, u'10.0.0.1', u'10.0.0.2', u'TCP',
+        close=close)
+
+  def testAddPacket(self):
+    """Tests the AddPacket function."""
+    stream_table = pcap.StreamTable()
+
+    self._AddTCPPacket(stream_table, 1, 3000, 1024)
+    self._AddTCPPacket(stream_table, 2, 1000, 1024)
+    self._AddTCPPacket(stream_table, 3, 2000, 1025, close=True)
+    self._AddTCPPacket(stream_table, 4, 4000, 1024)
+
+    self.assertEqual(stream_table.number_of_streams, 2)
+    self.assertEqual(stream_table.GetClosedStreams(100000000), [])
+
+    streams = stream_table.GetStreams()
+    self.assertEqual(len(streams), 2)
+    self.assertEqual(stream_table.number_of_streams, 0)
+
+    stream_object = streams[0]
+    self.assertEqual(stream_object.first_packet_id, 1)
+    self.assertEqual(stream_object.last_packet_id, 4)
+    self.assertEqual(stream_object.minimum_timestamp, 1000)
+    self.assertEqual(stream_object.maximum_timestamp, 4000)
+    self.assertEqual(stream_object.packet_count, 3)
+    self.assertEqual(stream_object.size, 192)
+    self.assertEqual(stream_object.start_time, 3000)
+    self.assertEqual(len(stream_object.all_data), 3)
+
+    stream_table = pcap.StreamTable(maximum_stream_data_size=100)
+
+    self._AddTCPPacket(stream_table, 1, 1000, 1024)
+    self._AddTCPPacket(stream_table, 2, 2000, 1024)
+    self._AddTCPPacket(stream_table, 3, 3000, 1024)
+
+    streams = stream_table.GetStreams()
+    self.assertEqual(len(streams), 1)
+    self.assertEqual(streams[0].packet_count, 3)
+    self.assertEqual(streams[0].size, 192)
+    self.assertEqual(len(streams[0].all_data), 2)
+
+    stream_table = pcap.StreamTable(maximum_number_of_streams=2)
+
+    self._AddTCPPacket(stream_table, 1, 1000, 1024)
+    self._AddTCPPacket(stream_table, 2, 2000, 1025)
+    self._AddTCPPacket(stream_table, 3, 3000, 1026)
+
+    self.assertEqual(stream_table.number_of_streams, 2)
+
+    streams = stream_table.GetClosedStreams(3000)
+    self.assertEqual(len(streams), 1)
+    self.assertEqual(streams[0].source_port, 1024)
+
+  def testGetClosedStreams(self):
+    """Tests the GetClosedStreams function."""
+    stream_table = pcap.StreamTable(close_timeout=100, idle_timeout=1000)
+
+    self._AddTCPPacket(stream_table, 1, 1000, 1024)
+    self._AddTCPPacket(stream_table, 2, 1100, 1025)
+    self._AddTCPPacket(stream_table, 3, 1500, 1024)
+    self._AddTCPPacket(stream_table, 4, 1600, 1026, close=True)
+    self._AddTCPPacket(stream_table, 5, 1650, 1026)
+
+    self.assertEqual(stream_table.GetClosedStreams(1650), [])
+
+    streams = stream_table.GetClosedStreams(1700)
+    self.assertEqual(len(streams), 1)
+    self.assertEqual(streams[0].source_port, 1026)
+    self.assertEqual(streams[0].packet_count, 2)
+
+    streams = stream_table.GetClosedStreams(2100)
+    self.assertEqual(len(streams), 1)
+    self.assertEqual(streams[0].source_port, 1025)
+
+    streams = stream_table.GetClosedStreams(2500)
+    self.assertEqual(len(streams), 1)
+    self.assertEqual(streams[0].source_port, 1024)
+
+    self.assertEqual(stream_table.number_of_streams, 0)
+
+
 class PcapParserTest(test_lib.ParserTestCase):
   """Tests for the PCAP parser."""
 
@@ -94,6 +195,30 @@ class PcapParserTest(test_lib.ParserTestCase):
 
     self._TestGetMessageStrings(event_object, expected_msg, expected_msg_short)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'test.pcap'])
+  def testParseInStreamingMode(self):
+    """Tests the Parse function in streaming mode."""
+    parser_object = pcap.PcapParser()
+    parser_object.STREAMING_MINIMUM_FILE_SIZE = 0
+    storage_writer = self._ParseFile([u'test.pcap'], parser_object)
+
+    # The streams in the test file are shorter than the timeouts, hence
+    # streaming mode produces the same events in a different order.
+    self.assertEqual(len(storage_writer.events), 192)
+
+    event_objects = [
+        event_object for event_object in storage_writer.events
+        if event_object.source_port == 55679]
+    self.assertEqual(len(event_objects), 2)
+
+    event_object = event_objects[0]
+    self.assertEqual(event_object.packet_count, 5)
+    self.assertEqual(event_object.protocol, u'UDP')
+    self.assertEqual(event_object.stream_type, u'DNS')
+    self.assertEqual(event_object.first_packet_id, 11)
+    self.assertEqual(event_object.last_packet_id, 1307)
+    self.assertEqual(event_object.size, 380)
+
 
 if __name__ == '__main__':
   unittest.main()
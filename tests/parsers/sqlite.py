@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the SQLite database parser."""
 
+import os
 import sys
 import unittest
 
@@ -13,6 +14,49 @@ from tests import test_lib as shared_test_lib
 from tests.parsers import test_lib
 
 
+class SQLiteTemporaryCopyCacheTest(test_lib.ParserTestCase):
+  """Tests for the SQLite temporary copy cache."""
+
+  @shared_test_lib.skipUnlessHasTestFile([u'wal_database.db'])
+  @shared_test_lib.skipUnlessHasTestFile([u'wal_database.db-wal'])
+  def testGetAndReleaseTemporaryCopy(self):
+    """Tests the GetTemporaryCopy and ReleaseTemporaryCopy functions."""
+    database_file = self._GetTestFilePath([u'wal_database.db'])
+    wal_file = self._GetTestFilePath([u'wal_database.db-wal'])
+
+    temporary_copy_cache = sqlite.SQLiteTemporaryCopyCache()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      with open(database_file, 'rb') as database_file_object:
+        path = temporary_copy_cache.GetTemporaryCopy(
+            database_file_object, temporary_directory=temp_directory)
+        self.assertTrue(os.path.exists(path))
+
+        second_path = temporary_copy_cache.GetTemporaryCopy(
+            database_file_object, temporary_directory=temp_directory)
+        self.assertEqual(second_path, path)
+
+        with open(wal_file, 'rb') as wal_file_object:
+          wal_path = temporary_copy_cache.GetTemporaryCopy(
+              database_file_object, wal_file_object=wal_file_object,
+              temporary_directory=temp_directory)
+
+        self.assertNotEqual(wal_path, path)
+        self.assertTrue(os.path.exists(u'{0:s}-wal'.format(wal_path)))
+
+      temporary_copy_cache.ReleaseTemporaryCopy(path)
+      temporary_copy_cache.ReleaseTemporaryCopy(second_path)
+      temporary_copy_cache.ReleaseTemporaryCopy(wal_path)
+
+      # Temporary copies that are no longer used remain cached.
+      self.assertTrue(os.path.exists(path))
+
+      temporary_copy_cache.Clear()
+
+      self.assertFalse(os.path.exists(path))
+      self.assertFalse(os.path.exists(wal_path))
+
+
 class SQLiteParserTest(test_lib.ParserTestCase):
   """Tests for the SQLite database parser."""
 
@@ -112,6 +156,19 @@ class SQLiteParserTest(test_lib.ParserTestCase):
 
     self.assertEqual(expected_results, row_results)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'contacts2.db'])
+  def testOpenWithOSPath(self):
+    """Tests the Open function with a path on the operating system."""
+    database_file = self._GetTestFilePath([u'contacts2.db'])
+
+    database = sqlite.SQLiteDatabase(u'contacts2.db')
+    with open(database_file, 'rb') as database_file_object:
+      database.Open(database_file_object, os_path=database_file)
+
+    self.assertIn(u'calls', database.tables)
+
+    database.Close()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """This file contains the tests for the generic text parser."""
 
+import io
+import re
 import unittest
 
 import pyparsing
@@ -11,6 +13,128 @@ from plaso.parsers import text_parser
 from tests.parsers import test_lib
 
 
+class EncodedTextReaderTest(test_lib.ParserTestCase):
+  """Tests the encoded text reader."""
+
+  _TEST_DATA = (
+      b'first line\r\n'
+      b'second line caf\xc3\xa9\n'
+      b'\xe6\x97\xa5\xe6\x9c\xac third line\n'
+      b'last line')
+
+  def testGetOffset(self):
+    """Tests the GetOffset function."""
+    file_object = io.BytesIO(self._TEST_DATA)
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=16, encoding=u'utf-8')
+    text_reader.ReadLines(file_object)
+    self.assertEqual(text_reader.GetOffset(), 0)
+
+    expected_offsets = [12, 30, 48]
+    for expected_offset in expected_offsets:
+      text_reader.ReadLine(file_object)
+      text_reader.ReadLines(file_object)
+      self.assertEqual(text_reader.GetOffset(), expected_offset)
+
+    # The offset of a position within a line with multi-byte characters.
+    file_object = io.BytesIO(self._TEST_DATA)
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=16, encoding=u'utf-8')
+    text_reader.ReadLines(file_object)
+    text_reader.SkipAhead(file_object, 30)
+    self.assertEqual(text_reader.GetOffset(), 36)
+
+    text_reader.SkipAhead(file_object, 100)
+    self.assertFalse(text_reader.HasLines())
+    self.assertEqual(text_reader.GetOffset(), len(self._TEST_DATA))
+
+  def testMatchStructure(self):
+    """Tests the MatchStructure function."""
+    structure = pyparsing.Regex(r'[^\n]+\n')
+    structure.parseWithTabs()
+    structure.streamline()
+
+    file_object = io.BytesIO(self._TEST_DATA)
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=16, encoding=u'utf-8')
+    text_reader.ReadLines(file_object)
+
+    tokens, number_of_characters = text_reader.MatchStructure(
+        file_object, structure)
+    self.assertEqual(tokens[0], u'first line\n')
+    self.assertEqual(number_of_characters, 11)
+
+    # A structure only matches at the current position.
+    text_reader.SkipAhead(file_object, 10)
+    tokens, number_of_characters = text_reader.MatchStructure(
+        file_object, structure)
+    self.assertIsNone(tokens)
+    self.assertEqual(number_of_characters, 0)
+
+    # A match that extends to the end of the buffer is not truncated.
+    structure = pyparsing.Regex(r'.+', re.DOTALL)
+    structure.parseWithTabs()
+    structure.streamline()
+
+    text_reader.SkipAhead(file_object, 1)
+    tokens, number_of_characters = text_reader.MatchStructure(
+        file_object, structure)
+    self.assertEqual(
+        tokens[0], u'second line caf\xe9\n日本 third line\nlast line')
+    self.assertEqual(number_of_characters, 40)
+
+  def testReadLine(self):
+    """Tests the ReadLine function."""
+    file_object = io.BytesIO(self._TEST_DATA)
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=16, encoding=u'utf-8')
+    text_reader.ReadLines(file_object)
+
+    lines = []
+    while text_reader.HasLines():
+      lines.append(text_reader.ReadLine(file_object))
+      text_reader.ReadLines(file_object)
+
+    expected_lines = [
+        u'first line', u'second line caf\xe9', u'日本 third line',
+        u'last line']
+    self.assertEqual(lines, expected_lines)
+
+  def testReadLines(self):
+    """Tests the ReadLines function."""
+    file_object = io.BytesIO(self._TEST_DATA)
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=16, encoding=u'utf-8')
+    text_reader.ReadLines(file_object)
+    self.assertEqual(text_reader.lines, u'first line\nsecond line caf\xe9\n')
+
+    # Lines are only read when the remaining text is smaller than the buffer
+    # size.
+    text_reader.SkipAhead(file_object, 11)
+    text_reader.ReadLines(file_object)
+    self.assertEqual(text_reader.lines, u'second line caf\xe9\n')
+
+    text_reader.SkipAhead(file_object, 17)
+    text_reader.ReadLines(file_object)
+    self.assertEqual(text_reader.lines, u'日本 third line\nlast line')
+
+    # A line that cannot be decoded is skipped.
+    file_object = io.BytesIO(b'first line\n\xff\nlast line\n')
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=64, encoding=u'utf-8')
+
+    with self.assertRaises(UnicodeDecodeError):
+      text_reader.ReadLines(file_object)
+
+    self.assertEqual(text_reader.lines, u'first line\n')
+
+    text_reader.ReadLines(file_object)
+    self.assertEqual(text_reader.lines, u'first line\nlast line\n')
+
+    text_reader.SkipAhead(file_object, 11)
+    self.assertEqual(text_reader.GetOffset(), 13)
+
+
 class PyparsingConstantsTest(test_lib.ParserTestCase):
   """Tests the PyparsingConstants text parser."""
 
@@ -79,5 +203,44 @@ class PyparsingConstantsTest(test_lib.ParserTestCase):
           u'a9', parseAll=True)
 
 
+class RegularExpressionLineStructureTest(test_lib.ParserTestCase):
+  """Tests the regular expression line structure."""
+
+  def testMatch(self):
+    """Tests the Match function."""
+    line_structure = text_parser.RegularExpressionLineStructure(
+        (r'(?P<_hours>[0-9]{2}):(?P<_minutes>[0-9]{2}) (?P<value>[0-9]+|-)'
+         r'(?: (?P<text>[a-z]+))?'),
+        conversions={
+            u'_hours': int,
+            u'_minutes': int,
+            u'value': lambda value: int(value, 10) if value != u'-' else value},
+        lists={u'time': (u'_hours', u'_minutes')})
+
+    structure = line_structure.Match(u'12:34 56 text')
+    self.assertIsInstance(structure, text_parser.RegularExpressionParseResults)
+    self.assertEqual(
+        structure, {u'text': u'text', u'time': [12, 34], u'value': 56})
+
+    self.assertEqual(structure.text, u'text')
+    self.assertEqual(structure.time, [12, 34])
+    self.assertEqual(structure.value, 56)
+
+    # Like pyparsing.ParseResults a missing value is an empty string.
+    structure = line_structure.Match(u'12:34 -')
+    self.assertEqual(structure.text, u'')
+    self.assertEqual(structure.value, u'-')
+
+    structure = line_structure.Match(u'12:34')
+    self.assertIsNone(structure)
+
+    # A value that cannot be converted is not matched.
+    line_structure = text_parser.RegularExpressionLineStructure(
+        r'(?P<value>[0-9a-f]+)', conversions={u'value': int})
+
+    structure = line_structure.Match(u'1a')
+    self.assertIsNone(structure)
+
+
 if __name__ == u'__main__':
   unittest.main()
@@ -0,0 +1,268 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the serializer object implementation using a binary format."""
+
+import collections
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import fake_path_spec
+from dfvfs.path import factory as path_spec_factory
+
+import plaso
+from plaso.containers import event_sources
+from plaso.containers import events
+from plaso.containers import sessions
+from plaso.serializer import binary_serializer
+
+from tests import test_lib as shared_test_lib
+
+
+class BinaryAttributeContainerSerializerTest(shared_test_lib.BaseTestCase):
+  """Tests for the binary attribute container serializer object."""
+
+  def testReadAndWriteSerializedEventObject(self):
+    """Test ReadSerialized and WriteSerialized of EventObject."""
+    test_file = self._GetTestFilePath([u'ímynd.dd'])
+
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=volume_path_spec)
+
+    expected_event_object = events.EventObject()
+    expected_event_object.data_type = u'test:event2'
+    expected_event_object.pathspec = path_spec
+    expected_event_object.timestamp = 1234124
+    expected_event_object.timestamp_desc = u'Written'
+
+    expected_event_object.binary_string = b'\xc0\x90\x90binary'
+    expected_event_object.empty_string = u''
+    expected_event_object.zero_integer = 0
+    expected_event_object.integer = 34
+    expected_event_object.large_integer = 0xffffffffffffffffff
+    expected_event_object.string = u'Normal string'
+    expected_event_object.unicode_string = u'And I am a unicorn.'
+    expected_event_object.my_list = [u'asf', 4234, 2, 54, u'asf']
+    expected_event_object.my_dict = {
+        u'a': u'not b', u'c': 34, u'list': [u'sf', 234], u'an': [234, 32]}
+    expected_event_object.a_tuple = (
+        u'some item', [234, 52, 15], {u'a': u'not a', u'b': u'not b'}, 35)
+    expected_event_object.path_specs = [volume_path_spec, path_spec]
+    expected_event_object.null_value = None
+
+    serialized = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event_object))
+
+    self.assertIsNotNone(serialized)
+
+    event_object = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized))
+
+    self.assertIsNotNone(event_object)
+    self.assertIsInstance(event_object, events.EventObject)
+
+    expected_event_object_dict = {
+        u'a_tuple': (
+            u'some item', [234, 52, 15], {u'a': u'not a', u'b': u'not b'}, 35),
+        u'binary_string': b'\xc0\x90\x90binary',
+        u'data_type': u'test:event2',
+        u'empty_string': u'',
+        u'integer': 34,
+        u'large_integer': 0xffffffffffffffffff,
+        u'my_dict': {
+            u'a': u'not b',
+            u'an': [234, 32],
+            u'c': 34,
+            u'list': [u'sf', 234]
+        },
+        u'my_list': [u'asf', 4234, 2, 54, u'asf'],
+        u'pathspec': path_spec.comparable,
+        u'path_specs': [volume_path_spec.comparable, path_spec.comparable],
+        u'string': u'Normal string',
+        u'timestamp_desc': u'Written',
+        u'timestamp': 1234124,
+        u'unicode_string': u'And I am a unicorn.',
+        u'zero_integer': 0
+    }
+
+    event_object_dict = event_object.CopyToDict()
+    path_spec = event_object_dict.get(u'pathspec', None)
+    if path_spec:
+      event_object_dict[u'pathspec'] = path_spec.comparable
+
+    path_specs = event_object_dict.get(u'path_specs', None)
+    if path_specs:
+      event_object_dict[u'path_specs'] = [
+          path_spec.comparable for path_spec in path_specs]
+
+    self.assertEqual(
+        sorted(event_object_dict.items()),
+        sorted(expected_event_object_dict.items()))
+
+    # The path specifications are stored only once in the path spec table.
+    self.assertIs(event_object.path_specs[0], event_object.pathspec.parent)
+    self.assertIs(event_object.path_specs[1], event_object.pathspec)
+
+  def testReadAndWriteSerializedEventSource(self):
+    """Test ReadSerialized and WriteSerialized of EventSource."""
+    test_path_spec = fake_path_spec.FakePathSpec(location=u'/opt/plaso.txt')
+
+    expected_event_source = event_sources.EventSource(path_spec=test_path_spec)
+
+    serialized = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event_source))
+
+    self.assertIsNotNone(serialized)
+
+    event_source = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized))
+
+    self.assertIsNotNone(event_source)
+    self.assertIsInstance(event_source, event_sources.EventSource)
+
+    expected_event_source_dict = {
+        u'path_spec': test_path_spec.comparable,
+    }
+
+    event_source_dict = event_source.CopyToDict()
+    path_spec = event_source_dict.get(u'path_spec', None)
+    if path_spec:
+      event_source_dict[u'path_spec'] = path_spec.comparable
+
+    self.assertEqual(
+        sorted(event_source_dict.items()),
+        sorted(expected_event_source_dict.items()))
+
+  def testReadAndWriteSerializedEventTag(self):
+    """Test ReadSerialized and WriteSerialized of EventTag."""
+    expected_event_tag = events.EventTag(comment=u'My first comment.')
+    expected_event_tag.AddLabels([u'Malware', u'Common'])
+
+    serialized = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event_tag))
+
+    self.assertIsNotNone(serialized)
+
+    event_tag = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized))
+
+    self.assertIsNotNone(event_tag)
+    self.assertIsInstance(event_tag, events.EventTag)
+
+    expected_event_tag_dict = {
+        u'comment': u'My first comment.',
+        u'labels': [u'Malware', u'Common'],
+    }
+
+    event_tag_dict = event_tag.CopyToDict()
+    self.assertEqual(
+        sorted(event_tag_dict.items()),
+        sorted(expected_event_tag_dict.items()))
+
+  def testReadAndWriteSerializedSession(self):
+    """Test ReadSerialized and WriteSerialized of Session."""
+    parsers_counter = collections.Counter()
+    parsers_counter[u'filestat'] = 3
+    parsers_counter[u'total'] = 3
+
+    expected_session = sessions.Session()
+    expected_session.product_name = u'plaso'
+    expected_session.product_version = plaso.GetVersion()
+    expected_session.parsers_counter = parsers_counter
+
+    serialized = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_session))
+
+    self.assertIsNotNone(serialized)
+
+    session = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized))
+
+    self.assertIsNotNone(session)
+    self.assertIsInstance(session, sessions.Session)
+    self.assertIsInstance(session.parsers_counter, collections.Counter)
+
+    expected_session_dict = {
+        u'aborted': False,
+        u'analysis_reports_counter': session.analysis_reports_counter,
+        u'debug_mode': False,
+        u'event_labels_counter': session.event_labels_counter,
+        u'identifier': session.identifier,
+        u'parsers_counter': parsers_counter,
+        u'preferred_encoding': u'utf-8',
+        u'preferred_time_zone': u'UTC',
+        u'product_name': u'plaso',
+        u'product_version': plaso.GetVersion(),
+        u'start_time': session.start_time
+    }
+
+    session_dict = session.CopyToDict()
+    self.assertEqual(
+        sorted(session_dict.items()), sorted(expected_session_dict.items()))
+
+  def testReadSerialized(self):
+    """Test ReadSerialized with unsupported data."""
+    with self.assertRaises(ValueError):
+      binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+          b'{"__type__": "AttributeContainer"}')
+
+    with self.assertRaises(ValueError):
+      binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+          b'plsc\x01\x00\x00\x00\x00')
+
+    # Values of unexpected types.
+    for serialized_container in (
+        b'{}', b'[]', b'["event",[[1000,1]],[]]', b'["event",[],[[0,[99,0]]]]',
+        b'["event",[],[[0,[5,0]]]]', b'["event",[],[[0,[3,[[[1],1]]]]]]',
+        b'["event",[],[[0,[7,1]]]]', b'[' * 100000):
+      with self.assertRaises(ValueError):
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            b'plsc\x02\x00\x00\x00\x00' + serialized_container)
+
+    # A path specification property that is not supported.
+    serialized_path_specs = b'[["FAKE",null,{"__class__":"test"}]]'
+    with self.assertRaises(ValueError):
+      binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+          b'plsc\x02\x24\x00\x00\x00' + serialized_path_specs +
+          b'["event_source",[],[[2,[5,0]]]]')
+
+  def testReadSerializedTruncated(self):
+    """Test ReadSerialized with truncated data."""
+    test_path_spec = fake_path_spec.FakePathSpec(location=u'/opt/plaso.txt')
+
+    event_object = events.EventObject()
+    event_object.data_type = u'test:event'
+    event_object.pathspec = test_path_spec
+    event_object.binary_string = b'\xc0\x90\x90binary'
+
+    serialized = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            event_object))
+
+    for size in range(1, len(serialized)):
+      with self.assertRaises(ValueError):
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized[:size])
+
+  def testWriteSerialized(self):
+    """Test WriteSerialized with an unsupported attribute value."""
+    event_object = events.EventObject()
+    event_object.unsupported = object()
+
+    with self.assertRaises(TypeError):
+      binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+          event_object)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the storage event constraints object."""
+
+import json
+import unittest
+
+from plaso.storage import event_constraints
+from plaso.storage import time_range
+from plaso.storage import zip_file
+
+from tests import test_lib as shared_test_lib
+
+
+class EventConstraintsTest(shared_test_lib.BaseTestCase):
+  """Tests for the storage event constraints object."""
+
+  def _CreateSerializedEvent(self, data_type, filename, parser):
+    """Creates a JSON serialized event.
+
+    Args:
+      data_type (str): data type of the event.
+      filename (str): filename of the event.
+      parser (str): parser chain that produced the event.
+
+    Returns:
+      bytes: JSON serialized event.
+    """
+    json_dict = {
+        u'__container_type__': u'event',
+        u'__type__': u'AttributeContainer',
+        u'data_type': data_type,
+        u'filename': filename,
+        u'parser': parser,
+        u'timestamp': 1327218753000000}
+    return json.dumps(json_dict).encode(u'utf-8')
+
+  def testHasConstraints(self):
+    """Tests the HasConstraints function."""
+    test_constraints = event_constraints.EventConstraints()
+    self.assertFalse(test_constraints.HasConstraints())
+
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line'])
+    self.assertTrue(test_constraints.HasConstraints())
+
+    test_constraints = event_constraints.EventConstraints(data_types=[])
+    self.assertTrue(test_constraints.HasConstraints())
+
+    test_constraints = event_constraints.EventConstraints(
+        time_range=time_range.TimeRange(0, 10))
+    self.assertTrue(test_constraints.HasConstraints())
+
+  def testIntersect(self):
+    """Tests the Intersect function."""
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line', u'fs:stat'], filename_prefix=u'/var',
+        time_range=time_range.TimeRange(0, 10))
+    other_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line'], filename_prefix=u'/var/log',
+        parsers=[u'syslog'], time_range=time_range.TimeRange(5, 20))
+
+    intersected_constraints = test_constraints.Intersect(other_constraints)
+    self.assertEqual(
+        intersected_constraints.data_types, frozenset([u'syslog:line']))
+    self.assertEqual(intersected_constraints.filename_prefix, u'/var/log')
+    self.assertEqual(intersected_constraints.parsers, frozenset([u'syslog']))
+    self.assertEqual(intersected_constraints.time_range.start_timestamp, 5)
+    self.assertEqual(intersected_constraints.time_range.end_timestamp, 10)
+
+    other_constraints = event_constraints.EventConstraints(
+        time_range=time_range.TimeRange(20, 30))
+
+    intersected_constraints = test_constraints.Intersect(other_constraints)
+    self.assertEqual(intersected_constraints.time_range.start_timestamp, 20)
+    self.assertEqual(intersected_constraints.time_range.end_timestamp, 20)
+
+  def testIsStreamRelevant(self):
+    """Tests the IsStreamRelevant function."""
+    event_stream_summary = zip_file.EventStreamSummary(1)
+    event_stream_summary.AddTimestamp(100)
+    event_stream_summary.AddTimestamp(200)
+    event_stream_summary.data_types.add(u'syslog:line')
+    event_stream_summary.parsers.add(u'syslog')
+
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line', u'fs:stat'])
+    self.assertTrue(test_constraints.IsStreamRelevant(event_stream_summary))
+
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'fs:stat'])
+    self.assertFalse(test_constraints.IsStreamRelevant(event_stream_summary))
+
+    test_constraints = event_constraints.EventConstraints(
+        parsers=[u'filestat'])
+    self.assertFalse(test_constraints.IsStreamRelevant(event_stream_summary))
+
+    test_constraints = event_constraints.EventConstraints(
+        time_range=time_range.TimeRange(150, 300))
+    self.assertTrue(test_constraints.IsStreamRelevant(event_stream_summary))
+
+    test_constraints = event_constraints.EventConstraints(
+        time_range=time_range.TimeRange(300, 400))
+    self.assertFalse(test_constraints.IsStreamRelevant(event_stream_summary))
+
+  def testMatchesSerializedEvent(self):
+    """Tests the MatchesSerializedEvent function."""
+    event_data = self._CreateSerializedEvent(
+        u'syslog:line', u'/var/log/syslog', u'syslog')
+
+    test_constraints = event_constraints.EventConstraints()
+    self.assertTrue(test_constraints.MatchesSerializedEvent(event_data))
+
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'fs:stat', u'syslog:line'])
+    self.assertTrue(test_constraints.MatchesSerializedEvent(event_data))
+
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog'])
+    self.assertFalse(test_constraints.MatchesSerializedEvent(event_data))
+
+    test_constraints = event_constraints.EventConstraints(
+        parsers=[u'syslog'])
+    self.assertTrue(test_constraints.MatchesSerializedEvent(event_data))
+
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line'], parsers=[u'filestat'])
+    self.assertFalse(test_constraints.MatchesSerializedEvent(event_data))
+
+    test_constraints = event_constraints.EventConstraints(
+        filename_prefix=u'/var/log/')
+    self.assertTrue(test_constraints.MatchesSerializedEvent(event_data))
+
+    test_constraints = event_constraints.EventConstraints(
+        filename_prefix=u'/log')
+    self.assertFalse(test_constraints.MatchesSerializedEvent(event_data))
+
+    event_data = self._CreateSerializedEvent(
+        u'syslog:line', u'/var/log/s\xfdslog', u'syslog')
+
+    test_constraints = event_constraints.EventConstraints(
+        filename_prefix=u'/var/log/s\xfd')
+    self.assertTrue(test_constraints.MatchesSerializedEvent(event_data))
+
+  def testUnion(self):
+    """Tests the Union function."""
+    test_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line'], filename_prefix=u'/var/log/syslog',
+        parsers=[u'syslog'], time_range=time_range.TimeRange(0, 10))
+    other_constraints = event_constraints.EventConstraints(
+        data_types=[u'fs:stat'], filename_prefix=u'/var/lib',
+        time_range=time_range.TimeRange(5, 20))
+
+    combined_constraints = test_constraints.Union(other_constraints)
+    self.assertEqual(
+        combined_constraints.data_types,
+        frozenset([u'fs:stat', u'syslog:line']))
+    self.assertEqual(combined_constraints.filename_prefix, u'/var/l')
+    self.assertIsNone(combined_constraints.parsers)
+    self.assertEqual(combined_constraints.time_range.start_timestamp, 0)
+    self.assertEqual(combined_constraints.time_range.end_timestamp, 20)
+
+    other_constraints = event_constraints.EventConstraints(
+        data_types=[u'fs:stat'])
+
+    combined_constraints = test_constraints.Union(other_constraints)
+    self.assertIsNone(combined_constraints.filename_prefix)
+    self.assertIsNone(combined_constraints.time_range)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -6,6 +6,9 @@ import os
 import unittest
 import zipfile
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import reports
@@ -16,6 +19,8 @@ from plaso.formatters import mediator as formatters_mediator
 from plaso.lib import definitions
 from plaso.lib import timelib
 from plaso.formatters import winreg   # pylint: disable=unused-import
+from plaso.storage import event_constraints
+from plaso.storage import gzip_file
 from plaso.storage import identifiers
 from plaso.storage import time_range
 from plaso.storage import zip_file
@@ -209,6 +214,35 @@ class SerializedDataTimestampTableTest(test_lib.StorageTestCase):
 
   # pylint: disable=protected-access
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEntryIndexOfTimestamp(self):
+    """Tests the GetEntryIndexOfTimestamp function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+    zip_file_object = zipfile.ZipFile(
+        test_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    stream_name = u'event_timestamps.000002'
+    timestamp_table = zip_file._SerializedDataTimestampTable(
+        zip_file_object, stream_name)
+    timestamp_table.Read()
+
+    self.assertEqual(timestamp_table.number_of_timestamps, 19)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(0)
+    self.assertEqual(entry_index, 0)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1327218841000000)
+    self.assertEqual(entry_index, 3)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1327218841000001)
+    self.assertEqual(entry_index, 5)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1491238788000000)
+    self.assertEqual(entry_index, 18)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1491238788000001)
+    self.assertEqual(entry_index, 19)
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   def testGetTimestamp(self):
     """Tests the GetTimestamp function."""
@@ -270,6 +304,66 @@ class SerializedDataTimestampTableTest(test_lib.StorageTestCase):
       timestamp_table.Write()
 
 
+class EventStreamSummaryTest(test_lib.StorageTestCase):
+  """Tests for the event stream summary."""
+
+  def testAddTimestamp(self):
+    """Tests the AddTimestamp function."""
+    event_stream_summary = zip_file.EventStreamSummary(1)
+    event_stream_summary.AddTimestamp(1327218753000000)
+    event_stream_summary.AddTimestamp(1491238788000000)
+
+    self.assertEqual(event_stream_summary.first_timestamp, 1327218753000000)
+    self.assertEqual(event_stream_summary.last_timestamp, 1491238788000000)
+    self.assertEqual(event_stream_summary.number_of_events, 2)
+
+  def testIsInTimeRange(self):
+    """Tests the IsInTimeRange function."""
+    event_stream_summary = zip_file.EventStreamSummary(1)
+
+    test_time_range = time_range.TimeRange(1327218753000000, 1327218753000000)
+    self.assertFalse(event_stream_summary.IsInTimeRange(test_time_range))
+
+    event_stream_summary.AddTimestamp(1327218753000000)
+    event_stream_summary.AddTimestamp(1491238788000000)
+
+    self.assertTrue(event_stream_summary.IsInTimeRange(test_time_range))
+
+    test_time_range = time_range.TimeRange(1400000000000000, 1500000000000000)
+    self.assertTrue(event_stream_summary.IsInTimeRange(test_time_range))
+
+    test_time_range = time_range.TimeRange(0, 1327218752999999)
+    self.assertFalse(event_stream_summary.IsInTimeRange(test_time_range))
+
+    test_time_range = time_range.TimeRange(1491238788000001, 1500000000000000)
+    self.assertFalse(event_stream_summary.IsInTimeRange(test_time_range))
+
+  def testReadAndWrite(self):
+    """Tests the Read and Write functions."""
+    event_stream_summary = zip_file.EventStreamSummary(1)
+    event_stream_summary.data_types = set([u'fs:stat', u'windows:registry'])
+    event_stream_summary.parsers = set([u'filestat', u'winreg'])
+    event_stream_summary.AddTimestamp(1327218753000000)
+    event_stream_summary.AddTimestamp(1491238788000000)
+
+    stream_data = event_stream_summary.Write()
+
+    event_stream_summary = zip_file.EventStreamSummary(1)
+    event_stream_summary.Read(stream_data)
+
+    self.assertEqual(
+        event_stream_summary.data_types,
+        set([u'fs:stat', u'windows:registry']))
+    self.assertEqual(event_stream_summary.first_timestamp, 1327218753000000)
+    self.assertEqual(event_stream_summary.last_timestamp, 1491238788000000)
+    self.assertEqual(event_stream_summary.number_of_events, 2)
+    self.assertEqual(
+        event_stream_summary.parsers, set([u'filestat', u'winreg']))
+
+    with self.assertRaises(IOError):
+      event_stream_summary.Read(b'bogus')
+
+
 class StorageMetadataReaderTest(test_lib.StorageTestCase):
   """Tests for the storage metadata reader."""
 
@@ -913,6 +1007,19 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      event_stream_summary = storage_file._GetEventStreamSummary(1)
+      self.assertIsNotNone(event_stream_summary)
+      self.assertEqual(event_stream_summary.number_of_events, 4)
+      self.assertEqual(
+          event_stream_summary.data_types,
+          set([u'text:entry', u'windows:registry:key_value']))
+      self.assertEqual(event_stream_summary.parsers, set([u'UNKNOWN']))
+
+      storage_file.Close()
+
   def testWriteSerializedEventSources(self):
     """Tests the _WriteSerializedEventSources function."""
     event_source = event_sources.EventSource()
@@ -1031,6 +1138,66 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
     # TODO: add test for exceeding buffer limit in AddEvent.
 
+  def testAddEventWithPathSpec(self):
+    """Tests the AddEvent function with events that have a path spec."""
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/cases/image.raw')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15,
+        location=u'/Windows/System32/config/SYSTEM', parent=os_path_spec)
+
+    test_events = self._CreateTestEvents()
+    for event in test_events[:3]:
+      # Each event has its own path spec object as if deserialized.
+      event.pathspec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15,
+          location=u'/Windows/System32/config/SYSTEM', parent=os_path_spec)
+
+    for serialization_format in sorted(definitions.SERIALIZER_FORMATS):
+      with shared_test_lib.TempDirectory() as temp_directory:
+        temp_file = os.path.join(temp_directory, u'storage.plaso')
+        storage_file = zip_file.ZIPStorageFile(
+            serialization_format=serialization_format)
+        storage_file.Open(path=temp_file, read_only=False)
+
+        for event in test_events:
+          storage_file.AddEvent(event)
+
+          # Make sure the event is not changed by adding it.
+          self.assertFalse(hasattr(event, u'path_spec_stream_number'))
+          self.assertFalse(hasattr(event, u'path_spec_entry_index'))
+
+        self.assertEqual(test_events[0].pathspec, path_spec)
+
+        storage_file.Close()
+
+        storage_file = zip_file.ZIPStorageFile()
+        storage_file.Open(path=temp_file)
+
+        # The path spec is stored only once.
+        offset_table = storage_file._GetSerializedPathSpecOffsetTable(1)
+        self.assertEqual(offset_table.number_of_offsets, 1)
+
+        stored_events = list(storage_file.GetEvents())
+        self.assertEqual(len(stored_events), 4)
+
+        stored_path_specs = [
+            event.pathspec for event in stored_events
+            if getattr(event, u'pathspec', None)]
+        self.assertEqual(len(stored_path_specs), 3)
+
+        for stored_event in stored_events:
+          self.assertFalse(hasattr(stored_event, u'path_spec_stream_number'))
+          self.assertFalse(hasattr(stored_event, u'path_spec_entry_index'))
+
+        for stored_path_spec in stored_path_specs:
+          self.assertEqual(stored_path_spec.comparable, path_spec.comparable)
+
+        # The decoded path spec is cached.
+        self.assertIs(stored_path_specs[0], stored_path_specs[1])
+
+        storage_file.Close()
+
   def testAddEventSource(self):
     """Tests the AddEventSource function."""
     event_source = event_sources.EventSource()
@@ -1150,6 +1317,122 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
     storage_file.Close()
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEventsInParallel(self):
+    """Tests the GetEventsInParallel function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file.Open(path=test_file)
+
+    expected_event_identifiers = []
+    for event in storage_file.GetEvents():
+      event_identifier = event.GetIdentifier()
+      expected_event_identifiers.append(event_identifier.CopyToString())
+
+    storage_file.Close()
+
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file._MERGE_BLOCK_SIZE = 3
+    storage_file.Open(path=test_file)
+
+    event_identifiers = []
+    event_tags = []
+    for event in storage_file.GetEventsInParallel(2):
+      event_identifier = event.GetIdentifier()
+      event_identifiers.append(event_identifier.CopyToString())
+      if event.tag:
+        event_tags.append(event.tag)
+
+    storage_file.Close()
+
+    self.assertEqual(len(event_identifiers), 38)
+    self.assertEqual(event_identifiers, expected_event_identifiers)
+    self.assertEqual(len(event_tags), 4)
+
+    # Test with a maximum number of pending blocks that is smaller than
+    # the number of streams.
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file._MAXIMUM_NUMBER_OF_PENDING_MERGE_BLOCKS = 1
+    storage_file._MERGE_BLOCK_SIZE = 3
+    storage_file.Open(path=test_file)
+
+    stream_numbers = storage_file._GetSerializedEventStreamNumbers()
+
+    event_identifiers = []
+    maximum_number_of_pending_merge_blocks = 0
+    for event in storage_file.GetEventsInParallel(2):
+      event_identifier = event.GetIdentifier()
+      event_identifiers.append(event_identifier.CopyToString())
+
+      maximum_number_of_pending_merge_blocks = max(
+          maximum_number_of_pending_merge_blocks,
+          storage_file._number_of_pending_merge_blocks)
+
+    storage_file.Close()
+
+    self.assertEqual(event_identifiers, expected_event_identifiers)
+    self.assertLessEqual(
+        maximum_number_of_pending_merge_blocks, len(stream_numbers))
+
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetUnsortedEvents(self):
+    """Tests the GetUnsortedEvents function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file.Open(path=test_file)
+
+    expected_event_identifiers = []
+    for event in storage_file.GetEvents():
+      event_identifier = event.GetIdentifier()
+      expected_event_identifiers.append(event_identifier.CopyToString())
+
+    storage_file.Close()
+
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file.Open(path=test_file)
+
+    event_identifiers = []
+    event_tags = []
+    for event in storage_file.GetUnsortedEvents():
+      event_identifier = event.GetIdentifier()
+      event_identifiers.append(event_identifier.CopyToString())
+      if event.tag:
+        event_tags.append(event.tag)
+
+    storage_file.Close()
+
+    self.assertEqual(len(event_identifiers), 38)
+    self.assertEqual(
+        sorted(event_identifiers), sorted(expected_event_identifiers))
+    self.assertEqual(len(event_tags), 4)
+
+  def testGetEventStreamSummaries(self):
+    """Tests the GetEventStreamSummaries function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      event_stream_summaries = list(storage_file.GetEventStreamSummaries())
+      self.assertEqual(len(event_stream_summaries), 1)
+
+      event_stream_summary = event_stream_summaries[0]
+      self.assertEqual(event_stream_summary.stream_number, 1)
+      self.assertEqual(event_stream_summary.first_timestamp, 1238934459000000)
+      self.assertEqual(event_stream_summary.last_timestamp, 1334966206929596)
+
+      storage_file.Close()
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   def testGetEventSourceByIndex(self):
     """Tests the GetEventSourceByIndex function."""
@@ -1379,6 +1662,112 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
       storage_file.Open(path=temp_file)
       storage_file.Close()
 
+  def testPreMergeTaskStorages(self):
+    """Tests the PreMergeTaskStorages function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, u'task.plaso')
+      task_storage_file = gzip_file.GZIPStorageFile()
+      task_storage_file.Open(path=task_storage_path, read_only=False)
+
+      for event in test_events:
+        task_storage_file.AddEvent(event)
+
+      task_storage_file.Close()
+
+      # The buffers are written when they exceed the maximum buffer size.
+      temp_file = os.path.join(temp_directory, u'pre_merged.plaso')
+      storage_file = zip_file.ZIPStorageFile(
+          maximum_buffer_size=1, storage_type=definitions.STORAGE_TYPE_TASK)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      parsers_counter = storage_file.PreMergeTaskStorages(
+          [task_storage_path], [5, 6, 7, 8], [5, 6, 7, 8])
+
+      self.assertEqual(
+          storage_file._GetSerializedEventStreamNumbers(), [5, 6, 7, 8])
+
+      storage_file.Close()
+
+      self.assertEqual(parsers_counter[u'total'], 4)
+
+      temp_file = os.path.join(temp_directory, u'too_many_streams.plaso')
+      storage_file = zip_file.ZIPStorageFile(
+          maximum_buffer_size=1, storage_type=definitions.STORAGE_TYPE_TASK)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      with self.assertRaises(IOError):
+        storage_file.PreMergeTaskStorages([task_storage_path], [5, 6], [5, 6])
+
+      storage_file.Close()
+
+  def testReservePreMergeStreamNumbers(self):
+    """Tests the ReservePreMergeStreamNumbers function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      storage_file.AddEvent(test_events[0])
+
+      stream_numbers = storage_file.ReservePreMergeStreamNumbers(1)
+      self.assertEqual(stream_numbers, ([2], [2]))
+
+      stream_numbers = storage_file.ReservePreMergeStreamNumbers(2)
+      self.assertEqual(stream_numbers, ([3, 4], [3, 4]))
+
+      # The buffered events are not written by the reservation.
+      self.assertEqual(storage_file._event_stream_number, 1)
+      self.assertFalse(storage_file._HasStream(u'event_data.000001'))
+
+      storage_file._WriteSerializedEvents()
+      self.assertTrue(storage_file._HasStream(u'event_data.000001'))
+      self.assertEqual(storage_file._event_stream_number, 5)
+
+      storage_file.AddEvent(test_events[1])
+      storage_file._WriteSerializedEvents()
+      self.assertTrue(storage_file._HasStream(u'event_data.000005'))
+      self.assertFalse(storage_file._HasStream(u'event_data.000002'))
+
+      storage_file.Close()
+
+  def testSerializationFormat(self):
+    """Tests reading and writing with the binary serialization format."""
+    with self.assertRaises(ValueError):
+      zip_file.ZIPStorageFile(serialization_format=u'bogus')
+
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile(
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertEqual(
+          storage_file.serialization_format,
+          definitions.SERIALIZER_FORMAT_BINARY)
+
+      stored_events = list(storage_file.GetEvents())
+      self.assertEqual(len(stored_events), len(test_events))
+
+      expected_timestamps = sorted(event.timestamp for event in test_events)
+      timestamps = [event.timestamp for event in stored_events]
+      self.assertEqual(timestamps, expected_timestamps)
+
+      storage_file.Close()
+
   def testWriteSessionStartAndCompletion(self):
     """Tests the WriteSessionStart and WriteSessionCompletion functions."""
     session = sessions.Session()
@@ -1504,6 +1893,84 @@ class ZIPStorageFileReaderTest(test_lib.StorageTestCase):
 
     self.assertEqual(sorted(timestamps), expected_timestamps)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEventsWithEventConstraints(self):
+    """Tests the GetEvents function with event constraints."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    test_event_constraints = event_constraints.EventConstraints(
+        data_types=[u'syslog:line'])
+
+    data_types = set()
+    with zip_file.ZIPStorageFileReader(
+        test_file, number_of_merge_workers=1) as storage_reader:
+      for event in storage_reader.GetEvents(
+          event_constraints=test_event_constraints):
+        data_types.add(event.data_type)
+
+    self.assertEqual(data_types, set([u'syslog:line']))
+
+    test_event_constraints = event_constraints.EventConstraints(
+        data_types=[u'bogus:data_type'])
+
+    with zip_file.ZIPStorageFileReader(
+        test_file, number_of_merge_workers=1) as storage_reader:
+      events = list(storage_reader.GetEvents(
+          event_constraints=test_event_constraints))
+
+    self.assertEqual(events, [])
+
+    test_time_range = time_range.TimeRange(
+        timelib.Timestamp.CopyFromString(u'2000-01-01 00:00:00'),
+        timelib.Timestamp.CopyFromString(u'2030-12-31 23:59:59'))
+    test_event_constraints = event_constraints.EventConstraints(
+        time_range=time_range.TimeRange(
+            timelib.Timestamp.CopyFromString(u'2012-04-30 06:41:49'),
+            timelib.Timestamp.CopyFromString(u'2030-12-31 23:59:59')))
+
+    with zip_file.ZIPStorageFileReader(
+        test_file, number_of_merge_workers=2) as storage_reader:
+      timestamps = [
+          event.timestamp for event in storage_reader.GetEvents(
+              time_range=test_time_range,
+              event_constraints=test_event_constraints)]
+
+    self.assertEqual(timestamps, self._EXPECTED_TIMESTAMPS_AFTER_20120430)
+
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEventsWithMergeWorkers(self):
+    """Tests the GetEvents function with merge worker processes."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    test_time_range = time_range.TimeRange(
+        timelib.Timestamp.CopyFromString(u'2012-04-30 06:41:49'),
+        timelib.Timestamp.CopyFromString(u'2030-12-31 23:59:59'))
+
+    timestamps = []
+    with zip_file.ZIPStorageFileReader(
+        test_file, number_of_merge_workers=2) as storage_reader:
+      for event in storage_reader.GetEvents(time_range=test_time_range):
+        timestamps.append(event.timestamp)
+
+    self.assertEqual(timestamps, self._EXPECTED_TIMESTAMPS_AFTER_20120430)
+
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetUnsortedEvents(self):
+    """Tests the GetUnsortedEvents function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    timestamps = []
+    with zip_file.ZIPStorageFileReader(test_file) as storage_reader:
+      for event in storage_reader.GetUnsortedEvents():
+        timestamps.append(event.timestamp)
+
+    expected_timestamps = []
+    expected_timestamps.extend(self._EXPECTED_TIMESTAMPS_BEFORE_20120430)
+    expected_timestamps.extend(self._EXPECTED_TIMESTAMPS_AFTER_20120430)
+
+    self.assertEqual(len(timestamps), 38)
+    self.assertEqual(sorted(timestamps), expected_timestamps)
+
   # TODO: add test for GetEventSources.
 
 
@@ -1772,6 +2239,102 @@ class ZIPStorageFileWriterTest(test_lib.StorageTestCase):
 
       session_storage_writer.Close()
 
+  def testStartMergeTaskStorageWithPreMerge(self):
+    """Tests the StartMergeTaskStorage functions with a merge process."""
+    session = sessions.Session()
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      session_storage_writer = zip_file.ZIPStorageFileWriter(session, temp_file)
+      session_storage_writer.Open()
+
+      session_storage_writer.WriteSessionStart()
+
+      session_storage_writer.StartTaskStorage(number_of_merge_processes=1)
+
+      task = tasks.Task(session_identifier=session.identifier)
+      task_storage_writer = session_storage_writer.CreateTaskStorage(task)
+      task_storage_writer.Open()
+      task_storage_writer.WriteTaskStart()
+
+      for event in test_events:
+        task_storage_writer.AddEvent(event)
+
+      task_storage_writer.WriteTaskCompletion()
+      task_storage_writer.Close()
+
+      session_storage_writer.PrepareMergeTaskStorage(task)
+
+      storage_merge_reader = session_storage_writer.StartMergeTaskStorage(task)
+      self.assertIsInstance(
+          storage_merge_reader, zip_file.ZIPStoragePreMergeReader)
+
+      fully_merged = False
+      while not fully_merged:
+        fully_merged = storage_merge_reader.MergeAttributeContainers()
+
+      self.assertTrue(storage_merge_reader.is_pre_merged)
+      self.assertEqual(session_storage_writer.number_of_events, 4)
+
+      session_storage_writer.StopTaskStorage()
+
+      session_storage_writer.WriteSessionCompletion()
+
+      session_storage_writer.Close()
+
+
+  def testStartMergeTaskStorages(self):
+    """Tests the StartMergeTaskStorages function."""
+    session = sessions.Session()
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      session_storage_writer = zip_file.ZIPStorageFileWriter(session, temp_file)
+      session_storage_writer.Open()
+
+      session_storage_writer.WriteSessionStart()
+
+      session_storage_writer.StartTaskStorage(number_of_merge_processes=1)
+
+      merge_tasks = []
+      for _ in range(2):
+        task = tasks.Task(session_identifier=session.identifier)
+        task_storage_writer = session_storage_writer.CreateTaskStorage(task)
+        task_storage_writer.Open()
+        task_storage_writer.WriteTaskStart()
+
+        for event in test_events:
+          task_storage_writer.AddEvent(event)
+
+        task_storage_writer.WriteTaskCompletion()
+        task_storage_writer.Close()
+
+        session_storage_writer.PrepareMergeTaskStorage(task)
+        merge_tasks.append(task)
+
+      storage_merge_readers = session_storage_writer.StartMergeTaskStorages(
+          merge_tasks)
+      self.assertEqual(len(storage_merge_readers), 1)
+
+      merged_tasks, storage_merge_reader = storage_merge_readers[0]
+      self.assertEqual(merged_tasks, merge_tasks)
+      self.assertIsInstance(
+          storage_merge_reader, zip_file.ZIPStoragePreMergeReader)
+
+      fully_merged = False
+      while not fully_merged:
+        fully_merged = storage_merge_reader.MergeAttributeContainers()
+
+      self.assertTrue(storage_merge_reader.is_pre_merged)
+      self.assertEqual(session_storage_writer.number_of_events, 8)
+
+      session_storage_writer.StopTaskStorage()
+
+      session_storage_writer.WriteSessionCompletion()
+
+      session_storage_writer.Close()
 
 if __name__ == '__main__':
   unittest.main()
@@ -74,15 +74,20 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         input_reader=input_reader, output_writer=output_writer)
     self._command_line_arguments = None
     self._enable_sigsegv_handler = False
+    self._event_cache_maximum_size = None
+    self._event_cache_path = None
     self._filter_expression = None
     self._front_end = log2timeline.Log2TimelineFrontend()
+    self._group_tasks_by_parent = False
     self._number_of_extraction_workers = 0
+    self._number_of_merge_workers = 0
     self._output = None
     self._source_type = None
     self._source_type_string = u'UNKNOWN'
     self._status_view_mode = u'linear'
     self._stdout_output_writer = isinstance(
         self._output_writer, cli_tools.StdoutOutputWriter)
+    self._task_batch_size = 1
     self._temporary_directory = None
     self._text_prepend = None
     self._worker_memory_limit = None
@@ -178,8 +183,17 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
           u'No such temporary directory: {0:s}'.format(
               self._temporary_directory))
 
+    self._event_cache_path = getattr(options, u'event_cache', None)
+    self._event_cache_maximum_size = getattr(options, u'event_cache_size', None)
+    if self._event_cache_maximum_size:
+      self._event_cache_maximum_size *= self._BYTES_IN_A_MIB
+
     self._worker_memory_limit = getattr(options, u'worker_memory_limit', None)
     self._number_of_extraction_workers = getattr(options, u'workers', 0)
+    self._number_of_merge_workers = getattr(options, u'merge_workers', 0)
+    self._task_batch_size = getattr(options, u'task_batch_size', 1)
+    self._group_tasks_by_parent = getattr(
+        options, u'group_tasks_by_parent', False)
 
     # TODO: add code to parse the worker options.
 
@@ -218,11 +232,44 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
             u'Disable queueing using ZeroMQ. A Multiprocessing queue will be '
             u'used instead.'))
 
+    argument_group.add_argument(
+        u'--event_cache', u'--event-cache', dest=u'event_cache', type=str,
+        action=u'store', metavar=u'FILE', help=(
+            u'Path of a file to cache the events extracted from file content '
+            u'in, so that files with the same content are not parsed again '
+            u'in subsequent runs.'))
+
+    argument_group.add_argument(
+        u'--event_cache_size', u'--event-cache-size', dest=u'event_cache_size',
+        action=u'store', type=int, metavar=u'MIB', help=(
+            u'Maximum size of the events stored in the event cache in MiB '
+            u'[defaults to 1024].'))
+
+    argument_group.add_argument(
+        u'--group_tasks_by_parent', u'--group-tasks-by-parent',
+        dest=u'group_tasks_by_parent', action=u'store_true', default=False,
+        help=(
+            u'Schedule the tasks of files that are stored on the same parent, '
+            u'such as a volume shadow snapshot or partition, consecutively.'))
+
+    argument_group.add_argument(
+        u'--merge_workers', u'--merge-workers', dest=u'merge_workers',
+        action=u'store', type=int, default=0, metavar=u'WORKERS', help=(
+            u'The number of worker processes that pre-merge the results of '
+            u'the extraction worker processes [defaults to 0, which disables '
+            u'pre-merging].'))
+
     argument_group.add_argument(
         u'--single_process', u'--single-process', dest=u'single_process',
         action=u'store_true', default=False, help=(
             u'Indicate that the tool should run in a single process.'))
 
+    argument_group.add_argument(
+        u'--task_batch_size', u'--task-batch-size', dest=u'task_batch_size',
+        action=u'store', type=int, default=1, metavar=u'FILES', help=(
+            u'The maximum number of small files that are processed as part '
+            u'of a single task [defaults to 1, which disables batching].'))
+
     argument_group.add_argument(
         u'--temporary_directory', u'--temporary-directory',
         dest=u'temporary_directory', type=str, action=u'store',
@@ -368,6 +415,7 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     output_group = argument_parser.add_argument_group(u'Output Arguments')
 
     self.AddOutputOptions(output_group)
+    self.AddStorageOptions(output_group)
 
     processing_group = argument_parser.add_argument_group(
         u'Processing Arguments')
@@ -541,7 +589,9 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         preferred_time_zone=self._preferred_time_zone,
         preferred_year=self._preferred_year)
 
-    storage_writer = self._front_end.CreateStorageWriter(session, self._output)
+    storage_writer = self._front_end.CreateStorageWriter(
+        session, self._output,
+        serialization_format=self._storage_serializer_format)
     # TODO: handle errors.BadConfigOption
 
     # TODO: pass preferred_encoding.
@@ -550,6 +600,9 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     configuration.debug_output = self._debug_mode
     configuration.event_extraction.filter_object = self._filter_object
     configuration.event_extraction.text_prepend = self._text_prepend
+    configuration.extraction.event_cache_maximum_size = (
+        self._event_cache_maximum_size)
+    configuration.extraction.event_cache_path = self._event_cache_path
     configuration.extraction.hasher_names_string = self._hasher_names_string
     configuration.extraction.process_archives = self._process_archives
     configuration.extraction.process_compressed_streams = (
@@ -570,9 +623,12 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         session, storage_writer, self._source_path_specs, self._source_type,
         configuration, enable_sigsegv_handler=self._enable_sigsegv_handler,
         force_preprocessing=self._force_preprocessing,
+        group_tasks_by_parent=self._group_tasks_by_parent,
         number_of_extraction_workers=self._number_of_extraction_workers,
+        number_of_merge_workers=self._number_of_merge_workers,
         single_process_mode=self._single_process_mode,
         status_update_callback=status_update_callback,
+        task_batch_size=self._task_batch_size,
         worker_memory_limit=self._worker_memory_limit)
 
     if not processing_status:
@@ -21,7 +21,13 @@ class Log2TimelineToolTest(cli_test_lib.CLIToolTestCase):
   _BDE_PASSWORD = u'bde-TEST'
 
   _EXPECTED_PROCESSING_OPTIONS = u'\n'.join([
-      u'usage: log2timeline_test.py [--disable_zeromq] [--single_process]',
+      (u'usage: log2timeline_test.py [--disable_zeromq] '
+       u'[--event_cache FILE]'),
+      (u'                            [--event_cache_size MIB] '
+       u'[--group_tasks_by_parent]'),
+      (u'                            [--merge_workers WORKERS] '
+       u'[--single_process]'),
+      u'                            [--task_batch_size FILES]',
       u'                            [--temporary_directory DIRECTORY]',
       (u'                            [--worker-memory-limit SIZE] '
        u'[--workers WORKERS]'),
@@ -33,9 +39,37 @@ class Log2TimelineToolTest(cli_test_lib.CLIToolTestCase):
       (u'                        Disable queueing using ZeroMQ. A '
        u'Multiprocessing queue'),
       u'                        will be used instead.',
+      u'  --event_cache FILE, --event-cache FILE',
+      (u'                        Path of a file to cache the events extracted '
+       u'from file'),
+      (u'                        content in, so that files with the same '
+       u'content are'),
+      u'                        not parsed again in subsequent runs.',
+      u'  --event_cache_size MIB, --event-cache-size MIB',
+      (u'                        Maximum size of the events stored in the '
+       u'event cache'),
+      u'                        in MiB [defaults to 1024].',
+      u'  --group_tasks_by_parent, --group-tasks-by-parent',
+      (u'                        Schedule the tasks of files that are stored '
+       u'on the'),
+      (u'                        same parent, such as a volume shadow '
+       u'snapshot or'),
+      u'                        partition, consecutively.',
+      u'  --merge_workers WORKERS, --merge-workers WORKERS',
+      (u'                        The number of worker processes that '
+       u'pre-merge the'),
+      (u'                        results of the extraction worker processes '
+       u'[defaults'),
+      u'                        to 0, which disables pre-merging].',
       u'  --single_process, --single-process',
       (u'                        Indicate that the tool should run in a '
        u'single process.'),
+      u'  --task_batch_size FILES, --task-batch-size FILES',
+      (u'                        The maximum number of small files that are '
+       u'processed'),
+      (u'                        as part of a single task [defaults to 1, '
+       u'which'),
+      u'                        disables batching].',
       u'  --temporary_directory DIRECTORY, --temporary-directory DIRECTORY',
       (u'                        Path to the directory that should be used to '
        u'store'),
@@ -268,6 +268,39 @@ class PinfoTool(analysis_tool.AnalysisTool):
 
     table_view.Write(self._output_writer)
 
+  def _PrintEventStreamSummaries(self, storage):
+    """Prints the event stream summaries.
+
+    Args:
+      storage (BaseStorage): storage.
+    """
+    for event_stream_summary in storage.GetEventStreamSummaries():
+      first_time = u'N/A'
+      if event_stream_summary.first_timestamp is not None:
+        first_time = timelib.Timestamp.CopyToIsoFormat(
+            event_stream_summary.first_timestamp)
+
+      last_time = u'N/A'
+      if event_stream_summary.last_timestamp is not None:
+        last_time = timelib.Timestamp.CopyToIsoFormat(
+            event_stream_summary.last_timestamp)
+
+      data_types = u', '.join(sorted(event_stream_summary.data_types))
+      parsers = u', '.join(sorted(event_stream_summary.parsers))
+
+      title = u'Event stream: {0:d}'.format(event_stream_summary.stream_number)
+      table_view = cli_views.ViewsFactory.GetTableView(
+          self._views_format_type, title=title)
+
+      table_view.AddRow([
+          u'Number of events', event_stream_summary.number_of_events])
+      table_view.AddRow([u'First time', first_time])
+      table_view.AddRow([u'Last time', last_time])
+      table_view.AddRow([u'Data types', data_types or u'N/A'])
+      table_view.AddRow([u'Parsers', parsers or u'N/A'])
+
+      table_view.Write(self._output_writer)
+
   def _PrintPreprocessingInformation(self, storage, session_number=None):
     """Prints the details of the preprocessing information.
 
@@ -438,6 +471,9 @@ class PinfoTool(analysis_tool.AnalysisTool):
       else:
         self._PrintEventLabelsCounter(storage_counters[u'event_labels'])
 
+      if self._verbose:
+        self._PrintEventStreamSummaries(storage)
+
       self._PrintErrorsDetails(storage)
       self._PrintAnalysisReportsDetails(storage)
 
@@ -257,6 +257,24 @@ class PsortTool(analysis_tool.AnalysisTool):
     use_zeromq = getattr(options, u'use_zeromq', True)
     self._front_end.SetUseZeroMQ(use_zeromq)
 
+    direct_storage_access = getattr(options, u'direct_storage_access', False)
+    self._front_end.SetDirectStorageAccess(direct_storage_access)
+
+    event_batch_size = getattr(options, u'event_batch_size', None)
+    if event_batch_size is not None and event_batch_size < 1:
+      raise errors.BadConfigOption(
+          u'Invalid event batch size: {0:d}.'.format(event_batch_size))
+
+    self._front_end.SetEventBatchSize(event_batch_size)
+
+    number_of_merge_workers = getattr(options, u'merge_workers', 1)
+    if number_of_merge_workers is None or number_of_merge_workers < 0:
+      raise errors.BadConfigOption(
+          u'Invalid number of merge workers: {0!s}.'.format(
+              number_of_merge_workers))
+
+    self._front_end.SetNumberOfMergeWorkers(number_of_merge_workers)
+
     self._temporary_directory = getattr(options, u'temporary_directory', None)
     if (self._temporary_directory and
         not os.path.isdir(self._temporary_directory)):
@@ -460,6 +478,29 @@ class PsortTool(analysis_tool.AnalysisTool):
             u'Disable queueing using ZeroMQ. A Multiprocessing queue will be '
             u'used instead.'))
 
+    argument_group.add_argument(
+        u'--direct_storage_access', u'--direct-storage-access',
+        dest=u'direct_storage_access', action=u'store_true', default=False,
+        help=(
+            u'Let the analysis plugins read the events from the storage file '
+            u'instead of passing the events to them. Analysis plugins that do '
+            u'not depend on the order of the events read the events in the '
+            u'order they were stored.'))
+
+    argument_group.add_argument(
+        u'--event_batch_size', u'--event-batch-size', dest=u'event_batch_size',
+        action=u'store', type=int, default=None, metavar=u'NUMBER', help=(
+            u'The maximum number of events that are passed to the analysis '
+            u'plugins as a single batch [defaults to 256].'))
+
+    argument_group.add_argument(
+        u'--merge_workers', u'--merge-workers', dest=u'merge_workers',
+        action=u'store', type=int, default=1, metavar=u'NUMBER', help=(
+            u'The number of worker processes used to deserialize events '
+            u'while sorting them for output, where 0 represents the number '
+            u'of available system CPUs minus one [defaults to 1, which '
+            u'represents that no worker processes should be used].'))
+
     argument_group.add_argument(
         u'--temporary_directory', u'--temporary-directory',
         dest=u'temporary_directory', type=str, action=u'store',
@@ -826,7 +867,8 @@ class PsortTool(analysis_tool.AnalysisTool):
 
       self._front_end.AnalyzeEvents(
           storage_writer, analysis_plugins, configuration,
-          status_update_callback=status_update_callback)
+          status_update_callback=status_update_callback,
+          storage_file_path=self._storage_file_path)
 
     counter = collections.Counter()
     if self._output_format != u'null':
@@ -242,16 +242,44 @@ class PsortToolTest(cli_test_lib.CLIToolTestCase):
 
   _EXPECTED_PROCESSING_OPTIONS = u'\n'.join([
       (u'usage: psort_test.py [--disable_zeromq] '
-       u'[--temporary_directory DIRECTORY]'),
+       u'[--direct_storage_access]'),
+      (u'                     [--event_batch_size NUMBER] '
+       u'[--merge_workers NUMBER]'),
+      u'                     [--temporary_directory DIRECTORY]',
       u'                     [--worker-memory-limit SIZE]',
       u'',
       u'Test argument parser.',
       u'',
       u'optional arguments:',
+      u'  --direct_storage_access, --direct-storage-access',
+      (u'                        Let the analysis plugins read the events '
+       u'from the'),
+      (u'                        storage file instead of passing the events '
+       u'to them.'),
+      (u'                        Analysis plugins that do not depend on the '
+       u'order of'),
+      (u'                        the events read the events in the order '
+       u'they were'),
+      u'                        stored.',
       u'  --disable_zeromq, --disable-zeromq',
       (u'                        Disable queueing using ZeroMQ. A '
        u'Multiprocessing queue'),
       u'                        will be used instead.',
+      u'  --event_batch_size NUMBER, --event-batch-size NUMBER',
+      (u'                        The maximum number of events that are passed '
+       u'to the'),
+      (u'                        analysis plugins as a single batch [defaults '
+       u'to 256].'),
+      u'  --merge_workers NUMBER, --merge-workers NUMBER',
+      (u'                        The number of worker processes used to '
+       u'deserialize'),
+      (u'                        events while sorting them for output, '
+       u'where 0'),
+      (u'                        represents the number of available system '
+       u'CPUs minus'),
+      (u'                        one [defaults to 1, which represents that no '
+       u'worker'),
+      u'                        processes should be used].',
       u'  --temporary_directory DIRECTORY, --temporary-directory DIRECTORY',
       (u'                        Path to the directory that should be used to '
        u'store'),
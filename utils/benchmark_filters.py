@@ -0,0 +1,171 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the throughput of the event filters."""
+
+from __future__ import print_function
+import argparse
+import sys
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+# The filters need to be imported before pfilter to prevent a circular import.
+from plaso import filters  # pylint: disable=unused-import
+from plaso.containers import events
+from plaso.formatters import interface as formatters_interface
+from plaso.formatters import manager as formatters_manager
+from plaso.lib import pfilter
+
+
+class BenchmarkEventFormatter(formatters_interface.ConditionalEventFormatter):
+  """Class that implements a formatter for synthetic events."""
+
+  DATA_TYPE = u'benchmark:event'
+
+  FORMAT_STRING_PIECES = [
+      u'Synthetic event: {text}',
+      u'Offset: {offset}',
+      u'File: {filename}']
+
+  FORMAT_STRING_SHORT_PIECES = [
+      u'Synthetic event: {text}']
+
+  SOURCE_LONG = u'Benchmark'
+  SOURCE_SHORT = u'LOG'
+
+
+FILTER_EXPRESSIONS = [
+    u'data_type is "benchmark:event"',
+    (u'date > "2017-01-01 01:00:00" and date < "2017-01-01 02:00:00" and '
+     u'parser is "benchmark_parser"'),
+    u'filename regexp "^/var/log/test1[0-9]\\.log$" or inode > 60',
+    (u'message contains "event: 5" or message contains "event: 7" or '
+     u'message contains "test3.log"'),
+    (u'parser inlist "webhist" or username is "root" or '
+     u'(hostname is "benchmark" and offset >= 1000 and offset < 2000)')]
+
+
+def CreateSyntheticEvents(number_of_events):
+  """Creates synthetic events.
+
+  Args:
+    number_of_events (int): number of events to create.
+
+  Returns:
+    list[EventObject]: events.
+  """
+  synthetic_events = []
+  for event_index in range(number_of_events):
+    event = events.EventObject()
+    event.data_type = u'benchmark:event'
+    event.filename = u'/var/log/test{0:d}.log'.format(event_index % 64)
+    event.hostname = u'benchmark'
+    event.inode = event_index % 64
+    event.offset = event_index
+    event.parser = u'benchmark_parser'
+    event.text = u'Synthetic event: {0:d}'.format(event_index)
+    event.timestamp = 1483228800000000 + (event_index * 1000000)
+    event.timestamp_desc = u'Modification Time'
+    event.username = u'benchmark'
+
+    synthetic_events.append(event)
+
+  return synthetic_events
+
+
+def MeasureFilter(matcher, synthetic_events, number_of_iterations):
+  """Measures matching events with a filter.
+
+  Args:
+    matcher (objectfilter.Filter): filter.
+    synthetic_events (list[EventObject]): events.
+    number_of_iterations (int): number of times to match the events.
+
+  Returns:
+    tuple: contains:
+
+      float: number of events matched per second of the fastest iteration.
+      int: number of events that matched the filter.
+  """
+  minimum_elapsed_time = None
+  for _ in range(number_of_iterations):
+    number_of_matches = 0
+
+    start_time = time.time()
+    for event in synthetic_events:
+      if matcher.Matches(event):
+        number_of_matches += 1
+
+    elapsed_time = time.time() - start_time
+    if minimum_elapsed_time is None or elapsed_time < minimum_elapsed_time:
+      minimum_elapsed_time = elapsed_time
+
+  return len(synthetic_events) / minimum_elapsed_time, number_of_matches
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput of the event filters interpreted and '
+      u'compiled into a closure.'))
+
+  argument_parser.add_argument(
+      u'--number_of_events', u'--number-of-events', dest=u'number_of_events',
+      type=int, action=u'store', default=10000, metavar=u'NUMBER', help=(
+          u'number of synthetic events to match per iteration.'))
+
+  argument_parser.add_argument(
+      u'--number_of_iterations', u'--number-of-iterations',
+      dest=u'number_of_iterations', type=int, action=u'store', default=3,
+      metavar=u'NUMBER', help=u'number of times to match the events.')
+
+  options = argument_parser.parse_args()
+
+  formatters_manager.FormattersManager.RegisterFormatter(
+      BenchmarkEventFormatter)
+
+  synthetic_events = CreateSyntheticEvents(options.number_of_events)
+
+  print(u'Matching {0:d} events {1:d} times.'.format(
+      len(synthetic_events), options.number_of_iterations))
+
+  result = True
+  filter_compiler = pfilter.PlasoFilterCompiler()
+  for filter_expression in FILTER_EXPRESSIONS:
+    parser = pfilter.BaseParser(filter_expression).Parse()
+    matcher = parser.Compile(pfilter.PlasoAttributeFilterImplementation)
+    compiled_matcher = filter_compiler.Compile(matcher)
+
+    interpreted_throughput, interpreted_matches = MeasureFilter(
+        matcher, synthetic_events, options.number_of_iterations)
+    compiled_throughput, compiled_matches = MeasureFilter(
+        compiled_matcher, synthetic_events, options.number_of_iterations)
+
+    print(u'')
+    print(filter_expression)
+    print(u'interpreted events/s\tcompiled events/s\tmatches')
+    print(u'{0:.1f}\t\t{1:.1f}\t({2:.2f}x)\t{3:d}'.format(
+        interpreted_throughput, compiled_throughput,
+        compiled_throughput / interpreted_throughput, compiled_matches))
+
+    if compiled_matches != interpreted_matches:
+      print(u'Number of matches differs: {0:d} interpreted.'.format(
+          interpreted_matches))
+      result = False
+
+  formatters_manager.FormattersManager.DeregisterFormatter(
+      BenchmarkEventFormatter)
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the throughput of the output modules."""
+
+from __future__ import print_function
+import argparse
+import sys
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import events
+from plaso.engine import knowledge_base
+from plaso.formatters import interface as formatters_interface
+from plaso.formatters import manager as formatters_manager
+from plaso.formatters import mediator as formatters_mediator
+from plaso.output import dynamic
+from plaso.output import l2t_csv
+from plaso.output import mediator
+from plaso.output import tln
+
+
+class BenchmarkEventFormatter(formatters_interface.ConditionalEventFormatter):
+  """Class that implements a formatter for synthetic events."""
+
+  DATA_TYPE = u'benchmark:event'
+
+  FORMAT_STRING_PIECES = [
+      u'Synthetic event: {text}',
+      u'Offset: {offset}',
+      u'File: {filename}']
+
+  FORMAT_STRING_SHORT_PIECES = [
+      u'Synthetic event: {text}']
+
+  SOURCE_LONG = u'Benchmark'
+  SOURCE_SHORT = u'LOG'
+
+
+class NullOutputWriter(object):
+  """Class that implements an output writer that discards the output."""
+
+  def Write(self, unused_string):
+    """Writes a string to the output.
+
+    Args:
+      string (str): output.
+    """
+    return
+
+
+class UncachedOutputMediator(mediator.OutputMediator):
+  """Class that implements an output mediator without the formatted event.
+
+  Every field is formatted separately, which corresponds to the behavior
+  of the output mediator before formatted views of events were shared.
+  """
+
+  def GetFormattedEvent(self, event):
+    """Retrieves the formatted view of an event.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      FormattedEvent: formatted view of the event.
+    """
+    return mediator.FormattedEvent(self, event)
+
+
+def CreateSyntheticEvents(number_of_events):
+  """Creates synthetic events.
+
+  Args:
+    number_of_events (int): number of events to create.
+
+  Returns:
+    list[EventObject]: events.
+  """
+  os_path_spec = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/cases/image.raw')
+
+  synthetic_events = []
+  for event_index in range(number_of_events):
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK,
+        inode=event_index % 64, location=u'/var/log/test{0:d}.log'.format(
+            event_index % 64), parent=os_path_spec)
+
+    event = events.EventObject()
+    event.data_type = u'benchmark:event'
+    event.display_name = u'TSK:{0:s}'.format(path_spec.location)
+    event.filename = path_spec.location
+    event.hostname = u'benchmark'
+    event.inode = path_spec.inode
+    event.offset = event_index
+    event.parser = u'benchmark_parser'
+    event.pathspec = path_spec
+    event.text = u'Synthetic event: {0:d}'.format(event_index)
+    event.timestamp = 1483228800000000 + (event_index * 1000000)
+    event.timestamp_desc = u'Modification Time'
+    event.username = u'benchmark'
+
+    synthetic_events.append(event)
+
+  return synthetic_events
+
+
+def CreateOutputModules(output_mediator):
+  """Creates the output modules to benchmark.
+
+  Args:
+    output_mediator (OutputMediator): output mediator.
+
+  Returns:
+    list[tuple[str, OutputModule]]: names and output modules.
+  """
+  dynamic_output_module = dynamic.DynamicOutputModule(output_mediator)
+
+  dynamic_all_fields_output_module = dynamic.DynamicOutputModule(
+      output_mediator)
+  dynamic_all_fields_output_module.SetFields([
+      u'date', u'time', u'timezone', u'macb', u'source', u'sourcetype',
+      u'type', u'user', u'host', u'message_short', u'message', u'filename',
+      u'inode', u'datetime', u'description', u'description_short',
+      u'source_long'])
+
+  return [
+      (u'dynamic', dynamic_output_module),
+      (u'dynamic (all fields)', dynamic_all_fields_output_module),
+      (u'l2tcsv', l2t_csv.L2TCSVOutputModule(output_mediator)),
+      (u'l2ttln', tln.L2TTLNOutputModule(output_mediator)),
+      (u'tln', tln.TLNOutputModule(output_mediator))]
+
+
+def MeasureOutputModule(output_module, synthetic_events, number_of_iterations):
+  """Measures writing events with an output module.
+
+  Args:
+    output_module (OutputModule): output module.
+    synthetic_events (list[EventObject]): events.
+    number_of_iterations (int): number of times to write the events.
+
+  Returns:
+    float: number of events written per second of the fastest iteration.
+  """
+  output_module.SetOutputWriter(NullOutputWriter())
+
+  minimum_elapsed_time = None
+  for _ in range(number_of_iterations):
+    start_time = time.time()
+    for event in synthetic_events:
+      output_module.WriteEvent(event)
+
+    elapsed_time = time.time() - start_time
+    if minimum_elapsed_time is None or elapsed_time < minimum_elapsed_time:
+      minimum_elapsed_time = elapsed_time
+
+  return len(synthetic_events) / minimum_elapsed_time
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput of the output modules with and without '
+      u'sharing the formatted view of an event between fields.'))
+
+  argument_parser.add_argument(
+      u'--number_of_events', u'--number-of-events', dest=u'number_of_events',
+      type=int, action=u'store', default=10000, metavar=u'NUMBER', help=(
+          u'number of synthetic events to output per iteration.'))
+
+  argument_parser.add_argument(
+      u'--number_of_iterations', u'--number-of-iterations',
+      dest=u'number_of_iterations', type=int, action=u'store', default=3,
+      metavar=u'NUMBER', help=u'number of times to output the events.')
+
+  options = argument_parser.parse_args()
+
+  formatters_manager.FormattersManager.RegisterFormatter(
+      BenchmarkEventFormatter)
+
+  synthetic_events = CreateSyntheticEvents(options.number_of_events)
+
+  knowledge_base_object = knowledge_base.KnowledgeBase()
+  formatter_mediator = formatters_mediator.FormatterMediator()
+
+  cached_output_mediator = mediator.OutputMediator(
+      knowledge_base_object, formatter_mediator)
+  uncached_output_mediator = UncachedOutputMediator(
+      knowledge_base_object, formatter_mediator)
+
+  print(u'Writing {0:d} events {1:d} times.'.format(
+      len(synthetic_events), options.number_of_iterations))
+  print(u'output module\t\tuncached events/s\tcached events/s')
+
+  cached_output_modules = CreateOutputModules(cached_output_mediator)
+  uncached_output_modules = CreateOutputModules(uncached_output_mediator)
+
+  for (name, cached_output_module), (_, uncached_output_module) in zip(
+      cached_output_modules, uncached_output_modules):
+    uncached_throughput = MeasureOutputModule(
+        uncached_output_module, synthetic_events,
+        options.number_of_iterations)
+    cached_throughput = MeasureOutputModule(
+        cached_output_module, synthetic_events, options.number_of_iterations)
+
+    print(u'{0:s}\t{1:.1f}\t\t{2:.1f}\t({3:.2f}x)'.format(
+        name.ljust(20), uncached_throughput, cached_throughput,
+        cached_throughput / uncached_throughput))
+
+  formatters_manager.FormattersManager.DeregisterFormatter(
+      BenchmarkEventFormatter)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
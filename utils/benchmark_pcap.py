@@ -0,0 +1,239 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the throughput and memory use of the PCAP parser."""
+
+from __future__ import print_function
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import socket
+import sys
+import tempfile
+import time
+
+import dpkt
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.containers import sessions
+from plaso.engine import knowledge_base
+from plaso.parsers import mediator as parsers_mediator
+from plaso.parsers import pcap
+from plaso.storage import fake_storage
+
+
+# The number of packets of a synthetic TCP connection, including the SYN
+# and FIN packets.
+_PACKETS_PER_CONNECTION = 8
+
+
+def WritePcap(file_object, number_of_packets):
+  """Writes a synthetic PCAP file.
+
+  The file contains short-lived TCP connections, with a HTTP request, that
+  are interleaved with DNS queries and that each start 10 milliseconds after
+  the previous one.
+
+  Args:
+    file_object (file): file-like object to write to.
+    number_of_packets (int): number of packets to write.
+
+  Returns:
+    int: number of packets written.
+  """
+  pcap_writer = dpkt.pcap.Writer(file_object)
+
+  source_ip_address = socket.inet_aton(u'192.168.0.2')
+  destination_ip_address = socket.inet_aton(u'10.0.0.1')
+  dns_server_ip_address = socket.inet_aton(u'192.168.0.1')
+
+  packet_number = 0
+  connection_index = 0
+  while packet_number < number_of_packets:
+    source_port = 1024 + (connection_index % 60000)
+    timestamp = 1374174700.0 + (connection_index * 0.01)
+
+    for packet_index in range(_PACKETS_PER_CONNECTION):
+      if packet_index == 0:
+        flags = dpkt.tcp.TH_SYN
+        data = b''
+      elif packet_index == _PACKETS_PER_CONNECTION - 1:
+        flags = dpkt.tcp.TH_FIN | dpkt.tcp.TH_ACK
+        data = b''
+      elif packet_index == 1:
+        flags = dpkt.tcp.TH_ACK | dpkt.tcp.TH_PUSH
+        data = (
+            b'GET /index{0:d}.html HTTP/1.1\r\nHost: example.com\r\n'
+            b'\r\n').format(connection_index)
+      else:
+        flags = dpkt.tcp.TH_ACK
+        data = b'\x00' * 1024
+
+      tcp_packet = dpkt.tcp.TCP(
+          sport=source_port, dport=80, flags=flags, data=data)
+      ip_packet = dpkt.ip.IP(
+          src=source_ip_address, dst=destination_ip_address,
+          p=dpkt.ip.IP_PROTO_TCP, data=tcp_packet)
+      ethernet_frame = dpkt.ethernet.Ethernet(
+          type=dpkt.ethernet.ETH_TYPE_IP, data=ip_packet)
+
+      pcap_writer.writepkt(
+          bytes(ethernet_frame), ts=timestamp + (packet_index * 0.001))
+      packet_number += 1
+
+    dns_packet = dpkt.dns.DNS(
+        id=connection_index % 65536, qd=[dpkt.dns.DNS.Q(name=u'example.com')])
+    udp_packet = dpkt.udp.UDP(
+        sport=1024 + (connection_index % 60000), dport=53,
+        data=bytes(dns_packet))
+    udp_packet.ulen = len(udp_packet)
+    ip_packet = dpkt.ip.IP(
+        src=source_ip_address, dst=dns_server_ip_address,
+        p=dpkt.ip.IP_PROTO_UDP, data=udp_packet)
+    ethernet_frame = dpkt.ethernet.Ethernet(
+        type=dpkt.ethernet.ETH_TYPE_IP, data=ip_packet)
+
+    pcap_writer.writepkt(bytes(ethernet_frame), ts=timestamp)
+    packet_number += 1
+
+    connection_index += 1
+
+  return packet_number
+
+
+def MeasureParser(path, streaming_mode):
+  """Measures parsing a PCAP file with the PCAP parser.
+
+  This function is run in a separate process, to measure the peak memory
+  use of the parser independently of other measurements.
+
+  Args:
+    path (str): path of the PCAP file.
+    streaming_mode (bool): True if the file should be parsed in streaming
+        mode.
+
+  Returns:
+    tuple: contains:
+
+      float: number of seconds it took to parse the file.
+      int: number of events produced.
+      int: peak resident set size in KiB before parsing the file.
+      int: peak resident set size in KiB after parsing the file.
+  """
+  session = sessions.Session()
+  storage_writer = fake_storage.FakeStorageWriter(session)
+  storage_writer.Open()
+
+  knowledge_base_object = knowledge_base.KnowledgeBase()
+  knowledge_base_object.SetTimeZone(u'UTC')
+
+  parser_mediator = parsers_mediator.ParserMediator(
+      storage_writer, knowledge_base_object)
+
+  path_spec = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location=path)
+  file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+  parser_mediator.SetFileEntry(file_entry)
+
+  parser_object = pcap.PcapParser()
+  if streaming_mode:
+    parser_object.STREAMING_MINIMUM_FILE_SIZE = 0
+  else:
+    parser_object.STREAMING_MINIMUM_FILE_SIZE = sys.maxsize
+
+  file_object = file_entry.GetFileObject()
+
+  # The events are counted instead of stored, since storing them would
+  # dominate the memory use.
+  number_of_events = []
+  storage_writer.AddEvent = lambda event: number_of_events.append(None)
+
+  initial_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+  start_time = time.time()
+  try:
+    parser_object.Parse(parser_mediator, file_object)
+  finally:
+    file_object.close()
+
+  elapsed_time = time.time() - start_time
+
+  peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+  return elapsed_time, len(number_of_events), initial_rss, peak_rss
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput and peak memory use of the PCAP parser '
+      u'with and without streaming mode.'))
+
+  argument_parser.add_argument(
+      u'--number_of_packets', u'--number-of-packets',
+      dest=u'number_of_packets', type=int, action=u'store', default=200000,
+      metavar=u'NUMBER', help=u'number of packets of the synthetic PCAP file.')
+
+  options = argument_parser.parse_args()
+
+  temporary_directory = tempfile.mkdtemp()
+
+  result = True
+  try:
+    path = os.path.join(temporary_directory, u'synthetic.pcap')
+    with open(path, 'wb') as file_object:
+      number_of_packets = WritePcap(file_object, options.number_of_packets)
+
+    print(u'Parsing {0:d} packets ({1:d} bytes).'.format(
+        number_of_packets, os.path.getsize(path)))
+    print(u'')
+    print(u'mode\t\tpackets/s\tpeak RSS increase (KiB)\tevents')
+
+    results = []
+    for streaming_mode in (False, True):
+      # A new process per measurement, to measure the peak memory use.
+      process_pool = multiprocessing.Pool(processes=1)
+      try:
+        elapsed_time, number_of_events, initial_rss, peak_rss = (
+            process_pool.apply(MeasureParser, (path, streaming_mode)))
+      finally:
+        process_pool.close()
+        process_pool.join()
+
+      results.append(number_of_events)
+
+      if streaming_mode:
+        mode = u'streaming'
+      else:
+        mode = u'default\t'
+
+      print(u'{0:s}\t{1:.1f}\t\t{2:d}\t\t\t{3:d}'.format(
+          mode, number_of_packets / elapsed_time, peak_rss - initial_rss,
+          number_of_events))
+
+    if results[0] != results[1]:
+      print(u'Number of events differs.')
+      result = False
+
+  finally:
+    shutil.rmtree(temporary_directory, True)
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
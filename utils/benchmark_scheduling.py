@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark task scheduling strategies by simulation.
+
+The simulation replays task timings, as recorded by the tasks profiler of
+the worker processes, on a number of simulated worker processes. Note that
+the simulation assumes that all tasks are known upfront.
+"""
+
+from __future__ import print_function
+import argparse
+import glob
+import heapq
+import os
+import random
+import sys
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from dfvfs.lib import definitions as dfvfs_definitions
+
+from plaso.containers import event_sources
+from plaso.multi_processing import task_engine
+
+
+class TaskTiming(object):
+  """Class that contains the timing of a task.
+
+  Attributes:
+    data_size (int): data size of the task, in bytes, or None if not known.
+    processing_time (float): time it took to process the task in seconds.
+  """
+
+  def __init__(self, data_size, processing_time):
+    """Initializes a task timing.
+
+    Args:
+      data_size (int): data size of the task, in bytes, or None if not known.
+      processing_time (float): time it took to process the task in seconds.
+    """
+    super(TaskTiming, self).__init__()
+    self.data_size = data_size
+    self.processing_time = processing_time
+
+
+def CreateSyntheticTaskTimings(number_of_tasks, seed=0):
+  """Creates synthetic task timings.
+
+  The data sizes follow a heavy-tailed distribution, with a small number of
+  very large files, and the processing time is proportional to the data size.
+
+  Args:
+    number_of_tasks (int): number of tasks.
+    seed (Optional[int]): seed of the random number generator.
+
+  Returns:
+    list[TaskTiming]: task timings.
+  """
+  random_generator = random.Random(seed)
+
+  task_timings = []
+  for _ in range(number_of_tasks):
+    data_size = int(random_generator.lognormvariate(10.0, 3.0))
+
+    # Assume 20 MiB/s of throughput and 5 ms of overhead per task.
+    processing_time = 0.005 + (float(data_size) / (20 * 1024 * 1024))
+
+    task_timings.append(TaskTiming(data_size, processing_time))
+
+  return task_timings
+
+
+def ReadTaskTimings(path):
+  """Reads task timings from sample files of the tasks profiler.
+
+  Args:
+    path (str): path of a sample file or a directory containing sample files.
+
+  Returns:
+    list[TaskTiming]: task timings.
+  """
+  if os.path.isdir(path):
+    paths = sorted(glob.glob(os.path.join(path, u'tasks-*.csv')))
+  else:
+    paths = [path]
+
+  task_timings = []
+  for sample_file in paths:
+    with open(sample_file, 'rb') as file_object:
+      # Skip the header.
+      file_object.readline()
+
+      for line in file_object:
+        values = line.decode(u'utf-8').rstrip().split(u'\t')
+        if len(values) != 4:
+          continue
+
+        data_size = None
+        if values[2] != u'None':
+          data_size = int(values[2], 10)
+
+        task_timings.append(TaskTiming(data_size, float(values[3])))
+
+  return task_timings
+
+
+def ScheduleInRecordedOrder(task_timings):
+  """Schedules task timings in the recorded order.
+
+  Args:
+    task_timings (list[TaskTiming]): task timings.
+
+  Returns:
+    list[TaskTiming]: task timings in order of scheduling.
+  """
+  return list(task_timings)
+
+
+def ScheduleWithEventSourceHeap(task_timings):
+  """Schedules task timings with the event source heap of the task engine.
+
+  Args:
+    task_timings (list[TaskTiming]): task timings.
+
+  Returns:
+    list[TaskTiming]: task timings in order of scheduling.
+  """
+  # pylint: disable=protected-access
+  event_source_heap = task_engine._EventSourceHeap(
+      maximum_number_of_items=len(task_timings) + 1)
+
+  for task_timing in task_timings:
+    event_source = event_sources.FileEntryEventSource()
+    event_source.data_size = task_timing.data_size
+    event_source.file_entry_type = dfvfs_definitions.FILE_ENTRY_TYPE_FILE
+    event_source.task_timing = task_timing
+    event_source_heap.PushEventSource(event_source)
+
+  scheduled_task_timings = []
+  event_source = event_source_heap.PopEventSource()
+  while event_source:
+    scheduled_task_timings.append(event_source.task_timing)
+    event_source = event_source_heap.PopEventSource()
+
+  return scheduled_task_timings
+
+
+def SimulateWorkers(task_timings, number_of_workers):
+  """Simulates worker processes that process tasks in order.
+
+  Args:
+    task_timings (list[TaskTiming]): task timings in order of scheduling.
+    number_of_workers (int): number of worker processes.
+
+  Returns:
+    float: time it took to process all the tasks in seconds.
+  """
+  worker_heap = [0.0] * number_of_workers
+
+  for task_timing in task_timings:
+    available_time = heapq.heappop(worker_heap)
+    heapq.heappush(worker_heap, available_time + task_timing.processing_time)
+
+  return max(worker_heap)
+
+
+_STRATEGIES = {
+    u'event_source_heap': ScheduleWithEventSourceHeap,
+    u'recorded_order': ScheduleInRecordedOrder}
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks task scheduling strategies by simulating worker '
+      u'processes.'))
+
+  argument_parser.add_argument(
+      u'--number_of_tasks', u'--number-of-tasks', dest=u'number_of_tasks',
+      type=int, action=u'store', default=100000, metavar=u'NUMBER', help=(
+          u'number of synthetic tasks to simulate.'))
+
+  argument_parser.add_argument(
+      u'--workers', dest=u'workers', type=int, action=u'store', default=8,
+      metavar=u'NUMBER', help=u'number of simulated worker processes.')
+
+  argument_parser.add_argument(
+      u'task_timings', nargs=u'?', action=u'store', metavar=u'PATH',
+      default=None, help=(
+          u'path of a sample file of the tasks profiler, or of the profiling '
+          u'directory containing the sample files, if not provided synthetic '
+          u'task timings are used.'))
+
+  options = argument_parser.parse_args()
+
+  if options.task_timings:
+    if not os.path.exists(options.task_timings):
+      print(u'No such file or directory: {0:s}.'.format(options.task_timings))
+      return False
+
+    task_timings = ReadTaskTimings(options.task_timings)
+  else:
+    task_timings = CreateSyntheticTaskTimings(options.number_of_tasks)
+
+  if not task_timings:
+    print(u'No task timings found.')
+    return False
+
+  total_processing_time = sum(
+      task_timing.processing_time for task_timing in task_timings)
+  maximum_processing_time = max(
+      task_timing.processing_time for task_timing in task_timings)
+
+  lower_bound = max(
+      total_processing_time / options.workers, maximum_processing_time)
+
+  print(u'Simulating {0:d} tasks on {1:d} workers.'.format(
+      len(task_timings), options.workers))
+  print(u'lower bound\t\t{0:.3f} seconds'.format(lower_bound))
+
+  for name, strategy in sorted(_STRATEGIES.items()):
+    scheduled_task_timings = strategy(task_timings)
+    processing_time = SimulateWorkers(
+        scheduled_task_timings, options.workers)
+
+    print(u'{0:s}\t{1:.3f} seconds\t({2:.1f}% of lower bound)'.format(
+        name, processing_time, (processing_time / lower_bound) * 100.0))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,207 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the attribute container serializers."""
+
+from __future__ import print_function
+import argparse
+import os
+import sys
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import events
+from plaso.engine import profiler
+from plaso.lib import definitions
+from plaso.serializer import binary_serializer
+from plaso.serializer import json_serializer
+from plaso.storage import zip_file
+
+
+_SERIALIZERS = {
+    definitions.SERIALIZER_FORMAT_BINARY: (
+        binary_serializer.BinaryAttributeContainerSerializer),
+    definitions.SERIALIZER_FORMAT_JSON: (
+        json_serializer.JSONAttributeContainerSerializer)}
+
+
+def CreateSyntheticEvents(number_of_events):
+  """Creates synthetic events.
+
+  Args:
+    number_of_events (int): number of events to create.
+
+  Returns:
+    list[EventObject]: events.
+  """
+  os_path_spec = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/cases/image.raw')
+
+  synthetic_events = []
+  for event_index in range(number_of_events):
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK,
+        inode=event_index % 64, location=u'/var/log/test{0:d}.log'.format(
+            event_index % 64), parent=os_path_spec)
+
+    event = events.EventObject()
+    event.data_type = u'test:event'
+    event.filename = path_spec.location
+    event.inode = path_spec.inode
+    event.offset = event_index
+    event.parser = u'test_parser'
+    event.pathspec = path_spec
+    event.text = u'Synthetic event: {0:d}'.format(event_index)
+    event.timestamp = 1483228800000000 + event_index
+    event.timestamp_desc = u'Test Time'
+
+    synthetic_events.append(event)
+
+  return synthetic_events
+
+
+def ReadEventsFromStorageFile(path, maximum_number_of_events):
+  """Reads events from a storage file.
+
+  Args:
+    path (str): path of the storage file.
+    maximum_number_of_events (int): maximum number of events to read.
+
+  Returns:
+    list[EventObject]: events.
+  """
+  storage_file = zip_file.ZIPStorageFile()
+  storage_file.Open(path=path)
+
+  stored_events = []
+  try:
+    for event in storage_file.GetEvents():
+      stored_events.append(event)
+      if len(stored_events) >= maximum_number_of_events:
+        break
+
+  finally:
+    storage_file.Close()
+
+  return stored_events
+
+
+def MeasureSerializer(
+    serializer, serializers_profiler, profile_prefix, containers,
+    number_of_iterations):
+  """Measures writing and reading attribute containers with a serializer.
+
+  Args:
+    serializer (type): attribute container serializer class.
+    serializers_profiler (SerializersProfiler): serializers profiler.
+    profile_prefix (str): prefix of the profile names.
+    containers (list[AttributeContainer]): attribute containers.
+    number_of_iterations (int): number of times to serialize the containers.
+
+  Returns:
+    tuple: contains:
+
+      float: time to write the containers in seconds.
+      float: time to read the containers in seconds.
+      int: total size of the serialized containers in bytes.
+  """
+  write_profile_name = u'{0:s}_write'.format(profile_prefix)
+  read_profile_name = u'{0:s}_read'.format(profile_prefix)
+
+  write_time = 0.0
+  read_time = 0.0
+  serialized_size = 0
+
+  for _ in range(number_of_iterations):
+    start_time = time.time()
+    serializers_profiler.StartTiming(write_profile_name)
+    serialized_containers = [
+        serializer.WriteSerialized(container) for container in containers]
+    serializers_profiler.StopTiming(write_profile_name)
+    write_time += time.time() - start_time
+
+    serialized_size += sum(map(len, serialized_containers))
+
+    start_time = time.time()
+    serializers_profiler.StartTiming(read_profile_name)
+    for serialized_container in serialized_containers:
+      serializer.ReadSerialized(serialized_container)
+    serializers_profiler.StopTiming(read_profile_name)
+    read_time += time.time() - start_time
+
+  return write_time, read_time, serialized_size
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput of the attribute container serializers.'))
+
+  argument_parser.add_argument(
+      u'--number_of_events', u'--number-of-events', dest=u'number_of_events',
+      type=int, action=u'store', default=10000, metavar=u'NUMBER', help=(
+          u'maximum number of events to serialize per iteration.'))
+
+  argument_parser.add_argument(
+      u'--number_of_iterations', u'--number-of-iterations',
+      dest=u'number_of_iterations', type=int, action=u'store', default=5,
+      metavar=u'NUMBER', help=u'number of times to serialize the events.')
+
+  argument_parser.add_argument(
+      u'--profiling_directory', u'--profiling-directory',
+      dest=u'profiling_directory', type=str, action=u'store', default=None,
+      metavar=u'DIRECTORY', help=(
+          u'path of the directory to write the serializers profile to.'))
+
+  argument_parser.add_argument(
+      u'storage_file', nargs=u'?', action=u'store', metavar=u'PATH',
+      default=None, help=(
+          u'path of the storage file to read events from, if not provided '
+          u'synthetic events are used.'))
+
+  options = argument_parser.parse_args()
+
+  if options.storage_file:
+    if not os.path.isfile(options.storage_file):
+      print(u'No such storage file: {0:s}.'.format(options.storage_file))
+      return False
+
+    containers = ReadEventsFromStorageFile(
+        options.storage_file, options.number_of_events)
+  else:
+    containers = CreateSyntheticEvents(options.number_of_events)
+
+  serializers_profiler = profiler.SerializersProfiler(
+      u'benchmark', path=options.profiling_directory)
+
+  print(u'Serializing {0:d} events {1:d} times.'.format(
+      len(containers), options.number_of_iterations))
+
+  for serializer_format, serializer in sorted(_SERIALIZERS.items()):
+    write_time, read_time, serialized_size = MeasureSerializer(
+        serializer, serializers_profiler, serializer_format, containers,
+        options.number_of_iterations)
+
+    print((u'{0:s}\twrite: {1:.3f} seconds\tread: {2:.3f} seconds\t'
+           u'size: {3:d} bytes').format(
+               serializer_format, write_time, read_time, serialized_size))
+
+  if options.profiling_directory:
+    serializers_profiler.Write()
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
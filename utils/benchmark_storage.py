@@ -0,0 +1,179 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark reading events from a ZIP-based storage file."""
+
+from __future__ import print_function
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from plaso.containers import events
+from plaso.storage import time_range as storage_time_range
+from plaso.storage import zip_file
+
+
+# The timestamp of 2017-01-01 00:00:00 UTC.
+_BASE_TIMESTAMP = 1483228800000000
+
+# The duration of the synthetic timeline, 365 days, in microseconds.
+_TIMELINE_DURATION = 365 * 24 * 60 * 60 * 1000000
+
+
+def CreateSyntheticStorageFile(path, number_of_events, buffer_size):
+  """Creates a storage file with synthetic events.
+
+  Args:
+    path (str): path of the storage file.
+    number_of_events (int): number of events to write.
+    buffer_size (int): maximum size of a single event data stream.
+  """
+  storage_file = zip_file.ZIPStorageFile(maximum_buffer_size=buffer_size)
+  storage_file.Open(path=path, read_only=False)
+
+  try:
+    for event_index in range(number_of_events):
+      event = events.EventObject()
+      event.data_type = u'test:event'
+      event.filename = u'/var/log/test{0:d}.log'.format(event_index % 64)
+      event.offset = event_index
+      event.parser = u'test_parser'
+      event.text = u'Synthetic event: {0:d}'.format(event_index)
+      event.timestamp = _BASE_TIMESTAMP + random.randint(
+          0, _TIMELINE_DURATION)
+      event.timestamp_desc = u'Test Time'
+
+      storage_file.AddEvent(event)
+
+  finally:
+    storage_file.Close()
+
+
+def MeasureTimeToFirstEvent(path, time_range, maximum_number_of_events):
+  """Measures the time to the first event of a time range.
+
+  Args:
+    path (str): path of the storage file.
+    time_range (TimeRange): time range of the slice.
+    maximum_number_of_events (int): maximum number of events to read.
+
+  Returns:
+    tuple: contains:
+
+      float: time to the first event in seconds or None if no event was read.
+      float: time to read the events in seconds.
+      int: number of events read.
+  """
+  start_time = time.time()
+  first_event_time = None
+  number_of_events = 0
+
+  storage_file = zip_file.ZIPStorageFile()
+  storage_file.Open(path=path)
+
+  try:
+    for _ in storage_file.GetEvents(time_range=time_range):
+      if first_event_time is None:
+        first_event_time = time.time() - start_time
+
+      number_of_events += 1
+      if number_of_events >= maximum_number_of_events:
+        break
+
+  finally:
+    storage_file.Close()
+
+  return first_event_time, time.time() - start_time, number_of_events
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the time to the first event of narrow time slices '
+      u'of a ZIP-based storage file.'))
+
+  argument_parser.add_argument(
+      u'--buffer_size', u'--buffer-size', dest=u'buffer_size', type=int,
+      action=u'store', default=4 * 1024 * 1024, metavar=u'SIZE', help=(
+          u'maximum size of an event data stream of the synthetic storage '
+          u'file.'))
+
+  argument_parser.add_argument(
+      u'--number_of_events', u'--number-of-events', dest=u'number_of_events',
+      type=int, action=u'store', default=100000, metavar=u'NUMBER', help=(
+          u'number of events in the synthetic storage file.'))
+
+  argument_parser.add_argument(
+      u'--number_of_slices', u'--number-of-slices', dest=u'number_of_slices',
+      type=int, action=u'store', default=10, metavar=u'NUMBER', help=(
+          u'number of time slices to measure.'))
+
+  argument_parser.add_argument(
+      u'--slice_size', u'--slice-size', dest=u'slice_size', type=int,
+      action=u'store', default=60, metavar=u'SECONDS', help=(
+          u'size of a time slice in seconds.'))
+
+  argument_parser.add_argument(
+      u'storage_file', nargs=u'?', action=u'store', metavar=u'PATH',
+      default=None, help=(
+          u'path of the storage file, if not provided a synthetic storage '
+          u'file is created.'))
+
+  options = argument_parser.parse_args()
+
+  temporary_directory = None
+  storage_file_path = options.storage_file
+
+  try:
+    if not storage_file_path:
+      temporary_directory = tempfile.mkdtemp()
+      storage_file_path = os.path.join(temporary_directory, u'storage.plaso')
+
+      start_time = time.time()
+      CreateSyntheticStorageFile(
+          storage_file_path, options.number_of_events, options.buffer_size)
+      print(u'Created synthetic storage file with {0:d} events in {1:.3f} '
+            u'seconds.'.format(options.number_of_events,
+                               time.time() - start_time))
+
+    slice_size = options.slice_size * 1000000
+    for _ in range(options.number_of_slices):
+      start_timestamp = _BASE_TIMESTAMP + random.randint(
+          0, _TIMELINE_DURATION - slice_size)
+      time_range = storage_time_range.TimeRange(
+          start_timestamp, start_timestamp + slice_size)
+
+      first_event_time, total_time, number_of_events = (
+          MeasureTimeToFirstEvent(
+              storage_file_path, time_range, options.number_of_events))
+
+      if first_event_time is None:
+        first_event_time = total_time
+
+      print((u'Slice: {0:d} - {1:d}\ttime to first event: {2:.3f} seconds\t'
+             u'events: {3:d} in {4:.3f} seconds').format(
+                 time_range.start_timestamp, time_range.end_timestamp,
+                 first_event_time, number_of_events, total_time))
+
+  finally:
+    if temporary_directory:
+      shutil.rmtree(temporary_directory, True)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
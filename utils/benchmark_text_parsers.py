@@ -0,0 +1,274 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the throughput of the text parsers."""
+
+from __future__ import print_function
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.containers import sessions
+from plaso.engine import knowledge_base
+from plaso.parsers import dpkg
+from plaso.parsers import iis
+from plaso.parsers import mediator as parsers_mediator
+from plaso.parsers import syslog
+from plaso.storage import fake_storage
+
+
+def WriteDpkgLog(file_object, number_of_lines):
+  """Writes a synthetic Debian dpkg.log file.
+
+  Args:
+    file_object (file): file-like object to write to.
+    number_of_lines (int): number of log lines to write.
+  """
+  bodies = [
+      u'startup archives unpack',
+      u'install base-passwd:amd64 <none> 3.5.33',
+      u'status half-installed base-passwd:amd64 3.5.33',
+      u'conffile /etc/X11/Xsession keep']
+
+  for line_index in range(number_of_lines):
+    line = u'2016-08-03 15:{0:02d}:{1:02d} {2:s}\n'.format(
+        (line_index // 60) % 60, line_index % 60,
+        bodies[line_index % len(bodies)])
+    file_object.write(line.encode(u'ascii'))
+
+
+def WriteIISLog(file_object, number_of_lines):
+  """Writes a synthetic Microsoft IIS log file.
+
+  Args:
+    file_object (file): file-like object to write to.
+    number_of_lines (int): number of log lines to write.
+  """
+  header = (
+      u'#Software: Microsoft Internet Information Services 7.5\r\n'
+      u'#Version: 1.0\r\n'
+      u'#Date: 2013-07-30 00:00:00\r\n'
+      u'#Fields: date time s-ip cs-method cs-uri-stem cs-uri-query s-port '
+      u'cs-username c-ip cs(User-Agent) sc-status sc-substatus '
+      u'sc-win32-status time-taken\r\n')
+  file_object.write(header.encode(u'ascii'))
+
+  for line_index in range(number_of_lines):
+    line = (
+        u'2013-07-30 00:{0:02d}:{1:02d} 10.10.10.100 GET '
+        u'/some/image/path/image{2:d}.jpg - 80 - 22.22.22.{3:d} '
+        u'Mozilla/5.0+(Macintosh;+Intel+Mac+OS+X+10_6_8) {4:d} 0 0 '
+        u'{5:d}\r\n').format(
+            (line_index // 60) % 60, line_index % 60, line_index,
+            line_index % 256, 200 + (line_index % 5) * 100, line_index % 1000)
+    file_object.write(line.encode(u'ascii'))
+
+
+def WriteSyslog(file_object, number_of_lines):
+  """Writes a synthetic syslog file.
+
+  Every tenth record is continued on a second line and every tenth record
+  is in the ChromeOS format, which only matches the last line structure of
+  the parser.
+
+  Args:
+    file_object (file): file-like object to write to.
+    number_of_lines (int): number of log lines to write.
+  """
+  for line_index in range(number_of_lines):
+    if line_index % 10 == 9:
+      line = u'  continued message of record {0:d}\n'.format(line_index - 1)
+    elif line_index % 10 == 4:
+      line = (
+          u'2016-10-25T07:{0:02d}:{1:02d}.297265-07:00 INFO client[{2:d}]: '
+          u'No new content\n').format(
+              (line_index // 60) % 60, line_index % 60, line_index % 65536)
+    else:
+      line = (
+          u'Jan 22 07:{0:02d}:{1:02d} myhostname.myhost.com client[{2:d}]: '
+          u'INFO No new content in \xedmynotes.xml.\n').format(
+              (line_index // 60) % 60, line_index % 60, line_index % 65536)
+    file_object.write(line.encode(u'utf-8'))
+
+
+# The line-oriented parsers to benchmark and the functions to write their
+# synthetic logs.
+PARSERS = [
+    (dpkg.DpkgParser, WriteDpkgLog),
+    (iis.WinIISParser, WriteIISLog)]
+
+# The multi-line parsers to benchmark and the functions to write their
+# synthetic logs.
+MULTI_LINE_PARSERS = [
+    (syslog.SyslogParser, WriteSyslog)]
+
+
+# The factor by which the number of lines is multiplied to measure how
+# the throughput of the multi-line parsers scales.
+_SCALING_FACTOR = 4
+
+
+def CreatePyparsingOnlyParserClass(parser_class):
+  """Creates a parser class that only uses the pyparsing line structures.
+
+  Args:
+    parser_class (type): class of a line-oriented text parser.
+
+  Returns:
+    type: class of the parser that ignores its regular expression line
+        structures.
+  """
+  class PyparsingOnlyParser(parser_class):
+    """Parser that only uses the pyparsing line structures."""
+
+    def _ParseLine(self, line):
+      """Parses a line with the pyparsing line structures.
+
+      Args:
+        line (str): line.
+
+      Returns:
+        tuple: contains:
+
+          str: key of the line structure that matched the line or None.
+          pyparsing.ParseResults: structure of tokens derived from the line
+              or None.
+      """
+      self._regular_expression_line_structures = []
+      return super(PyparsingOnlyParser, self)._ParseLine(line)
+
+  return PyparsingOnlyParser
+
+
+def MeasureParser(parser_class, path, number_of_lines):
+  """Measures parsing a log file with a parser.
+
+  Args:
+    parser_class (type): class of a line-oriented text parser.
+    path (str): path of the log file.
+    number_of_lines (int): number of log lines in the log file.
+
+  Returns:
+    tuple: contains:
+
+      float: number of lines parsed per second.
+      int: number of events produced.
+  """
+  session = sessions.Session()
+  storage_writer = fake_storage.FakeStorageWriter(session)
+  storage_writer.Open()
+
+  knowledge_base_object = knowledge_base.KnowledgeBase()
+  knowledge_base_object.SetTimeZone(u'UTC')
+
+  parser_mediator = parsers_mediator.ParserMediator(
+      storage_writer, knowledge_base_object)
+
+  path_spec = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location=path)
+  file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+  parser_mediator.SetFileEntry(file_entry)
+
+  parser_object = parser_class()
+  file_object = file_entry.GetFileObject()
+
+  start_time = time.time()
+  try:
+    parser_object.Parse(parser_mediator, file_object)
+  finally:
+    file_object.close()
+
+  elapsed_time = time.time() - start_time
+
+  return number_of_lines / elapsed_time, storage_writer.number_of_events
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput of the line-oriented text parsers with and '
+      u'without their regular expression line structures and the scaling '
+      u'of the multi-line text parsers.'))
+
+  argument_parser.add_argument(
+      u'--number_of_lines', u'--number-of-lines', dest=u'number_of_lines',
+      type=int, action=u'store', default=100000, metavar=u'NUMBER', help=(
+          u'number of lines of the synthetic log files.'))
+
+  options = argument_parser.parse_args()
+
+  temporary_directory = tempfile.mkdtemp()
+
+  result = True
+  try:
+    print(u'Parsing {0:d} lines per parser.'.format(options.number_of_lines))
+    print(u'')
+    print(u'parser\t\tpyparsing lines/s\tregular expression lines/s\tevents')
+
+    for parser_class, write_function in PARSERS:
+      path = os.path.join(temporary_directory, parser_class.NAME)
+      with open(path, 'wb') as file_object:
+        write_function(file_object, options.number_of_lines)
+
+      pyparsing_throughput, pyparsing_events = MeasureParser(
+          CreatePyparsingOnlyParserClass(parser_class), path,
+          options.number_of_lines)
+      throughput, number_of_events = MeasureParser(
+          parser_class, path, options.number_of_lines)
+
+      print(u'{0:s}\t\t{1:.1f}\t\t{2:.1f}\t({3:.2f}x)\t\t{4:d}'.format(
+          parser_class.NAME, pyparsing_throughput, throughput,
+          throughput / pyparsing_throughput, number_of_events))
+
+      if number_of_events != pyparsing_events:
+        print(u'Number of events differs: {0:d} with pyparsing.'.format(
+            pyparsing_events))
+        result = False
+
+    # The throughput of a parser that scales linearly with the size of
+    # the file does not depend on the number of lines.
+    print(u'')
+    print(u'parser\t\tlines/s\t\t{0:d}x lines/s\tevents'.format(
+        _SCALING_FACTOR))
+
+    for parser_class, write_function in MULTI_LINE_PARSERS:
+      throughputs = []
+      for number_of_lines in (
+          options.number_of_lines,
+          options.number_of_lines * _SCALING_FACTOR):
+        path = os.path.join(temporary_directory, parser_class.NAME)
+        with open(path, 'wb') as file_object:
+          write_function(file_object, number_of_lines)
+
+        throughput, number_of_events = MeasureParser(
+            parser_class, path, number_of_lines)
+        throughputs.append(throughput)
+
+      print(u'{0:s}\t\t{1:.1f}\t\t{2:.1f}\t({3:.2f}x)\t{4:d}'.format(
+          parser_class.NAME, throughputs[0], throughputs[1],
+          throughputs[1] / throughputs[0], number_of_events))
+
+  finally:
+    shutil.rmtree(temporary_directory, True)
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)